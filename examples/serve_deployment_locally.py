@@ -0,0 +1,128 @@
+# Copyright (C) 2023 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions
+# and limitations under the License.
+
+import argparse
+import json
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from geti_sdk.deployment import Deployment, InferenceServer
+
+
+def run_load_test(address: str, image_path: str, n_requests: int, concurrency: int):
+    """
+    Send `n_requests` inference requests for the same image to the server, with
+    `concurrency` requests in flight at any time, and print the server metrics.
+    """
+    with open(image_path, "rb") as image_file:
+        image_data = image_file.read()
+
+    def _predict(_) -> int:
+        return requests.post(f"{address}/predict", data=image_data).status_code
+
+    t_start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        status_codes = list(executor.map(_predict, range(n_requests)))
+    duration = time.perf_counter() - t_start
+    print(
+        f"{status_codes.count(200)}/{n_requests} requests succeeded in "
+        f"{duration:.2f} s ({n_requests / duration:.1f} requests/s)"
+    )
+    print(json.dumps(requests.get(f"{address}/metrics").json(), indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Serve a deployment over HTTP on the local machine."
+    )
+    parser.add_argument(
+        "deployment_path",
+        type=str,
+        help="Path to the folder containing the deployment data",
+    )
+    parser.add_argument(
+        "--device",
+        choices=["CPU", "GPU"],
+        default="CPU",
+        help="Device (CPU or GPU) to load the model to. Defaults to 'CPU'",
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="Address to listen on")
+    parser.add_argument("--port", type=int, default=8080, help="Port to listen on")
+    parser.add_argument(
+        "--max_batch_size",
+        type=int,
+        default=8,
+        help="Maximum number of images to infer in a single batch. Defaults to 8",
+    )
+    parser.add_argument(
+        "--max_queue_delay_ms",
+        type=float,
+        default=5,
+        help="Maximum time that an image waits for a batch to fill up, in "
+        "milliseconds. Defaults to 5",
+    )
+    parser.add_argument(
+        "--async_infer_requests",
+        type=int,
+        default=0,
+        help="Number of parallel asynchronous infer requests per model. Defaults to "
+        "0, which lets OpenVINO choose the optimal number",
+    )
+    parser.add_argument(
+        "--load_test_image",
+        type=str,
+        default=None,
+        help="Path to an image. If specified, the server is load tested by sending "
+        "inference requests for this image, after which the server is stopped",
+    )
+    parser.add_argument(
+        "--load_test_requests",
+        type=int,
+        default=500,
+        help="Number of requests to send in the load test. Defaults to 500",
+    )
+    parser.add_argument(
+        "--load_test_concurrency",
+        type=int,
+        default=16,
+        help="Number of concurrent requests in the load test. Defaults to 16",
+    )
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    deployment = Deployment.from_folder(args.deployment_path)
+    deployment.load_inference_models(
+        device=args.device, max_async_infer_requests=args.async_infer_requests
+    )
+    server = InferenceServer(
+        deployment,
+        host=args.host,
+        port=args.port,
+        max_batch_size=args.max_batch_size,
+        max_queue_delay=args.max_queue_delay_ms / 1000,
+    )
+    if args.load_test_image is None:
+        server.serve_forever()
+    else:
+        with server:
+            run_load_test(
+                server.address,
+                args.load_test_image,
+                n_requests=args.load_test_requests,
+                concurrency=args.load_test_concurrency,
+            )
@@ -12,12 +12,15 @@
 # See the License for the specific language governing permissions
 # and limitations under the License.
 import csv
+import gc
 import itertools
 import logging
 import os
+import tempfile
 import time
-from typing import Dict, List, Optional, Sequence, Union
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Union
 
+import cv2
 import numpy as np
 from tqdm.auto import tqdm
 from tqdm.contrib.logging import logging_redirect_tqdm
@@ -28,13 +31,42 @@ from geti_sdk.data_models import (
     Model,
     OptimizedModel,
     Performance,
+    Prediction,
     Project,
     Video,
 )
-from geti_sdk.deployment import Deployment
+from geti_sdk.deployment import (
+    Deployment,
+    DeploymentPool,
+    QuantizationReport,
+    StageTimer,
+    quantize_deployment,
+)
+from geti_sdk.deployment.stage_timer import INFERENCE_STAGES
 from geti_sdk.rest_clients import ImageClient, ModelClient, TrainingClient, VideoClient
 
-from .utils import get_system_info, load_benchmark_media, suppress_log_output
+from .utils import (
+    PeakMemoryMonitor,
+    get_memory_usage,
+    get_system_info,
+    load_benchmark_media,
+    suppress_log_output,
+)
+
+# Result of inferring a single benchmark frame: The index of the repeat and of the
+# frame, the latency in seconds (None if inference failed), and the time spent in
+# each inference stage per task, if measured
+FrameResult = Tuple[int, int, Optional[float], Optional[Dict[str, Dict[str, float]]]]
+
+# Result columns holding the time and memory required to load a deployment, and the
+# memory used during inference
+LOAD_METRIC_COLUMNS = [
+    "cold load time [s]",
+    "warm load time [s]",
+    "peak memory load [MB]",
+    "peak memory inference [MB]",
+    "memory delta [MB]",
+]
 
 
 class Benchmarker:
@@ -543,6 +575,84 @@ class Benchmarker:
                 f"valid deployment folders were found."
             )
 
+    def add_quantized_deployments(
+        self,
+        working_directory: os.PathLike = ".",
+        calibration_images: Optional[Sequence[np.ndarray]] = None,
+        n_calibration_images: int = 300,
+        n_validation_images: int = 50,
+        preset: str = "performance",
+    ) -> List[QuantizationReport]:
+        """
+        Quantize the deployments in the Benchmarker to INT8 precision locally, with
+        NNCF post-training quantization, and add the quantized deployments to the
+        benchmark. This allows comparing precisions without requesting optimization
+        jobs on the Intel® Geti™ server.
+
+        Deployments for which all models already have INT8 precision are skipped.
+        The last `n_validation_images` images are held out from calibration, and
+        used to compare the predictions and the throughput of the original and the
+        quantized deployments.
+
+        NOTE: This method requires the `nncf` package to be installed
+
+        :param working_directory: Output directory to which the quantized deployments
+            will be saved
+        :param calibration_images: Optional images to calibrate the quantization on,
+            with the channels in RGB order. If left as None, images are pulled from
+            the project
+        :param n_calibration_images: Number of images to pull from the project for
+            calibration, if no `calibration_images` are passed
+        :param n_validation_images: Number of images to hold out for validation
+        :param preset: Quantization preset, either `performance` or `mixed`
+        :return: List of QuantizationReports, one for each quantized deployment
+        """
+        self._check_deployments_available()
+        if calibration_images is None:
+            calibration_images = self._load_project_images(
+                n_calibration_images + n_validation_images
+            )
+        n_validation_images = min(n_validation_images, len(calibration_images) // 2)
+        if n_validation_images == 0:
+            raise ValueError(
+                "At least two images are required to quantize the deployments, one "
+                "for calibration and one for validation."
+            )
+        validation_images = calibration_images[-n_validation_images:]
+        calibration_images = calibration_images[:-n_validation_images]
+
+        os.makedirs(working_directory, exist_ok=True)
+        reports: List[QuantizationReport] = []
+        with logging_redirect_tqdm(tqdm_class=tqdm):
+            for deployment_folder in tqdm(
+                list(self._deployment_folders), desc="Quantizing deployments"
+            ):
+                deployment = Deployment.from_folder(deployment_folder)
+                if all(model.precision == ["INT8"] for model in deployment.models):
+                    continue
+                output_folder = os.path.join(
+                    working_directory,
+                    f"{os.path.basename(os.path.normpath(deployment_folder))}_int8",
+                )
+                with suppress_log_output():
+                    deployment.load_inference_models(device="CPU")
+                    report = quantize_deployment(
+                        deployment,
+                        output_folder=output_folder,
+                        calibration_images=calibration_images,
+                        validation_images=validation_images,
+                        subset_size=len(calibration_images),
+                        preset=preset,
+                    )
+                logging.info(
+                    f"Quantized deployment `{deployment_folder}`: Accuracy changed by "
+                    f"{report.accuracy_delta:+.3f}, throughput changed by a factor "
+                    f"{report.throughput_gain:.2f}."
+                )
+                self._deployment_folders.append(output_folder)
+                reports.append(report)
+        return reports
+
     def run_throughput_benchmark(
         self,
         working_directory: os.PathLike = ".",
@@ -550,10 +660,37 @@ class Benchmarker:
         target_device: str = "CPU",
         frames: int = 200,
         repeats: int = 3,
+        warmup_frames: int = 1,
+        mode: str = "sync",
+        streams: Sequence[Union[int, str]] = ("AUTO",),
+        requests: Sequence[int] = (0,),
     ) -> List[Dict[str, str]]:
         """
         Run the benchmark experiment.
 
+        Next to the throughput, the latency of each inferred frame is measured. The
+        results contain the 50th, 95th and 99th percentile of the latency. The
+        timings for the individual frames are saved to a separate file
+        `<results_filename>_frames.csv` in the `working_directory`.
+
+        In `sync` mode the frames are inferred one by one using `Deployment.infer`,
+        and the time spent in preprocessing, inference, postprocessing and conversion
+        to a Prediction is measured for each task in the project. The results contain
+        the mean time per stage.
+
+        In `async` mode the frames are submitted through `Deployment.infer_async`,
+        with the models compiled with the `THROUGHPUT` performance hint. The benchmark
+        is run for each combination of the number of inference `streams` and the
+        number of infer `requests`, so that the best configuration for serving the
+        models can be selected. The latency of a frame is measured from the moment it
+        is submitted, including any time spent waiting for a free infer request.
+
+        For each deployment and configuration, the results also contain the time
+        required to load the models with an empty model cache (cold load) and with
+        a populated model cache (warm load), the peak resident memory of the process
+        during loading and during inference, and the increase in resident memory
+        between the moment before the warm load and the end of the inference run.
+
         :param working_directory: Directory in which the deployments that should be
             benchmarked are stored. All output will be saved to this directory.
         :param results_filename: Name of the file to which the results will be saved.
@@ -566,6 +703,414 @@ class Benchmarker:
             fps
         :param repeats: Number of times to repeat the benchmark runs. FPS will be
             averaged over the runs.
+        :param warmup_frames: Number of frames to infer before the measurement starts.
+            These frames are not included in the results
+        :param mode: Inference mode to benchmark, either `sync` or `async`
+        :param streams: Numbers of inference streams to benchmark in `async` mode.
+            Each entry can be an integer or 'AUTO'
+        :param requests: Numbers of parallel infer requests to benchmark in `async`
+            mode. Use 0 to let OpenVINO choose the optimal number of requests for the
+            device and number of streams
+        :return: List of dictionaries holding the results, one for each deployment
+            in `sync` mode, or one for each combination of deployment, number of
+            streams and number of requests in `async` mode
+        """
+        if mode not in ["sync", "async"]:
+            raise ValueError(
+                f"Invalid benchmark mode `{mode}`, please choose either `sync` or "
+                f"`async`."
+            )
+        self._check_deployments_available()
+        logging.info("Starting throughput benchmark experiments.")
+        logging.info(
+            f"The Benchmarker will run for {len(self._deployment_folders)} deployments"
+        )
+        benchmark_frames = self._load_benchmark_frames(frames)
+        if mode == "sync":
+            logging.info(
+                f"Benchmarking inference rate for synchronous inference on {frames} "
+                f"frames with {repeats} repeats"
+            )
+            configurations: List[Dict[str, Union[int, str]]] = [{}]
+        else:
+            configurations = [
+                {"num_streams": num_streams, "max_async_infer_requests": num_requests}
+                for num_streams, num_requests in itertools.product(streams, requests)
+            ]
+            logging.info(
+                f"Benchmarking inference rate for asynchronous inference on {frames} "
+                f"frames with {repeats} repeats, for {len(configurations)} "
+                f"combinations of streams {list(streams)} and infer requests "
+                f"{list(requests)}"
+            )
+        task_titles = [task.title for task in self.project.get_trainable_tasks()]
+        stage_columns = [
+            (task_title, stage, f"{task_title} {stage} [ms]")
+            for task_title in task_titles
+            for stage in INFERENCE_STAGES
+        ]
+        frame_rows: List[Dict[str, str]] = []
+
+        def _benchmark_deployment(
+            deployment: Deployment, deployment_folder: str
+        ) -> Iterator[Tuple[bool, float, Dict[str, str]]]:
+            for configuration in configurations:
+                parameters = {
+                    "mode": mode,
+                    "streams": str(configuration.get("num_streams", "")),
+                    "requests": str(configuration.get("max_async_infer_requests", "")),
+                    "warm-up frames": str(warmup_frames),
+                    "failed frames": "",
+                    "latency p50 [ms]": "",
+                    "latency p95 [ms]": "",
+                    "latency p99 [ms]": "",
+                    **{column: "" for _, _, column in stage_columns},
+                    **{column: "" for column in LOAD_METRIC_COLUMNS},
+                }
+                if mode == "async":
+                    configuration = dict(configuration, performance_hint="THROUGHPUT")
+                with tempfile.TemporaryDirectory() as cache_dir:
+                    load_metrics = self._load_deployment_with_metrics(
+                        deployment,
+                        deployment_folder,
+                        target_device,
+                        cache_dir,
+                        **configuration,
+                    )
+                if load_metrics is None:
+                    yield False, 0.0, parameters
+                    continue
+                memory_before_load = load_metrics.pop("memory before load")
+                parameters.update(
+                    {
+                        column: _format_metric(load_metrics[column])
+                        for column in LOAD_METRIC_COLUMNS
+                        if column in load_metrics
+                    }
+                )
+                if mode == "async":
+                    parameters["requests"] = str(deployment.models[0].max_num_requests)
+                    measure_frames = self._measure_async_inference
+                else:
+                    measure_frames = self._measure_sync_inference
+                try:
+                    with PeakMemoryMonitor() as inference_monitor:
+                        frame_results, t_elapsed = measure_frames(
+                            deployment, benchmark_frames, repeats, warmup_frames
+                        )
+                except Exception as e:
+                    logging.info(
+                        f"Inference failed for deployment `{deployment_folder}`, with "
+                        f"error: `{e}`. Marking benchmark run for the deployment as "
+                        f"failed"
+                    )
+                    yield False, 0.0, parameters
+                    continue
+
+                latencies: List[float] = []
+                stage_times: Dict[str, List[float]] = {
+                    column: [] for _, _, column in stage_columns
+                }
+                for repeat, index, latency, frame_times in frame_results:
+                    frame_row = {
+                        "source": deployment_folder,
+                        "mode": mode,
+                        "streams": parameters["streams"],
+                        "requests": parameters["requests"],
+                        "repeat": str(repeat),
+                        "frame": str(index),
+                        "success": str(int(latency is not None)),
+                        "latency [ms]": "",
+                    }
+                    if latency is not None:
+                        frame_row["latency [ms]"] = f"{latency * 1000:.3f}"
+                        latencies.append(latency)
+                    if frame_times is not None:
+                        for task_title, stage, column in stage_columns:
+                            stage_time = frame_times.get(task_title, {}).get(stage, 0.0)
+                            frame_row[column] = f"{stage_time * 1000:.3f}"
+                            if latency is not None:
+                                stage_times[column].append(stage_time)
+                    frame_rows.append(frame_row)
+
+                parameters["failed frames"] = str(len(frame_results) - len(latencies))
+                memory_after_inference = get_memory_usage()
+                parameters["peak memory inference [MB]"] = _format_metric(
+                    _to_megabytes(inference_monitor.peak)
+                )
+                if (
+                    memory_before_load is not None
+                    and memory_after_inference is not None
+                ):
+                    parameters["memory delta [MB]"] = _format_metric(
+                        _to_megabytes(memory_after_inference - memory_before_load)
+                    )
+                if len(latencies) == 0:
+                    yield False, 0.0, parameters
+                    continue
+                percentiles = np.percentile(np.array(latencies) * 1000, [50, 95, 99])
+                for percentile, value in zip([50, 95, 99], percentiles):
+                    parameters[f"latency p{percentile} [ms]"] = f"{value:.2f}"
+                for _, _, column in stage_columns:
+                    if len(stage_times[column]) > 0:
+                        parameters[
+                            column
+                        ] = f"{np.mean(stage_times[column]) * 1000:.2f}"
+                yield True, len(latencies) / t_elapsed, parameters
+
+        results = self._run_benchmark_experiments(
+            benchmark_deployment=_benchmark_deployment,
+            working_directory=working_directory,
+            results_filename=results_filename,
+            target_device=target_device,
+            total_frames=frames * repeats,
+        )
+        frames_file = os.path.join(working_directory, f"{results_filename}_frames.csv")
+        logging.info(f"Writing frame timings to `{frames_file}`")
+        with open(frames_file, "w", newline="") as csvfile:
+            writer = csv.DictWriter(
+                csvfile,
+                fieldnames=[
+                    "source",
+                    "mode",
+                    "streams",
+                    "requests",
+                    "repeat",
+                    "frame",
+                    "success",
+                    "latency [ms]",
+                ]
+                + [column for _, _, column in stage_columns],
+            )
+            writer.writeheader()
+            writer.writerows(frame_rows)
+        return results
+
+    def run_batch_throughput_benchmark(
+        self,
+        working_directory: os.PathLike = ".",
+        results_filename: str = "batch_results",
+        target_device: str = "CPU",
+        frames: int = 200,
+        repeats: int = 3,
+        batch_sizes: Sequence[int] = (1, 2, 4, 8, 16),
+    ) -> List[Dict[str, str]]:
+        """
+        Run a benchmark experiment to measure the inference throughput for batched
+        inference, using `Deployment.infer_batch`, for a range of batch sizes.
+
+        :param working_directory: Directory in which the deployments that should be
+            benchmarked are stored. All output will be saved to this directory.
+        :param results_filename: Name of the file to which the results will be saved.
+            File extension should not be included, the results will always be saved as
+            a `.csv` file. Defaults to `batch_results.csv`. The results file will be
+            created within the `working_directory`
+        :param target_device: Device to run the inference models on, for example "CPU"
+            or "GPU". Defaults to "CPU".
+        :param frames: Number of frames/images to infer in order to calculate
+            fps
+        :param repeats: Number of times to repeat the benchmark runs. FPS will be
+            averaged over the runs.
+        :param batch_sizes: Batch sizes to measure the throughput for
+        :return: List of dictionaries holding the results, one for each combination
+            of deployment and batch size
+        """
+        self._check_deployments_available()
+        logging.info("Starting batched inference benchmark experiments.")
+        benchmark_frames = self._load_benchmark_frames(frames)
+        # Batched inference requires all frames in a batch to have the same size
+        frame_shape = benchmark_frames[0].shape
+        benchmark_frames = [
+            cv2.resize(frame, dsize=(frame_shape[1], frame_shape[0]))
+            if frame.shape != frame_shape
+            else frame
+            for frame in benchmark_frames
+        ]
+        logging.info(
+            f"Benchmarking inference rate for batched inference on {frames} frames "
+            f"with {repeats} repeats, for batch sizes {list(batch_sizes)}"
+        )
+
+        def _benchmark_deployment(
+            deployment: Deployment, deployment_folder: str
+        ) -> Iterator[Tuple[bool, float, Dict[str, str]]]:
+            loaded = self._load_deployment(deployment, deployment_folder, target_device)
+            for batch_size in batch_sizes:
+                parameters = {"batch size": str(batch_size)}
+                if not loaded:
+                    yield False, 0.0, parameters
+                    continue
+                batches = [
+                    benchmark_frames[start : start + batch_size]
+                    for start in range(0, frames, batch_size)
+                ]
+                try:
+                    # Warm-up, this also reshapes the model if needed
+                    deployment.infer_batch(batches[0], max_batch_size=batch_size)
+                    t_start = time.time()
+                    for _ in range(repeats):
+                        for batch in batches:
+                            deployment.infer_batch(batch, max_batch_size=batch_size)
+                    t_elapsed = time.time() - t_start
+                except Exception as e:
+                    logging.info(
+                        f"Batched inference with batch size {batch_size} failed for "
+                        f"deployment `{deployment_folder}`, with error: `{e}`"
+                    )
+                    yield False, 0.0, parameters
+                    continue
+                yield True, frames * repeats / t_elapsed, parameters
+
+        return self._run_benchmark_experiments(
+            benchmark_deployment=_benchmark_deployment,
+            working_directory=working_directory,
+            results_filename=results_filename,
+            target_device=target_device,
+            total_frames=frames * repeats,
+        )
+
+    def run_pool_throughput_benchmark(
+        self,
+        working_directory: os.PathLike = ".",
+        results_filename: str = "pool_results",
+        target_device: str = "CPU",
+        frames: int = 200,
+        repeats: int = 3,
+        workers: Sequence[int] = (1, 2, 4),
+    ) -> List[Dict[str, str]]:
+        """
+        Run a benchmark experiment to measure the inference throughput when running
+        the deployments in a `DeploymentPool`, for a range of worker counts.
+
+        :param working_directory: Directory in which the deployments that should be
+            benchmarked are stored. All output will be saved to this directory.
+        :param results_filename: Name of the file to which the results will be saved.
+            File extension should not be included, the results will always be saved as
+            a `.csv` file. Defaults to `pool_results.csv`. The results file will be
+            created within the `working_directory`
+        :param target_device: Device to run the inference models on, for example "CPU"
+            or "GPU". Defaults to "CPU".
+        :param frames: Number of frames/images to infer in order to calculate
+            fps
+        :param repeats: Number of times to repeat the benchmark runs. FPS will be
+            averaged over the runs.
+        :param workers: Numbers of worker processes to measure the throughput for
+        :return: List of dictionaries holding the results, one for each combination
+            of deployment and number of workers
+        """
+        self._check_deployments_available()
+        logging.info("Starting DeploymentPool benchmark experiments.")
+        benchmark_frames = self._load_benchmark_frames(frames)
+        max_frame_bytes = max(frame.nbytes for frame in benchmark_frames)
+
+        def _benchmark_deployment(
+            deployment: Deployment, deployment_folder: str
+        ) -> Iterator[Tuple[bool, float, Dict[str, str]]]:
+            for num_workers in workers:
+                parameters = {"workers": str(num_workers)}
+                try:
+                    with suppress_log_output(), DeploymentPool(
+                        deployment_folder,
+                        workers=num_workers,
+                        device=target_device,
+                        max_frame_bytes=max_frame_bytes,
+                    ) as pool:
+                        # Warm-up for all workers
+                        pool.infer_batch(benchmark_frames[0:num_workers])
+                        t_start = time.time()
+                        for _ in range(repeats):
+                            for _ in pool.imap(benchmark_frames):
+                                pass
+                        t_elapsed = time.time() - t_start
+                except Exception as e:
+                    logging.info(
+                        f"DeploymentPool benchmark with {num_workers} workers failed "
+                        f"for deployment `{deployment_folder}`, with error: `{e}`"
+                    )
+                    yield False, 0.0, parameters
+                    continue
+                yield True, frames * repeats / t_elapsed, parameters
+
+        return self._run_benchmark_experiments(
+            benchmark_deployment=_benchmark_deployment,
+            working_directory=working_directory,
+            results_filename=results_filename,
+            target_device=target_device,
+            total_frames=frames * repeats,
+        )
+
+    def run_startup_benchmark(
+        self,
+        working_directory: os.PathLike = ".",
+        results_filename: str = "startup_results",
+        target_device: str = "CPU",
+    ) -> List[Dict[str, str]]:
+        """
+        Run a benchmark experiment to measure the startup time of the deployments,
+        i.e. the time required to load the inference models and infer the first
+        frame. Each deployment is started twice: Once with an empty model cache
+        (cold start), and once more with the model cache populated by the first
+        start (warm start).
+
+        :param working_directory: Directory in which the deployments that should be
+            benchmarked are stored. All output will be saved to this directory.
+        :param results_filename: Name of the file to which the results will be saved.
+            File extension should not be included, the results will always be saved as
+            a `.csv` file. Defaults to `startup_results.csv`. The results file will be
+            created within the `working_directory`
+        :param target_device: Device to run the inference models on, for example "CPU"
+            or "GPU". Defaults to "CPU".
+        :return: List of dictionaries holding the results, one for each combination
+            of deployment and cache state. The `fps` column holds the inverse of the
+            time required to infer the first frame
+        """
+        self._check_deployments_available()
+        logging.info("Starting startup time benchmark experiments.")
+        benchmark_frame = self._load_benchmark_frames(1)[0]
+
+        def _benchmark_deployment(
+            deployment: Deployment, deployment_folder: str
+        ) -> Iterator[Tuple[bool, float, Dict[str, str]]]:
+            with tempfile.TemporaryDirectory() as cache_dir:
+                for cache_state in ["cold", "warm"]:
+                    if cache_state == "warm":
+                        # Start from a fresh deployment, so that nothing but the
+                        # cache is shared with the cold start
+                        deployment = Deployment.from_folder(deployment_folder)
+                    parameters = {"cache": cache_state}
+                    t_start = time.time()
+                    if not self._load_deployment(
+                        deployment, deployment_folder, target_device, cache_dir
+                    ):
+                        yield False, 0.0, parameters
+                        return
+                    t_loaded = time.time()
+                    try:
+                        deployment.infer(benchmark_frame)
+                    except Exception as e:
+                        logging.info(
+                            f"Inference failed for deployment `{deployment_folder}`, "
+                            f"with error: `{e}`. Marking benchmark run for the "
+                            f"deployment as failed"
+                        )
+                        yield False, 0.0, parameters
+                        return
+                    t_inferred = time.time()
+                    parameters["load time [s]"] = f"{t_loaded - t_start:.3f}"
+                    parameters["startup time [s]"] = f"{t_inferred - t_start:.3f}"
+                    yield True, 1 / (t_inferred - t_loaded), parameters
+
+        return self._run_benchmark_experiments(
+            benchmark_deployment=_benchmark_deployment,
+            working_directory=working_directory,
+            results_filename=results_filename,
+            target_device=target_device,
+            total_frames=1,
+        )
+
+    def _check_deployments_available(self) -> None:
+        """
+        Raise a ValueError if the Benchmarker does not hold any deployments yet.
         """
         if len(self._deployment_folders) == 0:
             raise ValueError(
@@ -574,121 +1119,385 @@ class Benchmarker:
                 "`Benchmarker.prepare_benchmark()` or "
                 "`Benchmarker.initialize_from_folder()` methods."
             )
-        logging.info("Starting throughput benchmark experiments.")
 
-        logging.info(
-            f"The Benchmarker will run for {len(self._deployment_folders)} deployments"
-        )
+    def _load_benchmark_frames(self, frames: int) -> List[np.ndarray]:
+        """
+        Load the media for the benchmark experiments.
 
+        :param frames: Number of frames/images to load
+        :return: List of numpy arrays holding the benchmark frames
+        """
         logging.info("Loading benchmark media")
-        benchmark_frames = load_benchmark_media(
+        return load_benchmark_media(
             session=self.geti.session,
             images=self.images,
             video=self.video,
             frames=frames,
         )
 
-        results_file = os.path.join(working_directory, f"{results_filename}.csv")
-        logging.info(f"Writing results to `{results_file}`")
+    def _load_project_images(self, n_images: int) -> List[np.ndarray]:
+        """
+        Load the pixel data for images in the project.
 
-        logging.info(
-            f"Benchmarking inference rate for synchronous inference on {frames} frames "
-            f"with {repeats} repeats"
+        :param n_images: Maximum number of images to load
+        :return: List of numpy arrays holding the images, with the channels in RGB
+            order
+        """
+        image_client = ImageClient(
+            session=self.geti.session,
+            workspace_id=self.geti.workspace_id,
+            project=self.project,
         )
+        images = image_client.get_all_images()[:n_images]
+        logging.info(f"Loading {len(images)} images from project `{self.project.name}`")
+        return [
+            cv2.cvtColor(image.get_data(session=self.geti.session), cv2.COLOR_BGR2RGB)
+            for image in images
+        ]
+
+    @staticmethod
+    def _measure_sync_inference(
+        deployment: Deployment,
+        benchmark_frames: List[np.ndarray],
+        repeats: int,
+        warmup_frames: int,
+    ) -> Tuple[List[FrameResult], float]:
+        """
+        Infer the benchmark frames one by one, and measure the latency and the time
+        spent in each inference stage for every frame.
+
+        :param deployment: Deployment to run inference with
+        :param benchmark_frames: Frames to infer
+        :param repeats: Number of times to infer all frames
+        :param warmup_frames: Number of frames to infer before the measurement starts
+        :raises: Exception if inference fails for any of the warm-up frames
+        :return: Tuple containing:
+            - A list holding a FrameResult for each inferred frame
+            - The total time spent on the frames that were inferred successfully
+        """
+        stage_timer = StageTimer()
+        deployment.set_stage_timer(stage_timer)
+        try:
+            for index in range(warmup_frames):
+                deployment.infer(benchmark_frames[index % len(benchmark_frames)])
+            frame_results: List[FrameResult] = []
+            for repeat in range(repeats):
+                for index, frame in enumerate(benchmark_frames):
+                    stage_timer.reset()
+                    t_start = time.perf_counter()
+                    try:
+                        deployment.infer(frame)
+                        latency: Optional[float] = time.perf_counter() - t_start
+                    except Exception as e:
+                        if all(result[2] is not None for result in frame_results):
+                            logging.info(
+                                f"Inference failed for frame {index}, with error: "
+                                f"`{e}`. Failed frames are excluded from the results"
+                            )
+                        latency = None
+                    frame_results.append((repeat, index, latency, stage_timer.reset()))
+        finally:
+            deployment.set_stage_timer(None)
+        t_elapsed = sum(
+            latency for _, _, latency, _ in frame_results if latency is not None
+        )
+        return frame_results, t_elapsed
+
+    @staticmethod
+    def _measure_async_inference(
+        deployment: Deployment,
+        benchmark_frames: List[np.ndarray],
+        repeats: int,
+        warmup_frames: int,
+    ) -> Tuple[List[FrameResult], float]:
+        """
+        Submit the benchmark frames for asynchronous inference, and measure the
+        latency for every frame and the total time required to infer all frames.
+
+        :param deployment: Deployment to run inference with
+        :param benchmark_frames: Frames to infer
+        :param repeats: Number of times to infer all frames
+        :param warmup_frames: Number of frames to infer before the measurement starts
+        :raises: Exception if inference fails for any of the warm-up frames
+        :return: Tuple containing:
+            - A list holding a FrameResult for each inferred frame. Times per
+              inference stage are not measured for asynchronous inference
+            - The time elapsed between submitting the first frame and completing
+              the last one
+        """
+
+        def _ignore_result(image: np.ndarray, prediction: Prediction, data: Any):
+            pass
+
+        for index in range(warmup_frames):
+            deployment.infer_async(
+                benchmark_frames[index % len(benchmark_frames)],
+                callback=_ignore_result,
+            )
+        deployment.await_all()
+
+        submit_times: Dict[Tuple[int, int], float] = {}
+        latencies: Dict[Tuple[int, int], Optional[float]] = {}
+
+        def _record_result(
+            image: np.ndarray, prediction: Prediction, key: Tuple[int, int]
+        ):
+            latencies[key] = time.perf_counter() - submit_times[key]
+
+        def _record_error(error: Exception, key: Tuple[int, int]):
+            if all(latency is not None for latency in latencies.values()):
+                logging.info(
+                    f"Inference failed for frame {key[1]}, with error: `{error}`. "
+                    f"Failed frames are excluded from the results"
+                )
+            latencies[key] = None
+
+        t_start = time.perf_counter()
+        for repeat in range(repeats):
+            for index, frame in enumerate(benchmark_frames):
+                submit_times[(repeat, index)] = time.perf_counter()
+                deployment.infer_async(
+                    frame,
+                    callback=_record_result,
+                    runtime_data=(repeat, index),
+                    error_callback=_record_error,
+                )
+        deployment.await_all()
+        t_elapsed = time.perf_counter() - t_start
+        frame_results: List[FrameResult] = [
+            (repeat, index, latencies.get((repeat, index)), None)
+            for repeat, index in submit_times
+        ]
+        return frame_results, t_elapsed
+
+    def _load_deployment_with_metrics(
+        self,
+        deployment: Deployment,
+        deployment_folder: str,
+        target_device: str,
+        cache_dir: str,
+        **load_kwargs: Any,
+    ) -> Optional[Dict[str, Optional[float]]]:
+        """
+        Load the inference models for a deployment that is benchmarked, and measure
+        the time and memory required to load them.
+
+        The models are first loaded in a separate instance of the deployment, with
+        an empty model cache (cold load). That instance is discarded, after which the
+        models for `deployment` are loaded from the populated cache (warm load).
+
+        :param deployment: Deployment to load the inference models for
+        :param deployment_folder: Path to the folder containing the deployment
+        :param target_device: Device to load the inference models on
+        :param cache_dir: Empty directory to use as cache for the compiled models
+        :param load_kwargs: Additional keyword arguments to pass to
+            `Deployment.load_inference_models`
+        :return: Dictionary holding the cold and warm load time in seconds, the peak
+            memory usage during loading in MB, and the memory usage in bytes before
+            the warm load (key `memory before load`). Memory usages are None if they
+            cannot be determined on this system. None is returned if loading fails
+        """
+        cold_deployment = Deployment.from_folder(deployment_folder)
+        with PeakMemoryMonitor() as load_monitor:
+            t_start = time.perf_counter()
+            if not self._load_deployment(
+                cold_deployment,
+                deployment_folder,
+                target_device,
+                cache_dir,
+                **load_kwargs,
+            ):
+                return None
+            cold_load_time = time.perf_counter() - t_start
+        del cold_deployment
+        gc.collect()
+
+        memory_before_load = get_memory_usage()
+        with PeakMemoryMonitor() as warm_load_monitor:
+            t_start = time.perf_counter()
+            if not self._load_deployment(
+                deployment, deployment_folder, target_device, cache_dir, **load_kwargs
+            ):
+                return None
+            warm_load_time = time.perf_counter() - t_start
+        peak_memory = None
+        if load_monitor.peak is not None and warm_load_monitor.peak is not None:
+            peak_memory = max(load_monitor.peak, warm_load_monitor.peak)
+        return {
+            "cold load time [s]": cold_load_time,
+            "warm load time [s]": warm_load_time,
+            "peak memory load [MB]": _to_megabytes(peak_memory),
+            "memory before load": memory_before_load,
+        }
+
+    @staticmethod
+    def _load_deployment(
+        deployment: Deployment,
+        deployment_folder: str,
+        target_device: str,
+        cache_dir: Optional[str] = None,
+        **load_kwargs: Any,
+    ) -> bool:
+        """
+        Load the inference models for a deployment that is benchmarked.
+
+        :param deployment: Deployment to load the inference models for
+        :param deployment_folder: Path to the folder containing the deployment
+        :param target_device: Device to load the inference models on
+        :param cache_dir: Optional cache directory for the compiled models
+        :param load_kwargs: Additional keyword arguments to pass to
+            `Deployment.load_inference_models`
+        :return: True if the models were loaded successfully, False otherwise
+        """
+        try:
+            with suppress_log_output():
+                deployment.load_inference_models(
+                    device=target_device, cache_dir=cache_dir, **load_kwargs
+                )
+        except Exception as e:
+            logging.info(
+                f"Failed to load inference models for deployment at path: "
+                f"`{deployment_folder}`, with error: {e}. Marking benchmark "
+                f"run for the deployment as failed"
+            )
+            return False
+        return True
+
+    def _run_benchmark_experiments(
+        self,
+        benchmark_deployment: Callable[
+            [Deployment, str], Iterator[Tuple[bool, float, Dict[str, str]]]
+        ],
+        working_directory: os.PathLike,
+        results_filename: str,
+        target_device: str,
+        total_frames: int,
+    ) -> List[Dict[str, str]]:
+        """
+        Run a benchmark experiment for all deployments in the Benchmarker, and write
+        the results to a csv file in the `working_directory`.
+
+        :param benchmark_deployment: Function that runs the experiment for a single
+            deployment. It is called with the deployment and the path to its folder,
+            and yields a tuple of (success, fps, parameters) for each benchmark run
+            on the deployment. The `parameters` dictionary holds additional columns
+            identifying the run in the results
+        :param working_directory: Directory to save the results file to
+        :param results_filename: Name of the results file, without extension
+        :param target_device: Device that the inference models are run on
+        :param total_frames: Total number of frames inferred in a single run
+        :return: List of dictionaries holding the results, one for each run
+        """
+        results_file = os.path.join(working_directory, f"{results_filename}.csv")
+        logging.info(f"Writing results to `{results_file}`")
+        results: List[Dict[str, str]] = []
         with logging_redirect_tqdm(tqdm_class=tqdm), open(
             results_file, "w", newline=""
         ) as csvfile:
-            results: List[Dict[str, str]] = []
+            writer: Optional[csv.DictWriter] = None
             for index, deployment_folder in enumerate(
                 tqdm(self._deployment_folders, desc="Benchmarking")
             ):
-                success = True
                 deployment = Deployment.from_folder(deployment_folder)
-                try:
-                    with suppress_log_output():
-                        deployment.load_inference_models(device=target_device)
-                except Exception as e:
-                    success = False
-                    logging.info(
-                        f"Failed to load inference models for deployment at path: "
-                        f"`{deployment_folder}`, with error: {e}. Marking benchmark "
-                        f"run for the deployment as failed"
+                for success, fps, parameters in benchmark_deployment(
+                    deployment, deployment_folder
+                ):
+                    result_row = self._create_result_row(
+                        name=f"Deployment {index}",
+                        deployment=deployment,
+                        deployment_folder=deployment_folder,
+                        target_device=target_device,
+                        parameters=parameters,
+                        success=success,
+                        fps=fps,
+                        total_frames=total_frames,
                     )
+                    results.append(result_row)
 
-                if success:
-                    try:
-                        # Warm-up for the model
-                        deployment.infer(benchmark_frames[0])
-
-                        # Estimate time to completion
-                        t_single_start = time.time()
-                        deployment.infer(benchmark_frames[0])
-                        single_inf_time = time.time() - t_single_start
-                        logging.info(
-                            f"Inference model(s) for deployment `{deployment_folder}` "
-                            f"loaded. Starting benchmark run. Estimated time required: "
-                            f"{repeats*frames*single_inf_time:.0f} seconds"
-                        )
-                    except Exception as e:
-                        success = False
-                        logging.info(
-                            f"Failed to run inference on frame number 0. Marking "
-                            f"benchmark run for deployment `{deployment_folder}` as "
-                            f"failed. Inference failed with error: `{e}`"
+                    # Write results to file
+                    if writer is None:
+                        writer = csv.DictWriter(
+                            csvfile, fieldnames=list(result_row.keys())
                         )
-                    t_start = time.time()
-                    for run in range(repeats):
-                        for frame in benchmark_frames:
-                            try:
-                                deployment.infer(frame)
-                            except Exception as e:
-                                success = False
-                                logging.info(
-                                    f"Failed to run inference on frame number "
-                                    f"{benchmark_frames.index(frame)}. Marking "
-                                    f"benchmark run for deployment "
-                                    f"`{deployment_folder}` as failed. Inference "
-                                    f"failed with error: `{e}`"
-                                )
-                    t_elapsed = time.time() - t_start
-                    fps = frames * repeats / t_elapsed
-                else:
-                    fps = 0
-
-                model_scores = []
-                for om in deployment.models:
-                    if isinstance(om.performance, Performance):
-                        score = om.performance.score
-                    elif isinstance(om.performance, dict):
-                        score = om.performance.get("score", -1)
-                    else:
-                        score = -1
-                    model_scores.append(score)
-
-                # Update result list
-                result_row: Dict[str, str] = {}
-                result_row["name"] = f"Deployment {index}"
-                result_row["project_name"] = self.project.name
-                result_row["target_device"] = target_device
-                result_row["task 1"] = self.project.get_trainable_tasks()[0].title
-                result_row["model 1"] = deployment.models[0].name
-                result_row["model 1 score"] = f"{model_scores[0]:.2f}"
-                if not self._is_single_task:
-                    result_row["task 2"] = self.project.get_trainable_tasks()[1].title
-                    result_row["model 2"] = deployment.models[1].name
-                    result_row["model 2 score"] = f"{model_scores[1]:.2f}"
-                result_row["success"] = str(int(success))
-                result_row["fps"] = f"{fps:.2f}"
-                result_row["total frames"] = f"{frames * repeats}"
-                result_row["source"] = deployment_folder
-                result_row.update(get_system_info(device=target_device))
-                results.append(result_row)
-
-                # Write results to file
-                if index == 0:
-                    fieldnames = list(result_row.keys())
-                    writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                    writer.writeheader()
-                writer.writerow(result_row)
-
+                        writer.writeheader()
+                    writer.writerow(result_row)
         return results
+
+    def _create_result_row(
+        self,
+        name: str,
+        deployment: Deployment,
+        deployment_folder: str,
+        target_device: str,
+        parameters: Dict[str, str],
+        success: bool,
+        fps: float,
+        total_frames: int,
+    ) -> Dict[str, str]:
+        """
+        Create a row for the benchmark results file.
+
+        :param name: Name of the benchmarked deployment
+        :param deployment: Deployment that was benchmarked
+        :param deployment_folder: Path to the folder containing the deployment
+        :param target_device: Device that the inference models were run on
+        :param parameters: Dictionary holding additional columns that identify the
+            benchmark run
+        :param success: True if the benchmark run completed successfully
+        :param fps: Measured throughput, in frames per second
+        :param total_frames: Total number of frames inferred in the run
+        :return: Dictionary holding the result row
+        """
+        model_scores = []
+        for om in deployment.models:
+            if isinstance(om.performance, Performance):
+                score = om.performance.score
+            elif isinstance(om.performance, dict):
+                score = om.performance.get("score", -1)
+            else:
+                score = -1
+            model_scores.append(score)
+
+        result_row: Dict[str, str] = {}
+        result_row["name"] = name
+        result_row["project_name"] = self.project.name
+        result_row["target_device"] = target_device
+        result_row["task 1"] = self.project.get_trainable_tasks()[0].title
+        result_row["model 1"] = deployment.models[0].name
+        result_row["model 1 score"] = f"{model_scores[0]:.2f}"
+        if not self._is_single_task:
+            result_row["task 2"] = self.project.get_trainable_tasks()[1].title
+            result_row["model 2"] = deployment.models[1].name
+            result_row["model 2 score"] = f"{model_scores[1]:.2f}"
+        result_row.update(parameters)
+        result_row["success"] = str(int(success))
+        result_row["fps"] = f"{fps:.2f}"
+        result_row["total frames"] = f"{total_frames}"
+        result_row["source"] = deployment_folder
+        result_row.update(get_system_info(device=target_device))
+        return result_row
+
+
+def _to_megabytes(n_bytes: Optional[int]) -> Optional[float]:
+    """
+    Convert a number of bytes to megabytes.
+
+    :param n_bytes: Number of bytes, or None
+    :return: Number of megabytes, or None if `n_bytes` is None
+    """
+    if n_bytes is None:
+        return None
+    return n_bytes / 1024**2
+
+
+def _format_metric(value: Optional[float]) -> str:
+    """
+    Format a metric for the benchmark results.
+
+    :param value: Value of the metric, or None if it was not measured
+    :return: String representation of the metric, which is empty if the metric was
+        not measured
+    """
+    if value is None:
+        return ""
+    return f"{value:.2f}"
@@ -15,6 +15,7 @@ import logging
 import os
 import platform
 import sys
+import threading
 from contextlib import contextmanager
 from logging.handlers import MemoryHandler
 from typing import Dict, List, Optional, Sequence, Union
@@ -207,3 +208,83 @@ def suppress_log_output(
         target_logger.removeHandler(memory_handler)
         for handler in original_handlers:
             target_logger.addHandler(handler)
+
+
+def get_memory_usage() -> Optional[int]:
+    """
+    Return the resident set size (RSS) of the current process.
+
+    The RSS is read with `psutil` if it is installed, or from the `/proc` filesystem
+    otherwise.
+
+    :return: Resident set size of the process in bytes, or None if it cannot be
+        determined on this system
+    """
+    try:
+        import psutil
+    except ImportError:
+        psutil = None
+    if psutil is not None:
+        return psutil.Process().memory_info().rss
+    try:
+        with open("/proc/self/statm", "r") as statm_file:
+            resident_pages = int(statm_file.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+class PeakMemoryMonitor:
+    """
+    Context manager that samples the resident set size of the current process in a
+    background thread, and records the peak value reached inside the context.
+    """
+
+    def __init__(self, interval: float = 0.005):
+        """
+        Create a new PeakMemoryMonitor.
+
+        :param interval: Time between two samples, in seconds
+        """
+        self.interval = interval
+        self.peak: Optional[int] = None
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def __enter__(self) -> "PeakMemoryMonitor":
+        """
+        Start sampling the memory usage.
+        """
+        self.peak = get_memory_usage()
+        if self.peak is not None:
+            self._stop_event.clear()
+            self._thread = threading.Thread(
+                target=self._sample, name="GetiSDK-memory-monitor", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        """
+        Stop sampling the memory usage.
+        """
+        if self._thread is not None:
+            self._stop_event.set()
+            self._thread.join()
+            self._thread = None
+            self._update_peak()
+
+    def _sample(self) -> None:
+        """
+        Sample the memory usage until the monitor is stopped.
+        """
+        while not self._stop_event.wait(self.interval):
+            self._update_peak()
+
+    def _update_peak(self) -> None:
+        """
+        Update the peak memory usage with the current memory usage.
+        """
+        memory_usage = get_memory_usage()
+        if memory_usage is not None:
+            self.peak = max(self.peak, memory_usage)
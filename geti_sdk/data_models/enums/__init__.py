@@ -25,6 +25,7 @@ from .media_type import MediaType
 from .model_status import ModelStatus
 from .optimization_type import OptimizationType
 from .prediction_mode import PredictionMode
+from .prediction_source import PredictionSource
 from .shape_type import ShapeType
 from .task_type import TaskType
 
@@ -35,6 +36,7 @@ __all__ = [
     "AnnotationKind",
     "AnnotationState",
     "PredictionMode",
+    "PredictionSource",
     "ConfigurationEntityType",
     "Domain",
     "ModelStatus",
@@ -0,0 +1,31 @@
+# Copyright (C) 2023 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions
+# and limitations under the License.
+
+from enum import Enum
+
+
+class PredictionSource(Enum):
+    """
+    Enum representing where a prediction was generated: by a local deployment, or
+    by the Intel® Geti™ server.
+    """
+
+    LOCAL = "local"
+    REMOTE = "remote"
+
+    def __str__(self):
+        """
+        Return the string representation of the PredictionSource instance.
+        """
+        return self.value
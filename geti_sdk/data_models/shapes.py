@@ -71,6 +71,19 @@ class Shape:
         """
         raise NotImplementedError
 
+    @abc.abstractmethod
+    def scale(self, factor_x: float, factor_y: float) -> "Shape":
+        """
+        Scale the Shape by a factor `factor_x` in the horizontal direction and
+        `factor_y` in the vertical direction, for example to convert it to the
+        coordinate system of a resized image.
+
+        :param factor_x: Scale factor to apply to the x coordinates and widths
+        :param factor_y: Scale factor to apply to the y coordinates and heights
+        :return: New Shape, scaled with respect to the origin of the image
+        """
+        raise NotImplementedError
+
     @abc.abstractmethod
     def to_normalized_coordinates(
         self, image_width: int, image_height: int
@@ -214,6 +227,22 @@ class Rectangle(Shape):
         y_min = parent_roi.y + self.y
         return Rectangle(x=x_min, y=y_min, width=self.width, height=self.height)
 
+    def scale(self, factor_x: float, factor_y: float) -> "Rectangle":
+        """
+        Scale the Rectangle by a factor `factor_x` in the horizontal direction and
+        `factor_y` in the vertical direction.
+
+        :param factor_x: Scale factor to apply to the x coordinate and width
+        :param factor_y: Scale factor to apply to the y coordinate and height
+        :return: Rectangle scaled with respect to the origin of the image
+        """
+        return Rectangle(
+            x=self.x * factor_x,
+            y=self.y * factor_y,
+            width=self.width * factor_x,
+            height=self.height * factor_y,
+        )
+
     @classmethod
     def from_ote(
         cls, ote_shape: OteRectangle, image_width: int, image_height: int
@@ -322,6 +351,22 @@ class Ellipse(Shape):
         y_min = parent_roi.y + self.y
         return Ellipse(x=x_min, y=y_min, width=self.width, height=self.height)
 
+    def scale(self, factor_x: float, factor_y: float) -> "Ellipse":
+        """
+        Scale the Ellipse by a factor `factor_x` in the horizontal direction and
+        `factor_y` in the vertical direction.
+
+        :param factor_x: Scale factor to apply to the x coordinate and width
+        :param factor_y: Scale factor to apply to the y coordinate and height
+        :return: Ellipse scaled with respect to the origin of the image
+        """
+        return Ellipse(
+            x=self.x * factor_x,
+            y=self.y * factor_y,
+            width=self.width * factor_x,
+            height=self.height * factor_y,
+        )
+
     def to_normalized_coordinates(
         self, image_width: int, image_height: int
     ) -> Dict[str, float]:
@@ -497,6 +542,22 @@ class Polygon(Shape):
         ]
         return Polygon(points=absolute_points)
 
+    def scale(self, factor_x: float, factor_y: float) -> "Polygon":
+        """
+        Scale the Polygon by a factor `factor_x` in the horizontal direction and
+        `factor_y` in the vertical direction.
+
+        :param factor_x: Scale factor to apply to the x coordinates of the points
+        :param factor_y: Scale factor to apply to the y coordinates of the points
+        :return: Polygon scaled with respect to the origin of the image
+        """
+        return Polygon(
+            points=[
+                Point(x=point.x * factor_x, y=point.y * factor_y)
+                for point in self.points
+            ]
+        )
+
     def to_normalized_coordinates(
         self, image_width: int, image_height: int
     ) -> Dict[str, Union[List[Dict[str, float]], str]]:
@@ -814,6 +875,31 @@ class RotatedRectangle(Shape):
         height = self.height
         return RotatedRectangle(x=x, y=y, width=width, height=height, angle=self.angle)
 
+    def scale(self, factor_x: float, factor_y: float) -> "RotatedRectangle":
+        """
+        Scale the RotatedRectangle by a factor `factor_x` in the horizontal direction
+        and `factor_y` in the vertical direction.
+
+        NOTE: If the scale factors are not equal, the scaled shape is a parallelogram
+        rather than a rectangle. In that case the result is the rotated rectangle
+        spanned by the scaled width and height axes of the original rectangle
+
+        :param factor_x: Scale factor to apply in the horizontal direction
+        :param factor_y: Scale factor to apply in the vertical direction
+        :return: RotatedRectangle scaled with respect to the origin of the image
+        """
+        cos_angle = math.cos(self._angle_x_radian)
+        sin_angle = math.sin(self._angle_x_radian)
+        width_axis = (factor_x * cos_angle, factor_y * sin_angle)
+        height_axis = (-factor_x * sin_angle, factor_y * cos_angle)
+        return RotatedRectangle(
+            x=self.x * factor_x,
+            y=self.y * factor_y,
+            width=self.width * math.hypot(*width_axis),
+            height=self.height * math.hypot(*height_axis),
+            angle=math.degrees(math.atan2(width_axis[1], width_axis[0])) % 360,
+        )
+
     def to_polygon(self) -> Polygon:
         """
         Convert the RotatedRectangle instance to a Polygon consisting of 4 points.
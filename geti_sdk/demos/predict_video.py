@@ -14,38 +14,395 @@
 
 import logging
 import os
+import queue
 import shutil
 import subprocess  # nosec B404
 import tempfile
+import threading
 import time
-from typing import List, Optional, Union
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
 import cv2
 import imageio_ffmpeg
+import numpy as np
 from tqdm.auto import tqdm
 from tqdm.contrib.logging import logging_redirect_tqdm
 
 from geti_sdk.data_models import Prediction
-from geti_sdk.deployment import Deployment
+from geti_sdk.deployment import Deployment, VideoInferencer
 from geti_sdk.utils import show_image_with_annotation_scene
 
+QUEUE_POLL_INTERVAL = 0.5  # Interval at which blocked stages check for a stop signal
+
+# Sentinel that is passed down the pipeline to mark the end of the video
+_END_OF_STREAM = object()
+
+
+class _PipelineStage:
+    """
+    Keeps track of the number of frames processed by a single stage of the video
+    prediction pipeline, and the time the stage spent processing them.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.frames = 0
+        self.busy_time = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, t_start: Optional[float] = None) -> None:
+        """
+        Record that the stage has processed a frame, starting at `t_start`
+
+        :param t_start: Value of `time.perf_counter()` at the start of processing.
+            If left as None, only the frame count is updated
+        """
+        with self._lock:
+            self.frames += 1
+            if t_start is not None:
+                self.busy_time += time.perf_counter() - t_start
+
+    @property
+    def fps(self) -> float:
+        """
+        Return the throughput of the stage, in frames per second of busy time
+        """
+        if self.busy_time == 0:
+            return 0.0
+        return self.frames / self.busy_time
+
+
+class _VideoPredictionPipeline:
+    """
+    Streaming pipeline that decodes the frames of a video, runs inference on them,
+    renders the predictions on top of the frames and writes the result to a new
+    video. Each stage runs in its own thread, and the stages are connected by
+    bounded queues so that only a fixed number of frames is held in memory.
+    """
+
+    def __init__(
+        self,
+        deployment: Deployment,
+        video_capture: cv2.VideoCapture,
+        video_writer: cv2.VideoWriter,
+        max_async_infer_requests: int = 1,
+        queue_size: int = 8,
+        video_inferencer: Optional[VideoInferencer] = None,
+    ):
+        if video_inferencer is not None and max_async_infer_requests > 1:
+            raise ValueError(
+                "Frame skipping requires the frames to be inferred in order, it can "
+                "not be combined with asynchronous inference."
+            )
+        self.deployment = deployment
+        self.video_inferencer = video_inferencer
+        self.video_capture = video_capture
+        self.video_writer = video_writer
+        self.use_async = max_async_infer_requests > 1
+
+        self._decoded: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._rendered: queue.Queue = queue.Queue(maxsize=queue_size)
+        # Bounds the number of frames between submission for inference and
+        # rendering, since asynchronous predictions may complete out of order
+        self._frames_in_flight = threading.BoundedSemaphore(
+            max_async_infer_requests + queue_size
+        )
+        # Asynchronous predictions are put in the queue from the inference callback,
+        # which must not block. The queue is bounded by the frames in flight instead
+        self._predicted: queue.Queue = queue.Queue(
+            maxsize=0 if self.use_async else queue_size
+        )
+        self._stop_event = threading.Event()
+        self._errors: List[Exception] = []
+        self.stages: Dict[str, _PipelineStage] = {
+            name: _PipelineStage(name)
+            for name in ["decode", "inference", "render", "encode"]
+        }
+
+    def run(self, progress_bar: Optional[tqdm] = None) -> List[Exception]:
+        """
+        Run the pipeline until all frames in the video have been written, or until
+        one of the stages fails.
+
+        :param progress_bar: Optional progress bar that is updated for every frame
+            that is written to the output video
+        :return: List of errors that occurred while running the pipeline. An empty
+            list means that the pipeline completed successfully
+        """
+        threads = [
+            threading.Thread(
+                target=self._run_stage, args=(target,), name=name, daemon=True
+            )
+            for name, target in [
+                ("decode", self._decode),
+                ("inference", self._infer),
+                ("render", self._render),
+                ("encode", partial(self._encode, progress_bar=progress_bar)),
+            ]
+        ]
+        for thread in threads:
+            thread.start()
+        try:
+            for thread in threads:
+                thread.join()
+        finally:
+            self._stop_event.set()
+        return self._errors
+
+    def throughput_report(self, total_time: float) -> str:
+        """
+        Return a report of the throughput for each stage of the pipeline. The stage
+        with the lowest throughput is the bottleneck of the pipeline.
+
+        :param total_time: Total time it took to run the pipeline, in seconds
+        :return: String containing the throughput report
+        """
+        lines = ["Video prediction pipeline throughput:"]
+        for stage in self.stages.values():
+            utilization = 100 * stage.busy_time / total_time if total_time > 0 else 0
+            lines.append(
+                f"  {stage.name:<10} {stage.frames:>7d} frames, "
+                f"{stage.fps:8.1f} fps, busy {utilization:5.1f}% of the time"
+            )
+        return "\n".join(lines)
+
+    def _run_stage(self, target: Callable[[], None]) -> None:
+        """
+        Run a stage of the pipeline, and stop the other stages if it fails.
+
+        :param target: Method implementing the stage
+        """
+        try:
+            target()
+        except Exception as error:
+            logging.exception("Error in video prediction pipeline")
+            self._errors.append(error)
+            self._stop_event.set()
+
+    def _put(self, target_queue: queue.Queue, item: Any) -> bool:
+        """
+        Put an item in a queue, blocking while the queue is full.
+
+        :param target_queue: Queue to put the item in
+        :param item: Item to put in the queue
+        :return: True if the item was put in the queue, False if the pipeline was
+            stopped while waiting
+        """
+        while not self._stop_event.is_set():
+            try:
+                target_queue.put(item, timeout=QUEUE_POLL_INTERVAL)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _get(self, source_queue: queue.Queue) -> Any:
+        """
+        Get an item from a queue, blocking while the queue is empty.
+
+        :param source_queue: Queue to get the item from
+        :return: The item, or the end-of-stream sentinel if the pipeline was
+            stopped while waiting
+        """
+        while not self._stop_event.is_set():
+            try:
+                return source_queue.get(timeout=QUEUE_POLL_INTERVAL)
+            except queue.Empty:
+                continue
+        return _END_OF_STREAM
+
+    def _decode(self) -> None:
+        """
+        Read the frames from the video and convert them to RGB
+        """
+        stage = self.stages["decode"]
+        frame_index = 0
+        while not self._stop_event.is_set():
+            t_start = time.perf_counter()
+            ret, frame = self.video_capture.read()
+            if ret is not True:
+                break
+            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            stage.record(t_start)
+            if not self._put(self._decoded, (frame_index, rgb_frame)):
+                return
+            frame_index += 1
+        self._put(self._decoded, _END_OF_STREAM)
+
+    def _infer(self) -> None:
+        """
+        Run inference on the decoded frames
+        """
+        stage = self.stages["inference"]
+        t_first_frame: Optional[float] = None
+        try:
+            while True:
+                item = self._get(self._decoded)
+                if item is _END_OF_STREAM:
+                    break
+                frame_index, rgb_frame = item
+                t_start = time.perf_counter()
+                if t_first_frame is None:
+                    t_first_frame = t_start
+                if not self.use_async:
+                    if self.video_inferencer is not None:
+                        prediction = self.video_inferencer.infer(rgb_frame)
+                    else:
+                        prediction = self.deployment.infer(rgb_frame)
+                    stage.record(t_start)
+                    if not self._put(
+                        self._predicted, (frame_index, rgb_frame, prediction)
+                    ):
+                        return
+                    continue
+                if not self._acquire_frame_slot():
+                    return
+                self.deployment.infer_async(
+                    rgb_frame,
+                    callback=self._on_prediction,
+                    runtime_data=frame_index,
+                    error_callback=self._on_prediction_error,
+                )
+        finally:
+            if self.use_async:
+                self.deployment.await_all()
+                if t_first_frame is not None:
+                    # Inference runs in the background, so the busy time of the
+                    # stage is the time from the first request to the last result
+                    stage.busy_time = time.perf_counter() - t_first_frame
+        self._put(self._predicted, _END_OF_STREAM)
+
+    def _acquire_frame_slot(self) -> bool:
+        """
+        Wait until a new frame can be submitted for asynchronous inference.
+
+        :return: True if the frame can be submitted, False if the pipeline was
+            stopped while waiting
+        """
+        while not self._frames_in_flight.acquire(timeout=QUEUE_POLL_INTERVAL):
+            if self._stop_event.is_set():
+                return False
+        return True
+
+    def _on_prediction(
+        self, rgb_frame: np.ndarray, prediction: Prediction, frame_index: int
+    ) -> None:
+        """
+        Pass the prediction for an asynchronous infer request on to the render stage.
+
+        This is called from the inference callback thread, so it must not block.
+
+        :param rgb_frame: Frame for which the prediction was generated
+        :param prediction: Prediction for the frame
+        :param frame_index: Index of the frame in the video
+        """
+        self.stages["inference"].record()
+        self._predicted.put_nowait((frame_index, rgb_frame, prediction))
+
+    def _on_prediction_error(self, error: Exception, frame_index: int) -> None:
+        """
+        Stop the pipeline if inference fails for one of the frames. The frame will
+        never be rendered, so the pipeline can not complete.
+
+        :param error: Error raised while generating the prediction
+        :param frame_index: Index of the frame in the video
+        """
+        logging.error(f"Inference failed for frame {frame_index}: {error}")
+        self._errors.append(error)
+        self._stop_event.set()
+
+    def _render(self) -> None:
+        """
+        Draw the predictions on top of the frames, in the order of the frames in the
+        video
+        """
+        stage = self.stages["render"]
+        # Asynchronous predictions may arrive out of order, they are held here until
+        # all preceding frames have been rendered
+        pending: Dict[int, Tuple[np.ndarray, Prediction]] = {}
+        next_frame_index = 0
+        while True:
+            item = self._get(self._predicted)
+            if item is _END_OF_STREAM:
+                break
+            frame_index, rgb_frame, prediction = item
+            pending[frame_index] = (rgb_frame, prediction)
+            while next_frame_index in pending:
+                rgb_frame, prediction = pending.pop(next_frame_index)
+                t_start = time.perf_counter()
+                output_frame = show_image_with_annotation_scene(
+                    image=rgb_frame, annotation_scene=prediction, show_results=False
+                )
+                stage.record(t_start)
+                if not self._put(self._rendered, output_frame):
+                    return
+                if self.use_async:
+                    self._frames_in_flight.release()
+                next_frame_index += 1
+        if len(pending) > 0 and not self._stop_event.is_set():
+            raise RuntimeError(
+                f"Prediction for frame {next_frame_index} is missing, unable to "
+                f"render the remaining {len(pending)} frames."
+            )
+        self._put(self._rendered, _END_OF_STREAM)
+
+    def _encode(self, progress_bar: Optional[tqdm] = None) -> None:
+        """
+        Write the rendered frames to the output video
+
+        :param progress_bar: Optional progress bar to update for every frame
+        """
+        stage = self.stages["encode"]
+        while True:
+            output_frame = self._get(self._rendered)
+            if output_frame is _END_OF_STREAM:
+                break
+            t_start = time.perf_counter()
+            self.video_writer.write(output_frame)
+            stage.record(t_start)
+            if progress_bar is not None:
+                progress_bar.update(1)
+
 
 def predict_video_from_deployment(
     video_path: Union[str, os.PathLike],
     deployment: Union[Deployment, str, os.PathLike],
     device: str = "CPU",
     preserve_audio: Optional[bool] = True,
+    max_async_infer_requests: int = 1,
+    queue_size: int = 8,
+    keyframe_interval: int = 1,
+    difference_threshold: Optional[float] = None,
 ) -> Optional[str]:
     """
     Create a video reconstruction with overlaid model predictions.
     This function runs inference on the local machine for every frame in the video.
     The inference results are overlaid on the frames and the output video path will be returned.
 
+    Decoding, inference, rendering and encoding of the frames run concurrently in
+    separate threads, connected by bounded queues. This keeps the memory usage
+    constant regardless of the length of the video.
+
     :param video_path: File path to video
     :param deployment: Path to the folder containing the Deployment data, or Deployment instance
     :param device: Device (CPU or GPU) to load the model to. Defaults to 'CPU'
     :param preserve_audio: True to preserve all audio in the original input video. Defaults to True.
         If ffmpeg could not be found, this option is ignored and no audio would be preserved.
+    :param max_async_infer_requests: Maximum number of frames for which inference
+        runs in parallel. Defaults to 1, in which case the frames are inferred one by
+        one. Increasing this can improve throughput on devices with multiple
+        cores or compute units
+    :param queue_size: Maximum number of frames that can be waiting in between two
+        subsequent stages of the pipeline
+    :param keyframe_interval: Run the deployment on every `keyframe_interval`-th
+        frame only, and track the detected objects in the frames in between.
+        Defaults to 1, in which case every frame is inferred. This can not be
+        combined with `max_async_infer_requests` > 1
+    :param difference_threshold: Optional threshold for the mean absolute
+        difference between a frame and the last inferred frame, relative to the
+        maximum pixel value. Frames that differ more are always inferred. Only used
+        if frames are skipped, i.e. if `keyframe_interval` > 1
     :return: The file path of the output video if generated successfully. Otherwise None.
     """
     retval: Optional[str] = None
@@ -57,7 +414,9 @@ def predict_video_from_deployment(
         raise ValueError(f"Unable to read deployment {deployment}")
 
     logging.info("Load inference models")
-    deployment.load_inference_models(device=device)
+    deployment.load_inference_models(
+        device=device, max_async_infer_requests=max_async_infer_requests
+    )
 
     # Open the video capture, this prepares the video to be ready for reading
     cap = cv2.VideoCapture(video_path)
@@ -77,56 +436,56 @@ def predict_video_from_deployment(
         f"for a total duration of {video_duration:.1f} seconds"
     )
 
-    t_start = time.time()
+    # Determine the output video path
+    fname, ext = os.path.splitext(video_path)
+    output_video_path = os.path.abspath(fname + "_reconstructed" + ext)
+
+    # Create a video writer to be able to save the reconstructed video
+    out_video = cv2.VideoWriter(
+        filename=output_video_path,
+        fourcc=cv2.VideoWriter_fourcc(*"mp4v"),
+        fps=fps,
+        frameSize=(frame_width, frame_height),
+    )
+
+    video_inferencer: Optional[VideoInferencer] = None
+    if keyframe_interval > 1:
+        video_inferencer = VideoInferencer(
+            deployment,
+            keyframe_interval=keyframe_interval,
+            difference_threshold=difference_threshold,
+        )
 
-    predictions: List[Prediction] = []
-    logging.info("Running video prediction... ")
+    t_start = time.time()
+    pipeline = _VideoPredictionPipeline(
+        deployment=deployment,
+        video_capture=cap,
+        video_writer=out_video,
+        max_async_infer_requests=max_async_infer_requests,
+        queue_size=queue_size,
+        video_inferencer=video_inferencer,
+    )
+    logging.info("Running video prediction and reconstruction... ")
     with logging_redirect_tqdm(tqdm_class=tqdm), tqdm(
         total=num_frames, desc="Predicting"
     ) as progress_bar:
-        while cap.isOpened():
-            ret, frame = cap.read()
-            if ret is True:
-                rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                prediction = deployment.infer(rgb_frame)
-                predictions.append((rgb_frame, prediction))
-                progress_bar.update(1)
-            else:
-                break
-
+        errors = pipeline.run(progress_bar=progress_bar)
     cap.release()
+    out_video.release()
 
-    if len(predictions) == num_frames:
+    if len(errors) == 0:
         t_prediction = time.time() - t_start
         logging.info(
-            f"Prediction completed successfully in {t_prediction:.1f} seconds. "
-        )
-
-        # Determine the output video path
-        fname, ext = os.path.splitext(video_path)
-        output_video_path = os.path.abspath(fname + "_reconstructed" + ext)
-
-        # Create a video writer to be able to save the reconstructed video
-        out_video = cv2.VideoWriter(
-            filename=output_video_path,
-            fourcc=cv2.VideoWriter_fourcc(*"mp4v"),
-            fps=fps,
-            frameSize=(frame_width, frame_height),
+            f"Prediction and reconstruction completed successfully in "
+            f"{t_prediction:.1f} seconds. "
         )
-
-        count = 0
-        logging.info("Running video reconstruction... ")
-        with logging_redirect_tqdm(tqdm_class=tqdm), tqdm(
-            total=num_frames, desc="Reconstructing"
-        ) as progress_bar:
-            for rgb_frame, prediction in predictions:
-                output_frame = show_image_with_annotation_scene(
-                    image=rgb_frame, annotation_scene=prediction, show_results=False
-                )
-                out_video.write(output_frame)
-                count += 1
-                progress_bar.update(1)
-        out_video.release()
+        logging.info(pipeline.throughput_report(total_time=t_prediction))
+        if video_inferencer is not None:
+            logging.info(
+                f"Deployment was run on {video_inferencer.frames_inferred} frames, "
+                f"predictions for {video_inferencer.frames_propagated} frames were "
+                f"propagated by the object tracker."
+            )
 
         if preserve_audio is True:
             try:
@@ -175,12 +534,10 @@ def predict_video_from_deployment(
                 )
 
         retval = output_video_path
-        t_reconstruction = time.time() - t_prediction - t_start
-        logging.info(
-            f"Reconstruction completed successfully in {t_reconstruction:.1f} seconds."
-        )
         logging.info(f"Output video saved to `{output_video_path}`")
     else:
-        logging.warning("Prediction process failed. ")
+        logging.warning(f"Prediction process failed with error: {errors[0]}")
+        if os.path.isfile(output_video_path):
+            os.remove(output_video_path)
 
     return retval
@@ -66,6 +66,94 @@ A saved Deployment can be loaded from its containing folder using the
 
    local_deployment = Deployment.from_folder("deployment_dummy_project")
 
+To spread inference over multiple CPU cores, a saved Deployment can be loaded in a
+:py:class:`~geti_sdk.deployment.deployment_pool.DeploymentPool`. This starts a number
+of worker processes that each run inference for a share of the frames:
+
+.. code-block:: python
+
+   from geti_sdk.deployment import DeploymentPool
+
+   with DeploymentPool("deployment_dummy_project", workers=4) as pool:
+       predictions = pool.infer_batch(list_of_images)
+
+For videos recorded by a fixed camera, a
+:py:class:`~geti_sdk.deployment.video_inference.VideoInferencer` can reduce the
+inference load by running the deployment on keyframes only, and tracking the
+detected objects in between:
+
+.. code-block:: python
+
+   from geti_sdk.deployment import VideoInferencer
+
+   inferencer = VideoInferencer(deployment, keyframe_interval=5)
+   for prediction in inferencer.infer_video(frames):
+       track_ids = [annotation.id for annotation in prediction.annotations]
+
+To serve the deployments for many projects from a single process, they can be
+registered in a :py:class:`~geti_sdk.deployment.model_registry.ModelRegistry`. The
+registry loads each deployment on its first request, and unloads the least recently
+used deployments when the memory budget is exceeded:
+
+.. code-block:: python
+
+   from geti_sdk.deployment import ModelRegistry
+
+   registry = ModelRegistry(max_memory_bytes=2 * 1024**3)
+   registry.register("dummy_project", "deployment_dummy_project")
+   prediction = registry.infer("dummy_project", image)
+
+For cameras that produce many identical or near-identical frames, a
+:py:class:`~geti_sdk.deployment.prediction_cache.PredictionCache` can be set on the
+deployment. Inference is then skipped for images that match a recently inferred
+image:
+
+.. code-block:: python
+
+   from geti_sdk.deployment import PredictionCache
+
+   deployment.set_prediction_cache(
+       PredictionCache(max_size=256, ttl=60, hash_method="perceptual")
+   )
+   prediction = deployment.infer(image=dummy_image)
+
+To compare the accuracy and speed of a deployment at a lower precision without
+requesting an optimization job on the server, its models can be quantized to INT8
+locally with NNCF post-training quantization. This requires the `nncf` package:
+
+.. code-block:: python
+
+   from geti_sdk.deployment import (
+       Deployment,
+       load_calibration_images,
+       quantize_deployment,
+   )
+
+   images = load_calibration_images("calibration_images", max_images=350)
+   report = quantize_deployment(
+       deployment,
+       output_folder="deployment_dummy_project_int8",
+       calibration_images=images[:300],
+       validation_images=images[300:],
+   )
+   print(report.accuracy_delta, report.throughput_gain)
+   int8_deployment = Deployment.from_folder("deployment_dummy_project_int8")
+
+To serve a deployment over HTTP, it can be wrapped in an
+:py:class:`~geti_sdk.deployment.serving.InferenceServer`. The server combines the
+images from concurrent requests into batches, and returns the predictions in the same
+JSON format as the Intel® Geti™ REST API:
+
+.. code-block:: python
+
+   from geti_sdk.deployment import InferenceServer
+
+   deployment.load_inference_models(device="CPU", max_async_infer_requests=4)
+   with InferenceServer(deployment, port=8080, max_batch_size=8) as server:
+       # POST encoded images to http://127.0.0.1:8080/predict, and read the latency
+       # and throughput metrics from http://127.0.0.1:8080/metrics
+       ...
+
 Module contents
 ---------------
 
@@ -78,9 +166,75 @@ Module contents
    :members:
    :undoc-members:
    :show-inheritance:
+
+.. automodule:: geti_sdk.deployment.deployment_pool
+   :members:
+   :undoc-members:
+   :show-inheritance:
+
+.. automodule:: geti_sdk.deployment.model_registry
+   :members:
+   :undoc-members:
+   :show-inheritance:
+
+.. automodule:: geti_sdk.deployment.ovms_adapter
+   :members:
+   :undoc-members:
+   :show-inheritance:
+
+.. automodule:: geti_sdk.deployment.prediction_cache
+   :members:
+   :undoc-members:
+   :show-inheritance:
+
+.. automodule:: geti_sdk.deployment.quantization
+   :members:
+   :undoc-members:
+   :show-inheritance:
+
+.. automodule:: geti_sdk.deployment.serving
+   :members:
+   :undoc-members:
+   :show-inheritance:
+
+.. automodule:: geti_sdk.deployment.stage_timer
+   :members:
+   :undoc-members:
+   :show-inheritance:
+
+.. automodule:: geti_sdk.deployment.video_inference
+   :members:
+   :undoc-members:
+   :show-inheritance:
 """
 
 from .deployed_model import DeployedModel
 from .deployment import Deployment
-
-__all__ = ["Deployment", "DeployedModel"]
+from .deployment_pool import DeploymentPool
+from .model_registry import ModelRegistry
+from .prediction_cache import PredictionCache
+from .quantization import (
+    QuantizationReport,
+    load_calibration_images,
+    quantize_deployment,
+)
+from .serving import DynamicBatcher, InferenceServer, ServingMetrics
+from .stage_timer import StageTimer
+from .video_inference import IoUTracker, VideoInferencer
+
+__all__ = [
+    "Deployment",
+    "DeployedModel",
+    "DeploymentPool",
+    "DynamicBatcher",
+    "InferenceServer",
+    "IoUTracker",
+    "ModelRegistry",
+    "PredictionCache",
+    "QuantizationReport",
+    "ServingMetrics",
+    "StageTimer",
+    "VideoInferencer",
+    "load_calibration_images",
+    "quantize_deployment",
+]
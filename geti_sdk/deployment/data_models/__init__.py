@@ -14,7 +14,16 @@
 
 # noqa: D104
 
+from .explain_outputs import ExplainOutputs
 from .intermediate_inference_result import IntermediateInferenceResult
+from .prediction_array import PredictionArray
+from .prediction_filter import PredictionFilter
 from .region_of_interest import ROI
 
-__all__ = ["ROI", "IntermediateInferenceResult"]
+__all__ = [
+    "ROI",
+    "IntermediateInferenceResult",
+    "ExplainOutputs",
+    "PredictionArray",
+    "PredictionFilter",
+]
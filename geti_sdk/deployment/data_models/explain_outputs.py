@@ -0,0 +1,258 @@
+# Copyright (C) 2023 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions
+# and limitations under the License.
+from typing import Callable, Collection, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from geti_sdk.data_models import Prediction
+from geti_sdk.data_models.predictions import ResultMedium
+
+FEATURES_OUTPUT = "features"
+SALIENCY_OUTPUT = "saliency"
+EXPLAIN_OUTPUTS = (FEATURES_OUTPUT, SALIENCY_OUTPUT)
+
+# Maximum number of channels that OpenCV can resize at once
+_MAX_RESIZE_CHANNELS = 512
+_RESIZABLE_DTYPES = (np.uint8, np.uint16, np.int16, np.float32, np.float64)
+
+
+class ExplainOutputs:
+    """
+    Explainability outputs of a model for a single image: the saliency map and the
+    feature vector.
+
+    The outputs are computed the first time one of them is accessed, so that
+    inference results for which the explanation is never used do not pay for its
+    postprocessing. Only the selected outputs are computed and kept in memory,
+    the saliency map can optionally be downscaled and quantized to 8 bit.
+    """
+
+    def __init__(
+        self,
+        outputs: Optional[Collection[str]] = None,
+        saliency_map_max_size: Optional[int] = None,
+        quantize_saliency_map: bool = False,
+    ):
+        """
+        Create a new, unbound ExplainOutputs instance.
+
+        :param outputs: Names of the outputs to compute, any of 'features' and
+            'saliency'. If left as None, all outputs are computed
+        :param saliency_map_max_size: Optional maximum size of the longest side of
+            the saliency map, in pixels. Larger saliency maps are downscaled,
+            preserving their aspect ratio
+        :param quantize_saliency_map: True to convert the saliency map to a uint8
+            array, by scaling its values to the range [0, 255]
+        """
+        if outputs is None:
+            outputs = EXPLAIN_OUTPUTS
+        invalid_outputs = set(outputs).difference(EXPLAIN_OUTPUTS)
+        if invalid_outputs:
+            raise ValueError(
+                f"Invalid explain outputs {sorted(invalid_outputs)}, supported outputs "
+                f"are {list(EXPLAIN_OUTPUTS)}."
+            )
+        if saliency_map_max_size is not None and saliency_map_max_size <= 0:
+            raise ValueError(
+                f"Invalid saliency map size {saliency_map_max_size}, please specify a "
+                f"positive number of pixels."
+            )
+        self.outputs = frozenset(outputs)
+        self.saliency_map_max_size = saliency_map_max_size
+        self.quantize_saliency_map = quantize_saliency_map
+
+        self._compute_function: Optional[
+            Callable[[], Tuple[Optional[np.ndarray], Optional[np.ndarray], bool]]
+        ] = None
+        self._is_computed = False
+        self._saliency_map: Optional[np.ndarray] = None
+        self._feature_vector: Optional[np.ndarray] = None
+
+    def bind(
+        self,
+        compute_function: Callable[
+            [], Tuple[Optional[np.ndarray], Optional[np.ndarray], bool]
+        ],
+    ) -> None:
+        """
+        Set the function that computes the explainability outputs. It is called at
+        most once, the first time one of the outputs is accessed.
+
+        :param compute_function: Function without arguments that returns a tuple
+            containing the raw saliency map, the feature vector and a boolean that
+            is True if the channels of the saliency map are in the last dimension
+        """
+        self._compute_function = compute_function
+        self._is_computed = False
+        self._saliency_map = None
+        self._feature_vector = None
+
+    @property
+    def is_computed(self) -> bool:
+        """
+        Return True if the explainability outputs have been computed.
+        """
+        return self._is_computed
+
+    @property
+    def saliency_map(self) -> Optional[np.ndarray]:
+        """
+        Return the saliency map, computing it if needed.
+        """
+        self._check_selected(SALIENCY_OUTPUT)
+        self._compute()
+        return self._saliency_map
+
+    @property
+    def feature_vector(self) -> Optional[np.ndarray]:
+        """
+        Return the feature vector, computing it if needed.
+        """
+        self._check_selected(FEATURES_OUTPUT)
+        self._compute()
+        return self._feature_vector
+
+    def add_to_prediction(self, prediction: Prediction) -> None:
+        """
+        Add the selected outputs to a prediction, as its feature vector and
+        saliency maps. This computes the outputs if needed.
+
+        :param prediction: Prediction to add the outputs to
+        """
+        if FEATURES_OUTPUT in self.outputs:
+            prediction.feature_vector = self.feature_vector
+        prediction.maps = self.to_result_media()
+
+    def to_result_media(self) -> List[ResultMedium]:
+        """
+        Return the saliency map as a list of ResultMedium, which can be assigned to
+        the `maps` of a Prediction. The list is empty if the saliency map is not
+        one of the selected outputs.
+        """
+        if SALIENCY_OUTPUT not in self.outputs:
+            return []
+        result_medium = ResultMedium(name="saliency map", type="saliency map")
+        result_medium.data = self.saliency_map
+        return [result_medium]
+
+    def _check_selected(self, output: str) -> None:
+        """
+        Raise a ValueError if `output` is not one of the selected outputs.
+
+        :param output: Name of the output
+        """
+        if output not in self.outputs:
+            raise ValueError(
+                f"The '{output}' output was not selected, it is not available. "
+                f"Selected outputs are {sorted(self.outputs)}."
+            )
+
+    def _compute(self) -> None:
+        """
+        Compute the selected outputs, if they have not been computed yet. The
+        reference to the compute function is dropped afterwards, releasing the
+        inference results that it holds.
+        """
+        if self._is_computed:
+            return
+        if self._compute_function is None:
+            raise ValueError(
+                "Unable to compute explainability outputs, no inference results "
+                "are bound to this ExplainOutputs instance."
+            )
+        saliency_map, feature_vector, channels_last = self._compute_function()
+        if FEATURES_OUTPUT in self.outputs:
+            self._feature_vector = feature_vector
+        if SALIENCY_OUTPUT in self.outputs and saliency_map is not None:
+            self._saliency_map = self._process_saliency_map(
+                saliency_map, channels_last=channels_last
+            )
+        self._compute_function = None
+        self._is_computed = True
+
+    def _process_saliency_map(
+        self, saliency_map: np.ndarray, channels_last: bool
+    ) -> np.ndarray:
+        """
+        Downscale and quantize the saliency map, according to the settings.
+
+        :param saliency_map: Raw saliency map, either a single map of shape
+            [height x width] or a map per class
+        :param channels_last: True if the class dimension of the saliency map is
+            the last dimension, False if it is the first
+        :return: Processed saliency map, with its class dimension in the original
+            position
+        """
+        if self.saliency_map_max_size is not None and saliency_map.ndim in (2, 3):
+            height, width = (
+                saliency_map.shape[:2] if channels_last else saliency_map.shape[-2:]
+            )
+            scale = self.saliency_map_max_size / max(height, width)
+            if scale < 1:
+                size = (max(round(width * scale), 1), max(round(height * scale), 1))
+                if saliency_map.ndim == 2:
+                    saliency_map = _resize(saliency_map, size)
+                elif channels_last:
+                    saliency_map = _resize_channels_last(saliency_map, size)
+                else:
+                    saliency_map = np.moveaxis(
+                        _resize_channels_last(np.moveaxis(saliency_map, 0, -1), size),
+                        -1,
+                        0,
+                    )
+        if self.quantize_saliency_map and saliency_map.dtype != np.uint8:
+            minimum, maximum = float(saliency_map.min()), float(saliency_map.max())
+            value_range = maximum - minimum if maximum > minimum else 1.0
+            saliency_map = np.round(
+                (saliency_map - minimum) * (255 / value_range)
+            ).astype(np.uint8)
+        return saliency_map
+
+
+def _resize_channels_last(
+    saliency_map: np.ndarray, size: Tuple[int, int]
+) -> np.ndarray:
+    """
+    Downscale a saliency map with its channels in the last dimension. All channels
+    are resized at once if OpenCV supports their number, otherwise one by one.
+
+    :param saliency_map: Array of shape [height x width x channels] to resize
+    :param size: Target size, as (width, height)
+    :return: Resized array of shape [new_height x new_width x channels]
+    """
+    n_channels = saliency_map.shape[-1]
+    if n_channels > _MAX_RESIZE_CHANNELS:
+        return np.stack(
+            [_resize(plane, size) for plane in np.moveaxis(saliency_map, -1, 0)],
+            axis=-1,
+        )
+    resized = _resize(np.ascontiguousarray(saliency_map), size)
+    return resized.reshape(size[1], size[0], n_channels)
+
+
+def _resize(array: np.ndarray, size: Tuple[int, int]) -> np.ndarray:
+    """
+    Downscale an array using area interpolation.
+
+    :param array: Array of shape [height x width] or [height x width x channels]
+        to resize
+    :param size: Target size, as (width, height)
+    :return: Resized array, with the same dtype as the input
+    """
+    if array.dtype in _RESIZABLE_DTYPES:
+        return cv2.resize(array, size, interpolation=cv2.INTER_AREA)
+    return cv2.resize(
+        array.astype(np.float32), size, interpolation=cv2.INTER_AREA
+    ).astype(array.dtype)
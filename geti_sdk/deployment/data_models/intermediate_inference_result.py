@@ -69,30 +69,30 @@ class IntermediateInferenceResult:
 
         :param rois: Optional list of ROIs to return the views for. If left as None,
             views for all ROIs are returned.
-        :return: List of numpy arrays containing the pixel data for the ROI's in the
-            list of ROI's associated with this inference result
+        :return: List of numpy arrays containing the pixel data for the ROI's, in the
+            same order as the ROI's in `rois`
         """
         if self.rois is None:
             return [self.image]
 
-        if rois is not None:
-            rois_to_get = [roi.shape for roi in self.rois if roi in rois]
-        else:
-            rois_to_get = [roi.shape for roi in self.rois]
+        if rois is None:
+            rois = self.rois
 
+        if len(self.image.shape) not in [2, 3]:
+            raise ValueError(
+                f"Unexpected image shape: {self.image.shape}. Unable to generate "
+                f"image views"
+            )
+        image_height, image_width = self.image.shape[0:2]
         views: List[np.ndarray] = []
-        for roi in rois_to_get:
-            y0, y1 = int(roi.y), int(roi.y + roi.height)
-            x0, x1 = int(roi.x), int(roi.x + roi.width)
-            if len(self.image.shape) == 3:
-                views.append(self.image[y0:y1, x0:x1, :])
-            elif len(self.image.shape) == 2:
-                views.append(self.image[y0:y1, x0:x1])
-            else:
-                raise ValueError(
-                    f"Unexpected image shape: {self.image.shape}. Unable to generate "
-                    f"image views"
-                )
+        for roi in rois:
+            shape = roi.shape
+            y0 = min(max(int(shape.y), 0), image_height)
+            x0 = min(max(int(shape.x), 0), image_width)
+            y1 = min(max(int(shape.y + shape.height), y0), image_height)
+            x1 = min(max(int(shape.x + shape.width), x0), image_width)
+            # Slicing creates a view on the image data, no pixel data is copied
+            views.append(self.image[y0:y1, x0:x1])
         return views
 
     def append_annotation(self, annotation: Annotation, roi: ROI):
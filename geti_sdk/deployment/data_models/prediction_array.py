@@ -0,0 +1,528 @@
+# Copyright (C) 2023 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions
+# and limitations under the License.
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import attr
+import cv2
+import numpy as np
+
+from geti_sdk.data_models import Annotation, Prediction, ScoredLabel
+from geti_sdk.data_models.enums import ShapeType
+from geti_sdk.data_models.predictions import ResultMedium
+from geti_sdk.data_models.shapes import (
+    Ellipse,
+    Point,
+    Polygon,
+    Rectangle,
+    RotatedRectangle,
+)
+
+# Shape types in the order of their codes in `PredictionArray.shape_types`
+SHAPE_TYPE_CODES: List[ShapeType] = [
+    ShapeType.RECTANGLE,
+    ShapeType.ELLIPSE,
+    ShapeType.POLYGON,
+    ShapeType.ROTATED_RECTANGLE,
+]
+
+
+# Shapes for which the IoU is computed from their axis-aligned box
+AXIS_ALIGNED_SHAPE_CODES = [
+    SHAPE_TYPE_CODES.index(ShapeType.RECTANGLE),
+    SHAPE_TYPE_CODES.index(ShapeType.ELLIPSE),
+]
+ROTATED_RECTANGLE_CODE = SHAPE_TYPE_CODES.index(ShapeType.ROTATED_RECTANGLE)
+
+
+def _offsets(counts: Sequence[int]) -> np.ndarray:
+    """
+    Return the offsets into a flat array for consecutive segments of `counts` items.
+
+    :param counts: Number of items in each segment
+    :return: Array of length len(counts) + 1, holding the start of each segment and
+        the total number of items as last element
+    """
+    offsets = np.zeros(len(counts) + 1, dtype=np.int32)
+    np.cumsum(counts, out=offsets[1:])
+    return offsets
+
+
+@attr.define(eq=False)
+class PredictionArray:
+    """
+    Columnar representation of a Prediction, holding the shapes, labels and scores
+    of all N annotations in flat numpy arrays instead of a list of Annotation
+    objects.
+
+    :var shape_types: Array of shape [N], holding the type of each shape as an index
+        into `SHAPE_TYPE_CODES`
+    :var boxes: Array of shape [N, 4], holding the x, y, width and height of each
+        shape. For rectangles and ellipses these are the shape itself, for rotated
+        rectangles x and y are the center of the rectangle, and for polygons the
+        array holds the bounding box of the polygon
+    :var angles: Array of shape [N], holding the angle of each rotated rectangle, in
+        degrees. The angle is 0 for all other shapes
+    :var label_offsets: Array of shape [N + 1]. The labels for annotation `i` are
+        found at positions `label_offsets[i]` up to `label_offsets[i + 1]` in
+        `label_indices` and `scores`
+    :var label_indices: Array holding the index of each predicted label into the
+        label table (`label_names`, `label_ids` and `label_colors`)
+    :var scores: Array holding the probability of each predicted label
+    :var polygon_offsets: Array of shape [N + 1]. The points of the polygon for
+        annotation `i` are found at positions `polygon_offsets[i]` up to
+        `polygon_offsets[i + 1]` in `polygon_points`. The range is empty for shapes
+        that are not polygons
+    :var polygon_points: Array of shape [P, 2], holding the x and y coordinates of
+        the polygon points
+    :var label_names: Names of the labels in the label table
+    :var label_ids: Unique database IDs of the labels in the label table
+    :var label_colors: Colors of the labels in the label table
+    :var feature_vector: Optional feature vector for the image
+    :var maps: List of additional result media belonging to the prediction
+    """
+
+    shape_types: np.ndarray
+    boxes: np.ndarray
+    angles: np.ndarray
+    label_offsets: np.ndarray
+    label_indices: np.ndarray
+    scores: np.ndarray
+    polygon_offsets: np.ndarray
+    polygon_points: np.ndarray
+    label_names: List[str]
+    label_ids: List[Optional[str]]
+    label_colors: List[Optional[str]]
+    feature_vector: Optional[np.ndarray] = attr.field(default=None, repr=False)
+    maps: List[ResultMedium] = attr.field(factory=list)
+
+    def __len__(self) -> int:
+        """
+        Return the number of annotations in the PredictionArray.
+        """
+        return len(self.shape_types)
+
+    @classmethod
+    def from_boxes(
+        cls,
+        boxes: np.ndarray,
+        label_indices: np.ndarray,
+        scores: np.ndarray,
+        labels: Sequence[Tuple[str, Optional[str], Optional[str]]],
+        shape_type: ShapeType = ShapeType.RECTANGLE,
+    ) -> "PredictionArray":
+        """
+        Create a PredictionArray holding a single label for each of a number of
+        rectangles or ellipses.
+
+        :param boxes: Array of shape [N, 4], holding the x, y, width and height of
+            each shape
+        :param label_indices: Array of shape [N], holding the index of the label for
+            each shape into `labels`
+        :param scores: Array of shape [N], holding the probability of the label for
+            each shape
+        :param labels: Label table, holding a tuple of (name, id, color) for each label
+        :param shape_type: Type of the shapes, either ShapeType.RECTANGLE or
+            ShapeType.ELLIPSE
+        :return: PredictionArray holding the shapes
+        """
+        n_shapes = len(boxes)
+        return cls(
+            shape_types=np.full(
+                n_shapes, SHAPE_TYPE_CODES.index(shape_type), dtype=np.uint8
+            ),
+            boxes=np.asarray(boxes, dtype=np.float32).reshape(n_shapes, 4),
+            angles=np.zeros(n_shapes, dtype=np.float32),
+            label_offsets=np.arange(n_shapes + 1, dtype=np.int32),
+            label_indices=np.asarray(label_indices, dtype=np.int32),
+            scores=np.asarray(scores, dtype=np.float64),
+            polygon_offsets=np.zeros(n_shapes + 1, dtype=np.int32),
+            polygon_points=np.zeros((0, 2), dtype=np.float32),
+            label_names=[label[0] for label in labels],
+            label_ids=[label[1] for label in labels],
+            label_colors=[label[2] for label in labels],
+        )
+
+    @classmethod
+    def from_prediction(cls, prediction: Prediction) -> "PredictionArray":
+        """
+        Create a PredictionArray from a Prediction.
+
+        The shapes, labels and scores are preserved exactly. Unique database IDs and
+        modification dates of the annotations are not kept.
+
+        :param prediction: Prediction to convert
+        :return: PredictionArray holding the annotations in the prediction
+        """
+        label_table: Dict[Tuple[str, Optional[str], Optional[str]], int] = {}
+        shape_types: List[int] = []
+        boxes: List[Tuple[float, float, float, float]] = []
+        angles: List[float] = []
+        label_counts: List[int] = []
+        label_indices: List[int] = []
+        scores: List[float] = []
+        polygon_counts: List[int] = []
+        polygon_points: List[Tuple[float, float]] = []
+        for annotation in prediction.annotations:
+            shape = annotation.shape
+            shape_types.append(SHAPE_TYPE_CODES.index(shape.type))
+            angle = 0.0
+            n_points = 0
+            if isinstance(shape, Polygon):
+                box = shape.to_roi()
+                boxes.append((box.x, box.y, box.width, box.height))
+                polygon_points.extend((point.x, point.y) for point in shape.points)
+                n_points = len(shape.points)
+            else:
+                boxes.append((shape.x, shape.y, shape.width, shape.height))
+                if isinstance(shape, RotatedRectangle):
+                    angle = shape.angle
+            angles.append(angle)
+            polygon_counts.append(n_points)
+            label_counts.append(len(annotation.labels))
+            for label in annotation.labels:
+                key = (label.name, label.id, label.color)
+                label_indices.append(label_table.setdefault(key, len(label_table)))
+                scores.append(label.probability)
+
+        n_shapes = len(shape_types)
+        return cls(
+            shape_types=np.array(shape_types, dtype=np.uint8),
+            boxes=np.array(boxes, dtype=np.float32).reshape(n_shapes, 4),
+            angles=np.array(angles, dtype=np.float32),
+            label_offsets=_offsets(label_counts),
+            label_indices=np.array(label_indices, dtype=np.int32),
+            scores=np.array(scores, dtype=np.float64),
+            polygon_offsets=_offsets(polygon_counts),
+            polygon_points=np.array(polygon_points, dtype=np.float32).reshape(-1, 2),
+            label_names=[key[0] for key in label_table],
+            label_ids=[key[1] for key in label_table],
+            label_colors=[key[2] for key in label_table],
+            feature_vector=prediction.feature_vector,
+            maps=list(prediction.maps),
+        )
+
+    def to_prediction(self) -> Prediction:
+        """
+        Convert the PredictionArray to a Prediction.
+
+        :return: Prediction holding an Annotation for each shape in the array
+        """
+        label_offsets = self.label_offsets.tolist()
+        label_indices = self.label_indices.tolist()
+        scores = self.scores.tolist()
+        polygon_offsets = self.polygon_offsets.tolist()
+        polygon_points = self.polygon_points.tolist()
+        boxes = self.boxes.tolist()
+        angles = self.angles.tolist()
+
+        annotations: List[Annotation] = []
+        for index, shape_code in enumerate(self.shape_types.tolist()):
+            shape_type = SHAPE_TYPE_CODES[shape_code]
+            x, y, width, height = boxes[index]
+            if shape_type == ShapeType.RECTANGLE:
+                shape = Rectangle(x=x, y=y, width=width, height=height)
+            elif shape_type == ShapeType.ELLIPSE:
+                shape = Ellipse(x=x, y=y, width=width, height=height)
+            elif shape_type == ShapeType.ROTATED_RECTANGLE:
+                shape = RotatedRectangle(
+                    x=x, y=y, width=width, height=height, angle=angles[index]
+                )
+            else:
+                points = polygon_points[
+                    polygon_offsets[index] : polygon_offsets[index + 1]
+                ]
+                shape = Polygon(points=[Point(x=px, y=py) for px, py in points])
+            labels = [
+                ScoredLabel(
+                    name=self.label_names[label_index],
+                    id=self.label_ids[label_index],
+                    color=self.label_colors[label_index],
+                    probability=score,
+                )
+                for label_index, score in zip(
+                    label_indices[label_offsets[index] : label_offsets[index + 1]],
+                    scores[label_offsets[index] : label_offsets[index + 1]],
+                )
+            ]
+            annotations.append(Annotation(shape=shape, labels=labels))
+        return Prediction(
+            annotations=annotations,
+            feature_vector=self.feature_vector,
+            maps=list(self.maps),
+        )
+
+    @property
+    def annotation_indices(self) -> np.ndarray:
+        """
+        Return the index of the annotation that each predicted label belongs to.
+
+        :return: Array of the same length as `label_indices` and `scores`
+        """
+        return np.repeat(
+            np.arange(len(self), dtype=np.int32), np.diff(self.label_offsets)
+        )
+
+    def get_top_labels(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Return the highest scoring label for each annotation.
+
+        :return: Tuple containing:
+            - Array of shape [N] holding the index into the label table of the
+              highest scoring label of each annotation, or -1 for annotations
+              without labels
+            - Array of shape [N] holding the score of that label, or -inf for
+              annotations without labels
+        """
+        top_labels = np.full(len(self), -1, dtype=np.int32)
+        top_scores = np.full(len(self), -np.inf, dtype=np.float64)
+        has_labels = np.diff(self.label_offsets) > 0
+        # Sort the labels by annotation and by descending score, so that the first
+        # label of each annotation is its highest scoring one
+        order = np.lexsort((-self.scores, self.annotation_indices))
+        first = order[self.label_offsets[:-1][has_labels]]
+        top_labels[has_labels] = self.label_indices[first]
+        top_scores[has_labels] = self.scores[first]
+        return top_labels, top_scores
+
+    def select(self, indices: np.ndarray) -> "PredictionArray":
+        """
+        Return a new PredictionArray holding a subset of the annotations.
+
+        :param indices: Boolean mask of shape [N], or array of indices of the
+            annotations to keep. Annotations are returned in the order of `indices`
+        :return: PredictionArray holding the selected annotations. The label table
+            is shared with the original array
+        """
+        indices = np.arange(len(self))[np.asarray(indices)]
+        label_counts = np.diff(self.label_offsets)[indices]
+        polygon_counts = np.diff(self.polygon_offsets)[indices]
+        return PredictionArray(
+            shape_types=self.shape_types[indices],
+            boxes=self.boxes[indices],
+            angles=self.angles[indices],
+            label_offsets=_offsets(label_counts),
+            label_indices=self.label_indices[
+                _ranges(self.label_offsets[indices], label_counts)
+            ],
+            scores=self.scores[_ranges(self.label_offsets[indices], label_counts)],
+            polygon_offsets=_offsets(polygon_counts),
+            polygon_points=self.polygon_points[
+                _ranges(self.polygon_offsets[indices], polygon_counts)
+            ],
+            label_names=self.label_names,
+            label_ids=self.label_ids,
+            label_colors=self.label_colors,
+            feature_vector=self.feature_vector,
+            maps=list(self.maps),
+        )
+
+    def filter_by_confidence(
+        self,
+        confidence_threshold: Union[float, Dict[str, float]],
+        default_threshold: float = 0.0,
+    ) -> "PredictionArray":
+        """
+        Return a new PredictionArray holding only the annotations that have at
+        least one label with a score of at least the confidence threshold for that
+        label.
+
+        :param confidence_threshold: Either a single threshold for all labels, or a
+            dictionary mapping label names to their threshold
+        :param default_threshold: Threshold for labels that are not in the
+            `confidence_threshold` dictionary
+        :return: PredictionArray holding the annotations that pass the threshold
+        """
+        if isinstance(confidence_threshold, dict):
+            thresholds = np.array(
+                [
+                    confidence_threshold.get(name, default_threshold)
+                    for name in self.label_names
+                ],
+                dtype=np.float64,
+            )
+        else:
+            thresholds = np.full(len(self.label_names), confidence_threshold)
+        passes = self.scores >= thresholds[self.label_indices]
+        keep = (
+            np.bincount(self.annotation_indices, weights=passes, minlength=len(self))
+            > 0
+        )
+        return self.select(keep)
+
+    def non_max_suppression(
+        self, iou_threshold: float, class_aware: bool = True
+    ) -> "PredictionArray":
+        """
+        Return a new PredictionArray without the annotations that overlap with a
+        higher scoring annotation by more than `iou_threshold`.
+
+        The overlap of rectangles and ellipses is computed from their boxes, the
+        overlap of rotated rectangles from their rotated outline. Other shapes are
+        never suppressed. Annotations are ranked by the score of their highest
+        scoring label.
+
+        :param iou_threshold: Annotations with an intersection over union larger
+            than this value with a higher scoring annotation are removed
+        :param class_aware: True to only suppress annotations that have the same
+            highest scoring label as the higher scoring annotation
+        :return: PredictionArray holding the remaining annotations, in their
+            original order
+        """
+        top_labels, top_scores = self.get_top_labels()
+        if not class_aware:
+            top_labels = np.zeros_like(top_labels)
+        keep = np.ones(len(self), dtype=bool)
+        for shape_codes, overlap_function in [
+            (AXIS_ALIGNED_SHAPE_CODES, _box_overlaps),
+            ([ROTATED_RECTANGLE_CODE], _rotated_box_overlaps),
+        ]:
+            is_candidate = np.isin(self.shape_types, shape_codes)
+            # Annotations with different labels never suppress each other, so the
+            # overlaps are only computed within each label
+            for label_index in np.unique(top_labels[is_candidate]):
+                candidates = np.flatnonzero(is_candidate & (top_labels == label_index))
+                if len(candidates) < 2:
+                    continue
+                order = candidates[np.argsort(-top_scores[candidates], kind="stable")]
+                suppressed = _greedy_suppression(
+                    overlap_function(
+                        self.boxes[order].astype(np.float64),
+                        self.angles[order],
+                        iou_threshold,
+                    )
+                )
+                keep[order[suppressed]] = False
+        return self.select(keep)
+
+    def top_k(self, k: int, per_label: bool = True) -> "PredictionArray":
+        """
+        Return a new PredictionArray holding only the `k` highest scoring
+        annotations. Annotations are ranked by the score of their highest scoring
+        label.
+
+        :param k: Maximum number of annotations to keep
+        :param per_label: True to keep the `k` highest scoring annotations for each
+            label, False to keep `k` annotations in total
+        :return: PredictionArray holding the highest scoring annotations, in their
+            original order
+        """
+        top_labels, top_scores = self.get_top_labels()
+        if not per_label:
+            top_labels = np.zeros_like(top_labels)
+        order = np.lexsort((-top_scores, top_labels))
+        sorted_labels = top_labels[order]
+        group_starts = np.flatnonzero(
+            np.r_[True, sorted_labels[1:] != sorted_labels[:-1]]
+        )
+        group_sizes = np.diff(np.r_[group_starts, len(order)])
+        ranks = np.arange(len(order)) - np.repeat(group_starts, group_sizes)
+        keep = np.zeros(len(self), dtype=bool)
+        keep[order[ranks < k]] = True
+        return self.select(keep)
+
+
+def _ranges(starts: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """
+    Return the concatenation of the ranges `start` up to `start + count` for each
+    pair of `starts` and `counts`.
+
+    :param starts: Start of each range
+    :param counts: Length of each range
+    :return: Array holding the indices in all ranges
+    """
+    total = int(counts.sum())
+    if total == 0:
+        return np.zeros(0, dtype=np.int64)
+    range_offsets = np.repeat(_offsets(counts)[:-1], counts)
+    return np.repeat(starts, counts) + np.arange(total) - range_offsets
+
+
+def _greedy_suppression(overlaps: np.ndarray) -> np.ndarray:
+    """
+    Run greedy non-maximum suppression on a list of boxes, sorted by descending
+    score.
+
+    :param overlaps: Boolean array of shape [n, n], where element [i, j] is True if
+        box i overlaps with box j by more than the IoU threshold, for j > i
+    :return: Boolean mask of shape [n], True for the suppressed boxes
+    """
+    suppressed = np.zeros(len(overlaps), dtype=bool)
+    for index in np.flatnonzero(overlaps.any(axis=1)):
+        if not suppressed[index]:
+            suppressed |= overlaps[index]
+    return suppressed
+
+
+def _box_overlaps(
+    boxes: np.ndarray, angles: np.ndarray, iou_threshold: float
+) -> np.ndarray:
+    """
+    Return which pairs of axis-aligned boxes overlap by more than `iou_threshold`.
+
+    :param boxes: Array of shape [n, 4] holding the x, y, width and height of the
+        boxes
+    :param angles: Unused, the boxes are axis-aligned
+    :param iou_threshold: Intersection over union above which boxes overlap
+    :return: Boolean array of shape [n, n], where element [i, j] is True if box i
+        and box j overlap, for j > i
+    """
+    x_min, y_min = boxes[:, 0], boxes[:, 1]
+    x_max, y_max = x_min + boxes[:, 2], y_min + boxes[:, 3]
+    areas = boxes[:, 2] * boxes[:, 3]
+    widths = np.minimum(x_max[:, None], x_max) - np.maximum(x_min[:, None], x_min)
+    heights = np.minimum(y_max[:, None], y_max) - np.maximum(y_min[:, None], y_min)
+    intersections = np.clip(widths, 0, None) * np.clip(heights, 0, None)
+    unions = areas[:, None] + areas - intersections
+    # Compare without dividing, to avoid division by zero for empty boxes
+    overlaps = intersections > iou_threshold * unions
+    return np.triu(overlaps, k=1)
+
+
+def _rotated_box_overlaps(
+    boxes: np.ndarray, angles: np.ndarray, iou_threshold: float
+) -> np.ndarray:
+    """
+    Return which pairs of rotated boxes overlap by more than `iou_threshold`.
+
+    Pairs of boxes whose circumscribed circles do not intersect are skipped, the
+    intersection of the remaining pairs is computed with OpenCV.
+
+    :param boxes: Array of shape [n, 4] holding the center x, y, width and height
+        of the boxes
+    :param angles: Array of shape [n] holding the angle of each box, in degrees
+    :param iou_threshold: Intersection over union above which boxes overlap
+    :return: Boolean array of shape [n, n], where element [i, j] is True if box i
+        and box j overlap, for j > i
+    """
+    radii = np.hypot(boxes[:, 2], boxes[:, 3]) / 2
+    distances = np.hypot(
+        boxes[:, None, 0] - boxes[:, 0], boxes[:, None, 1] - boxes[:, 1]
+    )
+    areas = boxes[:, 2] * boxes[:, 3]
+    overlaps = np.zeros((len(boxes), len(boxes)), dtype=bool)
+    rectangles = [
+        ((x, y), (width, height), angle)
+        for (x, y, width, height), angle in zip(boxes.tolist(), angles.tolist())
+    ]
+    candidates = np.triu(distances < radii[:, None] + radii, k=1)
+    for first, second in zip(*np.nonzero(candidates)):
+        _, intersection = cv2.rotatedRectangleIntersection(
+            rectangles[first], rectangles[second]
+        )
+        if intersection is None or len(intersection) < 3:
+            continue
+        intersection_area = cv2.contourArea(cv2.convexHull(intersection))
+        union = areas[first] + areas[second] - intersection_area
+        overlaps[first, second] = intersection_area > iou_threshold * union
+    return overlaps
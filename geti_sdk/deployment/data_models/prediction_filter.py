@@ -0,0 +1,80 @@
+# Copyright (C) 2023 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions
+# and limitations under the License.
+from typing import Dict, Optional, Union
+
+import attr
+
+from geti_sdk.data_models import Prediction
+
+from .prediction_array import PredictionArray
+
+
+@attr.define
+class PredictionFilter:
+    """
+    Filtering steps to apply to the predictions of a model: a confidence threshold,
+    non-maximum suppression and top-k selection, in that order. Steps that are not
+    configured are skipped.
+
+    :var confidence_threshold: Annotations that do not have any label with a score
+        of at least this value are removed. Either a single threshold for all
+        labels, or a dictionary mapping label names to their threshold
+    :var default_confidence_threshold: Threshold for the labels that are not in the
+        `confidence_threshold` dictionary
+    :var iou_threshold: Annotations that overlap with a higher scoring annotation
+        by more than this intersection over union are removed
+    :var class_aware: True to only suppress overlapping annotations that have the
+        same label
+    :var top_k: Maximum number of annotations to keep
+    :var top_k_per_label: True to keep `top_k` annotations for each label, False to
+        keep `top_k` annotations in total
+    """
+
+    confidence_threshold: Optional[Union[float, Dict[str, float]]] = None
+    default_confidence_threshold: float = 0.0
+    iou_threshold: Optional[float] = None
+    class_aware: bool = True
+    top_k: Optional[int] = None
+    top_k_per_label: bool = True
+
+    def apply(self, prediction_array: PredictionArray) -> PredictionArray:
+        """
+        Apply the filter to a PredictionArray.
+
+        :param prediction_array: PredictionArray to filter
+        :return: PredictionArray holding the annotations that pass the filter
+        """
+        if self.confidence_threshold is not None:
+            prediction_array = prediction_array.filter_by_confidence(
+                self.confidence_threshold,
+                default_threshold=self.default_confidence_threshold,
+            )
+        if self.iou_threshold is not None:
+            prediction_array = prediction_array.non_max_suppression(
+                self.iou_threshold, class_aware=self.class_aware
+            )
+        if self.top_k is not None:
+            prediction_array = prediction_array.top_k(
+                self.top_k, per_label=self.top_k_per_label
+            )
+        return prediction_array
+
+    def apply_to_prediction(self, prediction: Prediction) -> Prediction:
+        """
+        Apply the filter to a Prediction.
+
+        :param prediction: Prediction to filter
+        :return: New Prediction holding the annotations that pass the filter
+        """
+        return self.apply(PredictionArray.from_prediction(prediction)).to_prediction()
@@ -13,16 +13,19 @@
 # and limitations under the License.
 
 import datetime
+import hashlib
 import importlib.util
+import itertools
 import json
 import logging
 import os
 import shutil
 import sys
 import tempfile
-import time
+import threading
+import weakref
 import zipfile
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
 
 import attr
 import numpy as np
@@ -56,7 +59,15 @@ ANOMALY_SALIENCY_KEY = "anomaly_map"
 SEGMENTATION_SALIENCY_KEY = "soft_prediction"
 FEATURE_VECTOR_KEY = "feature_vector"
 
-OVMS_TIMEOUT = 10  # Max time to wait for OVMS models to become available
+
+PERFORMANCE_HINTS = ["LATENCY", "THROUGHPUT", "CUMULATIVE_THROUGHPUT"]
+
+DEFAULT_MAX_BATCH_SIZE = 16  # Max number of images to infer in a single batch
+
+# Subdirectories of the model cache directory, holding the extracted model data and
+# the compiled models created by the OpenVINO runtime
+MODEL_CACHE_DIR_NAME = "models"
+COMPILED_MODEL_CACHE_DIR_NAME = "compiled"
 
 
 @attr.define
@@ -89,6 +100,22 @@ class DeployedModel(OptimizedModel):
         self._feature_vector_location: Optional[str] = None
 
         self.openvino_model_parameters: Optional[Dict[str, Any]] = None
+        self._max_num_requests: int = 1
+        self._async_callback: Optional[
+            Callable[[Dict[str, np.ndarray], Any], None]
+        ] = None
+        # Callback and runtime data for each asynchronous infer request in flight,
+        # by request id. Only the id is passed to the infer queue of the model
+        self._pending_async_requests: Dict[
+            int, Tuple[Callable[[Dict[str, np.ndarray], Any], None], Any]
+        ] = {}
+        self._async_request_ids = itertools.count()
+        self._supports_batching: Optional[bool] = None
+        self._shares_input_memory: bool = False
+        self._static_input_shapes: Optional[Dict[str, List[int]]] = None
+        # Guards the infer requests of the model, and the model itself while it is
+        # being reshaped and recompiled for batched inference
+        self._inference_lock = threading.RLock()
 
     @property
     def model_data_path(self) -> str:
@@ -104,7 +131,11 @@ class DeployedModel(OptimizedModel):
             )
         return self._model_data_path
 
-    def get_data(self, source: Union[str, os.PathLike, GetiSession]):
+    def get_data(
+        self,
+        source: Union[str, os.PathLike, GetiSession],
+        cache_dir: Optional[Union[str, os.PathLike]] = None,
+    ):
         """
         Load the model weights from a data source. The `source` can be one of the
         following:
@@ -116,19 +147,26 @@ class DeployedModel(OptimizedModel):
           3. A folder on local disk containing the .xml and .bin file for the model
 
         :param source: Data source to load the weights from
+        :param cache_dir: Optional persistent cache directory. If specified, zipped
+            model data is extracted to this directory instead of a temporary one,
+            keyed by the model ID and the hash of the zip file. Model data that was
+            extracted before is re-used without extracting it again
         """
         if isinstance(source, (os.PathLike, str)):
             if os.path.isfile(source) and os.path.splitext(source)[1] == ".zip":
-                # Extract zipfile into temporary directory
-                if self._model_data_path is None:
-                    temp_dir = tempfile.mkdtemp()
-                    self._needs_tempdir_deletion = True
-                    self._tempdir_path = temp_dir
+                if cache_dir is not None:
+                    temp_dir = self._extract_to_cache(source, cache_dir=cache_dir)
                 else:
-                    temp_dir = self._model_data_path
+                    # Extract zipfile into temporary directory
+                    if self._model_data_path is None:
+                        temp_dir = tempfile.mkdtemp()
+                        self._needs_tempdir_deletion = True
+                        self._tempdir_path = temp_dir
+                    else:
+                        temp_dir = self._model_data_path
 
-                with zipfile.ZipFile(source, "r") as zipped_source_model:
-                    zipped_source_model.extractall(temp_dir)
+                    with zipfile.ZipFile(source, "r") as zipped_source_model:
+                        zipped_source_model.extractall(temp_dir)
 
                 # _model_data_path contains the model structure and weights
                 # _model_python_path contains the custom model wrappers
@@ -186,7 +224,46 @@ class DeployedModel(OptimizedModel):
             self._model_data_path = model_dir
             self._needs_tempdir_deletion = True
             self._tempdir_path = model_dir
-            self.get_data(source=model_filepath)
+            self.get_data(source=model_filepath, cache_dir=cache_dir)
+
+    def _extract_to_cache(
+        self, zip_path: Union[str, os.PathLike], cache_dir: Union[str, os.PathLike]
+    ) -> str:
+        """
+        Extract a zip file holding the model data to the persistent model cache, if
+        it was not extracted there before.
+
+        :param zip_path: Path to the zip file holding the model data
+        :param cache_dir: Path to the cache directory
+        :return: Path to the directory holding the extracted model data
+        """
+        file_hash = hashlib.sha256()
+        with open(zip_path, "rb") as zip_file:
+            for chunk in iter(lambda: zip_file.read(1024 * 1024), b""):
+                file_hash.update(chunk)
+        model_key = self.id if self.id is not None else "model"
+        models_dir = os.path.join(cache_dir, MODEL_CACHE_DIR_NAME)
+        target_dir = os.path.join(models_dir, f"{model_key}_{file_hash.hexdigest()}")
+        if os.path.isdir(target_dir):
+            logging.debug(f"Using cached model data at `{target_dir}`")
+            return target_dir
+
+        # Extract to a staging directory first, so that the cache never holds
+        # partially extracted models
+        os.makedirs(models_dir, exist_ok=True)
+        staging_dir = tempfile.mkdtemp(dir=models_dir, prefix=".extracting_")
+        try:
+            with zipfile.ZipFile(zip_path, "r") as zipped_source_model:
+                zipped_source_model.extractall(staging_dir)
+            os.rename(staging_dir, target_dir)
+        except OSError:
+            # The model was extracted concurrently by another process
+            if not os.path.isdir(target_dir):
+                raise
+        finally:
+            if os.path.isdir(staging_dir):
+                shutil.rmtree(staging_dir)
+        return target_dir
 
     def __del__(self):
         """
@@ -202,6 +279,11 @@ class DeployedModel(OptimizedModel):
         device: str = "CPU",
         configuration: Optional[Dict[str, Any]] = None,
         project: Optional[Project] = None,
+        max_num_requests: int = 1,
+        performance_hint: Optional[str] = None,
+        num_streams: Optional[Union[int, str]] = None,
+        cache_dir: Optional[Union[str, os.PathLike]] = None,
+        core: Optional[Any] = None,
     ) -> None:
         """
         Load the actual model weights to a specified device.
@@ -212,16 +294,28 @@ class DeployedModel(OptimizedModel):
         :param project: Optional project to which the model belongs.
             This is only used when the model is run on OVMS, in that case the
             project is needed to identify the correct model
+        :param max_num_requests: Maximum number of infer requests that the model can
+            process in parallel when running asynchronous inference. Set to 0 to let
+            OpenVINO determine the optimal number of requests for the device.
+            Defaults to 1
+        :param performance_hint: Optional OpenVINO performance hint to compile the
+            model with. Can be either 'LATENCY', 'THROUGHPUT' or
+            'CUMULATIVE_THROUGHPUT'. If left as None, the device default is used
+        :param num_streams: Optional number of inference streams to use. Can be an
+            integer or 'AUTO'. If left as None, the device default is used
+        :param cache_dir: Optional persistent cache directory. If specified, the
+            OpenVINO runtime stores the compiled model in this directory, and loads it
+            from there on subsequent calls instead of compiling the model again
+        :param core: Optional OpenVINO Core to compile the model with. Sharing a
+            single Core between models avoids duplicating the runtime plugins for
+            every model. If left as None, a new Core is created for the model
         :return: OpenVino inference engine model that can be used to make predictions
             on images
         """
         try:
-            from openvino.model_api.adapters import (
-                OpenvinoAdapter,
-                OVMSAdapter,
-                create_core,
-            )
-            from openvino.model_api.models import Model as OMZModel
+            from openvino.model_api.adapters import OpenvinoAdapter, create_core
+
+            from .ovms_adapter import AsyncOVMSAdapter
         except ImportError as error:
             raise ValueError(
                 f"Unable to load inference model for {self}. Relevant OpenVINO "
@@ -231,13 +325,18 @@ class DeployedModel(OptimizedModel):
 
         if not target_device_is_ovms(device=device):
             # Run the model locally
+            plugin_config = self._get_plugin_config(
+                performance_hint=performance_hint,
+                num_streams=num_streams,
+                cache_dir=cache_dir,
+            )
             model_adapter = OpenvinoAdapter(
-                create_core(),
+                core if core is not None else create_core(),
                 model=os.path.join(self._model_data_path, "model.xml"),
                 weights_path=os.path.join(self._model_data_path, "model.bin"),
                 device=device,
-                plugin_config=None,
-                max_num_requests=1,
+                plugin_config=plugin_config,
+                max_num_requests=max_num_requests,
             )
         else:
             # Connect to an OpenVINO model server instance
@@ -246,24 +345,157 @@ class DeployedModel(OptimizedModel):
                 ovms_address=device, model_name=model_name
             )
 
-            ovms_connected = False
-            ovms_error: Optional[BaseException] = None
-            t_start = time.time()
-            while not ovms_connected and time.time() - t_start < OVMS_TIMEOUT:
-                # If OVMS has just started, model needs some time to initialize
-                try:
-                    model_adapter = OVMSAdapter(model_address)
-                    ovms_connected = True
-                except RuntimeError as error:
-                    time.sleep(0.5)
-                    ovms_error = error
-            if not ovms_connected:
-                if ovms_error is not None:
-                    raise RuntimeError("Unable to connect to OVMS") from ovms_error
-                else:
-                    raise RuntimeError(
-                        "Unknown error encountered while connecting to OVMS"
-                    )
+            # Models of a task chain share the gRPC channel to the OVMS instance.
+            # If OVMS has just started, the model needs some time to initialize
+            model_adapter = AsyncOVMSAdapter(
+                model_address, max_num_requests=max_num_requests
+            )
+            max_num_requests = model_adapter.max_num_requests
+
+        model, configuration = self._create_model_wrapper(
+            model_adapter, configuration=configuration, preload=True
+        )
+        self.openvino_model_parameters = configuration
+        self._inference_model = model
+        if max_num_requests == 0:
+            # OpenVINO created the optimal number of infer requests for the device
+            max_num_requests = len(model_adapter.async_queue)
+        self._max_num_requests = max_num_requests
+        self._supports_batching = False if target_device_is_ovms(device) else None
+        self._shares_input_memory = not target_device_is_ovms(device)
+        model.inference_adapter.set_callback(DeployedModel._adapter_callback)
+
+        # TODO: This is a workaround to fix the issue that causes the output blob name
+        #  to be unset. Remove this once it has been fixed on OTX/ModelAPI side
+        output_names = list(self._inference_model.outputs.keys())
+        if hasattr(self._inference_model, "output_blob_name"):
+            if not self._inference_model.output_blob_name:
+                self._inference_model.output_blob_name = {
+                    name: name for name in output_names
+                }
+
+    def save_with_embedded_preprocessing(
+        self, path_to_folder: Union[str, os.PathLike]
+    ) -> None:
+        """
+        Save the model in OpenVINO IR format, with its preprocessing steps (resize,
+        layout change, mean/scale normalization) embedded in the graph. The saved
+        model accepts raw uint8 images, as required for inference with OVMS.
+
+        The preprocessing is embedded in the same way as when the model is loaded
+        for local inference.
+
+        :param path_to_folder: Folder to save the `model.xml` and `model.bin` files to
+        """
+        try:
+            from openvino.model_api.adapters import OpenvinoAdapter, create_core
+        except ImportError as error:
+            raise ValueError(
+                f"Unable to load inference model for {self}. Relevant OpenVINO "
+                f"packages were not found. Please make sure that OpenVINO is installed "
+                f"correctly."
+            ) from error
+        model_adapter = OpenvinoAdapter(
+            create_core(),
+            model=os.path.join(self._model_data_path, "model.xml"),
+            weights_path=os.path.join(self._model_data_path, "model.bin"),
+        )
+        model, _ = self._create_model_wrapper(model_adapter, preload=False)
+        os.makedirs(path_to_folder, exist_ok=True)
+        model.save(
+            xml_path=os.path.join(path_to_folder, "model.xml"),
+            bin_path=os.path.join(path_to_folder, "model.bin"),
+        )
+
+    def save_quantized(
+        self,
+        path_to_folder: Union[str, os.PathLike],
+        calibration_images: Sequence[np.ndarray],
+        subset_size: int = 300,
+        preset: str = "performance",
+    ) -> None:
+        """
+        Quantize the model to INT8 precision with NNCF post-training quantization,
+        and save the quantized model in OpenVINO IR format.
+
+        The quantization runs locally on the CPU, and uses the `calibration_images`
+        to collect the statistics for the quantization parameters. The preprocessing
+        steps are embedded in the quantized graph, in the same way as for
+        :py:meth:`save_with_embedded_preprocessing`, so that the saved model can be
+        loaded like any other deployed model.
+
+        NOTE: This method requires the `nncf` package to be installed
+
+        :param path_to_folder: Folder to save the `model.xml` and `model.bin` files to
+        :param calibration_images: Images to calibrate the quantization parameters
+            on, as numpy arrays with dimensions [height x width x channels] and the
+            channels in RGB order
+        :param subset_size: Maximum number of calibration images to use
+        :param preset: Quantization preset, either `performance` for symmetric
+            quantization of weights and activations, or `mixed` for asymmetric
+            quantization of the activations
+        """
+        try:
+            import nncf
+        except ImportError as error:
+            raise ImportError(
+                f"Unable to quantize model {self}, the `nncf` package was not found. "
+                f"Please install it using `pip install nncf`."
+            ) from error
+        from openvino.model_api.adapters import OpenvinoAdapter, create_core
+
+        if len(calibration_images) == 0:
+            raise ValueError(
+                f"No calibration images were passed, unable to quantize model {self}."
+            )
+        model_adapter = OpenvinoAdapter(
+            create_core(),
+            model=os.path.join(self._model_data_path, "model.xml"),
+            weights_path=os.path.join(self._model_data_path, "model.bin"),
+        )
+        model, _ = self._create_model_wrapper(model_adapter, preload=False)
+
+        def _transform(image: np.ndarray) -> Dict[str, np.ndarray]:
+            preprocessed_image, _ = model.preprocess(image)
+            return preprocessed_image
+
+        quantized_model = nncf.quantize(
+            model.get_model(),
+            nncf.Dataset(calibration_images, _transform),
+            preset=nncf.QuantizationPreset(preset),
+            subset_size=min(subset_size, len(calibration_images)),
+        )
+        # Saving through the wrapper stores its parameters in the runtime info of the
+        # quantized graph, just like for the original model
+        model_adapter.model = quantized_model
+        os.makedirs(path_to_folder, exist_ok=True)
+        model.save(
+            xml_path=os.path.join(path_to_folder, "model.xml"),
+            bin_path=os.path.join(path_to_folder, "model.bin"),
+        )
+
+    def _create_model_wrapper(
+        self,
+        model_adapter: Any,
+        configuration: Optional[Dict[str, Any]] = None,
+        preload: bool = True,
+    ) -> Tuple[Any, Dict[str, Any]]:
+        """
+        Create the model API wrapper for the model, using the configuration in the
+        model `config.json` file.
+
+        For image models running locally, the model API embeds the preprocessing
+        steps (resize, layout change, mean/scale normalization) into the OpenVINO
+        graph with a PrePostProcessor when the wrapper is created, so that the
+        model accepts raw uint8 images.
+
+        :param model_adapter: Inference adapter to create the wrapper for
+        :param configuration: Optional dictionary holding additional configuration
+            parameters for the model
+        :param preload: True to compile the model to the device of the adapter
+        :return: Tuple containing the model wrapper and its configuration
+        """
+        from openvino.model_api.models import Model as OMZModel
 
         # Load model configuration
         config_path = os.path.join(self._model_data_path, "config.json")
@@ -313,19 +545,56 @@ class DeployedModel(OptimizedModel):
             model=model_adapter,
             model_type=model_type,
             configuration=configuration,
-            preload=True,
+            preload=preload,
         )
-        self.openvino_model_parameters = configuration
-        self._inference_model = model
+        return model, configuration
 
-        # TODO: This is a workaround to fix the issue that causes the output blob name
-        #  to be unset. Remove this once it has been fixed on OTX/ModelAPI side
-        output_names = list(self._inference_model.outputs.keys())
-        if hasattr(self._inference_model, "output_blob_name"):
-            if not self._inference_model.output_blob_name:
-                self._inference_model.output_blob_name = {
-                    name: name for name in output_names
-                }
+    @staticmethod
+    def _get_plugin_config(
+        performance_hint: Optional[str] = None,
+        num_streams: Optional[Union[int, str]] = None,
+        cache_dir: Optional[Union[str, os.PathLike]] = None,
+    ) -> Optional[Dict[str, str]]:
+        """
+        Validate the OpenVINO performance settings for the model, and convert them to
+        a plugin configuration for the OpenVINO runtime.
+
+        :param performance_hint: Optional OpenVINO performance hint, either
+            'LATENCY', 'THROUGHPUT' or 'CUMULATIVE_THROUGHPUT'
+        :param num_streams: Optional number of inference streams, either a positive
+            integer or 'AUTO'
+        :param cache_dir: Optional cache directory. If specified, the compiled model
+            is cached in the `compiled` subdirectory of this directory
+        :raises: ValueError if the performance hint or number of streams is invalid
+        :return: Dictionary containing the plugin configuration, or None if no
+            settings were specified
+        """
+        if performance_hint is None and num_streams is None and cache_dir is None:
+            return None
+        plugin_config: Dict[str, str] = {}
+        if performance_hint is not None:
+            performance_hint = performance_hint.upper()
+            if performance_hint not in PERFORMANCE_HINTS:
+                raise ValueError(
+                    f"Invalid performance hint `{performance_hint}` specified. "
+                    f"Supported hints are: {PERFORMANCE_HINTS}"
+                )
+            plugin_config["PERFORMANCE_HINT"] = performance_hint
+        if num_streams is not None:
+            num_streams = str(num_streams).upper()
+            if num_streams != "AUTO" and not (
+                num_streams.isdigit() and int(num_streams) > 0
+            ):
+                raise ValueError(
+                    f"Invalid number of streams `{num_streams}` specified. Please "
+                    f"specify a positive integer or 'AUTO'."
+                )
+            plugin_config["NUM_STREAMS"] = num_streams
+        if cache_dir is not None:
+            plugin_config["CACHE_DIR"] = os.path.join(
+                cache_dir, COMPILED_MODEL_CACHE_DIR_NAME
+            )
+        return plugin_config
 
     @classmethod
     def from_model_and_hypers(
@@ -570,7 +839,356 @@ class DeployedModel(OptimizedModel):
             image
         :return: Dictionary containing the model outputs
         """
-        return self._inference_model.infer_sync(preprocessed_image)
+        with self._inference_lock:
+            if self._shares_input_memory:
+                # The preprocessing is embedded in the model, so the image can be
+                # passed to the infer request without copying it
+                adapter = self._inference_model.inference_adapter
+                request = adapter.async_queue[adapter.async_queue.get_idle_request_id()]
+                request.infer(preprocessed_image, shared_memory=True)
+                return adapter.get_raw_result(request)
+            return self._inference_model.infer_sync(preprocessed_image)
+
+    def infer_async(
+        self,
+        preprocessed_image: Dict[str, np.ndarray],
+        runtime_data: Any = None,
+        callback: Optional[Callable[[Dict[str, np.ndarray], Any], None]] = None,
+    ) -> None:
+        """
+        Start asynchronous inference on an already preprocessed image. This method
+        returns immediately, once inference completes the `callback` is called with
+        the model outputs and the `runtime_data`.
+
+        If all infer requests for the model are busy, this method blocks until one of
+        them becomes available. For models running on OVMS, the callback receives the
+        exception raised by the request instead of the model outputs if the request
+        fails.
+
+        :param preprocessed_image: Dictionary holding the preprocessing results for an
+            image
+        :param runtime_data: Additional data that is passed to the callback function
+            together with the inference results
+        :param callback: Optional function to call when inference for this request
+            completes. If left as None, the callback function set via
+            :py:meth:`set_asynchronous_callback` is used
+        """
+        if callback is None:
+            callback = self._async_callback
+        if callback is None:
+            raise ValueError(
+                f"No callback function was specified for asynchronous inference with "
+                f"model `{self.name}`. Please pass a callback or set one using "
+                f"`set_asynchronous_callback` first."
+            )
+        request_id = next(self._async_request_ids)
+        self._pending_async_requests[request_id] = (callback, runtime_data)
+        with self._inference_lock:
+            try:
+                self._inference_model.infer_async_raw(
+                    preprocessed_image, (weakref.ref(self), request_id)
+                )
+            except Exception:
+                self._pending_async_requests.pop(request_id, None)
+                raise
+
+    def set_asynchronous_callback(
+        self, callback_function: Callable[[Dict[str, np.ndarray], Any], None]
+    ) -> None:
+        """
+        Set the default function that is called whenever an asynchronous infer
+        request started via :py:meth:`infer_async` completes.
+
+        :param callback_function: Function that is called with the dictionary
+            containing the model outputs and the `runtime_data` that was passed to
+            `infer_async` as arguments
+        """
+        self._async_callback = callback_function
+
+    @staticmethod
+    def _adapter_callback(request: Any, callback_data: Any) -> None:
+        """
+        Handle the completion of an asynchronous infer request in the model adapter,
+        and pass the model outputs on to the callback for the request.
+
+        The infer queue of the model adapter keeps the callback and the callback
+        data alive, and the garbage collector cannot see the references held by
+        the queue. This callback is therefore not bound to the model, and the
+        callback data only holds a weak reference to the model and the id of the
+        request, so that the model can be collected once it is no longer used.
+
+        :param request: Completed infer request, or a dictionary holding the model
+            outputs or the exception raised by the request in case of remote
+            inference
+        :param callback_data: Callback data that was passed with the request
+        """
+        if isinstance(request, (dict, Exception)):
+            # Remote (OVMS) inference returns the model outputs directly, or the
+            # error raised by the request, and wraps the callback data in a tuple
+            inference_results = request
+            callback_data = callback_data[1]
+        model_reference, request_id = callback_data
+        model: Optional[DeployedModel] = model_reference()
+        if model is None:
+            return
+        callback, runtime_data = model._pending_async_requests.pop(request_id)
+        if not isinstance(request, (dict, Exception)):
+            # Outputs have to be copied, because the infer request may be re-used
+            # as soon as the callback returns
+            adapter = model._inference_model.inference_adapter
+            inference_results = adapter.copy_raw_result(request)
+        callback(inference_results, runtime_data)
+
+    def infer_batch(
+        self,
+        preprocessed_images: List[Dict[str, np.ndarray]],
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+    ) -> List[Dict[str, np.ndarray]]:
+        """
+        Run inference on a batch of already preprocessed images.
+
+        The images are split into chunks of at most `max_batch_size` images. If all
+        images in a chunk have the same shape and the model supports it, they are
+        stacked and inferred in a single call with a batch dimension. The first time
+        this happens, the model is reshaped to accept a dynamic batch size and
+        recompiled. If batched inference is not possible, the images are submitted
+        as asynchronous infer requests if the model was loaded with multiple infer
+        requests, or inferred one by one otherwise.
+
+        :param preprocessed_images: List of dictionaries holding the preprocessing
+            results for the images in the batch
+        :param max_batch_size: Maximum number of images to infer in a single call
+        :return: List of dictionaries containing the model outputs for each image
+        """
+        if max_batch_size < 1:
+            raise ValueError(
+                f"Invalid maximum batch size {max_batch_size}, please specify a "
+                f"positive integer."
+            )
+        results: List[Dict[str, np.ndarray]] = []
+        for start in range(0, len(preprocessed_images), max_batch_size):
+            results.extend(
+                self._infer_chunk(preprocessed_images[start : start + max_batch_size])
+            )
+        return results
+
+    def _infer_chunk(
+        self, preprocessed_images: List[Dict[str, np.ndarray]]
+    ) -> List[Dict[str, np.ndarray]]:
+        """
+        Run inference on a chunk of preprocessed images, as a single batch if
+        possible.
+
+        :param preprocessed_images: List of dictionaries holding the preprocessing
+            results for the images in the chunk
+        :return: List of dictionaries containing the model outputs for each image
+        """
+        if len(preprocessed_images) > 1 and not self._can_infer_as_batch(
+            preprocessed_images
+        ):
+            if self._max_num_requests != 1:
+                return self._infer_many_async(preprocessed_images)
+        with self._inference_lock:
+            if len(preprocessed_images) == 1 or not self._supports_batching:
+                return [self._infer_and_copy(image) for image in preprocessed_images]
+            batch = {
+                name: np.concatenate([image[name] for image in preprocessed_images])
+                for name in preprocessed_images[0].keys()
+            }
+            batch_results = self._infer_and_copy(batch)
+            batch_size = len(preprocessed_images)
+            if not all(
+                isinstance(output, np.ndarray)
+                and output.ndim > 0
+                and output.shape[0] == batch_size
+                for output in batch_results.values()
+            ):
+                # Some model outputs are not batched, so they can't be assigned to
+                # the individual images. Fall back to inference per image
+                logging.warning(
+                    f"Model `{self.name}` produces outputs that can not be split per "
+                    f"image, batched inference is disabled for this model."
+                )
+                self._disable_batching()
+                return [self._infer_and_copy(image) for image in preprocessed_images]
+        return [
+            {name: output[index : index + 1] for name, output in batch_results.items()}
+            for index in range(batch_size)
+        ]
+
+    def _infer_and_copy(
+        self, preprocessed_image: Dict[str, np.ndarray]
+    ) -> Dict[str, np.ndarray]:
+        """
+        Run inference on a preprocessed image and copy the model outputs.
+
+        The outputs of :py:meth:`infer` refer to the memory of the infer request,
+        which is overwritten by the next inference call on the same request.
+
+        :param preprocessed_image: Dictionary holding the preprocessing results for an
+            image
+        :return: Dictionary containing a copy of the model outputs
+        """
+        return {
+            name: np.copy(output)
+            for name, output in self.infer(preprocessed_image).items()
+        }
+
+    def _infer_many_async(
+        self, preprocessed_images: List[Dict[str, np.ndarray]]
+    ) -> List[Dict[str, np.ndarray]]:
+        """
+        Run inference on a list of preprocessed images by submitting them as
+        asynchronous infer requests, and wait for these requests to complete.
+
+        :param preprocessed_images: List of dictionaries holding the preprocessing
+            results for the images
+        :return: List of dictionaries containing the model outputs for each image, in
+            the same order as the input images
+        """
+        results: List[Optional[Dict[str, np.ndarray]]] = [None] * len(
+            preprocessed_images
+        )
+        n_pending = [len(preprocessed_images)]
+        completed = threading.Condition()
+
+        def _collect_result(inference_results: Dict[str, np.ndarray], index: int):
+            results[index] = inference_results
+            with completed:
+                n_pending[0] -= 1
+                completed.notify_all()
+
+        # Only the requests submitted here are waited for, requests submitted by
+        # other callers of the model may still be in progress afterwards
+        for index, image in enumerate(preprocessed_images):
+            self.infer_async(image, runtime_data=index, callback=_collect_result)
+        with completed:
+            completed.wait_for(lambda: n_pending[0] == 0)
+        for result in results:
+            if isinstance(result, Exception):
+                raise result
+        return results
+
+    def _can_infer_as_batch(
+        self, preprocessed_images: List[Dict[str, np.ndarray]]
+    ) -> bool:
+        """
+        Return True if the preprocessed images can be inferred by the model as a
+        single batch. This requires the images to have the same shape, and the
+        model to accept a dynamic batch size. If needed, the model is reshaped and
+        recompiled to accept a dynamic batch size.
+
+        :param preprocessed_images: List of dictionaries holding the preprocessing
+            results for the images in the batch
+        :return: True if the images can be inferred as a batch, False otherwise
+        """
+        if self._supports_batching is False:
+            return False
+        first_image = preprocessed_images[0]
+        for image in preprocessed_images[1:]:
+            if any(
+                image[name].shape != first_image[name].shape
+                for name in first_image.keys()
+            ):
+                return False
+        with self._inference_lock:
+            if self._supports_batching is None:
+                self._enable_batching()
+            return self._supports_batching
+
+    def _enable_batching(self) -> None:
+        """
+        Reshape the model to accept a dynamic batch size, and recompile it.
+
+        If this fails, the original input shapes of the model are restored and
+        batched inference is disabled for the model. Must be called while holding
+        the inference lock.
+        """
+        adapter = self._inference_model.inference_adapter
+        input_layers = adapter.get_input_layers()
+        self._static_input_shapes = {
+            name: list(metadata.shape) for name, metadata in input_layers.items()
+        }
+        new_shapes: Dict[str, List[int]] = {}
+        for name, shape in self._static_input_shapes.items():
+            if len(shape) != 4:
+                logging.warning(
+                    f"Unable to enable batched inference for model `{self.name}`, "
+                    f"images will be inferred one by one. Input `{name}` is not an "
+                    f"image input."
+                )
+                self._supports_batching = False
+                return
+            new_shapes[name] = [-1, *shape[1:]]
+        try:
+            self._reshape_and_reload(new_shapes)
+        except RuntimeError as error:
+            logging.warning(
+                f"Unable to enable batched inference for model `{self.name}`, "
+                f"images will be inferred one by one. Reshaping the model failed "
+                f"with error: `{error}`"
+            )
+            self._disable_batching()
+            return
+        self._supports_batching = True
+        logging.debug(f"Enabled dynamic batch size for model `{self.name}`.")
+
+    def _disable_batching(self) -> None:
+        """
+        Disable batched inference for the model, and restore its original static
+        input shapes if it was reshaped before. Must be called while holding the
+        inference lock.
+        """
+        self._supports_batching = False
+        adapter = self._inference_model.inference_adapter
+        if self._static_input_shapes is None:
+            return
+        current_shapes = {
+            name: list(metadata.shape)
+            for name, metadata in adapter.get_input_layers().items()
+        }
+        if current_shapes != self._static_input_shapes:
+            self._reshape_and_reload(self._static_input_shapes)
+            logging.debug(f"Restored static input shapes for model `{self.name}`.")
+
+    def _reshape_and_reload(self, input_shapes: Dict[str, List[int]]) -> None:
+        """
+        Reshape the inputs of the model and recompile it. Infer requests that are
+        still in progress are completed first. Must be called while holding the
+        inference lock.
+
+        :param input_shapes: Dictionary mapping the names of the model inputs to
+            their new shapes
+        """
+        adapter = self._inference_model.inference_adapter
+        adapter.await_all()
+        adapter.reshape_model(input_shapes)
+        adapter.load_model()
+        # Recompiling the model creates a new infer queue, the callback needs
+        # to be set again
+        adapter.set_callback(DeployedModel._adapter_callback)
+
+    def await_all(self) -> None:
+        """
+        Block until all asynchronous infer requests for the model are completed.
+        """
+        self._inference_model.await_all()
+
+    def await_any(self) -> None:
+        """
+        Block until at least one of the infer requests for the model is available
+        for a new asynchronous inference call.
+        """
+        self._inference_model.await_any()
+
+    @property
+    def max_num_requests(self) -> int:
+        """
+        Return the maximum number of infer requests that the model was loaded with.
+
+        :return: Maximum number of parallel infer requests
+        """
+        return self._max_num_requests
 
     @property
     def ote_label_schema(self) -> LabelSchemaEntity:
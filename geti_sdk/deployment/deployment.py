@@ -12,13 +12,29 @@
 # See the License for the specific language governing permissions
 # and limitations under the License.
 
+import contextlib
 import json
 import logging
 import os
 import shutil
-from typing import Any, Dict, List, Optional, Union
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    Any,
+    Callable,
+    Collection,
+    ContextManager,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 
 import attr
+import cv2
 import numpy as np
 import otx
 from otx.api.utils.detection_utils import detection2array
@@ -32,13 +48,29 @@ from geti_sdk.data_models import (
     Task,
     TaskType,
 )
-from geti_sdk.data_models.predictions import ResultMedium
 from geti_sdk.data_models.shapes import Polygon, Rectangle, RotatedRectangle
-from geti_sdk.deployment.data_models import ROI, IntermediateInferenceResult
+from geti_sdk.deployment.data_models import (
+    ROI,
+    ExplainOutputs,
+    IntermediateInferenceResult,
+    PredictionArray,
+    PredictionFilter,
+)
 from geti_sdk.rest_converters import ProjectRESTConverter
 
-from .deployed_model import DeployedModel
-from .utils import OVMS_README_PATH, generate_ovms_model_name
+from .deployed_model import (
+    DEFAULT_MAX_BATCH_SIZE,
+    SEGMENTATION_SALIENCY_KEY,
+    DeployedModel,
+)
+from .prediction_cache import PredictionCache
+from .prediction_converters import PredictionConverter, create_prediction_converter
+from .stage_timer import StageTimer
+from .utils import OVMS_README_PATH, generate_ovms_model_name, generate_tiles
+
+# Number of images per infer request that can be submitted via `infer_async` while
+# earlier results are still waiting to be postprocessed
+ASYNC_RESULT_BUFFER_FACTOR = 2
 
 
 @attr.define(slots=False)
@@ -58,9 +90,17 @@ class Deployment:
         self._is_single_task: bool = len(self.project.get_trainable_tasks()) == 1
         self._are_models_loaded: bool = False
         self._inference_converters: Dict[str, Any] = {}
+        self._prediction_converters: Dict[str, Optional[PredictionConverter]] = {}
         self._empty_labels: Dict[str, Label] = {}
         self._path_to_temp_resources: Optional[str] = None
         self._requires_resource_cleanup: bool = False
+        self._async_errors: List[Exception] = []
+        self._async_postprocessing_executor: Optional[ThreadPoolExecutor] = None
+        self._async_result_slots: Optional[threading.BoundedSemaphore] = None
+        self._model_load_times: Dict[str, Dict[str, float]] = {}
+        self._prediction_filter: Optional[PredictionFilter] = None
+        self._prediction_cache: Optional[PredictionCache] = None
+        self._stage_timer: Optional[StageTimer] = None
 
     @property
     def is_single_task(self) -> bool:
@@ -83,6 +123,94 @@ class Deployment:
         """
         return self._are_models_loaded
 
+    @property
+    def model_load_times(self) -> Dict[str, Dict[str, float]]:
+        """
+        Return the time required to load the inference model for each task in the
+        deployment, as measured by the last call to :py:meth:`load_inference_models`.
+
+        :return: Dictionary mapping the title of each task to a breakdown of the
+            load time for its model, in seconds. The breakdown contains the time
+            required to load and compile the model (key `model`), and the time
+            required to create the prediction converter (key `converter`)
+        """
+        return self._model_load_times
+
+    @property
+    def prediction_filter(self) -> Optional[PredictionFilter]:
+        """
+        Return the filter that is applied to the predictions of each model in the
+        deployment, if any.
+
+        :return: PredictionFilter applied during postprocessing, or None if the
+            predictions are not filtered
+        """
+        return self._prediction_filter
+
+    def set_prediction_filter(
+        self, prediction_filter: Optional[PredictionFilter]
+    ) -> None:
+        """
+        Set a filter to apply to the predictions of each model in the deployment,
+        for example to run non-maximum suppression or to keep only the top-k
+        predictions.
+
+        The filter is applied during postprocessing, before the predictions are
+        passed to the next task in a task chain. For models that support direct
+        conversion to a PredictionArray, the annotations that are filtered out are
+        never created.
+
+        :param prediction_filter: PredictionFilter to apply, or None to disable
+            filtering
+        """
+        self._prediction_filter = prediction_filter
+        # Cached predictions were created with the previous filter
+        if self._prediction_cache is not None:
+            self._prediction_cache.clear()
+
+    @property
+    def prediction_cache(self) -> Optional[PredictionCache]:
+        """
+        Return the cache holding the predictions for recently inferred images, if
+        any.
+
+        :return: PredictionCache used by :py:meth:`infer`, or None if predictions
+            are not cached
+        """
+        return self._prediction_cache
+
+    def set_prediction_cache(self, prediction_cache: Optional[PredictionCache]) -> None:
+        """
+        Set a cache for the predictions of the deployment. When an image that
+        matches a cached image is passed to :py:meth:`infer`, a copy of the cached
+        prediction is returned and inference is skipped.
+
+        :param prediction_cache: PredictionCache to use, or None to disable caching
+        """
+        self._prediction_cache = prediction_cache
+
+    @property
+    def stage_timer(self) -> Optional[StageTimer]:
+        """
+        Return the timer recording the time spent in each stage of the inference
+        pipeline, if any.
+
+        :return: StageTimer attached to the deployment, or None if the inference
+            stages are not timed
+        """
+        return self._stage_timer
+
+    def set_stage_timer(self, stage_timer: Optional[StageTimer]) -> None:
+        """
+        Set a timer to record the time spent in preprocessing, inference,
+        postprocessing and conversion to a Prediction, for each task in the
+        deployment.
+
+        :param stage_timer: StageTimer to record the times with, or None to disable
+            timing
+        """
+        self._stage_timer = stage_timer
+
     def save(self, path_to_folder: Union[str, os.PathLike]) -> bool:
         """
         Save the Deployment instance to a folder on local disk.
@@ -147,14 +275,44 @@ class Deployment:
             )
         return cls(models=models, project=project)
 
-    def load_inference_models(self, device: str = "CPU"):
+    def load_inference_models(
+        self,
+        device: str = "CPU",
+        max_async_infer_requests: int = 1,
+        performance_hint: Optional[str] = None,
+        num_streams: Optional[Union[int, str]] = None,
+        cache_dir: Optional[Union[str, os.PathLike]] = None,
+        core: Optional[Any] = None,
+    ):
         """
         Load the inference models for the deployment to the specified device.
 
+        For task chain projects, the models for all tasks are loaded concurrently.
+        The time required to load each model is available through
+        :py:attr:`model_load_times` afterwards.
+
         Note: For a list of devices that are supported for OpenVINO inference, please see:
         https://docs.openvino.ai/latest/openvino_docs_OV_UG_supported_plugins_Supported_Devices.html
 
         :param device: Device to load the inference models to (e.g. 'CPU', 'GPU', 'AUTO', etc)
+        :param max_async_infer_requests: Maximum number of infer requests that each
+            model can process in parallel when running inference through
+            :py:meth:`infer_async`. Set to 0 to let OpenVINO determine the optimal
+            number of requests for the device. Defaults to 1
+        :param performance_hint: Optional OpenVINO performance hint to compile the
+            models with, either 'LATENCY', 'THROUGHPUT' or 'CUMULATIVE_THROUGHPUT'.
+            For asynchronous inference with multiple requests, 'THROUGHPUT' is
+            recommended. If left as None, the device default is used
+        :param num_streams: Optional number of inference streams to use for each
+            model. Can be an integer or 'AUTO'. If left as None, the device default
+            is used
+        :param cache_dir: Optional persistent cache directory for the compiled
+            models. The first time the models are loaded they are compiled and stored
+            in this directory. Subsequent loads, for example after a restart of the
+            application, read the compiled models from the cache instead of
+            compiling them again, which reduces the startup time considerably
+        :param core: Optional OpenVINO Core to compile the models with. If left as
+            None, a new Core is created for each model
         """
         try:
             from otx.api.usecases.exportable_code.prediction_to_annotation_converter import (
@@ -168,10 +326,24 @@ class Deployment:
                 f"file `requirements-deployment.txt` have been installed. "
             ) from error
 
-        inference_converters: Dict[str, IPredictionToAnnotationConverter] = {}
-        empty_labels: Dict[str, Label] = {}
-        for model, task in zip(self.models, self.project.get_trainable_tasks()):
-            model.load_inference_model(device=device, project=self.project)
+        def _load_task_model(
+            model: DeployedModel, task: Task
+        ) -> Tuple[
+            IPredictionToAnnotationConverter,
+            Optional[PredictionConverter],
+            Dict[str, float],
+        ]:
+            t_start = time.perf_counter()
+            model.load_inference_model(
+                device=device,
+                project=self.project,
+                max_num_requests=max_async_infer_requests,
+                performance_hint=performance_hint,
+                num_streams=num_streams,
+                cache_dir=cache_dir,
+                core=core,
+            )
+            t_model_loaded = time.perf_counter()
 
             # This is a workaround for a bug in the label schema for anomaly tasks
             if task.type.is_anomaly:
@@ -196,38 +368,278 @@ class Deployment:
             inference_converter = create_converter(
                 converter_type=task.type.to_ote_domain(), **converter_args
             )
-            inference_converters.update({task.title: inference_converter})
+            prediction_converter = create_prediction_converter(
+                task_type=task.type,
+                label_schema=model.ote_label_schema,
+                configuration=model.openvino_model_parameters,
+            )
+            load_times = {
+                "model": t_model_loaded - t_start,
+                "converter": time.perf_counter() - t_model_loaded,
+            }
+            return inference_converter, prediction_converter, load_times
+
+        # Model compilation releases the GIL, so the models for the tasks in a task
+        # chain are loaded concurrently
+        tasks = self.project.get_trainable_tasks()
+        with ThreadPoolExecutor(
+            max_workers=len(tasks), thread_name_prefix="GetiSDK-model-loading"
+        ) as executor:
+            futures = [
+                executor.submit(_load_task_model, model, task)
+                for model, task in zip(self.models, tasks)
+            ]
+            results = [future.result() for future in futures]
 
+        inference_converters: Dict[str, IPredictionToAnnotationConverter] = {}
+        empty_labels: Dict[str, Label] = {}
+        prediction_converters: Dict[str, Optional[PredictionConverter]] = {}
+        model_load_times: Dict[str, Dict[str, float]] = {}
+        for task, (inference_converter, prediction_converter, load_times) in zip(
+            tasks, results
+        ):
+            inference_converters.update({task.title: inference_converter})
+            prediction_converters.update({task.title: prediction_converter})
             empty_label = next((label for label in task.labels if label.is_empty), None)
             empty_labels.update({task.title: empty_label})
+            model_load_times.update({task.title: load_times})
+            logging.debug(
+                f"Loaded model for task `{task.title}` in "
+                f"{load_times['model']:.2f} seconds, prediction converter created in "
+                f"{load_times['converter']:.2f} seconds."
+            )
 
         self._inference_converters = inference_converters
+        self._prediction_converters = prediction_converters
         self._empty_labels = empty_labels
+        self._model_load_times = model_load_times
+        # The models report the actual number of infer requests, which is chosen by
+        # OpenVINO if `max_async_infer_requests` is 0
+        self._prepare_async_inference(self.models[0].max_num_requests)
         self._are_models_loaded = True
         logging.info(f"Inference models loaded on device `{device}` successfully.")
 
-    def infer(self, image: np.ndarray) -> Prediction:
+    def infer(
+        self, image: np.ndarray, as_array: bool = False
+    ) -> Union[Prediction, PredictionArray]:
         """
         Run inference on an image for the full model chain in the deployment.
 
         :param image: Image to run inference on, as a numpy array containing the pixel
             data. The image is expected to have dimensions [height x width x channels],
             with the channels in RGB order
+        :param as_array: True to return the inference results as a PredictionArray,
+            holding the shapes, labels and scores in flat numpy arrays. For
+            single-task detection deployments the model outputs are converted to the
+            PredictionArray directly, which is considerably faster than creating a
+            Prediction when many objects are detected. The prediction cache is not
+            used for inference results in this format
         :return: inference results
         """
         self._check_models_loaded()
+        prediction_cache = self._prediction_cache if not as_array else None
+        if prediction_cache is not None:
+            cache_key = prediction_cache.compute_key(image)
+            cached_prediction = prediction_cache.get(cache_key)
+            if cached_prediction is not None:
+                return cached_prediction
 
         # Single task inference
         if self.is_single_task:
-            prediction = self._infer_task(
-                image, task=self.project.get_trainable_tasks()[0], explain=False
-            )
+            task = self.project.get_trainable_tasks()[0]
+            if as_array:
+                return self._infer_task_array(image, task=task)
+            prediction = self._infer_task(image, task=task, explain=False)
         # Multi-task inference
         else:
             prediction = self._infer_pipeline(image=image, explain=False)
+        if as_array:
+            return PredictionArray.from_prediction(prediction)
+        if prediction_cache is not None:
+            prediction_cache.put(cache_key, prediction)
+        return prediction
+
+    def infer_batch(
+        self,
+        images: Sequence[np.ndarray],
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+    ) -> List[Prediction]:
+        """
+        Run inference on a batch of images for the full model chain in the
+        deployment.
+
+        If all images in the batch have the same dimensions, the first model in the
+        chain will infer them in a single call with a batch dimension. The first
+        time this happens the model is reshaped to accept a dynamic batch size,
+        which requires recompiling it. Downstream tasks in a task chain are run per
+        image.
+
+        :param images: List of images to run inference on, as numpy arrays
+            containing the pixel data. The images are expected to have dimensions
+            [height x width x channels], with the channels in RGB order
+        :param max_batch_size: Maximum number of images to infer in a single call.
+            Larger lists of images are split into multiple batches
+        :return: List of inference results, one for each image in the batch
+        """
+        self._check_models_loaded()
+        if max_batch_size < 1:
+            raise ValueError(
+                f"Invalid maximum batch size {max_batch_size}, please specify a "
+                f"positive integer."
+            )
+        predictions = self._infer_task_batch(
+            images,
+            task=self.project.get_trainable_tasks()[0],
+            max_batch_size=max_batch_size,
+        )
+        if not self.is_single_task:
+            predictions = [
+                self._infer_pipeline(image=image, first_task_prediction=prediction)
+                for image, prediction in zip(images, predictions)
+            ]
+        return predictions
+
+    def infer_tiled(
+        self,
+        image: np.ndarray,
+        tile_size: Union[int, Tuple[int, int]] = 1024,
+        tile_overlap: float = 0.2,
+        scale: float = 1.0,
+        iou_threshold: Optional[float] = 0.5,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+    ) -> Prediction:
+        """
+        Run inference on a large image by splitting it into overlapping tiles, and
+        inferring each tile separately with the first model in the deployment.
+        This preserves small objects that would disappear if the full image was
+        resized to the input size of the model.
+
+        The tiles are inferred in batches, or through parallel asynchronous infer
+        requests if the model was loaded with more than one infer request. The
+        predictions for the tiles are converted to full-image coordinates and
+        merged, objects detected in multiple overlapping tiles are merged by
+        non-maximum suppression. Downstream tasks in a task chain are run on the
+        merged prediction, for the full image.
+
+        :param image: Image to run inference on, as a numpy array containing the pixel
+            data. The image is expected to have dimensions [height x width x channels],
+            with the channels in RGB order
+        :param tile_size: Size of the tiles, in pixels of the scaled image. Either a
+            single integer for square tiles, or a tuple of (width, height)
+        :param tile_overlap: Fraction of the tile size by which neighbouring tiles
+            overlap, between 0 and 1
+        :param scale: Factor by which the image is resized before it is split into
+            tiles. Values smaller than 1 reduce the number of tiles, at the cost of
+            detail
+        :param iou_threshold: Objects with the same label that overlap by more than
+            this intersection over union are merged. Rectangles, ellipses and
+            rotated rectangles are merged, polygons are not. In addition, objects
+            that are cut off by the edge of a tile are removed if more than this
+            fraction of their box is covered by a complete object with the same
+            label from another tile. Set to None to keep all objects
+        :param max_batch_size: Maximum number of tiles to infer in a single call
+        :return: inference results for the full image
+        """
+        self._check_models_loaded()
+        task = self.project.get_trainable_tasks()[0]
+        if task.is_global:
+            raise ValueError(
+                f"Tiled inference is not supported for task `{task.title}` of type "
+                f"{task.type}, because it predicts labels for the full image."
+            )
+        if scale <= 0:
+            raise ValueError(f"Invalid scale {scale}, please specify a positive value.")
+        if isinstance(tile_size, int):
+            tile_size = (tile_size, tile_size)
+
+        image_height, image_width = image.shape[0:2]
+        scaled_image = image
+        if scale != 1:
+            scaled_image = cv2.resize(
+                image,
+                dsize=(
+                    max(round(image_width * scale), 1),
+                    max(round(image_height * scale), 1),
+                ),
+                interpolation=cv2.INTER_AREA if scale < 1 else cv2.INTER_LINEAR,
+            )
+        scaled_height, scaled_width = scaled_image.shape[0:2]
+        tiles = [
+            ROI(labels=[], shape=tile, original_shape=tile)
+            for tile in generate_tiles(
+                scaled_width, scaled_height, *tile_size, overlap=tile_overlap
+            )
+        ]
+        tiling_result = IntermediateInferenceResult(
+            image=scaled_image, prediction=Prediction(annotations=[]), rois=tiles
+        )
+        tile_predictions = self._infer_task_batch(
+            tiling_result.generate_views(), task=task, max_batch_size=max_batch_size
+        )
+
+        # Convert the predictions for the tiles to the coordinates of the full image.
+        # Empty labels are left out, they are assigned to the image as a whole below
+        empty_label = self._empty_labels.get(task.title)
+        is_cut_off: List[bool] = []
+        for tile, tile_prediction in zip(tiles, tile_predictions):
+            tile_box = tile.shape
+            for annotation in tile_prediction.annotations:
+                if empty_label is not None and all(
+                    label.name == empty_label.name for label in annotation.labels
+                ):
+                    continue
+                tiling_result.append_annotation(annotation, roi=tile)
+                # Objects touching a tile edge inside the image may continue in a
+                # neighbouring tile
+                box = annotation.shape.to_roi()
+                is_cut_off.append(
+                    (tile_box.x > 0 and box.x <= 1)
+                    or (tile_box.y > 0 and box.y <= 1)
+                    or (
+                        tile_box.x_max < scaled_width
+                        and box.x_max >= tile_box.width - 1
+                    )
+                    or (
+                        tile_box.y_max < scaled_height
+                        and box.y_max >= tile_box.height - 1
+                    )
+                )
+        prediction = tiling_result.prediction
+        if scale != 1:
+            factor_x, factor_y = (
+                image_width / scaled_width,
+                image_height / scaled_height,
+            )
+            for annotation in prediction.annotations:
+                annotation.shape = annotation.shape.scale(factor_x, factor_y)
+        if iou_threshold is not None:
+            prediction.annotations = _remove_cut_off_objects(
+                prediction.annotations, np.array(is_cut_off, dtype=bool), iou_threshold
+            )
+            prediction = PredictionFilter(
+                iou_threshold=iou_threshold
+            ).apply_to_prediction(prediction)
+        if len(prediction.annotations) == 0 and empty_label is not None:
+            prediction.append(
+                Annotation(
+                    shape=Rectangle(x=0, y=0, width=image_width, height=image_height),
+                    labels=[ScoredLabel.from_label(empty_label, probability=1)],
+                )
+            )
+
+        if not self.is_single_task:
+            prediction = self._infer_pipeline(
+                image=image, first_task_prediction=prediction
+            )
         return prediction
 
-    def explain(self, image: np.ndarray) -> Prediction:
+    def explain(
+        self,
+        image: np.ndarray,
+        outputs: Optional[Collection[str]] = None,
+        saliency_map_max_size: Optional[int] = None,
+        quantize_saliency_map: bool = False,
+    ) -> Prediction:
         """
         Run inference on an image for the full model chain in the deployment. The
         resulting prediction will also contain saliency maps and the feature vector
@@ -236,19 +648,222 @@ class Deployment:
         :param image: Image to run inference on, as a numpy array containing the pixel
             data. The image is expected to have dimensions [height x width x channels],
             with the channels in RGB order
+        :param outputs: Names of the explainability outputs to include in the
+            prediction, any of 'features' and 'saliency'. Outputs that are not
+            selected are not computed. If left as None, all outputs are included
+        :param saliency_map_max_size: Optional maximum size of the longest side of
+            the saliency map, in pixels. Larger saliency maps are downscaled
+        :param quantize_saliency_map: True to convert the saliency map to a uint8
+            array, to reduce its memory footprint
         :return: inference results
         """
+        prediction, explain_outputs = self.infer_with_explanation(
+            image,
+            outputs=outputs,
+            saliency_map_max_size=saliency_map_max_size,
+            quantize_saliency_map=quantize_saliency_map,
+        )
+        explain_outputs.add_to_prediction(prediction)
+        return prediction
+
+    def infer_with_explanation(
+        self,
+        image: np.ndarray,
+        outputs: Optional[Collection[str]] = None,
+        saliency_map_max_size: Optional[int] = None,
+        quantize_saliency_map: bool = False,
+    ) -> Tuple[Prediction, ExplainOutputs]:
+        """
+        Run inference on an image for the full model chain in the deployment, and
+        return the prediction together with the explainability outputs for the
+        first task in the chain.
+
+        The explainability outputs are computed lazily, the first time the saliency
+        map or feature vector is accessed. This avoids the cost of postprocessing
+        them for images for which they are not needed.
+
+        :param image: Image to run inference on, as a numpy array containing the pixel
+            data. The image is expected to have dimensions [height x width x channels],
+            with the channels in RGB order
+        :param outputs: Names of the explainability outputs to make available, any
+            of 'features' and 'saliency'. If left as None, all outputs are available
+        :param saliency_map_max_size: Optional maximum size of the longest side of
+            the saliency map, in pixels. Larger saliency maps are downscaled
+        :param quantize_saliency_map: True to convert the saliency map to a uint8
+            array, to reduce its memory footprint
+        :return: Tuple containing the inference results and the explainability
+            outputs
+        """
         self._check_models_loaded()
+        explain_outputs = ExplainOutputs(
+            outputs=outputs,
+            saliency_map_max_size=saliency_map_max_size,
+            quantize_saliency_map=quantize_saliency_map,
+        )
 
         # Single task inference
         if self.is_single_task:
             prediction = self._infer_task(
-                image, task=self.project.get_trainable_tasks()[0], explain=True
+                image,
+                task=self.project.get_trainable_tasks()[0],
+                explain_outputs=explain_outputs,
             )
         # Multi-task inference
         else:
-            prediction = self._infer_pipeline(image=image, explain=True)
-        return prediction
+            prediction = self._infer_pipeline(
+                image=image, explain_outputs=explain_outputs
+            )
+        return prediction, explain_outputs
+
+    def infer_async(
+        self,
+        image: np.ndarray,
+        callback: Callable[[np.ndarray, Prediction, Any], None],
+        runtime_data: Any = None,
+        error_callback: Optional[Callable[[Exception, Any], None]] = None,
+    ) -> None:
+        """
+        Run asynchronous inference on an image for the full model chain in the
+        deployment. This method returns as soon as the image is submitted to the first
+        model in the chain. Once the prediction is ready, `callback` is called with
+        the image, the prediction and the `runtime_data` as arguments.
+
+        The number of images that can be processed in parallel is determined by the
+        `max_async_infer_requests` parameter passed to `load_inference_models`. If
+        all infer requests are busy, or too many results are still waiting to be
+        postprocessed, this method blocks until the image can be submitted. Use
+        :py:meth:`await_all` to wait for all pending requests to complete.
+
+        NOTE: Postprocessing, inference for any downstream tasks in the chain and the
+        callback are executed in a single worker thread owned by the deployment. The
+        callbacks are called one at a time, but not in the thread that submitted the
+        image.
+
+        :param image: Image to run inference on, as a numpy array containing the pixel
+            data. The image is expected to have dimensions [height x width x channels],
+            with the channels in RGB order
+        :param callback: Function to call when the prediction for the image is ready
+        :param runtime_data: Optional additional data that will be passed to the
+            callback function, for example a frame index
+        :param error_callback: Optional function to call with the error and the
+            `runtime_data` if generating the prediction for the image fails. If left
+            as None, errors are collected and raised by :py:meth:`await_all`
+        """
+        self._check_models_loaded()
+        model = self.models[0]
+        self._async_result_slots.acquire()
+        try:
+            preprocessed_image, metadata = model.preprocess(image)
+            model.infer_async(
+                preprocessed_image,
+                runtime_data=(image, metadata, callback, error_callback, runtime_data),
+            )
+        except Exception:
+            self._async_result_slots.release()
+            raise
+
+    def _prepare_async_inference(self, max_async_infer_requests: int) -> None:
+        """
+        Set up the callback and postprocessing worker for asynchronous inference.
+
+        Results of asynchronous requests are postprocessed in a single worker thread,
+        so that the OpenVINO callback threads are released right away and the
+        downstream models in a task chain are never used concurrently.
+
+        :param max_async_infer_requests: Maximum number of parallel infer requests
+            that the models were loaded with
+        """
+        self.models[0].set_asynchronous_callback(self._async_inference_callback)
+        if self._async_postprocessing_executor is None:
+            self._async_postprocessing_executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="GetiSDK-postprocessing"
+            )
+        self._async_result_slots = threading.BoundedSemaphore(
+            ASYNC_RESULT_BUFFER_FACTOR * max(max_async_infer_requests, 1)
+        )
+
+    def await_all(self) -> None:
+        """
+        Block until all asynchronous infer requests started via :py:meth:`infer_async`
+        are completed, and their callbacks have been executed.
+
+        :raises: RuntimeError if an error occurred while processing the results for
+            any of the asynchronous requests, and no `error_callback` was passed for
+            the request
+        """
+        self._check_models_loaded()
+        self.models[0].await_all()
+        # The postprocessing worker handles results in order, so once this no-op
+        # completes all earlier results have been processed
+        self._async_postprocessing_executor.submit(lambda: None).result()
+        if len(self._async_errors) > 0:
+            errors = self._async_errors
+            self._async_errors = []
+            raise RuntimeError(
+                f"Asynchronous inference failed for {len(errors)} image(s)."
+            ) from errors[0]
+
+    def _async_inference_callback(
+        self,
+        inference_results: Dict[str, np.ndarray],
+        runtime_data: Tuple[np.ndarray, Dict[str, Any], Callable, Callable, Any],
+    ) -> None:
+        """
+        Handle the outputs of an asynchronous infer request for the first model in
+        the deployment. This runs in an OpenVINO callback thread, so the outputs are
+        handed off to the postprocessing worker without blocking.
+
+        :param inference_results: Dictionary containing the model outputs
+        :param runtime_data: Tuple containing the image, preprocessing metadata, user
+            callback, user error callback and user runtime data for the request
+        """
+        self._async_postprocessing_executor.submit(
+            self._process_async_result, inference_results, runtime_data
+        )
+
+    def _process_async_result(
+        self,
+        inference_results: Dict[str, np.ndarray],
+        runtime_data: Tuple[np.ndarray, Dict[str, Any], Callable, Callable, Any],
+    ) -> None:
+        """
+        Postprocess the outputs of an asynchronous infer request for the first model
+        in the deployment, run the downstream tasks if needed, and pass the resulting
+        prediction to the user callback.
+
+        :param inference_results: Dictionary containing the model outputs
+        :param runtime_data: Tuple containing the image, preprocessing metadata, user
+            callback, user error callback and user runtime data for the request
+        """
+        image, metadata, callback, error_callback, user_data = runtime_data
+        try:
+            if isinstance(inference_results, Exception):
+                # Remote inference passes the error raised by the infer request
+                raise inference_results
+            first_task = self.project.get_trainable_tasks()[0]
+            prediction = self._postprocess_task(
+                image=image,
+                task=first_task,
+                inference_results=inference_results,
+                metadata=metadata,
+            )
+            if not self.is_single_task:
+                prediction = self._infer_pipeline(
+                    image=image, first_task_prediction=prediction
+                )
+            callback(image, prediction, user_data)
+        except Exception as error:
+            if error_callback is None:
+                logging.exception("Error in asynchronous inference callback")
+                self._async_errors.append(error)
+            else:
+                try:
+                    error_callback(error, user_data)
+                except Exception as callback_error:
+                    logging.exception("Error in asynchronous error callback")
+                    self._async_errors.append(callback_error)
+        finally:
+            self._async_result_slots.release()
 
     def _check_models_loaded(self) -> None:
         """
@@ -263,7 +878,11 @@ class Deployment:
             )
 
     def _infer_task(
-        self, image: np.ndarray, task: Task, explain: bool = False
+        self,
+        image: np.ndarray,
+        task: Task,
+        explain: bool = False,
+        explain_outputs: Optional[ExplainOutputs] = None,
     ) -> Prediction:
         """
         Run pre-processing, inference, and post-processing on the input `image`, for
@@ -273,25 +892,246 @@ class Deployment:
         :param task: Task to run inference for
         :param explain: True to get additional outputs for model explainability,
             including saliency maps and the feature vector for the image
+        :param explain_outputs: Optional ExplainOutputs to bind the model outputs
+            to, so that the explainability outputs can be computed lazily
         :return: Inference result
         """
         model = self._get_model_for_task(task)
-        preprocessed_image, metadata = model.preprocess(image)
-        inference_results = model.infer(preprocessed_image)
-        postprocessing_results = model.postprocess(inference_results, metadata=metadata)
+        with self._measure_stage(task, "preprocess"):
+            preprocessed_image, metadata = model.preprocess(image)
+        with self._measure_stage(task, "infer"):
+            inference_results = model.infer(preprocessed_image)
+        return self._postprocess_task(
+            image=image,
+            task=task,
+            inference_results=inference_results,
+            metadata=metadata,
+            explain=explain,
+            explain_outputs=explain_outputs,
+        )
+
+    def _infer_task_array(self, image: np.ndarray, task: Task) -> PredictionArray:
+        """
+        Run pre-processing, inference, and post-processing on the input `image`, for
+        the model associated with the `task`, and return the result as a
+        PredictionArray.
+
+        :param image: Image to run inference on
+        :param task: Task to run inference for
+        :return: Inference result
+        """
+        prediction_converter = self._prediction_converters.get(task.title)
+        if prediction_converter is None or task.type == TaskType.ROTATED_DETECTION:
+            return PredictionArray.from_prediction(self._infer_task(image, task=task))
+        model = self._get_model_for_task(task)
+        with self._measure_stage(task, "preprocess"):
+            preprocessed_image, metadata = model.preprocess(image)
+        with self._measure_stage(task, "infer"):
+            inference_results = model.infer(preprocessed_image)
+        with self._measure_stage(task, "postprocess"):
+            postprocessing_results = model.postprocess(
+                inference_results, metadata=metadata
+            )
+        with self._measure_stage(task, "convert"):
+            prediction_array = prediction_converter.convert_to_array(
+                postprocessing_results,
+                metadata=metadata,
+                image_width=image.shape[1],
+                image_height=image.shape[0],
+            )
+        if self._prediction_filter is not None:
+            prediction_array = self._prediction_filter.apply(prediction_array)
+        empty_label = self._empty_labels[task.title]
+        if len(prediction_array) == 0 and empty_label is not None:
+            prediction_array = PredictionArray.from_boxes(
+                boxes=np.array([[0, 0, image.shape[1], image.shape[0]]]),
+                label_indices=np.array([0]),
+                scores=np.array([1.0]),
+                labels=[(empty_label.name, empty_label.id, empty_label.color)],
+            )
+        return prediction_array
+
+    def _infer_task_batch(
+        self,
+        images: Sequence[np.ndarray],
+        task: Task,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+    ) -> List[Prediction]:
+        """
+        Run pre-processing, inference, and post-processing on a batch of `images`,
+        for the model associated with the `task`.
+
+        The images are processed in chunks of at most `max_batch_size` images. Each
+        chunk is inferred in a single batched call if possible, or through multiple
+        parallel asynchronous infer requests if the model was loaded with more than
+        one infer request.
+
+        :param images: List of images to run inference on
+        :param task: Task to run inference for
+        :param max_batch_size: Maximum number of images to infer in a single call
+        :return: List of inference results, one for each image
+        """
+        model = self._get_model_for_task(task)
+        predictions: List[Prediction] = []
+        for start in range(0, len(images), max_batch_size):
+            chunk = images[start : start + max_batch_size]
+            with self._measure_stage(task, "preprocess"):
+                preprocessing_results = [model.preprocess(image) for image in chunk]
+            with self._measure_stage(task, "infer"):
+                batch_results = model.infer_batch(
+                    [preprocessed for preprocessed, _ in preprocessing_results],
+                    max_batch_size=max_batch_size,
+                )
+            predictions.extend(
+                self._postprocess_task(
+                    image=image,
+                    task=task,
+                    inference_results=inference_results,
+                    metadata=metadata,
+                )
+                for image, (_, metadata), inference_results in zip(
+                    chunk, preprocessing_results, batch_results
+                )
+            )
+        return predictions
+
+    def _postprocess_task(
+        self,
+        image: np.ndarray,
+        task: Task,
+        inference_results: Dict[str, np.ndarray],
+        metadata: Dict[str, Any],
+        explain: bool = False,
+        explain_outputs: Optional[ExplainOutputs] = None,
+    ) -> Prediction:
+        """
+        Run post-processing on the raw model outputs for the input `image`, for the
+        model associated with the `task`, and convert the result to a Prediction.
+
+        :param image: Image for which the inference results were generated
+        :param task: Task to which the inference results belong
+        :param inference_results: Dictionary containing the raw model outputs
+        :param metadata: Dictionary containing the metadata generated during
+            preprocessing of the image
+        :param explain: True to get additional outputs for model explainability,
+            including saliency maps and the feature vector for the image
+        :param explain_outputs: Optional ExplainOutputs to bind the model outputs
+            to, so that the explainability outputs can be computed lazily
+        :return: Inference result
+        """
+        model = self._get_model_for_task(task)
+        with self._measure_stage(task, "postprocess"):
+            postprocessing_results = model.postprocess(
+                inference_results, metadata=metadata
+            )
 
         # Optional output related to explainability
-        saliency_map: Optional[np.ndarray] = None
-        repr_vector: Optional[np.ndarray] = None
-        if explain:
-            saliency_map, repr_vector = model.postprocess_explain_outputs(
-                inference_results=inference_results, metadata=metadata
+        if explain and explain_outputs is None:
+            explain_outputs = ExplainOutputs()
+        if explain_outputs is not None:
+            # The outputs are only copied if they are not used right away
+            explain_outputs.bind(
+                _explain_function(
+                    model,
+                    inference_results,
+                    metadata=metadata,
+                    copy_outputs=not explain,
+                )
             )
-        converter = self._inference_converters[task.title]
 
         width: int = image.shape[1]
         height: int = image.shape[0]
 
+        # Conversion of the model outputs to a Prediction
+        with self._measure_stage(task, "convert"):
+            prediction_converter = self._prediction_converters.get(task.title)
+            prediction_filter = self._prediction_filter
+            if (
+                prediction_converter is not None
+                and prediction_filter is not None
+                and task.type != TaskType.ROTATED_DETECTION
+            ):
+                # Filter the model outputs before any annotations are created
+                prediction = prediction_filter.apply(
+                    prediction_converter.convert_to_array(
+                        postprocessing_results,
+                        metadata=metadata,
+                        image_width=width,
+                        image_height=height,
+                    )
+                ).to_prediction()
+                prediction_filter = None
+            elif prediction_converter is not None:
+                # Convert the model outputs to a Prediction directly
+                prediction = prediction_converter.convert(
+                    postprocessing_results,
+                    metadata=metadata,
+                    image_width=width,
+                    image_height=height,
+                )
+            else:
+                prediction = self._convert_with_otx(
+                    postprocessing_results,
+                    task=task,
+                    metadata=metadata,
+                    image_width=width,
+                    image_height=height,
+                )
+
+            # Rotated detection models produce Polygons, convert them here to
+            # RotatedRectangles
+            if task.type == TaskType.ROTATED_DETECTION:
+                for annotation in prediction.annotations:
+                    if isinstance(annotation.shape, Polygon):
+                        annotation.shape = RotatedRectangle.from_polygon(
+                            annotation.shape
+                        )
+
+            if prediction_filter is not None:
+                prediction = prediction_filter.apply_to_prediction(prediction)
+
+            # Empty label is not generated by OTE correctly, append it here if there
+            # are no other predictions
+            if len(prediction.annotations) == 0:
+                if self._empty_labels[task.title] is not None:
+                    prediction.append(
+                        Annotation(
+                            shape=Rectangle(x=0, y=0, width=width, height=height),
+                            labels=[
+                                ScoredLabel.from_label(
+                                    self._empty_labels[task.title], probability=1
+                                )
+                            ],
+                        )
+                    )
+
+        # Add optional explainability outputs
+        if explain:
+            explain_outputs.add_to_prediction(prediction)
+
+        return prediction
+
+    def _convert_with_otx(
+        self,
+        postprocessing_results: Any,
+        task: Task,
+        metadata: Dict[str, Any],
+        image_width: int,
+        image_height: int,
+    ) -> Prediction:
+        """
+        Convert the postprocessed model outputs for an image to a Prediction, using
+        the OTX prediction converter for the `task`.
+
+        :param postprocessing_results: Output of the postprocessing step of the model
+        :param task: Task to which the model outputs belong
+        :param metadata: Dictionary containing the metadata generated during
+            preprocessing of the image
+        :param image_width: Width of the image, in pixels
+        :param image_height: Height of the image, in pixels
+        :return: Prediction for the image
+        """
+        converter = self._inference_converters[task.title]
         # Handle empty annotations
         if isinstance(postprocessing_results, (np.ndarray, list)):
             try:
@@ -329,43 +1169,21 @@ class Deployment:
                 predictions=postprocessing_results, metadata=metadata
             )
             prediction = Prediction.from_ote(
-                annotation_scene_entity, image_width=width, image_height=height
+                annotation_scene_entity,
+                image_width=image_width,
+                image_height=image_height,
             )
         else:
             prediction = Prediction(annotations=[])
-
-        # Empty label is not generated by OTE correctly, append it here if there are
-        # no other predictions
-        if len(prediction.annotations) == 0:
-            if self._empty_labels[task.title] is not None:
-                prediction.append(
-                    Annotation(
-                        shape=Rectangle(x=0, y=0, width=width, height=height),
-                        labels=[
-                            ScoredLabel.from_label(
-                                self._empty_labels[task.title], probability=1
-                            )
-                        ],
-                    )
-                )
-
-        # Rotated detection models produce Polygons, convert them here to
-        # RotatedRectangles
-        if task.type == TaskType.ROTATED_DETECTION:
-            for annotation in prediction.annotations:
-                if isinstance(annotation.shape, Polygon):
-                    annotation.shape = RotatedRectangle.from_polygon(annotation.shape)
-
-        # Add optional explainability outputs
-        if explain:
-            prediction.feature_vector = repr_vector
-            result_medium = ResultMedium(name="saliency map", type="saliency map")
-            result_medium.data = saliency_map
-            prediction.maps = [result_medium]
-
         return prediction
 
-    def _infer_pipeline(self, image: np.ndarray, explain: bool = False) -> Prediction:
+    def _infer_pipeline(
+        self,
+        image: np.ndarray,
+        explain: bool = False,
+        first_task_prediction: Optional[Prediction] = None,
+        explain_outputs: Optional[ExplainOutputs] = None,
+    ) -> Prediction:
         """
         Run pre-processing, inference, and post-processing on the input `image`, for
         all models in the task chain associated with the deployment.
@@ -376,6 +1194,12 @@ class Deployment:
         :param image: Image to run inference on
         :param explain: True to get additional outputs for model explainability,
             including saliency maps and the feature vector for the image
+        :param first_task_prediction: Optional prediction for the first task in the
+            pipeline. If this is passed, inference for the first task is skipped and
+            the prediction is used as the starting point for the downstream tasks
+        :param explain_outputs: Optional ExplainOutputs to bind the outputs of the
+            model for the first task to, so that the explainability outputs can be
+            computed lazily
         :return: Inference result
         """
         previous_labels: Optional[List[Label]] = None
@@ -387,7 +1211,15 @@ class Deployment:
         for task in self.project.pipeline.tasks[1:]:
             # First task in the pipeline generates the initial result and ROIs
             if task.is_trainable and previous_labels is None:
-                task_prediction = self._infer_task(image, task=task, explain=explain)
+                if first_task_prediction is not None:
+                    task_prediction = first_task_prediction
+                else:
+                    task_prediction = self._infer_task(
+                        image,
+                        task=task,
+                        explain=explain,
+                        explain_outputs=explain_outputs,
+                    )
                 rois: Optional[List[ROI]] = None
                 if not task.is_global:
                     rois = [
@@ -407,9 +1239,11 @@ class Deployment:
                         "project: A flow control task is required between each "
                         "trainable task in the pipeline."
                     )
+                # Run inference for all ROIs at once, so that the views can be
+                # processed in a batch or in parallel
+                view_predictions = self._infer_task_batch(image_views, task=task)
                 new_rois: List[ROI] = []
-                for roi, view in zip(rois, image_views):
-                    view_prediction = self._infer_task(view, task)
+                for roi, view_prediction in zip(rois, view_predictions):
                     if task.is_global:
                         # Global tasks add their labels to the existing shape in the ROI
                         intermediate_result.extend_annotations(
@@ -420,11 +1254,13 @@ class Deployment:
                         # and generate ROI's corresponding to the new shapes
                         for annotation in view_prediction.annotations:
                             intermediate_result.append_annotation(annotation, roi=roi)
-                            new_rois.append(ROI.from_annotation(annotation))
-                        intermediate_result.rois = [
-                            new_roi.to_absolute_coordinates(parent_roi=roi)
-                            for new_roi in new_rois
-                        ]
+                            new_rois.append(
+                                ROI.from_annotation(annotation).to_absolute_coordinates(
+                                    parent_roi=roi
+                                )
+                            )
+                if not task.is_global:
+                    intermediate_result.rois = new_rois
                 previous_labels = [label for label in task.labels if not label.is_empty]
 
             # Downstream flow control tasks
@@ -447,6 +1283,19 @@ class Deployment:
                     )
         return intermediate_result.prediction
 
+    def _measure_stage(self, task: Task, stage: str) -> ContextManager[None]:
+        """
+        Return a context manager that records the time spent in a stage of the
+        inference pipeline with the stage timer, if a timer is set.
+
+        :param task: Task that the stage is run for
+        :param stage: Name of the stage
+        :return: Context manager timing the stage
+        """
+        if self._stage_timer is None:
+            return contextlib.nullcontext()
+        return self._stage_timer.measure(task.title, stage)
+
     def _get_model_for_task(self, task: Task) -> DeployedModel:
         """
         Get the DeployedModel instance corresponding to the input `task`.
@@ -485,6 +1334,8 @@ class Deployment:
         """
         if self._requires_resource_cleanup:
             self._remove_temporary_resources()
+        if self._async_postprocessing_executor is not None:
+            self._async_postprocessing_executor.shutdown(wait=False)
 
     def generate_ovms_config(self, output_folder: Union[str, os.PathLike]) -> None:
         """
@@ -525,22 +1376,8 @@ class Deployment:
             source_model_dir = model.model_data_path
 
             if otx.__version__ >= "1.4.0":
-                # Load the model to embed preprocessing for inference with OVMS adapter
-                try:
-                    from openvino.model_api.models import Model as OMZModel
-                except ImportError as error:
-                    raise ValueError(
-                        f"Unable to load inference model for {model.name}. Relevant "
-                        f"OpenVINO packages were not found. Please make sure that "
-                        f"OpenVINO is installed correctly."
-                    ) from error
-                embedded_model = OMZModel.create_model(
-                    model=os.path.join(model.model_data_path, "model.xml")
-                )
-                embedded_model.save(
-                    xml_path=os.path.join(ovms_model_dir, "model.xml"),
-                    bin_path=os.path.join(ovms_model_dir, "model.bin"),
-                )
+                # Embed the preprocessing in the model, OVMS receives raw images
+                model.save_with_embedded_preprocessing(ovms_model_dir)
                 logging.info(f"Model `{model.name}` prepared for OVMS inference.")
             else:
                 os.makedirs(ovms_model_dir, exist_ok=True)
@@ -565,3 +1402,89 @@ class Deployment:
             f"file with instructions on how to launch OVMS, connect to it and run "
             f"inference. Please follow the instructions outlined there to get started."
         )
+
+
+def _explain_function(
+    model: DeployedModel,
+    inference_results: Dict[str, np.ndarray],
+    metadata: Dict[str, Any],
+    copy_outputs: bool = True,
+) -> Callable[[], Tuple[Optional[np.ndarray], Optional[np.ndarray], bool]]:
+    """
+    Return a function that computes the explainability outputs of `model` for a
+    single image, to bind to an ExplainOutputs instance.
+
+    The model outputs may reference the memory of an infer request that is reused
+    for the next image, so they must be copied if the function is not called right
+    away.
+
+    :param model: Model that generated the inference results
+    :param inference_results: Dictionary containing the raw model outputs
+    :param metadata: Dictionary containing the metadata generated during
+        preprocessing and postprocessing of the image
+    :param copy_outputs: True to copy the model outputs
+    :return: Function returning the saliency map, the feature vector, and a
+        boolean that is True if the channels of the saliency map are in the last
+        dimension
+    """
+    if copy_outputs:
+        inference_results = {
+            name: np.copy(output) for name, output in inference_results.items()
+        }
+
+    def compute() -> Tuple[Optional[np.ndarray], Optional[np.ndarray], bool]:
+        saliency_map, feature_vector = model.postprocess_explain_outputs(
+            inference_results=inference_results, metadata=metadata
+        )
+        channels_last = model._saliency_key == SEGMENTATION_SALIENCY_KEY
+        return saliency_map, feature_vector, channels_last
+
+    return compute
+
+
+def _remove_cut_off_objects(
+    annotations: List[Annotation], is_cut_off: np.ndarray, coverage_threshold: float
+) -> List[Annotation]:
+    """
+    Remove the annotations for objects that were cut off by the edge of a tile, if
+    the object was also detected completely in another tile.
+
+    :param annotations: Annotations predicted for all tiles, in full-image
+        coordinates
+    :param is_cut_off: Boolean array holding True for each annotation that touches
+        an edge of its tile inside the image
+    :param coverage_threshold: Cut off annotations are removed if more than this
+        fraction of their box is covered by the box of a complete annotation with
+        the same label
+    :return: List of remaining annotations
+    """
+    if not is_cut_off.any() or is_cut_off.all():
+        return annotations
+    rois = [annotation.shape.to_roi() for annotation in annotations]
+    boxes = np.array(
+        [[roi.x, roi.y, roi.x + roi.width, roi.y + roi.height] for roi in rois],
+        dtype=np.float64,
+    )
+    label_names = np.array(
+        [
+            max(annotation.labels, key=lambda label: label.probability).name
+            if annotation.labels
+            else ""
+            for annotation in annotations
+        ]
+    )
+    cut_off, complete = boxes[is_cut_off], boxes[~is_cut_off]
+    widths = np.minimum(cut_off[:, None, 2], complete[:, 2]) - np.maximum(
+        cut_off[:, None, 0], complete[:, 0]
+    )
+    heights = np.minimum(cut_off[:, None, 3], complete[:, 3]) - np.maximum(
+        cut_off[:, None, 1], complete[:, 1]
+    )
+    intersections = np.clip(widths, 0, None) * np.clip(heights, 0, None)
+    areas = (cut_off[:, 2] - cut_off[:, 0]) * (cut_off[:, 3] - cut_off[:, 1])
+    is_covered = (intersections > coverage_threshold * areas[:, None]) & (
+        label_names[is_cut_off][:, None] == label_names[~is_cut_off]
+    )
+    keep = np.ones(len(annotations), dtype=bool)
+    keep[np.flatnonzero(is_cut_off)[is_covered.any(axis=1)]] = False
+    return [annotation for annotation, kept in zip(annotations, keep) if kept]
@@ -0,0 +1,440 @@
+# Copyright (C) 2023 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions
+# and limitations under the License.
+
+import logging
+import multiprocessing
+import os
+import queue
+import sys
+import time
+from collections import deque
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+from geti_sdk.data_models import Prediction
+
+from .deployment import Deployment
+
+WORKER_STARTUP_TIMEOUT = 300  # Max time to wait for a worker to load its models
+RESULT_POLL_INTERVAL = 0.5  # Interval at which worker health is checked, in seconds
+
+# Message types sent from the worker processes to the pool
+_READY = "ready"
+_RESULT = "result"
+_ERROR = "error"
+
+
+def _attach_shared_memory(name: str) -> SharedMemory:
+    """
+    Attach to an existing shared memory block, without registering it with the
+    resource tracker.
+
+    The block is owned by the DeploymentPool, which unlinks it when it is closed.
+    A worker that registers the block would either cause it to be unlinked when the
+    worker exits, or, if it unregisters it again, remove the registration of the
+    pool from the resource tracker that is shared with spawned workers.
+
+    :param name: Name of the shared memory block
+    :return: SharedMemory instance attached to the block
+    """
+    if sys.version_info >= (3, 13):
+        return SharedMemory(name=name, track=False)
+    register = resource_tracker.register
+    resource_tracker.register = lambda *args, **kwargs: None
+    try:
+        return SharedMemory(name=name)
+    finally:
+        resource_tracker.register = register
+
+
+def _pool_worker(
+    worker_index: int,
+    path_to_folder: str,
+    device: str,
+    shared_memory_name: str,
+    slot_size: int,
+    task_queue: multiprocessing.Queue,
+    result_queue: multiprocessing.Queue,
+) -> None:
+    """
+    Entrypoint for the worker processes of the DeploymentPool. Each worker loads the
+    deployment, and then processes frames from the shared memory ring buffer until it
+    receives a stop signal (None) on its task queue.
+
+    :param worker_index: Index of the worker in the pool
+    :param path_to_folder: Path to the folder containing the deployment
+    :param device: Device to load the inference models to
+    :param shared_memory_name: Name of the shared memory block holding the frames
+    :param slot_size: Size of a single slot in the ring buffer, in bytes
+    :param task_queue: Queue from which the worker receives its tasks
+    :param result_queue: Queue to which the worker sends its results
+    """
+    deployment = Deployment.from_folder(path_to_folder)
+    deployment.load_inference_models(device=device)
+    shared_memory = _attach_shared_memory(shared_memory_name)
+    result_queue.put((_READY, worker_index, None, None))
+    try:
+        while True:
+            task = task_queue.get()
+            if task is None:
+                break
+            frame_index, slot, shape, dtype = task
+            frame = np.ndarray(
+                shape,
+                dtype=dtype,
+                buffer=shared_memory.buf,
+                offset=slot * slot_size,
+            )
+            try:
+                prediction = deployment.infer(frame)
+                result_queue.put((_RESULT, worker_index, frame_index, prediction))
+            except Exception as error:
+                result_queue.put(
+                    (_ERROR, worker_index, frame_index, f"{type(error)}: {error}")
+                )
+            del frame
+    finally:
+        shared_memory.close()
+
+
+class DeploymentPool:
+    """
+    Pool of worker processes that each hold a copy of a Deployment, to run inference
+    on multiple frames in parallel. This allows the python based pre- and
+    postprocessing steps of the deployment to scale beyond a single CPU core.
+
+    Frames are passed to the workers through a ring buffer in shared memory, so that
+    the pixel data is not pickled. Predictions are returned in the order in which the
+    frames were submitted.
+    """
+
+    def __init__(
+        self,
+        path_to_folder: Union[str, os.PathLike],
+        workers: int = 2,
+        device: str = "CPU",
+        max_frame_size: Tuple[int, int, int] = (2160, 3840, 3),
+        frames_per_worker: int = 2,
+        max_restarts: int = 3,
+        max_frame_bytes: Optional[int] = None,
+    ):
+        """
+        Create a DeploymentPool for the deployment saved in `path_to_folder`, and
+        start the worker processes. This method returns once all workers have loaded
+        their inference models.
+
+        :param path_to_folder: Path to the folder containing the Deployment data
+        :param workers: Number of worker processes to start
+        :param device: Device to load the inference models to in each worker
+        :param max_frame_size: Maximum size (height, width, channels) of the frames
+            that can be inferred by the pool. This determines the size of the slots in
+            the shared memory ring buffer, for frames of type uint8
+        :param frames_per_worker: Number of frames that can be queued for each
+            worker at the same time. The ring buffer holds `workers *
+            frames_per_worker` frames
+        :param max_restarts: Maximum number of times a worker is restarted after it
+            terminates unexpectedly, before the pool gives up
+        :param max_frame_bytes: Optional maximum size of the frames that can be
+            inferred by the pool, in bytes. If specified, this takes precedence over
+            `max_frame_size`, and can be used for frames of other data types
+        """
+        if workers < 1:
+            raise ValueError("A DeploymentPool requires at least one worker.")
+        self.path_to_folder = str(path_to_folder)
+        self.device = device
+        self.workers = workers
+        self.max_restarts = max_restarts
+        if max_frame_bytes is None:
+            max_frame_bytes = int(np.prod(max_frame_size))
+        self._slot_size = max_frame_bytes
+        self._num_slots = workers * frames_per_worker
+
+        self._context = multiprocessing.get_context("spawn")
+        self._shared_memory = SharedMemory(
+            create=True, size=self._slot_size * self._num_slots
+        )
+        self._free_slots: Deque[int] = deque(range(self._num_slots))
+        self._result_queue = self._context.Queue()
+        self._processes: List[Optional[multiprocessing.Process]] = [None] * workers
+        self._task_queues: List[Optional[multiprocessing.Queue]] = [None] * workers
+        # Tasks that are assigned to each worker but not completed yet, keyed by frame
+        self._pending_tasks: List[Dict[int, Tuple[int, Tuple[int, ...], str]]] = [
+            {} for _ in range(workers)
+        ]
+        self._completed: Dict[int, Prediction] = {}
+        self._errors: Dict[int, str] = {}
+        self._next_frame_index = 0
+        self._restart_count = 0
+        self._is_closed = False
+
+        for worker_index in range(workers):
+            self._start_worker(worker_index)
+        self._await_workers_ready(list(range(workers)))
+        logging.info(
+            f"DeploymentPool with {workers} workers started for deployment at "
+            f"`{self.path_to_folder}`."
+        )
+
+    def __enter__(self) -> "DeploymentPool":
+        """
+        Enter the context of the DeploymentPool.
+        """
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        """
+        Shut down the DeploymentPool when exiting its context.
+        """
+        self.close()
+
+    def _start_worker(self, worker_index: int) -> None:
+        """
+        Start the worker process with index `worker_index`.
+
+        :param worker_index: Index of the worker to start
+        """
+        task_queue = self._context.Queue()
+        process = self._context.Process(
+            target=_pool_worker,
+            kwargs={
+                "worker_index": worker_index,
+                "path_to_folder": self.path_to_folder,
+                "device": self.device,
+                "shared_memory_name": self._shared_memory.name,
+                "slot_size": self._slot_size,
+                "task_queue": task_queue,
+                "result_queue": self._result_queue,
+            },
+            daemon=True,
+        )
+        process.start()
+        self._processes[worker_index] = process
+        self._task_queues[worker_index] = task_queue
+
+    def _await_workers_ready(self, worker_indices: List[int]) -> None:
+        """
+        Wait until the workers with the specified indices have loaded their models.
+
+        :param worker_indices: Indices of the workers to wait for
+        """
+        waiting_for = set(worker_indices)
+        t_start = time.time()
+        while waiting_for:
+            if time.time() - t_start > WORKER_STARTUP_TIMEOUT:
+                self.close()
+                raise RuntimeError(
+                    f"Timeout while waiting for DeploymentPool workers "
+                    f"{sorted(waiting_for)} to start."
+                )
+            for worker_index in waiting_for:
+                if not self._processes[worker_index].is_alive():
+                    self.close()
+                    raise RuntimeError(
+                        f"DeploymentPool worker {worker_index} terminated during "
+                        f"startup, unable to load deployment from "
+                        f"`{self.path_to_folder}`."
+                    )
+            try:
+                message = self._result_queue.get(timeout=RESULT_POLL_INTERVAL)
+            except queue.Empty:
+                continue
+            self._handle_message(message)
+            if message[0] == _READY:
+                waiting_for.discard(message[1])
+
+    def _handle_message(self, message: Tuple[str, int, Optional[int], Any]) -> None:
+        """
+        Process a message received from one of the workers.
+
+        :param message: Tuple containing the message type, worker index, frame index
+            and payload
+        """
+        message_type, worker_index, frame_index, payload = message
+        if message_type == _READY:
+            return
+        task = self._pending_tasks[worker_index].pop(frame_index, None)
+        if task is None:
+            # Duplicate result for a frame that was resubmitted after a worker
+            # restart, the frame is already completed
+            return
+        self._free_slots.append(task[0])
+        if message_type == _RESULT:
+            self._completed[frame_index] = payload
+        else:
+            self._errors[frame_index] = payload
+
+    def _check_worker_health(self) -> None:
+        """
+        Check that all workers are alive. Workers that have terminated unexpectedly
+        are restarted, and the frames that were assigned to them are resubmitted.
+        """
+        for worker_index, process in enumerate(self._processes):
+            if process.is_alive():
+                continue
+            if self._restart_count >= self.max_restarts:
+                self.close()
+                raise RuntimeError(
+                    f"DeploymentPool worker {worker_index} terminated with exit code "
+                    f"{process.exitcode}, and the maximum number of worker restarts "
+                    f"({self.max_restarts}) was reached."
+                )
+            logging.warning(
+                f"DeploymentPool worker {worker_index} terminated unexpectedly with "
+                f"exit code {process.exitcode}. Restarting worker."
+            )
+            self._restart_count += 1
+            self._task_queues[worker_index].close()
+            self._start_worker(worker_index)
+            self._await_workers_ready([worker_index])
+            for frame_index, task in self._pending_tasks[worker_index].items():
+                self._task_queues[worker_index].put((frame_index, *task))
+
+    def _wait_for_result(self) -> None:
+        """
+        Block until at least one result is received from the workers, while
+        monitoring the health of the workers.
+        """
+        while True:
+            try:
+                message = self._result_queue.get(timeout=RESULT_POLL_INTERVAL)
+            except queue.Empty:
+                self._check_worker_health()
+                continue
+            self._handle_message(message)
+            if message[0] != _READY:
+                return
+
+    def _submit(self, image: np.ndarray) -> int:
+        """
+        Copy an image into a free slot of the ring buffer, and assign it to the
+        worker with the fewest pending frames. Blocks until a slot is available.
+
+        :param image: Image to submit for inference
+        :return: Index of the submitted frame
+        """
+        if self._is_closed:
+            raise ValueError("Unable to submit frame, the DeploymentPool is closed.")
+        if image.nbytes > self._slot_size:
+            raise ValueError(
+                f"Image of shape {image.shape} and type {image.dtype} exceeds the "
+                f"maximum frame size for the DeploymentPool. Please increase "
+                f"`max_frame_size` when creating the pool."
+            )
+        while not self._free_slots:
+            self._wait_for_result()
+        slot = self._free_slots.popleft()
+        frame = np.ndarray(
+            image.shape,
+            dtype=image.dtype,
+            buffer=self._shared_memory.buf,
+            offset=slot * self._slot_size,
+        )
+        frame[:] = image
+        del frame
+
+        frame_index = self._next_frame_index
+        self._next_frame_index += 1
+        worker_index = min(
+            range(self.workers), key=lambda index: len(self._pending_tasks[index])
+        )
+        task = (slot, image.shape, image.dtype.str)
+        self._pending_tasks[worker_index][frame_index] = task
+        self._task_queues[worker_index].put((frame_index, *task))
+        return frame_index
+
+    def _get_result(self, frame_index: int) -> Prediction:
+        """
+        Block until the prediction for the frame with index `frame_index` is
+        available, and return it.
+
+        :param frame_index: Index of the frame to get the prediction for
+        :return: Prediction for the frame
+        """
+        while frame_index not in self._completed and frame_index not in self._errors:
+            self._wait_for_result()
+        if frame_index in self._errors:
+            raise RuntimeError(
+                f"Inference failed for frame {frame_index} in DeploymentPool worker, "
+                f"with error: {self._errors.pop(frame_index)}"
+            )
+        return self._completed.pop(frame_index)
+
+    def infer(self, image: np.ndarray) -> Prediction:
+        """
+        Run inference on a single image in one of the worker processes.
+
+        :param image: Image to run inference on, as a numpy array containing the pixel
+            data. The image is expected to have dimensions [height x width x channels],
+            with the channels in RGB order
+        :return: Inference result
+        """
+        return self._get_result(self._submit(image))
+
+    def imap(self, images: Iterable[np.ndarray]) -> Iterator[Prediction]:
+        """
+        Run inference on a stream of images, distributing them over the worker
+        processes. The predictions are yielded in the same order as the images.
+
+        The number of frames in flight is bounded by the size of the ring buffer, so
+        this method can be used on arbitrarily long streams of frames.
+
+        :param images: Iterable of images to run inference on
+        :return: Iterator yielding the prediction for each image, in order
+        """
+        in_flight: Deque[int] = deque()
+        for image in images:
+            if len(in_flight) == self._num_slots:
+                yield self._get_result(in_flight.popleft())
+            in_flight.append(self._submit(image))
+        while in_flight:
+            yield self._get_result(in_flight.popleft())
+
+    def infer_batch(self, images: Iterable[np.ndarray]) -> List[Prediction]:
+        """
+        Run inference on a list of images, distributing them over the worker
+        processes.
+
+        :param images: List of images to run inference on
+        :return: List of predictions, in the same order as the images
+        """
+        return list(self.imap(images))
+
+    def close(self) -> None:
+        """
+        Stop all worker processes and release the shared memory.
+        """
+        if self._is_closed:
+            return
+        self._is_closed = True
+        for task_queue in self._task_queues:
+            if task_queue is not None:
+                task_queue.put(None)
+        for process in self._processes:
+            if process is None:
+                continue
+            process.join(timeout=10)
+            if process.is_alive():
+                process.terminate()
+        self._shared_memory.close()
+        self._shared_memory.unlink()
+
+    def __del__(self):
+        """
+        Shut down the worker processes when the DeploymentPool is deleted.
+        """
+        if hasattr(self, "_is_closed"):
+            self.close()
@@ -0,0 +1,308 @@
+# Copyright (C) 2023 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions
+# and limitations under the License.
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Union
+
+import numpy as np
+
+from geti_sdk.data_models import Prediction
+
+from .deployment import Deployment
+
+
+class ModelRegistry:
+    """
+    Registry that serves the deployments for multiple projects from a single
+    process.
+
+    Deployments are registered by name and loaded lazily, the first time they are
+    requested. All inference models are compiled with a single, shared OpenVINO
+    Core. When the loaded deployments exceed the memory budget of the registry, the
+    least recently used deployments are unloaded.
+    """
+
+    def __init__(
+        self,
+        max_memory_bytes: Optional[int] = None,
+        device: str = "CPU",
+        cache_dir: Optional[Union[str, os.PathLike]] = None,
+        load_kwargs: Optional[Dict[str, Any]] = None,
+    ):
+        """
+        Create a new, empty ModelRegistry.
+
+        :param max_memory_bytes: Maximum amount of memory, in bytes, that the loaded
+            deployments may occupy. The memory footprint of a deployment is
+            estimated from the size of the weights of its models. If left as None,
+            deployments are never unloaded
+        :param device: Device to load the inference models to
+        :param cache_dir: Optional persistent cache directory for the compiled
+            models, which speeds up loading a deployment again after it was unloaded
+        :param load_kwargs: Optional additional keyword arguments to pass to
+            :py:meth:`~geti_sdk.deployment.deployment.Deployment.load_inference_models`
+            when loading a deployment
+        """
+        if max_memory_bytes is not None and max_memory_bytes <= 0:
+            raise ValueError(
+                f"Invalid memory budget {max_memory_bytes}, please specify a positive "
+                f"number of bytes."
+            )
+        self.max_memory_bytes = max_memory_bytes
+        self.device = device
+        self.cache_dir = cache_dir
+        self.load_kwargs = load_kwargs if load_kwargs is not None else {}
+
+        self._deployment_folders: Dict[str, str] = {}
+        self._deployments: "OrderedDict[str, Deployment]" = OrderedDict()
+        self._memory_usage: Dict[str, int] = {}
+        self._load_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self._core: Optional[Any] = None
+
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @property
+    def hits(self) -> int:
+        """
+        Return the number of requests for a deployment that was already loaded.
+        """
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        """
+        Return the number of requests for which a deployment had to be loaded.
+        """
+        return self._misses
+
+    @property
+    def evictions(self) -> int:
+        """
+        Return the number of times a deployment was unloaded to stay within the
+        memory budget.
+        """
+        return self._evictions
+
+    @property
+    def memory_usage(self) -> int:
+        """
+        Return the estimated memory footprint of all loaded deployments, in bytes.
+        """
+        with self._lock:
+            return sum(self._memory_usage.values())
+
+    @property
+    def loaded_deployments(self) -> List[str]:
+        """
+        Return the names of the loaded deployments, from least to most recently
+        used.
+        """
+        with self._lock:
+            return list(self._deployments.keys())
+
+    def register(self, name: str, path_to_folder: Union[str, os.PathLike]) -> None:
+        """
+        Register a deployment in the registry. The deployment is not loaded until
+        it is requested for the first time.
+
+        :param name: Name to register the deployment under
+        :param path_to_folder: Path to the folder containing the deployment
+        """
+        with self._lock:
+            if name in self._deployment_folders:
+                raise ValueError(
+                    f"A deployment named `{name}` is already registered in the "
+                    f"ModelRegistry."
+                )
+            self._deployment_folders[name] = str(path_to_folder)
+            self._load_locks[name] = threading.Lock()
+
+    def unregister(self, name: str) -> None:
+        """
+        Remove a deployment from the registry, unloading it if it is loaded.
+
+        :param name: Name of the deployment to remove
+        """
+        with self._lock:
+            self._check_registered(name)
+            self._deployment_folders.pop(name)
+            self._load_locks.pop(name)
+            self._deployments.pop(name, None)
+            self._memory_usage.pop(name, None)
+
+    def get(self, name: str) -> Deployment:
+        """
+        Return the deployment registered under `name`, loading its inference models
+        if they are not loaded yet.
+
+        :param name: Name of the deployment
+        :return: Deployment with its inference models loaded
+        """
+        with self._lock:
+            self._check_registered(name)
+            load_lock = self._load_locks[name]
+            deployment = self._get_loaded(name)
+            if deployment is not None:
+                return deployment
+
+        # Loading happens outside of the registry lock, so that requests for other
+        # deployments are not blocked while the models are compiled
+        with load_lock:
+            with self._lock:
+                # The deployment may have been loaded by another thread meanwhile
+                deployment = self._get_loaded(name)
+                if deployment is not None:
+                    return deployment
+                self._misses += 1
+                deployment_folder = self._deployment_folders[name]
+            deployment = Deployment.from_folder(deployment_folder)
+            deployment.load_inference_models(
+                device=self.device,
+                cache_dir=self.cache_dir,
+                core=self._get_core(),
+                **self.load_kwargs,
+            )
+            with self._lock:
+                if name in self._deployment_folders:
+                    self._deployments[name] = deployment
+                    self._memory_usage[name] = _estimate_memory_usage(deployment)
+                    self._evict(keep=name)
+        return deployment
+
+    def infer(self, name: str, image: np.ndarray) -> Prediction:
+        """
+        Run inference on an image, using the deployment registered under `name`.
+
+        :param name: Name of the deployment to use
+        :param image: Image to run inference on, as a numpy array containing the pixel
+            data. The image is expected to have dimensions [height x width x channels],
+            with the channels in RGB order
+        :return: inference results
+        """
+        return self.get(name).infer(image)
+
+    def unload(self, name: Optional[str] = None) -> None:
+        """
+        Unload the inference models for a deployment. The deployment remains
+        registered, and is loaded again the next time it is requested.
+
+        :param name: Name of the deployment to unload. If left as None, all
+            deployments are unloaded
+        """
+        with self._lock:
+            if name is None:
+                self._deployments.clear()
+                self._memory_usage.clear()
+                return
+            self._check_registered(name)
+            self._deployments.pop(name, None)
+            self._memory_usage.pop(name, None)
+
+    def _check_registered(self, name: str) -> None:
+        """
+        Raise a KeyError if no deployment is registered under `name`.
+
+        :param name: Name of the deployment
+        """
+        if name not in self._deployment_folders:
+            raise KeyError(f"No deployment named `{name}` found in the ModelRegistry")
+
+    def _get_loaded(self, name: str) -> Optional[Deployment]:
+        """
+        Return the deployment registered under `name` if it is loaded, and mark it
+        as most recently used. Must be called while holding the registry lock.
+
+        :param name: Name of the deployment
+        :return: The loaded deployment, or None if it is not loaded
+        """
+        deployment = self._deployments.get(name)
+        if deployment is not None:
+            self._deployments.move_to_end(name)
+            self._hits += 1
+        return deployment
+
+    def _evict(self, keep: str) -> None:
+        """
+        Unload the least recently used deployments until the loaded deployments fit
+        in the memory budget. Must be called while holding the registry lock.
+
+        Deployments that are still in use by another thread are not interrupted,
+        their memory is released once the last reference to them is dropped.
+
+        :param keep: Name of the deployment that must not be unloaded
+        """
+        if self.max_memory_bytes is None:
+            return
+        for name in list(self._deployments.keys()):
+            if sum(self._memory_usage.values()) <= self.max_memory_bytes:
+                break
+            if name == keep:
+                continue
+            self._deployments.pop(name)
+            self._memory_usage.pop(name)
+            self._evictions += 1
+            logging.debug(f"Unloaded deployment `{name}` from the ModelRegistry")
+        if self._memory_usage[keep] > self.max_memory_bytes:
+            logging.warning(
+                f"Deployment `{keep}` requires an estimated {self._memory_usage[keep]} "
+                f"bytes of memory, which exceeds the memory budget of the "
+                f"ModelRegistry ({self.max_memory_bytes} bytes)."
+            )
+
+    def _get_core(self) -> Any:
+        """
+        Return the OpenVINO Core shared by all models in the registry, creating it
+        if needed.
+        """
+        with self._lock:
+            if self._core is None:
+                from openvino.model_api.adapters import create_core
+
+                self._core = create_core()
+            return self._core
+
+    def __contains__(self, name: str) -> bool:
+        """
+        Return True if a deployment is registered under `name`.
+        """
+        return name in self._deployment_folders
+
+    def __len__(self) -> int:
+        """
+        Return the number of deployments registered in the registry.
+        """
+        return len(self._deployment_folders)
+
+
+def _estimate_memory_usage(deployment: Deployment) -> int:
+    """
+    Estimate the memory footprint of a loaded deployment, from the size of the
+    weights of its models.
+
+    :param deployment: Deployment to estimate the memory footprint for
+    :return: Estimated memory footprint, in bytes
+    """
+    memory_usage = 0
+    for model in deployment.models:
+        if model._model_data_path is None:
+            continue
+        weights_path = os.path.join(model._model_data_path, "model.bin")
+        if os.path.isfile(weights_path):
+            memory_usage += os.path.getsize(weights_path)
+    return memory_usage
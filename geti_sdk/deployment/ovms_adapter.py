@@ -0,0 +1,210 @@
+# Copyright (C) 2023 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions
+# and limitations under the License.
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+import numpy as np
+from openvino.model_api.adapters.ovms_adapter import OVMSAdapter, _parse_model_arg
+
+# Max time to wait for OVMS models to become available, in seconds
+OVMS_TIMEOUT = 10
+# Initial and maximum delay between two readiness checks for an OVMS model, in
+# seconds. The delay doubles after every failed check
+OVMS_INITIAL_BACKOFF = 0.05
+OVMS_MAX_BACKOFF = 2.0
+# Number of requests in flight per model if no number is specified
+DEFAULT_OVMS_ASYNC_REQUESTS = 4
+
+_grpc_clients: Dict[str, Any] = {}
+_grpc_clients_lock = threading.Lock()
+
+
+def get_grpc_client(service_url: str) -> Any:
+    """
+    Return a gRPC client for the OpenVINO Model Server at `service_url`. Clients are
+    cached, so all models served by the same OVMS instance share a single gRPC
+    channel.
+
+    :param service_url: Address and port of the OVMS instance
+    :return: ovmsclient gRPC client for the OVMS instance
+    """
+    with _grpc_clients_lock:
+        client = _grpc_clients.get(service_url)
+        if client is None:
+            import ovmsclient
+
+            client = ovmsclient.make_grpc_client(url=service_url)
+            _grpc_clients[service_url] = client
+        return client
+
+
+def wait_for_model_available(
+    client: Any,
+    model_name: str,
+    model_version: int = 0,
+    timeout: float = OVMS_TIMEOUT,
+) -> None:
+    """
+    Wait until a model is available on the OpenVINO Model Server. The model status
+    is polled with an exponentially increasing delay, starting at
+    `OVMS_INITIAL_BACKOFF` seconds.
+
+    :param client: ovmsclient client connected to the OVMS instance
+    :param model_name: Name of the model
+    :param model_version: Version of the model, 0 for the latest version
+    :param timeout: Maximum time to wait, in seconds
+    :raises: RuntimeError if the model does not become available within `timeout`
+        seconds
+    """
+    deadline = time.monotonic() + timeout
+    delay = OVMS_INITIAL_BACKOFF
+    while True:
+        try:
+            model_status = client.get_model_status(
+                model_name=model_name, model_version=model_version
+            )
+            version_status = model_status[max(model_status.keys())]
+            if version_status["state"] == "AVAILABLE":
+                return
+            error: Exception = RuntimeError(
+                f"Model `{model_name}` is in state `{version_status['state']}`"
+            )
+        except Exception as status_error:
+            # OVMS may still be starting up, or loading the model
+            error = status_error
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise RuntimeError(
+                f"Unable to connect to OVMS: model `{model_name}` did not become "
+                f"available within {timeout} seconds."
+            ) from error
+        time.sleep(min(delay, remaining))
+        delay = min(delay * 2, OVMS_MAX_BACKOFF)
+
+
+class AsyncOVMSAdapter(OVMSAdapter):
+    """
+    Adapter for models served by the OpenVINO Model Server, which keeps multiple
+    infer requests in flight at the same time.
+
+    The OVMSAdapter from the OpenVINO model API blocks on every request, even for
+    asynchronous inference. This adapter runs the requests in a pool of worker
+    threads instead, and reuses a single gRPC channel for all models served by the
+    same OVMS instance.
+    """
+
+    def __init__(
+        self,
+        target_model: str,
+        max_num_requests: int = 1,
+        timeout: float = OVMS_TIMEOUT,
+        client: Optional[Any] = None,
+    ):
+        """
+        Connect to a model on the OpenVINO Model Server, waiting for it to become
+        available if needed.
+
+        :param target_model: Address of the model, in the format
+            `<address>:<port>/models/<model_name>[:<model_version>]`
+        :param max_num_requests: Maximum number of requests in flight at the same
+            time. Set to 0 to use `DEFAULT_OVMS_ASYNC_REQUESTS`
+        :param timeout: Maximum time to wait for the model to become available, in
+            seconds
+        :param client: Optional ovmsclient client to use. If left as None, the
+            shared gRPC client for the OVMS instance is used
+        """
+        service_url, self.model_name, self.model_version = _parse_model_arg(
+            target_model
+        )
+        self.client = client if client is not None else get_grpc_client(service_url)
+        wait_for_model_available(
+            self.client, self.model_name, self.model_version, timeout=timeout
+        )
+        self.metadata = self.client.get_model_metadata(
+            model_name=self.model_name, model_version=self.model_version
+        )
+        self.max_num_requests = (
+            max_num_requests if max_num_requests > 0 else DEFAULT_OVMS_ASYNC_REQUESTS
+        )
+        self.callback_fn: Optional[Callable[[Any, Any], None]] = None
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_num_requests, thread_name_prefix="GetiSDK-OVMS"
+        )
+        self._request_slots = threading.BoundedSemaphore(self.max_num_requests)
+        self._n_in_flight = 0
+        self._idle = threading.Condition()
+
+    def infer_async(self, dict_data: Dict[str, np.ndarray], callback_data: Any):
+        """
+        Submit an infer request to OVMS and return immediately. Blocks while the
+        maximum number of requests is in flight.
+
+        When the request completes, the callback is called with a dictionary
+        holding the model outputs, or with the exception raised by the request if
+        it failed.
+
+        :param dict_data: Dictionary holding the model inputs
+        :param callback_data: Data to pass to the callback
+        """
+        self._request_slots.acquire()
+        with self._idle:
+            self._n_in_flight += 1
+        self._executor.submit(self._run_request, dict_data, callback_data)
+
+    def _run_request(self, dict_data: Dict[str, np.ndarray], callback_data: Any):
+        """
+        Run an infer request in a worker thread, and pass the result to the
+        callback.
+
+        :param dict_data: Dictionary holding the model inputs
+        :param callback_data: Data to pass to the callback
+        """
+        try:
+            try:
+                result: Any = self.infer_sync(dict_data)
+            except Exception as error:
+                result = error
+            try:
+                self.callback_fn(result, (lambda x: x, callback_data))
+            except Exception:
+                logging.exception("Error in OVMS inference callback")
+        finally:
+            with self._idle:
+                self._n_in_flight -= 1
+                self._idle.notify_all()
+            self._request_slots.release()
+
+    def is_ready(self) -> bool:
+        """
+        Return True if a new request can be submitted without blocking.
+        """
+        with self._idle:
+            return self._n_in_flight < self.max_num_requests
+
+    def await_all(self) -> None:
+        """
+        Block until all requests in flight are completed.
+        """
+        with self._idle:
+            self._idle.wait_for(lambda: self._n_in_flight == 0)
+
+    def await_any(self) -> None:
+        """
+        Block until a new request can be submitted.
+        """
+        with self._idle:
+            self._idle.wait_for(lambda: self._n_in_flight < self.max_num_requests)
@@ -0,0 +1,232 @@
+# Copyright (C) 2023 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions
+# and limitations under the License.
+import copy
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+import cv2
+import numpy as np
+
+from geti_sdk.data_models import Prediction
+
+EXACT_HASH = "exact"
+PERCEPTUAL_HASH = "perceptual"
+HASH_METHODS = (EXACT_HASH, PERCEPTUAL_HASH)
+
+# Images are subsampled to at most this many pixels along each side before the
+# perceptual hash is computed, which is sufficient for a hash of a few bytes
+_MAX_PERCEPTUAL_HASH_INPUT_SIZE = 256
+# Minimum intensity difference between neighbouring pixels of the downscaled image
+# for the perceptual hash to register a gradient. Without it, noise flips the bits
+# for flat image regions
+_DIFFERENCE_HASH_TOLERANCE = 1.0
+
+
+class PredictionCache:
+    """
+    Cache for the predictions of a Deployment, keyed by a hash of the input image.
+
+    With the `exact` hash method, only byte-identical images share a cache entry.
+    The `perceptual` hash method computes a difference hash of a small grayscale
+    version of the image, so that near-identical images (for example consecutive
+    frames from a static camera, or images that were re-encoded) share a cache
+    entry as well. Note that with the perceptual hash, images that differ in small
+    details may also map to the same entry.
+
+    The cache holds at most `max_size` predictions, the least recently used
+    prediction is evicted when the cache is full. Predictions that are older than
+    `ttl` seconds are not returned from the cache.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 128,
+        ttl: Optional[float] = None,
+        hash_method: str = EXACT_HASH,
+        hash_size: int = 16,
+    ):
+        """
+        Create a new, empty PredictionCache.
+
+        :param max_size: Maximum number of predictions to keep in the cache
+        :param ttl: Optional time to live of a cached prediction, in seconds. If left
+            as None, predictions are kept until they are evicted
+        :param hash_method: Method to compute the cache key for an image, either
+            'exact' or 'perceptual'
+        :param hash_size: Size of the downscaled image that the perceptual hash is
+            computed for. A larger size distinguishes smaller differences between
+            images. Only used for the 'perceptual' hash method
+        """
+        if max_size < 1:
+            raise ValueError(
+                f"Invalid cache size {max_size}, please specify a positive integer."
+            )
+        if ttl is not None and ttl <= 0:
+            raise ValueError(
+                f"Invalid time to live {ttl}, please specify a positive number of "
+                f"seconds."
+            )
+        if hash_method not in HASH_METHODS:
+            raise ValueError(
+                f"Invalid hash method `{hash_method}`, supported methods are "
+                f"{list(HASH_METHODS)}."
+            )
+        if hash_size < 2:
+            raise ValueError(
+                f"Invalid hash size {hash_size}, please specify an integer of at "
+                f"least 2."
+            )
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hash_method = hash_method
+        self.hash_size = hash_size
+
+        self._entries: "OrderedDict[str, Tuple[float, Prediction]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @property
+    def hits(self) -> int:
+        """
+        Return the number of lookups for which a cached prediction was returned.
+        """
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        """
+        Return the number of lookups for which no valid cached prediction was found.
+        """
+        return self._misses
+
+    @property
+    def evictions(self) -> int:
+        """
+        Return the number of predictions that were removed to stay within the
+        maximum size of the cache.
+        """
+        return self._evictions
+
+    @property
+    def hit_rate(self) -> float:
+        """
+        Return the fraction of lookups for which a cached prediction was returned.
+        """
+        lookups = self._hits + self._misses
+        return self._hits / lookups if lookups > 0 else 0.0
+
+    def compute_key(self, image: np.ndarray) -> str:
+        """
+        Compute the cache key for an image.
+
+        :param image: Image to compute the key for, as a numpy array containing the
+            pixel data
+        :return: String holding the cache key
+        """
+        shape = "x".join(str(size) for size in image.shape)
+        if self.hash_method == EXACT_HASH:
+            digest = hashlib.sha256(np.ascontiguousarray(image).data).hexdigest()
+            return f"{shape}-{image.dtype}-{digest}"
+        return f"{shape}-{self._difference_hash(image)}"
+
+    def get(self, key: str) -> Optional[Prediction]:
+        """
+        Return a copy of the prediction cached under `key`, and mark it as most
+        recently used.
+
+        :param key: Cache key, as computed by :py:meth:`compute_key`
+        :return: Copy of the cached prediction, or None if no valid prediction is
+            cached for the key
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._is_expired(entry[0]):
+                self._entries.pop(key)
+                entry = None
+            if entry is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            prediction = entry[1]
+        return copy.deepcopy(prediction)
+
+    def put(self, key: str, prediction: Prediction) -> None:
+        """
+        Store a copy of a prediction in the cache, evicting the least recently used
+        prediction if the cache is full.
+
+        :param key: Cache key, as computed by :py:meth:`compute_key`
+        :param prediction: Prediction to cache
+        """
+        prediction = copy.deepcopy(prediction)
+        with self._lock:
+            self._entries[key] = (time.monotonic(), prediction)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def clear(self) -> None:
+        """
+        Remove all predictions from the cache.
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def _is_expired(self, creation_time: float) -> bool:
+        """
+        Return True if a cache entry created at `creation_time` has expired.
+
+        :param creation_time: Time at which the entry was created, as returned by
+            `time.monotonic`
+        """
+        return self.ttl is not None and time.monotonic() - creation_time > self.ttl
+
+    def _difference_hash(self, image: np.ndarray) -> str:
+        """
+        Compute the difference hash of an image: the positive horizontal gradients
+        in a grayscale version of the image, downscaled to `hash_size` x
+        `hash_size + 1` pixels.
+
+        :param image: Image to compute the hash for
+        :return: String holding the hash, in hexadecimal format
+        """
+        height, width = image.shape[:2]
+        step = max(1, min(height, width) // _MAX_PERCEPTUAL_HASH_INPUT_SIZE)
+        image = image[::step, ::step].astype(np.float32)
+        if image.ndim == 3 and image.shape[2] == 3:
+            image = cv2.cvtColor(image, cv2.COLOR_RGB2GRAY)
+        elif image.ndim == 3:
+            image = image[..., 0]
+        thumbnail = cv2.resize(
+            image,
+            (self.hash_size + 1, self.hash_size),
+            interpolation=cv2.INTER_AREA,
+        )
+        gradients = thumbnail[:, 1:] - thumbnail[:, :-1]
+        return np.packbits(gradients > _DIFFERENCE_HASH_TOLERANCE).tobytes().hex()
+
+    def __len__(self) -> int:
+        """
+        Return the number of predictions in the cache, including expired
+        predictions that have not been removed yet.
+        """
+        return len(self._entries)
@@ -0,0 +1,635 @@
+# Copyright (C) 2023 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions
+# and limitations under the License.
+import abc
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+from otx.api.entities.label import LabelEntity
+from otx.api.entities.label_schema import LabelSchemaEntity
+
+from geti_sdk.data_models import Annotation, Prediction, ScoredLabel, TaskType
+from geti_sdk.data_models.enums import ShapeType
+from geti_sdk.data_models.shapes import Ellipse, Point, Polygon, Rectangle
+
+from .data_models import PredictionArray
+
+
+class PredictionConverter(metaclass=abc.ABCMeta):
+    """
+    Convert the postprocessed outputs of a model directly to a Prediction.
+
+    The converters produce the same predictions as the prediction converters from
+    OTX followed by `Prediction.from_ote`, but without creating the intermediate
+    OTX annotation entities.
+    """
+
+    def __init__(self, labels: Sequence[LabelEntity]):
+        """
+        Initialize the converter.
+
+        :param labels: OTX labels that the model can predict, in the order of the
+            label indices in the model output
+        """
+        self._labels: List[Tuple[str, str, str]] = [
+            (label.name, str(label.id), label.color.hex_str) for label in labels
+        ]
+
+    def _scored_label(self, label_index: int, probability: float) -> ScoredLabel:
+        """
+        Create a ScoredLabel for the label with index `label_index`.
+
+        :param label_index: Index of the label
+        :param probability: Probability to assign to the label
+        :return: ScoredLabel for the label
+        """
+        name, label_id, color = self._labels[label_index]
+        return ScoredLabel(name=name, id=label_id, color=color, probability=probability)
+
+    @abc.abstractmethod
+    def convert(
+        self,
+        postprocessing_results: Any,
+        metadata: Dict[str, Any],
+        image_width: int,
+        image_height: int,
+    ) -> Prediction:
+        """
+        Convert the postprocessed model outputs for an image to a Prediction.
+
+        :param postprocessing_results: Output of the postprocessing step of the model
+        :param metadata: Dictionary containing the metadata generated during
+            preprocessing of the image
+        :param image_width: Width of the image, in pixels
+        :param image_height: Height of the image, in pixels
+        :return: Prediction for the image
+        """
+        raise NotImplementedError
+
+    def convert_to_array(
+        self,
+        postprocessing_results: Any,
+        metadata: Dict[str, Any],
+        image_width: int,
+        image_height: int,
+    ) -> PredictionArray:
+        """
+        Convert the postprocessed model outputs for an image to a PredictionArray.
+
+        :param postprocessing_results: Output of the postprocessing step of the model
+        :param metadata: Dictionary containing the metadata generated during
+            preprocessing of the image
+        :param image_width: Width of the image, in pixels
+        :param image_height: Height of the image, in pixels
+        :return: PredictionArray for the image
+        """
+        return PredictionArray.from_prediction(
+            self.convert(
+                postprocessing_results,
+                metadata=metadata,
+                image_width=image_width,
+                image_height=image_height,
+            )
+        )
+
+
+class DetectionConverter(PredictionConverter):
+    """
+    Convert the outputs of a detection model to a Prediction with a Rectangle or
+    Ellipse for each detected object.
+    """
+
+    def __init__(
+        self,
+        labels: Sequence[LabelEntity],
+        use_ellipse_shapes: bool = False,
+        confidence_threshold: float = 0.0,
+    ):
+        """
+        Initialize the converter.
+
+        :param labels: OTX labels that the model can predict
+        :param use_ellipse_shapes: True to represent the detected objects as
+            ellipses instead of rectangles
+        :param confidence_threshold: Objects with a score below this threshold are
+            discarded
+        """
+        super().__init__(labels)
+        self.use_ellipse_shapes = use_ellipse_shapes
+        self.confidence_threshold = confidence_threshold
+
+    def convert(
+        self,
+        postprocessing_results: Any,
+        metadata: Dict[str, Any],
+        image_width: int,
+        image_height: int,
+    ) -> Prediction:
+        """
+        Convert the postprocessed model outputs for an image to a Prediction.
+
+        :param postprocessing_results: Output of the postprocessing step of the
+            model. Either a result holding a list of `Detection` objects, or an
+            array of shape [n, 6] or [n, 7] holding the label index, score and box
+            coordinates for each object
+        :param metadata: Dictionary containing the metadata generated during
+            preprocessing of the image
+        :param image_width: Width of the image, in pixels
+        :param image_height: Height of the image, in pixels
+        :return: Prediction for the image
+        """
+        boxes, label_indices, scores = self._get_boxes(
+            postprocessing_results, metadata, image_width, image_height
+        )
+        annotations: List[Annotation] = []
+        for (x, y, width, height), label_index, score in zip(
+            boxes.tolist(), label_indices.tolist(), scores.tolist()
+        ):
+            if self.use_ellipse_shapes:
+                shape = Ellipse(
+                    x=int(x), y=int(y), width=int(width), height=int(height)
+                )
+            else:
+                shape = Rectangle(x=x, y=y, width=width, height=height)
+            annotations.append(
+                Annotation(shape=shape, labels=[self._scored_label(label_index, score)])
+            )
+        return Prediction(annotations=annotations)
+
+    def convert_to_array(
+        self,
+        postprocessing_results: Any,
+        metadata: Dict[str, Any],
+        image_width: int,
+        image_height: int,
+    ) -> PredictionArray:
+        """
+        Convert the postprocessed model outputs for an image to a PredictionArray,
+        without creating an Annotation for each detected object.
+
+        :param postprocessing_results: Output of the postprocessing step of the
+            model, see :py:meth:`convert`
+        :param metadata: Dictionary containing the metadata generated during
+            preprocessing of the image
+        :param image_width: Width of the image, in pixels
+        :param image_height: Height of the image, in pixels
+        :return: PredictionArray for the image
+        """
+        boxes, label_indices, scores = self._get_boxes(
+            postprocessing_results, metadata, image_width, image_height
+        )
+        # Round the coordinates in the same way as the shapes in `convert` do
+        if self.use_ellipse_shapes:
+            boxes = np.trunc(boxes)
+        return PredictionArray.from_boxes(
+            boxes=np.round(boxes),
+            label_indices=label_indices,
+            scores=scores,
+            labels=self._labels,
+            shape_type=ShapeType.ELLIPSE
+            if self.use_ellipse_shapes
+            else ShapeType.RECTANGLE,
+        )
+
+    def _get_boxes(
+        self,
+        postprocessing_results: Any,
+        metadata: Dict[str, Any],
+        image_width: int,
+        image_height: int,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Return the boxes, label indices and scores of the detected objects that pass
+        the confidence threshold. Objects with a non-positive width or height are
+        discarded.
+
+        :param postprocessing_results: Output of the postprocessing step of the
+            model, see :py:meth:`convert`
+        :param metadata: Dictionary containing the metadata generated during
+            preprocessing of the image
+        :param image_width: Width of the image, in pixels
+        :param image_height: Height of the image, in pixels
+        :return: Tuple containing:
+            - Array of shape [n, 4] holding the x, y, width and height of each object,
+              in pixels of the image
+            - Array of shape [n] holding the label index of each object
+            - Array of shape [n] holding the score of each object
+        """
+        if hasattr(postprocessing_results, "objects"):
+            detections = _detections_to_array(postprocessing_results.objects)
+        else:
+            detections = np.asarray(postprocessing_results)
+            if detections.ndim == 2 and detections.shape[1] == 7:
+                detections = detections[:, 1:]
+        if len(detections) == 0:
+            return np.empty((0, 4)), np.empty(0, dtype=int), np.empty(0)
+        if detections.ndim != 2 or detections.shape[1] != 6:
+            raise ValueError(
+                f"Unexpected shape {detections.shape} of the detection model output, "
+                f"expected (n, 6) or (n, 7)."
+            )
+        detections = detections[detections[:, 1] >= self.confidence_threshold]
+
+        # The coordinates are normalized and scaled back to the image size with the
+        # same precision as in the OTX conversion, to obtain identical shapes
+        original_height, original_width = metadata["original_shape"][0:2]
+        boxes = (
+            detections[:, 2:].astype(np.float64)
+            / np.tile([original_width, original_height], 2)
+        ).astype(detections.dtype)
+        widths = (boxes[:, 2] - boxes[:, 0]).astype(np.float64) * image_width
+        heights = (boxes[:, 3] - boxes[:, 1]).astype(np.float64) * image_height
+        boxes = boxes.astype(np.float64)
+        boxes = np.stack(
+            [boxes[:, 0] * image_width, boxes[:, 1] * image_height, widths, heights],
+            axis=1,
+        )
+        is_valid = (widths > 0) & (heights > 0)
+        return (
+            boxes[is_valid],
+            detections[is_valid, 0].astype(int),
+            detections[is_valid, 1].astype(np.float64),
+        )
+
+
+class InstanceSegmentationConverter(PredictionConverter):
+    """
+    Convert the outputs of an instance segmentation or rotated detection model to
+    a Prediction with a Polygon for each detected object.
+    """
+
+    def __init__(
+        self,
+        labels: Sequence[LabelEntity],
+        use_ellipse_shapes: bool = False,
+        confidence_threshold: float = 0.0,
+        rotated_rectangles: bool = False,
+    ):
+        """
+        Initialize the converter.
+
+        :param labels: OTX labels that the model can predict
+        :param use_ellipse_shapes: True to represent the detected objects as
+            ellipses instead of polygons
+        :param confidence_threshold: Objects with a score below this threshold are
+            discarded
+        :param rotated_rectangles: True to represent each object by the minimum
+            area rectangle around its contour, as done for rotated detection models
+        """
+        super().__init__(labels)
+        self.use_ellipse_shapes = use_ellipse_shapes
+        self.confidence_threshold = confidence_threshold
+        self.rotated_rectangles = rotated_rectangles
+
+    def convert(
+        self,
+        postprocessing_results: Any,
+        metadata: Dict[str, Any],
+        image_width: int,
+        image_height: int,
+    ) -> Prediction:
+        """
+        Convert the postprocessed model outputs for an image to a Prediction.
+
+        :param postprocessing_results: Output of the postprocessing step of the
+            model. Either a tuple of (scores, label indices, boxes, masks) or a list
+            of `SegmentedObject`s. Label indices start at 1
+        :param metadata: Dictionary containing the metadata generated during
+            preprocessing of the image
+        :param image_width: Width of the image, in pixels
+        :param image_height: Height of the image, in pixels
+        :return: Prediction for the image
+        """
+        if hasattr(postprocessing_results, "segmentedObjects"):
+            postprocessing_results = postprocessing_results.segmentedObjects
+        if isinstance(postprocessing_results, list):
+            objects = [
+                (obj.score, obj.id, (obj.xmin, obj.ymin, obj.xmax, obj.ymax), obj.mask)
+                for obj in postprocessing_results
+            ]
+        else:
+            objects = zip(*postprocessing_results)
+        height, width = metadata["original_shape"][0:2]
+
+        annotations: List[Annotation] = []
+        for score, class_index, box, mask in objects:
+            if score < self.confidence_threshold:
+                continue
+            label_index, score = int(class_index) - 1, float(score)
+            if self.use_ellipse_shapes:
+                x_min, x_max = box[0] / width, box[2] / width
+                y_min, y_max = box[1] / height, box[3] / height
+                shape = Ellipse(
+                    x=int(x_min * image_width),
+                    y=int(y_min * image_height),
+                    width=int((x_max - x_min) * image_width),
+                    height=int((y_max - y_min) * image_height),
+                )
+                annotations.append(
+                    Annotation(
+                        shape=shape, labels=[self._scored_label(label_index, score)]
+                    )
+                )
+                continue
+            contours, hierarchies = cv2.findContours(
+                mask.astype(np.uint8), cv2.RETR_CCOMP, cv2.CHAIN_APPROX_SIMPLE
+            )
+            if hierarchies is None:
+                continue
+            for contour, hierarchy in zip(contours, hierarchies[0]):
+                # Skip holes and degenerate contours
+                if hierarchy[3] != -1:
+                    continue
+                if len(contour) <= 2 or cv2.contourArea(contour) < 1.0:
+                    continue
+                if self.rotated_rectangles:
+                    points = cv2.boxPoints(cv2.minAreaRect(contour))
+                else:
+                    points = contour[:, 0, :]
+                points = points.astype(np.float64)
+                x_coordinates = (points[:, 0] / width * image_width).astype(int)
+                y_coordinates = (points[:, 1] / height * image_height).astype(int)
+                shape = Polygon(
+                    points=[
+                        Point(x=x, y=y)
+                        for x, y in zip(x_coordinates.tolist(), y_coordinates.tolist())
+                    ]
+                )
+                annotations.append(
+                    Annotation(
+                        shape=shape, labels=[self._scored_label(label_index, score)]
+                    )
+                )
+        return Prediction(annotations=annotations)
+
+
+class ClassificationConverter(PredictionConverter):
+    """
+    Convert the outputs of a (multi-class or multi-label) classification model to
+    a Prediction with a single full-image annotation.
+    """
+
+    def __init__(
+        self, labels: Sequence[LabelEntity], empty_label: Optional[LabelEntity] = None
+    ):
+        """
+        Initialize the converter.
+
+        :param labels: OTX labels that the model can predict
+        :param empty_label: Optional empty label, which is assigned to the image if
+            the model does not predict any of the `labels`
+        """
+        super().__init__(labels)
+        self._empty_label_index: Optional[int] = None
+        if empty_label is not None:
+            self._empty_label_index = len(self._labels)
+            self._labels.append(
+                (empty_label.name, str(empty_label.id), empty_label.color.hex_str)
+            )
+
+    def convert(
+        self,
+        postprocessing_results: Any,
+        metadata: Dict[str, Any],
+        image_width: int,
+        image_height: int,
+    ) -> Prediction:
+        """
+        Convert the postprocessed model outputs for an image to a Prediction.
+
+        :param postprocessing_results: Output of the postprocessing step of the
+            model, as a list of (label index, score) tuples
+        :param metadata: Dictionary containing the metadata generated during
+            preprocessing of the image
+        :param image_width: Width of the image, in pixels
+        :param image_height: Height of the image, in pixels
+        :return: Prediction for the image
+        """
+        labels = [
+            self._scored_label(index, float(score))
+            for index, score in postprocessing_results
+        ]
+        if not labels and self._empty_label_index is not None:
+            labels = [self._scored_label(self._empty_label_index, 1.0)]
+        return Prediction(
+            annotations=[
+                Annotation(
+                    shape=_full_box(image_width, image_height),
+                    labels=labels,
+                )
+            ]
+        )
+
+
+class AnomalyConverter(PredictionConverter):
+    """
+    Convert the outputs of an anomaly classification or anomaly detection model
+    to a Prediction.
+    """
+
+    def __init__(self, normal_label: LabelEntity, anomalous_label: LabelEntity):
+        """
+        Initialize the converter.
+
+        :param normal_label: OTX label for normal images
+        :param anomalous_label: OTX label for anomalous images or regions
+        """
+        super().__init__([normal_label, anomalous_label])
+
+
+class AnomalyClassificationConverter(AnomalyConverter):
+    """
+    Convert the outputs of an anomaly classification model to a Prediction with a
+    single full-image annotation.
+    """
+
+    def convert(
+        self,
+        postprocessing_results: Any,
+        metadata: Dict[str, Any],
+        image_width: int,
+        image_height: int,
+    ) -> Prediction:
+        """
+        Convert the postprocessed model outputs for an image to a Prediction.
+
+        :param postprocessing_results: AnomalyResult holding the predicted label and
+            score for the image
+        :param metadata: Dictionary containing the metadata generated during
+            preprocessing of the image
+        :param image_width: Width of the image, in pixels
+        :param image_height: Height of the image, in pixels
+        :return: Prediction for the image
+        """
+        label_index = 1 if postprocessing_results.pred_label == "Anomaly" else 0
+        return Prediction(
+            annotations=[
+                Annotation(
+                    shape=_full_box(image_width, image_height),
+                    labels=[
+                        self._scored_label(
+                            label_index, float(postprocessing_results.pred_score)
+                        )
+                    ],
+                )
+            ]
+        )
+
+
+class AnomalyDetectionConverter(AnomalyConverter):
+    """
+    Convert the outputs of an anomaly detection model to a Prediction with a
+    Rectangle for each anomalous region.
+    """
+
+    def convert(
+        self,
+        postprocessing_results: Any,
+        metadata: Dict[str, Any],
+        image_width: int,
+        image_height: int,
+    ) -> Prediction:
+        """
+        Convert the postprocessed model outputs for an image to a Prediction.
+
+        :param postprocessing_results: AnomalyResult holding the predicted boxes,
+            mask and score for the image
+        :param metadata: Dictionary containing the metadata generated during
+            preprocessing of the image
+        :param image_width: Width of the image, in pixels
+        :param image_height: Height of the image, in pixels
+        :return: Prediction for the image
+        """
+        mask_height, mask_width = postprocessing_results.pred_mask.shape
+        boxes = np.asarray(postprocessing_results.pred_boxes, dtype=np.float64)
+        boxes = boxes.reshape(-1, 4)
+        if len(boxes) == 0:
+            return Prediction(
+                annotations=[
+                    Annotation(
+                        shape=_full_box(image_width, image_height),
+                        labels=[self._scored_label(0, 1.0)],
+                    )
+                ]
+            )
+        x_min, x_max = boxes[:, 0] / mask_width, boxes[:, 2] / mask_width
+        y_min, y_max = boxes[:, 1] / mask_height, boxes[:, 3] / mask_height
+        score = postprocessing_results.pred_score
+        annotations = [
+            Annotation(
+                shape=Rectangle(x=x, y=y, width=width, height=height),
+                labels=[self._scored_label(1, score)],
+            )
+            for x, y, width, height in zip(
+                (x_min * image_width).tolist(),
+                (y_min * image_height).tolist(),
+                ((x_max - x_min) * image_width).tolist(),
+                ((y_max - y_min) * image_height).tolist(),
+            )
+        ]
+        return Prediction(annotations=annotations)
+
+
+def create_prediction_converter(
+    task_type: TaskType,
+    label_schema: LabelSchemaEntity,
+    configuration: Optional[Dict[str, Any]] = None,
+) -> Optional[PredictionConverter]:
+    """
+    Create a PredictionConverter for a model of the given task type.
+
+    Converters are not available for semantic segmentation, anomaly segmentation
+    and hierarchical classification models. Their conversion is dominated by the
+    extraction of contours from the segmentation maps or the resolution of the
+    label hierarchy, respectively, so they are converted via OTX.
+
+    :param task_type: Type of the task that the model belongs to
+    :param label_schema: OTX label schema of the model
+    :param configuration: Optional configuration parameters of the model
+    :return: PredictionConverter for the model, or None if no converter is
+        available for the task type
+    """
+    configuration = configuration if configuration is not None else {}
+    labels = label_schema.get_labels(include_empty=False)
+    if task_type == TaskType.DETECTION:
+        return DetectionConverter(
+            labels,
+            use_ellipse_shapes=configuration.get("use_ellipse_shapes", False),
+            confidence_threshold=configuration.get("confidence_threshold", 0.0),
+        )
+    if task_type in [TaskType.INSTANCE_SEGMENTATION, TaskType.ROTATED_DETECTION]:
+        return InstanceSegmentationConverter(
+            labels,
+            use_ellipse_shapes=configuration.get("use_ellipse_shapes", False),
+            confidence_threshold=configuration.get("confidence_threshold", 0.0),
+            rotated_rectangles=task_type == TaskType.ROTATED_DETECTION,
+        )
+    if task_type == TaskType.CLASSIFICATION:
+        groups = label_schema.get_groups(include_empty=False)
+        is_multilabel = len(groups) > 1 and len(groups) == len(labels)
+        if len(groups) > 1 and not is_multilabel:
+            # Hierarchical classification
+            return None
+        if len(labels) == 1:
+            labels = label_schema.get_labels(include_empty=True)
+        empty_labels = label_schema.get_labels(include_empty=True)
+        empty_label = next((label for label in empty_labels if label.is_empty), None)
+        return ClassificationConverter(labels, empty_label=empty_label)
+    if task_type in [TaskType.ANOMALY_CLASSIFICATION, TaskType.ANOMALY_DETECTION]:
+        normal_label = next(label for label in labels if not label.is_anomalous)
+        anomalous_label = next(label for label in labels if label.is_anomalous)
+        if task_type == TaskType.ANOMALY_CLASSIFICATION:
+            return AnomalyClassificationConverter(normal_label, anomalous_label)
+        return AnomalyDetectionConverter(normal_label, anomalous_label)
+    return None
+
+
+def _detections_to_array(detections: Sequence[Any]) -> np.ndarray:
+    """
+    Convert a list of `Detection` objects to an array of shape [n, 6], holding the
+    label index, score and box coordinates for each object. Objects with an area
+    smaller than one pixel are discarded.
+
+    :param detections: List of detected objects
+    :return: Array holding the detections
+    """
+    if len(detections) == 0:
+        return np.empty((0, 6), dtype=np.float64)
+    array = np.array(
+        [
+            [
+                detection.id,
+                detection.score,
+                detection.xmin,
+                detection.ymin,
+                detection.xmax,
+                detection.ymax,
+            ]
+            for detection in detections
+        ],
+        dtype=np.float64,
+    )
+    areas = (array[:, 4] - array[:, 2]) * (array[:, 5] - array[:, 3])
+    return array[areas >= 1.0]
+
+
+def _full_box(image_width: int, image_height: int) -> Rectangle:
+    """
+    Return a Rectangle covering the full image.
+
+    :param image_width: Width of the image, in pixels
+    :param image_height: Height of the image, in pixels
+    :return: Rectangle covering the full image
+    """
+    return Rectangle(x=0.0, y=0.0, width=float(image_width), height=float(image_height))
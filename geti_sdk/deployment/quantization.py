@@ -0,0 +1,374 @@
+# Copyright (C) 2023 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions
+# and limitations under the License.
+import logging
+import os
+import time
+from typing import List, Optional, Sequence, Tuple, Union
+
+import attr
+import cv2
+import numpy as np
+
+from geti_sdk.data_models import AnnotationScene, Prediction
+from geti_sdk.deployment.data_models import (
+    ROI,
+    IntermediateInferenceResult,
+    PredictionArray,
+)
+
+from .deployed_model import DeployedModel
+from .deployment import Deployment
+from .video_inference import _box_iou
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp", ".tif", ".tiff", ".webp")
+
+
+@attr.define
+class QuantizationReport:
+    """
+    Summary of the local quantization of a Deployment to INT8 precision.
+
+    The accuracy of both the original and the quantized deployment is measured on a
+    held-out set of validation images, as the mean F1 score per image. Predicted
+    and reference annotations match if they have the same top label and their
+    bounding boxes overlap with an intersection over union of at least the IoU
+    threshold. If no ground truth annotations are available, the predictions of the
+    original deployment are used as the reference, and the accuracy of the quantized
+    deployment expresses its agreement with the original one.
+
+    :var output_folder: Folder to which the quantized deployment was saved
+    :var n_calibration_images: Number of images used to calibrate the quantization
+    :var n_validation_images: Number of held-out images used for validation
+    :var reference_accuracy: Accuracy of the original deployment
+    :var quantized_accuracy: Accuracy of the quantized deployment
+    :var reference_fps: Throughput of the original deployment, in frames per second
+    :var quantized_fps: Throughput of the quantized deployment, in frames per second
+    :var uses_ground_truth: True if the accuracy was measured against ground truth
+        annotations, False if it was measured against the original predictions
+    """
+
+    output_folder: str
+    n_calibration_images: int
+    n_validation_images: int
+    reference_accuracy: float
+    quantized_accuracy: float
+    reference_fps: float
+    quantized_fps: float
+    uses_ground_truth: bool
+
+    @property
+    def accuracy_delta(self) -> float:
+        """
+        Return the change in accuracy due to quantization. A negative value means
+        that the quantized deployment is less accurate than the original one.
+        """
+        return self.quantized_accuracy - self.reference_accuracy
+
+    @property
+    def throughput_gain(self) -> float:
+        """
+        Return the throughput of the quantized deployment relative to that of the
+        original deployment.
+        """
+        if self.reference_fps == 0:
+            return float("nan")
+        return self.quantized_fps / self.reference_fps
+
+
+def load_calibration_images(
+    path_to_folder: Union[str, os.PathLike], max_images: Optional[int] = None
+) -> List[np.ndarray]:
+    """
+    Load the images in a folder, to use them for calibrating the quantization of a
+    deployment.
+
+    :param path_to_folder: Folder containing the images
+    :param max_images: Maximum number of images to load. If left as None, all images
+        in the folder are loaded
+    :return: List of numpy arrays holding the images, with the channels in RGB order
+    """
+    filenames = sorted(
+        filename
+        for filename in os.listdir(path_to_folder)
+        if os.path.splitext(filename)[1].lower() in IMAGE_EXTENSIONS
+    )
+    images: List[np.ndarray] = []
+    for filename in filenames:
+        if max_images is not None and len(images) >= max_images:
+            break
+        image = cv2.imread(os.path.join(path_to_folder, filename))
+        if image is None:
+            logging.warning(f"Unable to read image `{filename}`, skipping.")
+            continue
+        images.append(cv2.cvtColor(image, cv2.COLOR_BGR2RGB))
+    return images
+
+
+def quantize_deployment(
+    deployment: Deployment,
+    output_folder: Union[str, os.PathLike],
+    calibration_images: Sequence[np.ndarray],
+    validation_images: Sequence[np.ndarray],
+    validation_annotations: Optional[Sequence[AnnotationScene]] = None,
+    subset_size: int = 300,
+    preset: str = "performance",
+    iou_threshold: float = 0.5,
+    device: str = "CPU",
+) -> QuantizationReport:
+    """
+    Quantize all models in a deployment to INT8 precision with NNCF post-training
+    quantization, and save the result as a new deployment. The quantized deployment
+    can be loaded with :py:meth:`~geti_sdk.deployment.deployment.Deployment.from_folder`.
+
+    The models for downstream tasks in a task chain project are calibrated on the
+    regions of interest predicted by the original deployment for the calibration
+    images. After quantization, the accuracy and the throughput of the original and
+    the quantized deployment are compared on the `validation_images`.
+
+    NOTE: The inference models of the `deployment` must be loaded. Quantization
+    requires the `nncf` package to be installed
+
+    :param deployment: Deployment to quantize
+    :param output_folder: Folder to save the quantized deployment to
+    :param calibration_images: Images to calibrate the quantization parameters on,
+        with the channels in RGB order
+    :param validation_images: Held-out images to compare the original and quantized
+        deployment on, with the channels in RGB order. These should not overlap with
+        the `calibration_images`
+    :param validation_annotations: Optional ground truth annotations for the
+        `validation_images`. If left as None, the accuracy of the quantized deployment
+        is measured against the predictions of the original deployment
+    :param subset_size: Maximum number of calibration images to use for each model
+    :param preset: Quantization preset, either `performance` or `mixed`
+    :param iou_threshold: Minimum intersection over union for a predicted annotation
+        to match a reference annotation
+    :param device: Device to load the quantized deployment to, for validation
+    :return: QuantizationReport comparing the original and quantized deployment
+    """
+    deployment._check_models_loaded()
+    if len(validation_images) == 0:
+        raise ValueError("No validation images were passed, unable to quantize.")
+    if validation_annotations is not None and len(validation_annotations) != len(
+        validation_images
+    ):
+        raise ValueError(
+            f"Received {len(validation_annotations)} validation annotations for "
+            f"{len(validation_images)} validation images. Please pass a ground truth "
+            f"annotation for each validation image."
+        )
+    output_folder = str(output_folder)
+
+    quantized_models = [_create_quantized_model(model) for model in deployment.models]
+    quantized_deployment = Deployment(
+        project=deployment.project, models=quantized_models
+    )
+    if not quantized_deployment.save(output_folder):
+        raise ValueError(f"Unable to save quantized deployment to `{output_folder}`.")
+    task_images = _get_calibration_images_per_task(deployment, calibration_images)
+    for model, quantized_model, images in zip(
+        deployment.models, quantized_models, task_images
+    ):
+        logging.info(
+            f"Quantizing model `{model.name}` using {min(len(images), subset_size)} "
+            f"calibration images."
+        )
+        # Overwrites the copy of the original model in the new deployment folder
+        model.save_quantized(
+            quantized_model.model_data_path,
+            calibration_images=images,
+            subset_size=subset_size,
+            preset=preset,
+        )
+
+    quantized_deployment = Deployment.from_folder(output_folder)
+    quantized_deployment.load_inference_models(device=device)
+    reference_predictions, reference_fps = _predict_and_time(
+        deployment, validation_images
+    )
+    quantized_predictions, quantized_fps = _predict_and_time(
+        quantized_deployment, validation_images
+    )
+    if validation_annotations is not None:
+        ground_truth = [
+            Prediction(annotations=annotation_scene.annotations)
+            for annotation_scene in validation_annotations
+        ]
+        reference_accuracy = _mean_f1_score(
+            reference_predictions, ground_truth, iou_threshold=iou_threshold
+        )
+    else:
+        ground_truth = reference_predictions
+        reference_accuracy = 1.0
+    quantized_accuracy = _mean_f1_score(
+        quantized_predictions, ground_truth, iou_threshold=iou_threshold
+    )
+    return QuantizationReport(
+        output_folder=output_folder,
+        n_calibration_images=min(len(calibration_images), subset_size),
+        n_validation_images=len(validation_images),
+        reference_accuracy=reference_accuracy,
+        quantized_accuracy=quantized_accuracy,
+        reference_fps=reference_fps,
+        quantized_fps=quantized_fps,
+        uses_ground_truth=validation_annotations is not None,
+    )
+
+
+def _create_quantized_model(model: DeployedModel) -> DeployedModel:
+    """
+    Create a copy of a deployed model that describes its quantized counterpart. The
+    copy points to the data of the original model, until it is saved.
+
+    :param model: DeployedModel to create the copy for
+    :return: DeployedModel for the quantized model
+    """
+    quantized_model = attr.evolve(
+        model,
+        name=f"{model.name} INT8 PTQ",
+        precision=["INT8"],
+        optimization_type="NNCF",
+    )
+    quantized_model._model_data_path = model._model_data_path
+    quantized_model._model_python_path = model._model_python_path
+    quantized_model._has_custom_model_wrappers = model._has_custom_model_wrappers
+    return quantized_model
+
+
+def _get_calibration_images_per_task(
+    deployment: Deployment, images: Sequence[np.ndarray]
+) -> List[List[np.ndarray]]:
+    """
+    Return the calibration images for the model of each task in the deployment.
+
+    The first model is calibrated on the full images. Downstream models in a task
+    chain are calibrated on the views of the regions of interest that the previous
+    model predicts for the images.
+
+    :param deployment: Deployment holding the models to calibrate
+    :param images: Calibration images for the deployment
+    :return: List holding the calibration images for each task
+    """
+    tasks = deployment.project.get_trainable_tasks()
+    task_images: List[List[np.ndarray]] = [list(images)]
+    for upstream_task, task in zip(tasks[:-1], tasks[1:]):
+        views: List[np.ndarray] = []
+        for image in task_images[-1]:
+            prediction = deployment._infer_task(image, task=upstream_task)
+            rois: Optional[List[ROI]] = None
+            if not upstream_task.is_global:
+                rois = [
+                    ROI.from_annotation(annotation)
+                    for annotation in prediction.annotations
+                ]
+            result = IntermediateInferenceResult(
+                image=image, prediction=prediction, rois=rois
+            )
+            views.extend(result.generate_views())
+        if len(views) == 0:
+            logging.warning(
+                f"No regions of interest were predicted for the calibration images, "
+                f"calibrating the model for task `{task.title}` on the full images "
+                f"instead."
+            )
+            views = list(images)
+        task_images.append(views)
+    return task_images
+
+
+def _predict_and_time(
+    deployment: Deployment, images: Sequence[np.ndarray]
+) -> Tuple[List[Prediction], float]:
+    """
+    Run inference on a sequence of images, and measure the throughput.
+
+    :param deployment: Deployment to run inference with
+    :param images: Images to infer
+    :return: Tuple containing the predictions for the images, and the throughput in
+        frames per second
+    """
+    # Warm up, so that the first inference is not included in the measurement
+    deployment.infer(images[0])
+    t_start = time.perf_counter()
+    predictions = [deployment.infer(image) for image in images]
+    t_elapsed = time.perf_counter() - t_start
+    return predictions, len(images) / t_elapsed
+
+
+def _mean_f1_score(
+    predictions: Sequence[Prediction],
+    references: Sequence[Prediction],
+    iou_threshold: float,
+) -> float:
+    """
+    Compute the mean of the per-image F1 scores of a sequence of predictions.
+
+    :param predictions: Predictions to score
+    :param references: Reference annotations for each prediction
+    :param iou_threshold: Minimum intersection over union for a predicted annotation
+        to match a reference annotation
+    :return: Mean F1 score
+    """
+    return float(
+        np.mean(
+            [
+                _f1_score(prediction, reference, iou_threshold=iou_threshold)
+                for prediction, reference in zip(predictions, references)
+            ]
+        )
+    )
+
+
+def _f1_score(
+    prediction: Prediction, reference: Prediction, iou_threshold: float
+) -> float:
+    """
+    Compute the F1 score of the annotations in a prediction, with respect to a set
+    of reference annotations.
+
+    Predicted annotations are matched greedily in order of decreasing score, to the
+    unmatched reference annotation with the same top label and the highest bounding
+    box overlap.
+
+    :param prediction: Prediction to score
+    :param reference: Reference annotations
+    :param iou_threshold: Minimum intersection over union for a predicted annotation
+        to match a reference annotation
+    :return: F1 score, which is 1 if both the prediction and the reference are empty
+    """
+    predicted = PredictionArray.from_prediction(prediction)
+    expected = PredictionArray.from_prediction(reference)
+    if len(predicted) == 0 or len(expected) == 0:
+        return float(len(predicted) == len(expected))
+    predicted_labels, predicted_scores = predicted.get_top_labels()
+    expected_labels, _ = expected.get_top_labels()
+    predicted_names = np.array(
+        [
+            predicted.label_names[index] if index >= 0 else ""
+            for index in predicted_labels
+        ]
+    )
+    expected_names = np.array(
+        [expected.label_names[index] if index >= 0 else "" for index in expected_labels]
+    )
+    ious = _box_iou(
+        predicted.boxes.astype(np.float64), expected.boxes.astype(np.float64)
+    )
+    ious[predicted_names[:, None] != expected_names[None, :]] = 0
+    is_matched = np.zeros(len(expected), dtype=bool)
+    for index in np.argsort(-predicted_scores, kind="stable"):
+        candidate_ious = np.where(is_matched, 0, ious[index])
+        best_match = int(np.argmax(candidate_ious))
+        if candidate_ious[best_match] >= iou_threshold:
+            is_matched[best_match] = True
+    return 2 * int(is_matched.sum()) / (len(predicted) + len(expected))
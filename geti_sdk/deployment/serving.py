@@ -0,0 +1,458 @@
+# Copyright (C) 2023 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions
+# and limitations under the License.
+import json
+import logging
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from geti_sdk.data_models import Prediction
+from geti_sdk.rest_converters import PredictionRESTConverter
+
+from .deployment import Deployment
+
+# Number of most recent requests over which the latency percentiles are computed
+LATENCY_WINDOW_SIZE = 1000
+
+
+class ServingMetrics:
+    """
+    Thread-safe collection of latency and throughput metrics for an
+    InferenceServer.
+    """
+
+    def __init__(self, window_size: int = LATENCY_WINDOW_SIZE):
+        """
+        Create a new, empty set of metrics.
+
+        :param window_size: Number of most recent requests over which the latency
+            percentiles are computed
+        """
+        self._lock = threading.Lock()
+        self._start_time = time.perf_counter()
+        self._latencies: Deque[float] = deque(maxlen=window_size)
+        self._queue_delays: Deque[float] = deque(maxlen=window_size)
+        self._n_requests = 0
+        self._n_errors = 0
+        self._n_batches = 0
+        self._n_batched_images = 0
+
+    def record_batch(self, batch_size: int, queue_delays: List[float]) -> None:
+        """
+        Record that a batch of images was submitted for inference.
+
+        :param batch_size: Number of images in the batch
+        :param queue_delays: Time that each image in the batch spent waiting in the
+            queue, in seconds
+        """
+        with self._lock:
+            self._n_batches += 1
+            self._n_batched_images += batch_size
+            self._queue_delays.extend(queue_delays)
+
+    def record_request(self, latency: float, success: bool = True) -> None:
+        """
+        Record a completed inference request.
+
+        :param latency: Time between receiving the request and sending the response,
+            in seconds
+        :param success: False if the request failed
+        """
+        with self._lock:
+            self._n_requests += 1
+            if not success:
+                self._n_errors += 1
+            self._latencies.append(latency)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Return a snapshot of the metrics.
+
+        :return: Dictionary holding the number of requests, errors and batches, the
+            mean batch size, the throughput in requests per second since the server
+            started, and the 50th, 90th and 99th percentile of the request latency
+            and the queue delay, in milliseconds
+        """
+        with self._lock:
+            uptime = time.perf_counter() - self._start_time
+            metrics: Dict[str, Any] = {
+                "requests": self._n_requests,
+                "errors": self._n_errors,
+                "batches": self._n_batches,
+                "mean_batch_size": (
+                    self._n_batched_images / self._n_batches if self._n_batches else 0
+                ),
+                "throughput_fps": self._n_requests / uptime if uptime > 0 else 0,
+                "uptime_s": uptime,
+            }
+            for name, values in [
+                ("latency", self._latencies),
+                ("queue_delay", self._queue_delays),
+            ]:
+                percentiles = (
+                    np.percentile(np.array(values) * 1000, [50, 90, 99]).tolist()
+                    if values
+                    else [0.0, 0.0, 0.0]
+                )
+                for percentile, value in zip([50, 90, 99], percentiles):
+                    metrics[f"{name}_p{percentile}_ms"] = value
+        return metrics
+
+
+class DynamicBatcher:
+    """
+    Collect images submitted from multiple threads into batches, and run inference
+    on each batch with a Deployment.
+
+    A batch is submitted as soon as it holds `max_batch_size` images, or when the
+    oldest image in the batch has waited for `max_queue_delay` seconds. The
+    deployment infers each batch in a single batched call, or through parallel
+    asynchronous infer requests if its models were loaded with more than one infer
+    request.
+    """
+
+    def __init__(
+        self,
+        deployment: Deployment,
+        max_batch_size: int = 8,
+        max_queue_delay: float = 0.005,
+        metrics: Optional[ServingMetrics] = None,
+    ):
+        """
+        Create a new DynamicBatcher and start its worker thread.
+
+        :param deployment: Deployment to run inference with. Its inference models
+            must be loaded
+        :param max_batch_size: Maximum number of images in a batch
+        :param max_queue_delay: Maximum time, in seconds, that an image waits for
+            other images to fill up its batch
+        :param metrics: Optional ServingMetrics to record the batch statistics in
+        """
+        if max_batch_size < 1:
+            raise ValueError(
+                f"Invalid maximum batch size {max_batch_size}, please specify a "
+                f"positive integer."
+            )
+        if max_queue_delay < 0:
+            raise ValueError(
+                f"Invalid maximum queue delay {max_queue_delay}, please specify a "
+                f"non-negative number of seconds."
+            )
+        self.deployment = deployment
+        self.max_batch_size = max_batch_size
+        self.max_queue_delay = max_queue_delay
+        self.metrics = metrics if metrics is not None else ServingMetrics()
+        self._queue: "queue.Queue[Optional[Tuple[np.ndarray, Future, float]]]" = (
+            queue.Queue()
+        )
+        self._worker = threading.Thread(
+            target=self._run, name="GetiSDK-dynamic-batching", daemon=True
+        )
+        self._worker.start()
+
+    def submit(self, image: np.ndarray) -> "Future[Prediction]":
+        """
+        Submit an image for inference.
+
+        :param image: Image to run inference on, as a numpy array containing the pixel
+            data. The image is expected to have dimensions [height x width x channels],
+            with the channels in RGB order
+        :return: Future that resolves to the Prediction for the image
+        """
+        if not self._worker.is_alive():
+            raise RuntimeError("The DynamicBatcher has been stopped.")
+        future: "Future[Prediction]" = Future()
+        self._queue.put((image, future, time.perf_counter()))
+        return future
+
+    def infer(self, image: np.ndarray) -> Prediction:
+        """
+        Run inference on an image as part of a batch, and wait for the result.
+
+        :param image: Image to run inference on, as a numpy array containing the pixel
+            data. The image is expected to have dimensions [height x width x channels],
+            with the channels in RGB order
+        :return: Prediction for the image
+        """
+        return self.submit(image).result()
+
+    def stop(self) -> None:
+        """
+        Stop the worker thread, after the images that are already queued have been
+        processed.
+        """
+        if self._worker.is_alive():
+            self._queue.put(None)
+            self._worker.join()
+
+    def _run(self) -> None:
+        """
+        Collect images from the queue into batches and run inference on them, until
+        the batcher is stopped.
+        """
+        stopped = False
+        while not stopped:
+            item = self._queue.get()
+            if item is None:
+                break
+            batch = [item]
+            deadline = item[2] + self.max_queue_delay
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - time.perf_counter()
+                try:
+                    item = (
+                        self._queue.get(timeout=timeout)
+                        if timeout > 0
+                        else self._queue.get_nowait()
+                    )
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopped = True
+                    break
+                batch.append(item)
+            self._infer_batch(batch)
+
+    def _infer_batch(self, batch: List[Tuple[np.ndarray, Future, float]]) -> None:
+        """
+        Run inference on a batch of images, and resolve their futures.
+
+        :param batch: List of tuples holding the image, the future for its result and
+            the time at which it was submitted
+        """
+        start_time = time.perf_counter()
+        self.metrics.record_batch(
+            len(batch), [start_time - submit_time for _, _, submit_time in batch]
+        )
+        try:
+            predictions = self.deployment.infer_batch(
+                [image for image, _, _ in batch], max_batch_size=self.max_batch_size
+            )
+        except Exception as error:
+            for _, future, _ in batch:
+                future.set_exception(error)
+            return
+        for (_, future, _), prediction in zip(batch, predictions):
+            future.set_result(prediction)
+
+
+class _InferenceRequestHandler(BaseHTTPRequestHandler):
+    """
+    Handler for the HTTP requests to an InferenceServer.
+    """
+
+    server: "_InferenceHTTPServer"
+
+    def do_GET(self) -> None:
+        """
+        Handle a GET request, for the `/metrics` and `/health` endpoints.
+        """
+        if self.path == "/metrics":
+            self._send_json(200, self.server.metrics.to_dict())
+        elif self.path == "/health":
+            self._send_json(200, {"status": "ok"})
+        else:
+            self._send_json(404, {"error": f"Unknown endpoint {self.path}"})
+
+    def do_POST(self) -> None:
+        """
+        Handle a POST request to the `/predict` endpoint. The request body must hold
+        an encoded image, for example in PNG or JPEG format.
+        """
+        if self.path != "/predict":
+            self._send_json(404, {"error": f"Unknown endpoint {self.path}"})
+            return
+        start_time = time.perf_counter()
+        content_length = int(self.headers.get("Content-Length", 0))
+        data = np.frombuffer(self.rfile.read(content_length), dtype=np.uint8)
+        image = cv2.imdecode(data, cv2.IMREAD_COLOR) if data.size > 0 else None
+        if image is None:
+            self.server.metrics.record_request(
+                time.perf_counter() - start_time, success=False
+            )
+            self._send_json(400, {"error": "Unable to decode the image."})
+            return
+        try:
+            prediction = self.server.batcher.infer(
+                cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+            )
+        except Exception as error:
+            logging.exception("Error while running inference for a request")
+            self.server.metrics.record_request(
+                time.perf_counter() - start_time, success=False
+            )
+            self._send_json(500, {"error": str(error)})
+            return
+        response = PredictionRESTConverter.to_dict(prediction)
+        self._send_json(200, response)
+        self.server.metrics.record_request(time.perf_counter() - start_time)
+
+    def _send_json(self, status: int, content: Dict[str, Any]) -> None:
+        """
+        Send a JSON response.
+
+        :param status: HTTP status code of the response
+        :param content: Content of the response
+        """
+        body = json.dumps(content).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        """
+        Log the requests at debug level, instead of writing them to stderr.
+        """
+        logging.debug(f"{self.address_string()} - {format % args}")
+
+
+class _InferenceHTTPServer(ThreadingHTTPServer):
+    """
+    HTTP server holding the DynamicBatcher and metrics for its request handlers.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        server_address: Tuple[str, int],
+        batcher: DynamicBatcher,
+        metrics: ServingMetrics,
+    ):
+        super().__init__(server_address, _InferenceRequestHandler)
+        self.batcher = batcher
+        self.metrics = metrics
+
+
+class InferenceServer:
+    """
+    HTTP server that runs inference with a Deployment.
+
+    The server provides the following endpoints:
+
+    - `POST /predict`: Run inference on the encoded image (for example in PNG or
+      JPEG format) in the request body. The response holds the prediction in the
+      same JSON format as the Intel® Geti™ REST API
+    - `GET /metrics`: Return the latency and throughput metrics of the server
+    - `GET /health`: Return a 200 status code if the server is running
+
+    Requests are handled in parallel, and the images of concurrent requests are
+    inferred together in dynamically formed batches.
+    """
+
+    def __init__(
+        self,
+        deployment: Deployment,
+        host: str = "127.0.0.1",
+        port: int = 8080,
+        max_batch_size: int = 8,
+        max_queue_delay: float = 0.005,
+    ):
+        """
+        Create a new InferenceServer. The server does not accept requests until it
+        is started.
+
+        :param deployment: Deployment to run inference with. Its inference models
+            must be loaded. Set `max_async_infer_requests` when loading the models
+            to infer the images in a batch in parallel
+        :param host: Address to listen on
+        :param port: Port to listen on. Set to 0 to pick a free port
+        :param max_batch_size: Maximum number of images to infer in a single batch
+        :param max_queue_delay: Maximum time, in seconds, that an image waits for
+            other images to fill up its batch
+        """
+        if not deployment.are_models_loaded:
+            raise ValueError(
+                "The inference models for the deployment are not loaded. Please call "
+                "'load_inference_models' before starting the InferenceServer."
+            )
+        self.deployment = deployment
+        self.metrics = ServingMetrics()
+        self.batcher = DynamicBatcher(
+            deployment,
+            max_batch_size=max_batch_size,
+            max_queue_delay=max_queue_delay,
+            metrics=self.metrics,
+        )
+        self._http_server = _InferenceHTTPServer(
+            (host, port), batcher=self.batcher, metrics=self.metrics
+        )
+        self._server_thread: Optional[threading.Thread] = None
+
+    @property
+    def address(self) -> str:
+        """
+        Return the URL at which the server can be reached.
+        """
+        host, port = self._http_server.server_address[0:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> None:
+        """
+        Start serving requests in a background thread.
+        """
+        if self._server_thread is not None:
+            return
+        self._server_thread = threading.Thread(
+            target=self._http_server.serve_forever,
+            name="GetiSDK-inference-server",
+            daemon=True,
+        )
+        self._server_thread.start()
+        logging.info(f"Inference server listening on {self.address}")
+
+    def serve_forever(self) -> None:
+        """
+        Serve requests in the calling thread, until the process is interrupted.
+        """
+        logging.info(f"Inference server listening on {self.address}")
+        try:
+            self._http_server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop()
+
+    def stop(self) -> None:
+        """
+        Stop the server and release its port.
+        """
+        if self._server_thread is not None:
+            self._http_server.shutdown()
+            self._server_thread.join()
+            self._server_thread = None
+        self._http_server.server_close()
+        self.batcher.stop()
+
+    def __enter__(self) -> "InferenceServer":
+        """
+        Start the server when entering the context.
+        """
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        """
+        Stop the server when leaving the context.
+        """
+        self.stop()
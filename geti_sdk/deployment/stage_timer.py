@@ -0,0 +1,93 @@
+# Copyright (C) 2023 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions
+# and limitations under the License.
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator
+
+# Stages of the inference pipeline for a single task, in order of execution. The
+# `convert` stage covers the conversion of the postprocessed model outputs to a
+# Prediction
+INFERENCE_STAGES = ("preprocess", "infer", "postprocess", "convert")
+
+
+class StageTimer:
+    """
+    Timer that accumulates the time spent in each stage of the inference pipeline
+    of a Deployment, for each task in the deployment.
+
+    A timer is attached to a deployment with
+    :py:meth:`~geti_sdk.deployment.deployment.Deployment.set_stage_timer`. Time
+    spent in a stage is added up, so that the times for a task in a task chain
+    project cover all regions of interest that the task was run on.
+    """
+
+    def __init__(self):
+        """
+        Create a new StageTimer, without any recorded times.
+        """
+        self._stage_times: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def stage_times(self) -> Dict[str, Dict[str, float]]:
+        """
+        Return the time recorded for each stage since the timer was last reset.
+
+        :return: Dictionary mapping the title of each task to the time spent in each
+            stage of the inference pipeline for that task, in seconds
+        """
+        with self._lock:
+            return {
+                task_title: dict(task_times)
+                for task_title, task_times in self._stage_times.items()
+            }
+
+    @contextmanager
+    def measure(self, task_title: str, stage: str) -> Iterator[None]:
+        """
+        Context manager that records the time spent inside it for a stage.
+
+        :param task_title: Title of the task that the stage is run for
+        :param stage: Name of the stage
+        """
+        t_start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(task_title, stage, time.perf_counter() - t_start)
+
+    def record(self, task_title: str, stage: str, duration: float) -> None:
+        """
+        Add time spent in a stage to the recorded times.
+
+        :param task_title: Title of the task that the stage was run for
+        :param stage: Name of the stage
+        :param duration: Time spent in the stage, in seconds
+        """
+        with self._lock:
+            task_times = self._stage_times.setdefault(task_title, {})
+            task_times[stage] = task_times.get(stage, 0.0) + duration
+
+    def reset(self) -> Dict[str, Dict[str, float]]:
+        """
+        Clear the recorded times.
+
+        :return: The times recorded before the reset, in the same format as
+            :py:attr:`stage_times`
+        """
+        with self._lock:
+            stage_times = self._stage_times
+            self._stage_times = {}
+        return stage_times
@@ -14,10 +14,12 @@
 
 import re
 from importlib import resources
+from typing import List
 
 from pathvalidate import sanitize_filepath
 
 from geti_sdk.data_models import OptimizedModel, Project
+from geti_sdk.data_models.shapes import Rectangle
 
 try:
     OVMS_README_PATH = str(
@@ -86,3 +88,62 @@ def target_device_is_ovms(device: str) -> bool:
         r"^((https?://)|(www.))(?:([a-zA-Z]+)|(\d+\.\d+\.\d+\.\d+)):\d{1,5}?$"
     )
     return server_pattern.match(device) is not None
+
+
+def _tile_offsets(length: int, tile_length: int, overlap: float) -> List[int]:
+    """
+    Return the offsets of the tiles along one dimension of an image.
+
+    :param length: Size of the image along the dimension, in pixels
+    :param tile_length: Size of the tiles along the dimension, in pixels
+    :param overlap: Fraction of the tile size by which neighbouring tiles overlap
+    :return: List of offsets at which the tiles start
+    """
+    if length <= tile_length:
+        return [0]
+    stride = max(int(tile_length * (1 - overlap)), 1)
+    offsets = list(range(0, length - tile_length, stride))
+    # The last tile is aligned with the edge of the image, so that all tiles have
+    # the same size
+    offsets.append(length - tile_length)
+    return offsets
+
+
+def generate_tiles(
+    image_width: int,
+    image_height: int,
+    tile_width: int,
+    tile_height: int,
+    overlap: float = 0.0,
+) -> List[Rectangle]:
+    """
+    Generate a grid of tiles covering an image.
+
+    All tiles have the same size, unless the image is smaller than a tile along
+    one of its dimensions, in which case the tiles span the full image along that
+    dimension.
+
+    :param image_width: Width of the image, in pixels
+    :param image_height: Height of the image, in pixels
+    :param tile_width: Width of the tiles, in pixels
+    :param tile_height: Height of the tiles, in pixels
+    :param overlap: Fraction of the tile size by which neighbouring tiles overlap,
+        between 0 and 1
+    :return: List of Rectangles representing the tiles, row by row
+    """
+    if tile_width < 1 or tile_height < 1:
+        raise ValueError(
+            f"Invalid tile size {tile_width}x{tile_height}, please specify a "
+            f"positive width and height."
+        )
+    if not 0 <= overlap < 1:
+        raise ValueError(
+            f"Invalid tile overlap {overlap}, please specify a fraction between 0 "
+            f"and 1."
+        )
+    width, height = min(tile_width, image_width), min(tile_height, image_height)
+    return [
+        Rectangle(x=x, y=y, width=width, height=height)
+        for y in _tile_offsets(image_height, tile_height, overlap)
+        for x in _tile_offsets(image_width, tile_width, overlap)
+    ]
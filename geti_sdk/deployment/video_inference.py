@@ -0,0 +1,409 @@
+# Copyright (C) 2023 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions
+# and limitations under the License.
+
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+import attr
+import cv2
+import numpy as np
+
+from geti_sdk.data_models import Annotation, Prediction
+from geti_sdk.data_models.label import ScoredLabel
+from geti_sdk.data_models.shapes import Rectangle, Shape
+
+from .deployment import Deployment
+
+# Size of the thumbnails that are compared to compute the frame difference score
+DIFFERENCE_THUMBNAIL_SIZE = (64, 64)
+
+
+@attr.define
+class Track:
+    """
+    Object that is followed over multiple frames of a video by the
+    :py:class:`IoUTracker`.
+
+    :var track_id: Unique identifier of the track
+    :var shape: Shape of the object in the frame in which it was last detected
+    :var labels: Labels of the object in the frame in which it was last detected
+    :var box: Bounding box (x, y, width, height) of the object in the frame in which
+        it was last detected
+    :var velocity: Estimated displacement (dx, dy) of the object per frame, or None
+        if the object was detected only once so far
+    :var frames_since_update: Number of frames since the object was last detected
+    :var missed_updates: Number of consecutive tracker updates in which the object
+        was not detected
+    """
+
+    track_id: int
+    shape: Shape
+    labels: List[ScoredLabel]
+    box: np.ndarray
+    velocity: Optional[np.ndarray] = None
+    frames_since_update: int = 0
+    missed_updates: int = 0
+
+    @property
+    def predicted_offset(self) -> np.ndarray:
+        """
+        Return the displacement (dx, dy) of the object since it was last detected,
+        assuming it moves with constant velocity.
+        """
+        if self.velocity is None:
+            return np.zeros(2)
+        return self.velocity * self.frames_since_update
+
+    def to_annotation(self) -> Annotation:
+        """
+        Return an Annotation for the object at its predicted position in the current
+        frame. The `id` of the annotation is set to the track ID.
+        """
+        dx, dy = self.predicted_offset
+        if dx == 0 and dy == 0:
+            shape = self.shape
+        else:
+            shape = self.shape.to_absolute_coordinates(
+                parent_roi=Rectangle(x=dx, y=dy, width=1, height=1)
+            )
+        return Annotation(shape=shape, labels=self.labels, id=str(self.track_id))
+
+
+def _box_iou(boxes_a: np.ndarray, boxes_b: np.ndarray) -> np.ndarray:
+    """
+    Compute the intersection over union between two sets of boxes.
+
+    :param boxes_a: Array of shape (N, 4) holding boxes as (x, y, width, height)
+    :param boxes_b: Array of shape (M, 4) holding boxes as (x, y, width, height)
+    :return: Array of shape (N, M) holding the IoU for each pair of boxes
+    """
+    a_min, a_max = boxes_a[:, None, :2], boxes_a[:, None, :2] + boxes_a[:, None, 2:]
+    b_min, b_max = boxes_b[None, :, :2], boxes_b[None, :, :2] + boxes_b[None, :, 2:]
+    overlap = np.clip(np.minimum(a_max, b_max) - np.maximum(a_min, b_min), 0, None)
+    intersection = overlap[..., 0] * overlap[..., 1]
+    area_a = boxes_a[:, None, 2] * boxes_a[:, None, 3]
+    area_b = boxes_b[None, :, 2] * boxes_b[None, :, 3]
+    union = area_a + area_b - intersection
+    return np.divide(
+        intersection, union, out=np.zeros_like(intersection), where=union > 0
+    )
+
+
+class IoUTracker:
+    """
+    Lightweight multi-object tracker that associates the objects detected in a frame
+    with the existing tracks by the overlap (IoU) of their bounding boxes.
+
+    The velocity of each track is estimated from its consecutive detections with an
+    alpha-beta filter, so that its position can be predicted in frames for which
+    no detections are available.
+    """
+
+    def __init__(
+        self,
+        iou_threshold: float = 0.3,
+        max_missed_updates: int = 0,
+        velocity_smoothing: float = 0.5,
+    ):
+        """
+        Create a new IoUTracker without any tracks.
+
+        :param iou_threshold: Minimum IoU between the predicted box of a track and a
+            detection for the detection to be assigned to the track
+        :param max_missed_updates: Number of consecutive updates in which a track
+            can go undetected before it is removed. Defaults to 0, meaning that
+            tracks are removed as soon as they are not detected
+        :param velocity_smoothing: Weight of the latest observed displacement in the
+            velocity estimate of a track, between 0 and 1
+        """
+        self.iou_threshold = iou_threshold
+        self.max_missed_updates = max_missed_updates
+        self.velocity_smoothing = velocity_smoothing
+        self.tracks: List[Track] = []
+        self._next_track_id = 0
+
+    def update(self, prediction: Prediction) -> Prediction:
+        """
+        Update the tracks with the objects detected in a new frame.
+
+        Detections are assigned to the tracks greedily, in order of decreasing IoU.
+        Detections that are not assigned to a track start a new track.
+
+        :param prediction: Prediction holding the objects detected in the frame
+        :return: Prediction for the frame, in which the `id` of each annotation is
+            set to the ID of its track
+        """
+        annotations = prediction.annotations
+        detected_boxes = np.array(
+            [_bounding_box(annotation.shape) for annotation in annotations]
+        ).reshape(-1, 4)
+        predicted_boxes = np.array(
+            [
+                np.concatenate([track.box[:2] + track.predicted_offset, track.box[2:]])
+                for track in self.tracks
+            ]
+        ).reshape(-1, 4)
+        matches = self._match(predicted_boxes, detected_boxes)
+
+        matched_tracks = set()
+        tracks_by_detection = {}
+        for track_index, detection_index in matches:
+            track = self.tracks[track_index]
+            self._update_track(
+                track, annotations[detection_index], detected_boxes[detection_index]
+            )
+            matched_tracks.add(track_index)
+            tracks_by_detection[detection_index] = track
+
+        remaining_tracks: List[Track] = []
+        for track_index, track in enumerate(self.tracks):
+            if track_index not in matched_tracks:
+                track.missed_updates += 1
+                if track.missed_updates > self.max_missed_updates:
+                    continue
+            remaining_tracks.append(track)
+        for detection_index, annotation in enumerate(annotations):
+            if detection_index not in tracks_by_detection:
+                track = Track(
+                    track_id=self._next_track_id,
+                    shape=annotation.shape,
+                    labels=annotation.labels,
+                    box=detected_boxes[detection_index],
+                )
+                self._next_track_id += 1
+                remaining_tracks.append(track)
+                tracks_by_detection[detection_index] = track
+        self.tracks = remaining_tracks
+
+        for detection_index, annotation in enumerate(annotations):
+            annotation.id = str(tracks_by_detection[detection_index].track_id)
+        return prediction
+
+    def predict(self) -> Prediction:
+        """
+        Advance the tracks by one frame without new detections, and return the
+        predicted positions of the tracked objects in that frame.
+
+        :return: Prediction holding an annotation for each track, in which the `id`
+            of the annotation is set to the track ID
+        """
+        self.advance()
+        return Prediction(annotations=[track.to_annotation() for track in self.tracks])
+
+    def advance(self) -> None:
+        """
+        Advance the tracks by one frame, before the detections for that frame are
+        passed to :py:meth:`update`.
+        """
+        for track in self.tracks:
+            track.frames_since_update += 1
+
+    def reset(self) -> None:
+        """
+        Remove all tracks.
+        """
+        self.tracks = []
+
+    def _match(
+        self, predicted_boxes: np.ndarray, detected_boxes: np.ndarray
+    ) -> List[Tuple[int, int]]:
+        """
+        Greedily match tracks to detections, in order of decreasing IoU.
+
+        :param predicted_boxes: Array of shape (N, 4) holding the predicted boxes of
+            the tracks
+        :param detected_boxes: Array of shape (M, 4) holding the detected boxes
+        :return: List of (track index, detection index) tuples
+        """
+        if len(predicted_boxes) == 0 or len(detected_boxes) == 0:
+            return []
+        iou = _box_iou(predicted_boxes, detected_boxes)
+        matches: List[Tuple[int, int]] = []
+        for flat_index in np.argsort(-iou, axis=None):
+            track_index, detection_index = np.unravel_index(flat_index, iou.shape)
+            if iou[track_index, detection_index] < self.iou_threshold:
+                break
+            if any(
+                track_index == match[0] or detection_index == match[1]
+                for match in matches
+            ):
+                continue
+            matches.append((int(track_index), int(detection_index)))
+        return matches
+
+    def _update_track(
+        self, track: Track, annotation: Annotation, box: np.ndarray
+    ) -> None:
+        """
+        Update a track with a new detection.
+
+        :param track: Track to update
+        :param annotation: Detected annotation that was assigned to the track
+        :param box: Bounding box of the annotation
+        """
+        if track.frames_since_update > 0:
+            observed_velocity = (
+                _box_center(box) - _box_center(track.box)
+            ) / track.frames_since_update
+            if track.velocity is None:
+                track.velocity = observed_velocity
+            else:
+                track.velocity = (
+                    1 - self.velocity_smoothing
+                ) * track.velocity + self.velocity_smoothing * observed_velocity
+        track.shape = annotation.shape
+        track.labels = annotation.labels
+        track.box = box
+        track.frames_since_update = 0
+        track.missed_updates = 0
+
+
+def _bounding_box(shape: Shape) -> np.ndarray:
+    """
+    Return the bounding box of a shape as an array (x, y, width, height).
+    """
+    roi = shape.to_roi()
+    return np.array([roi.x, roi.y, roi.width, roi.height], dtype=np.float64)
+
+
+def _box_center(box: np.ndarray) -> np.ndarray:
+    """
+    Return the center (x, y) of a box given as (x, y, width, height).
+    """
+    return box[:2] + box[2:] / 2
+
+
+class VideoInferencer:
+    """
+    Run inference on the frames of a video, without running the deployment for
+    every frame.
+
+    The deployment is run on keyframes only: every `keyframe_interval` frames, and
+    for any frame that differs significantly from the last keyframe. For the frames
+    in between, the objects detected in the last keyframe are propagated by an
+    :py:class:`IoUTracker`. The annotations in the predictions carry the ID of the
+    track they belong to in their `id` attribute, for keyframes and propagated
+    frames alike.
+
+    The frames must be passed in the order in which they appear in the video.
+    """
+
+    def __init__(
+        self,
+        deployment: Deployment,
+        keyframe_interval: int = 5,
+        difference_threshold: Optional[float] = None,
+        tracker: Optional[IoUTracker] = None,
+    ):
+        """
+        Create a VideoInferencer to run inference on a video with the `deployment`.
+
+        :param deployment: Deployment to run inference with. The inference models
+            for the deployment must be loaded
+        :param keyframe_interval: The deployment is run on every
+            `keyframe_interval`-th frame. Set to 1 to run it on every frame
+        :param difference_threshold: Optional threshold for the mean absolute
+            difference between a frame and the last keyframe, relative to the
+            maximum pixel value. Frames that differ more than this from the last
+            keyframe are inferred by the deployment as well
+        :param tracker: Optional tracker to propagate the objects between the
+            keyframes. If left as None, an IoUTracker with default settings is used
+        """
+        if keyframe_interval < 1:
+            raise ValueError(
+                f"Invalid keyframe interval {keyframe_interval}, please specify a "
+                f"positive integer."
+            )
+        self.deployment = deployment
+        self.keyframe_interval = keyframe_interval
+        self.difference_threshold = difference_threshold
+        self.tracker = tracker if tracker is not None else IoUTracker()
+        self.frames_inferred = 0
+        self.frames_propagated = 0
+        self._frames_since_keyframe = 0
+        self._keyframe_thumbnail: Optional[np.ndarray] = None
+
+    def infer(self, frame: np.ndarray) -> Prediction:
+        """
+        Return the prediction for the next frame in the video.
+
+        :param frame: Frame to get the prediction for, as a numpy array containing
+            the pixel data. The frame is expected to have dimensions
+            [height x width x channels], with the channels in RGB order
+        :return: Prediction for the frame
+        """
+        thumbnail: Optional[np.ndarray] = None
+        if self.difference_threshold is not None:
+            thumbnail = _thumbnail(frame)
+        if not self._is_keyframe(thumbnail):
+            self._frames_since_keyframe += 1
+            self.frames_propagated += 1
+            return self.tracker.predict()
+
+        prediction = self.deployment.infer(frame)
+        self.tracker.advance()
+        prediction = self.tracker.update(prediction)
+        self._frames_since_keyframe = 0
+        self._keyframe_thumbnail = thumbnail
+        self.frames_inferred += 1
+        return prediction
+
+    def infer_video(self, frames: Iterable[np.ndarray]) -> Iterator[Prediction]:
+        """
+        Return the predictions for a sequence of video frames.
+
+        :param frames: Iterable of frames, in the order in which they appear in
+            the video
+        :return: Iterator yielding the prediction for each frame
+        """
+        for frame in frames:
+            yield self.infer(frame)
+
+    def reset(self) -> None:
+        """
+        Reset the state of the inferencer, to start processing a new video.
+        """
+        self.tracker.reset()
+        self._frames_since_keyframe = 0
+        self._keyframe_thumbnail = None
+        self.frames_inferred = 0
+        self.frames_propagated = 0
+
+    def _is_keyframe(self, thumbnail: Optional[np.ndarray]) -> bool:
+        """
+        Return True if the deployment should be run for the current frame.
+
+        :param thumbnail: Thumbnail of the current frame, if the frame difference
+            is used to select keyframes
+        """
+        if self.frames_inferred == 0:
+            return True
+        if self._frames_since_keyframe + 1 >= self.keyframe_interval:
+            return True
+        if thumbnail is not None and self._keyframe_thumbnail is not None:
+            difference = cv2.absdiff(thumbnail, self._keyframe_thumbnail)
+            return float(np.mean(difference)) / 255 > self.difference_threshold
+        return False
+
+
+def _thumbnail(frame: np.ndarray) -> np.ndarray:
+    """
+    Return a small grayscale version of a frame, to compute frame differences.
+    """
+    if frame.ndim == 3 and frame.shape[2] == 3:
+        frame = cv2.cvtColor(frame, cv2.COLOR_RGB2GRAY)
+    elif frame.ndim == 3:
+        frame = frame[..., 0]
+    if frame.dtype != np.uint8:
+        frame = np.clip(frame, 0, 255).astype(np.uint8)
+    return cv2.resize(frame, DIFFERENCE_THUMBNAIL_SIZE, interpolation=cv2.INTER_AREA)
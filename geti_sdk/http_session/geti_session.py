@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions
 # and limitations under the License.
 import logging
+import threading
 import time
 import warnings
 from json import JSONDecodeError
@@ -80,6 +81,8 @@ class GetiSession(requests.Session):
 
         self.config = server_config
         self.logged_in = False
+        self._authentication_lock = threading.Lock()
+        self._authentication_count = 0
 
         # Determine authentication method
         if isinstance(server_config, ServerCredentialConfig):
@@ -239,8 +242,8 @@ class GetiSession(requests.Session):
 
         :param url: the REST url without the hostname and api pattern
         :param method: 'GET', 'POST', 'PUT', 'DELETE'
-        :param contenttype: currently either 'json', 'jpeg', 'multipart', 'zip', or '',
-            defaults to "json"
+        :param contenttype: currently either 'json', 'jpeg', 'png', 'webp',
+            'multipart', 'zip', or '', defaults to "json"
         :param data: the data to send in a post request, as json
         :param allow_reauthentication: True to handle authentication errors
             by attempting to re-authenticate. If set to False, such errors
@@ -257,8 +260,6 @@ class GetiSession(requests.Session):
         if url.startswith(self.config.api_pattern):
             url = url[len(self.config.api_pattern) :]
 
-        self._update_headers_for_content_type(content_type=contenttype)
-
         if not include_organization_id:
             requesturl = f"{self.config.base_url}{url}"
         else:
@@ -269,7 +270,7 @@ class GetiSession(requests.Session):
                 kw_data_arg = {"json": data}
             elif contenttype == "multipart":
                 kw_data_arg = {"files": data}
-            elif contenttype == "jpeg" or contenttype == "zip":
+            elif contenttype in ["jpeg", "png", "webp", "zip"]:
                 kw_data_arg = {"data": data}
             else:
                 raise ValueError(
@@ -282,6 +283,7 @@ class GetiSession(requests.Session):
         request_params = {
             "method": method,
             "url": requesturl,
+            "headers": self._get_headers_for_content_type(content_type=contenttype),
             **kw_data_arg,
             "stream": True,
         }
@@ -289,6 +291,7 @@ class GetiSession(requests.Session):
         if not self.use_token:
             request_params.update({"cookies": self._cookies})
 
+        authentication_count = self._authentication_count
         try:
             response = self.request(**request_params, **self._proxies)
         except requests.exceptions.SSLError as error:
@@ -310,6 +313,7 @@ class GetiSession(requests.Session):
                     request_data=kw_data_arg,
                     allow_reauthentication=allow_reauthentication,
                     content_type=contenttype,
+                    authentication_count=authentication_count,
                 )
 
         if response.headers.get("Content-Type", None) == "application/json":
@@ -425,6 +429,7 @@ class GetiSession(requests.Session):
         request_data: Dict[str, Any],
         allow_reauthentication: bool = True,
         content_type: str = "json",
+        authentication_count: Optional[int] = None,
     ) -> Response:
         """
         Handle error responses from the server.
@@ -436,23 +441,36 @@ class GetiSession(requests.Session):
             by attempting to re-authenticate. If set to False, such errors
             will be raised instead.
         :param content_type: The content type of the original request
+        :param authentication_count: Number of times the session had
+            re-authenticated at the time the original request was made. If another
+            thread has re-authenticated since then, the request is retried without
+            authenticating again
         :raises: GetiRequestException in case the error cannot be handled
         :return: Response object resulting from the request
         """
         retry_request = False
 
         if response.status_code in [200, 401, 403] and allow_reauthentication:
-            # Authentication has likely expired, re-authenticate
-            logging.info("Authentication may have expired, re-authenticating...")
-            self.logged_in = False
-            if not self.use_token:
-                self.authenticate(verbose=False)
-                logging.info("Authentication complete.")
+            # Authentication has likely expired, re-authenticate. The lock makes sure
+            # that only one thread re-authenticates if the session is shared
+            with self._authentication_lock:
+                if (
+                    authentication_count is None
+                    or authentication_count == self._authentication_count
+                ):
+                    logging.info(
+                        "Authentication may have expired, re-authenticating..."
+                    )
+                    self.logged_in = False
+                    if not self.use_token:
+                        self.authenticate(verbose=False)
+                        logging.info("Authentication complete.")
 
-            else:
-                access_token = self._acquire_access_token()
-                logging.info("New bearer token obtained.")
-                self.headers.update({"Authorization": f"Bearer {access_token}"})
+                    else:
+                        access_token = self._acquire_access_token()
+                        logging.info("New bearer token obtained.")
+                        self.headers.update({"Authorization": f"Bearer {access_token}"})
+                    self._authentication_count += 1
 
             retry_request = True
 
@@ -466,7 +484,6 @@ class GetiSession(requests.Session):
         # GetiRequestException will be raised holding further details of the
         # reason for failure.
         if retry_request:
-            self._update_headers_for_content_type(content_type=content_type)
             # Reset any file buffers that were included in the request data, so that we
             # can attempt to upload them again.
             if content_type == "multipart":
@@ -491,22 +508,32 @@ class GetiSession(requests.Session):
             response_data=response_data,
         )
 
-    def _update_headers_for_content_type(self, content_type: str) -> None:
+    @staticmethod
+    def _get_headers_for_content_type(content_type: str) -> Dict[str, Optional[str]]:
         """
-        Update the session headers to contain the correct content type
+        Return the headers to send with a request with content of type
+        `content_type`.
+
+        The headers are passed with each individual request rather than stored in
+        the session headers, so that the session can be shared by multiple threads
+        that make requests with different content types at the same time. A header
+        with value None removes the header from the request.
 
         :param content_type: content type for the request
+        :return: Dictionary containing the headers for the request
         """
-        if content_type == "json":
-            self.headers.update({"Content-Type": "application/json"})
-        elif content_type == "jpeg":
-            self.headers.update({"Content-Type": "image/jpeg"})
-        elif content_type == "multipart":
-            self.headers.pop("Content-Type", None)
-        elif content_type == "":
-            self.headers.pop("Content-Type", None)
-        elif content_type == "zip":
-            self.headers.update({"Content-Type": "application/zip"})
+        content_type_headers = {
+            "json": "application/json",
+            "jpeg": "image/jpeg",
+            "png": "image/png",
+            "webp": "image/webp",
+            "multipart": None,
+            "": None,
+            "zip": "application/zip",
+        }
+        if content_type not in content_type_headers:
+            return {}
+        return {"Content-Type": content_type_headers[content_type]}
 
     @property
     def base_url(self) -> str:
@@ -13,10 +13,13 @@
 # and limitations under the License.
 
 import io
+import itertools
 import json
 import logging
 import os
 import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from functools import partial
 from typing import Any, Dict, List, Optional, Tuple, Union
 
 import cv2
@@ -34,13 +37,23 @@ from geti_sdk.data_models import (
     VideoFrame,
 )
 from geti_sdk.data_models.containers import MediaList
-from geti_sdk.data_models.enums import PredictionMode
+from geti_sdk.data_models.enums import PredictionMode, PredictionSource
+from geti_sdk.data_models.model import Model
+from geti_sdk.deployment import DeployedModel, Deployment
 from geti_sdk.http_session import GetiRequestException, GetiSession
+from geti_sdk.rest_clients.model_client import ModelClient
 from geti_sdk.rest_converters.prediction_rest_converter import (
     NormalizedPredictionRESTConverter,
     PredictionRESTConverter,
 )
 
+IMAGE_ENCODING_EXTENSIONS = {"jpeg": ".jpg", "png": ".png", "webp": ".webp"}
+IMAGE_ENCODING_QUALITY_FLAGS = {
+    "jpeg": cv2.IMWRITE_JPEG_QUALITY,
+    "png": cv2.IMWRITE_PNG_COMPRESSION,
+    "webp": cv2.IMWRITE_WEBP_QUALITY,
+}
+
 
 class PredictionClient:
     """
@@ -50,12 +63,24 @@ class PredictionClient:
     def __init__(self, session: GetiSession, project: Project, workspace_id: str):
         self.session = session
         self.project = project
+        self.workspace_id = workspace_id
         self._base_url = f"workspaces/{workspace_id}/projects/{project.id}/"
         self._labels = project.get_all_labels()
         self.__project_ready = self.__are_models_trained()
         self._mode = PredictionMode.AUTO
         self.__override_mode: Optional[PredictionMode] = None
 
+        # Optional local deployment to route predictions to
+        self._deployment: Optional[Deployment] = None
+        self._model_client: Optional[ModelClient] = None
+        self._version_check_interval: Optional[float] = None
+        self._last_version_check: Optional[float] = None
+        self._deployment_is_up_to_date = False
+        self._last_prediction_source: Optional[PredictionSource] = None
+        self._prediction_source_counts: Dict[PredictionSource, int] = {
+            source: 0 for source in PredictionSource
+        }
+
     def __are_models_trained(self) -> bool:
         """
         Check that the project to which this PredictionClient belongs has trained
@@ -295,6 +320,8 @@ class PredictionClient:
         include_result_media: bool = True,
         inferred_frames_only: bool = True,
         frame_stride: Optional[int] = None,
+        max_concurrent_requests: int = 1,
+        resume: bool = False,
     ) -> float:
         """
         Download predictions for a list of videos from the server to a target folder
@@ -311,6 +338,12 @@ class PredictionClient:
         :param frame_stride: Optional frame stride to use when generating predictions.
             This is only used when `inferred_frames_only = False`. If left unspecified,
             the frame_stride is deduced from the video
+        :param max_concurrent_requests: Maximum number of prediction requests that
+            will be in flight at the same time. Defaults to 1, which means that the
+            predictions for the frames are requested one by one
+        :param resume: True to skip all frames for which a prediction has already
+            been saved to the target folder. This allows resuming a download that was
+            interrupted without requesting the same frames again. Defaults to False
         :return: Time elapsed to download the predictions, in seconds
         """
         t_total = 0
@@ -325,6 +358,8 @@ class PredictionClient:
                 include_result_media=include_result_media,
                 inferred_frames_only=inferred_frames_only,
                 frame_stride=frame_stride,
+                max_concurrent_requests=max_concurrent_requests,
+                resume=resume,
             )
         logging.info(f"Video prediction download finished in {t_total:.1f} seconds.")
         return t_total
@@ -336,6 +371,8 @@ class PredictionClient:
         include_result_media: bool = True,
         inferred_frames_only: bool = True,
         frame_stride: Optional[int] = None,
+        max_concurrent_requests: int = 1,
+        resume: bool = False,
     ) -> float:
         """
         Download video predictions from the server to a target folder on disk.
@@ -350,6 +387,12 @@ class PredictionClient:
         :param frame_stride: Optional frame stride to use when generating predictions.
             This is only used when `inferred_frames_only = False`. If left unspecified,
             the frame_stride is deduced from the video
+        :param max_concurrent_requests: Maximum number of prediction requests that
+            will be in flight at the same time. Defaults to 1, which means that the
+            predictions for the frames are requested one by one
+        :param resume: True to skip all frames for which a prediction has already
+            been saved to the target folder. This allows resuming a download that was
+            interrupted without requesting the same frames again. Defaults to False
         :return: Returns the time elapsed to download the predictions, in seconds
         """
         if inferred_frames_only:
@@ -384,6 +427,8 @@ class PredictionClient:
                 path_to_folder=path_to_folder,
                 verbose=False,
                 include_result_media=include_result_media,
+                max_concurrent_requests=max_concurrent_requests,
+                resume=resume,
             )
         else:
             result = 0
@@ -413,6 +458,8 @@ class PredictionClient:
         path_to_folder: str,
         include_result_media: bool = True,
         verbose: bool = True,
+        max_concurrent_requests: int = 1,
+        resume: bool = False,
     ) -> float:
         """
         Download predictions from the server to a target folder on disk.
@@ -423,6 +470,10 @@ class PredictionClient:
         :param include_result_media: True to also download the result media belonging
             to the predictions, if any. False to skip downloading result media
         :param verbose: True to print verbose output, False to run in silent mode
+        :param max_concurrent_requests: Maximum number of prediction requests that
+            will be in flight at the same time
+        :param resume: True to skip all media items for which a prediction file
+            already exists in the target folder
         :return: Returns the time elapsed to download the predictions, in seconds
         """
         if media_list.media_type == Image:
@@ -436,6 +487,11 @@ class PredictionClient:
                 "Invalid media type found in media_list, unable to download "
                 "predictions."
             )
+        if max_concurrent_requests < 1:
+            raise ValueError(
+                f"Invalid value `{max_concurrent_requests}` for "
+                f"`max_concurrent_requests`, please specify a value of at least 1."
+            )
 
         if not path_to_folder.endswith("predictions"):
             path_to_predictions_folder = os.path.join(path_to_folder, "predictions")
@@ -449,79 +505,73 @@ class PredictionClient:
                 f"{path_to_predictions_folder}"
             )
         os.makedirs(path_to_predictions_folder, exist_ok=True, mode=0o770)
+
+        resume_count = 0
+        if resume:
+            # Prediction files are only written once the full prediction for an item
+            # is downloaded, so existing files mark the items that are completed
+            media_to_download: List[MediaItem] = []
+            for media_item in media_list:
+                if os.path.isfile(
+                    os.path.join(path_to_predictions_folder, media_item.name + ".json")
+                ):
+                    resume_count += 1
+                else:
+                    media_to_download.append(media_item)
+            if verbose and resume_count > 0:
+                logging.info(
+                    f"Found existing predictions for {resume_count} "
+                    f"{media_name_plural}, these will not be downloaded again."
+                )
+        else:
+            media_to_download = list(media_list)
+
+        prediction_mode = self.mode
         t_start = time.time()
         download_count = 0
         skip_count = 0
         tqdm_prefix = "Downloading predictions"
-        with logging_redirect_tqdm(tqdm_class=tqdm):
-            for media_item in tqdm(media_list, desc=tqdm_prefix):
-                prediction, msg = self._get_prediction_for_media_item(
-                    media_item, prediction_mode=self.mode
-                )
-                if prediction is None:
-                    if verbose:
-                        logging.info(
-                            f"Unable to retrieve prediction for {media_name} "
-                            f"{media_item.name}, with reason: {msg}. Skipping this "
-                            f"{media_name}"
-                        )
-                    skip_count += 1
-                    continue
-                kind = prediction.kind
-                if kind != AnnotationKind.PREDICTION:
-                    if verbose:
-                        logging.warning(
-                            f"Received invalid prediction of kind {kind} for {media_name} "
-                            f"with name{media_item.name}"
-                        )
-                    skip_count += 1
-                    continue
-
-                # Download result media belonging to the prediction, if required
-                if prediction.has_result_media and include_result_media:
-                    try:
-                        result_media = prediction.get_result_media_data(self.session)
-                    except GetiRequestException:
-                        if verbose:
-                            logging.info(
-                                f"Unable to retrieve prediction result map for "
-                                f"{media_name} '{media_item.name}'. Skipping"
-                            )
-                        result_media = None
-                    if result_media is not None:
-                        path_to_result_media_folder = os.path.join(
-                            path_to_predictions_folder, "saliency_maps"
-                        )
-                        os.makedirs(
-                            path_to_result_media_folder, exist_ok=True, mode=0o770
+        download_prediction = partial(
+            self._download_prediction_for_media_item,
+            prediction_mode=prediction_mode,
+            path_to_predictions_folder=path_to_predictions_folder,
+            include_result_media=include_result_media,
+            media_name=media_name,
+            verbose=verbose,
+        )
+        with logging_redirect_tqdm(tqdm_class=tqdm), tqdm(
+            total=len(media_to_download), desc=tqdm_prefix
+        ) as progress_bar:
+            if max_concurrent_requests == 1:
+                for media_item in media_to_download:
+                    success = download_prediction(media_item)
+                    download_count += int(success)
+                    skip_count += int(not success)
+                    progress_bar.update(1)
+            else:
+                media_iterator = iter(media_to_download)
+                with ThreadPoolExecutor(
+                    max_workers=max_concurrent_requests
+                ) as executor:
+                    # Only submit a new request once a running request completes, to
+                    # bound the number of requests in flight
+                    pending = {
+                        executor.submit(download_prediction, media_item)
+                        for media_item in itertools.islice(
+                            media_iterator, max_concurrent_requests
                         )
-                        for result_medium in result_media:
-                            result_media_path = os.path.join(
-                                path_to_result_media_folder,
-                                media_item.name
-                                + "_"
-                                + result_medium.friendly_name
-                                + ".jpg",
-                            )
-
-                            os.makedirs(
-                                os.path.dirname(result_media_path),
-                                exist_ok=True,
-                                mode=0o770,
+                    }
+                    while pending:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            success = future.result()
+                            download_count += int(success)
+                            skip_count += int(not success)
+                            progress_bar.update(1)
+                        for media_item in itertools.islice(media_iterator, len(done)):
+                            pending.add(
+                                executor.submit(download_prediction, media_item)
                             )
-                            with open(result_media_path, "wb") as f:
-                                f.write(result_medium.data)
-
-                # Convert prediction to json and save to file
-                export_data = PredictionRESTConverter.to_dict(prediction)
-                prediction_path = os.path.join(
-                    path_to_predictions_folder, media_item.name + ".json"
-                )
-
-                os.makedirs(os.path.dirname(prediction_path), exist_ok=True, mode=0o770)
-                with open(prediction_path, "w") as f:
-                    json.dump(export_data, f, indent=4)
-                download_count += 1
         t_elapsed = time.time() - t_start
         if download_count > 0:
             msg = (
@@ -539,18 +589,277 @@ class PredictionClient:
             logging.info(msg)
         return t_elapsed
 
+    def _download_prediction_for_media_item(
+        self,
+        media_item: Union[Image, VideoFrame],
+        prediction_mode: PredictionMode,
+        path_to_predictions_folder: str,
+        include_result_media: bool = True,
+        media_name: str = "image",
+        verbose: bool = True,
+    ) -> bool:
+        """
+        Download the prediction for a single image or video frame and save it to the
+        target folder on disk.
+
+        The prediction file is written only once the prediction and its result media
+        have been retrieved successfully, so that the presence of the file indicates
+        a completed download.
+
+        :param media_item: Image or VideoFrame to download the prediction for
+        :param prediction_mode: PredictionMode to use for retrieving the prediction
+        :param path_to_predictions_folder: Folder to save the prediction to
+        :param include_result_media: True to also download the result media belonging
+            to the prediction, if any. False to skip downloading result media
+        :param media_name: Name of the media type, used in log messages
+        :param verbose: True to print verbose output, False to run in silent mode
+        :return: True if the prediction was downloaded successfully, False otherwise
+        """
+        prediction, msg = self._get_prediction_for_media_item(
+            media_item, prediction_mode=prediction_mode
+        )
+        if prediction is None:
+            if verbose:
+                logging.info(
+                    f"Unable to retrieve prediction for {media_name} "
+                    f"{media_item.name}, with reason: {msg}. Skipping this "
+                    f"{media_name}"
+                )
+            return False
+        kind = prediction.kind
+        if kind != AnnotationKind.PREDICTION:
+            if verbose:
+                logging.warning(
+                    f"Received invalid prediction of kind {kind} for {media_name} "
+                    f"with name{media_item.name}"
+                )
+            return False
+
+        # Download result media belonging to the prediction, if required
+        if prediction.has_result_media and include_result_media:
+            try:
+                result_media = prediction.get_result_media_data(self.session)
+            except GetiRequestException:
+                if verbose:
+                    logging.info(
+                        f"Unable to retrieve prediction result map for "
+                        f"{media_name} '{media_item.name}'. Skipping"
+                    )
+                result_media = None
+            if result_media is not None:
+                path_to_result_media_folder = os.path.join(
+                    path_to_predictions_folder, "saliency_maps"
+                )
+                os.makedirs(path_to_result_media_folder, exist_ok=True, mode=0o770)
+                for result_medium in result_media:
+                    result_media_path = os.path.join(
+                        path_to_result_media_folder,
+                        media_item.name + "_" + result_medium.friendly_name + ".jpg",
+                    )
+
+                    os.makedirs(
+                        os.path.dirname(result_media_path),
+                        exist_ok=True,
+                        mode=0o770,
+                    )
+                    with open(result_media_path, "wb") as f:
+                        f.write(result_medium.data)
+
+        # Convert prediction to json and save to file. The file is written to a
+        # temporary location first, so that an interrupted download never leaves a
+        # partial prediction file behind
+        export_data = PredictionRESTConverter.to_dict(prediction)
+        prediction_path = os.path.join(
+            path_to_predictions_folder, media_item.name + ".json"
+        )
+
+        os.makedirs(os.path.dirname(prediction_path), exist_ok=True, mode=0o770)
+        temp_prediction_path = prediction_path + ".partial"
+        with open(temp_prediction_path, "w") as f:
+            json.dump(export_data, f, indent=4)
+        os.replace(temp_prediction_path, prediction_path)
+        return True
+
+    @property
+    def deployment(self) -> Optional[Deployment]:
+        """
+        Return the local deployment attached to the PredictionClient, if any.
+        """
+        return self._deployment
+
+    @property
+    def last_prediction_source(self) -> Optional[PredictionSource]:
+        """
+        Return where the prediction for the last call to :py:meth:`predict_image`
+        was generated: by the local deployment or by the Intel® Geti™ server.
+
+        :return: PredictionSource for the last prediction, or None if no prediction
+            was made yet
+        """
+        return self._last_prediction_source
+
+    @property
+    def prediction_source_counts(self) -> Dict[str, int]:
+        """
+        Return the number of predictions made by :py:meth:`predict_image` that were
+        generated by the local deployment and by the Intel® Geti™ server.
+
+        :return: Dictionary mapping the prediction source ('local' or 'remote') to
+            the number of predictions generated there
+        """
+        return {
+            str(source): count
+            for source, count in self._prediction_source_counts.items()
+        }
+
+    def attach_deployment(
+        self, deployment: Deployment, version_check_interval: Optional[float] = 60
+    ) -> None:
+        """
+        Attach a local deployment for the project to the PredictionClient. As long as
+        the models in the deployment are the active models for the project on the
+        Intel® Geti™ server, :py:meth:`predict_image` runs inference with the
+        deployment instead of sending the image to the server. If the active models
+        on the server change, predictions are requested from the server again.
+
+        :param deployment: Deployment for the project, for example created by
+            :py:meth:`~geti_sdk.geti.Geti.deploy_project`. The inference models for
+            the deployment must be loaded
+        :param version_check_interval: Time, in seconds, after which the active
+            models on the server are checked again. Set to 0 to check before every
+            prediction, or to None to only check when the deployment is attached
+        """
+        if not deployment.are_models_loaded:
+            raise ValueError(
+                "The inference models for the deployment are not loaded. Please call "
+                "'deployment.load_inference_models' before attaching it to the "
+                "PredictionClient."
+            )
+        if len(deployment.models) != len(self.project.get_trainable_tasks()):
+            raise ValueError(
+                f"The deployment contains {len(deployment.models)} models, but "
+                f"project '{self.project.name}' has "
+                f"{len(self.project.get_trainable_tasks())} trainable tasks. Unable "
+                f"to attach the deployment."
+            )
+        if self._model_client is None:
+            self._model_client = ModelClient(
+                workspace_id=self.workspace_id,
+                project=self.project,
+                session=self.session,
+            )
+        self._deployment = deployment
+        self._version_check_interval = version_check_interval
+        self._check_deployment_versions()
+
+    def detach_deployment(self) -> None:
+        """
+        Detach the local deployment from the PredictionClient. All subsequent
+        predictions are requested from the Intel® Geti™ server.
+        """
+        self._deployment = None
+        self._last_version_check = None
+        self._deployment_is_up_to_date = False
+
+    def _check_deployment_versions(self) -> bool:
+        """
+        Check whether the models in the attached deployment are the active models for
+        the project on the Intel® Geti™ server.
+
+        The result is cached, the server is only queried again once the version check
+        interval has passed.
+
+        :return: True if the deployment can be used to generate predictions, False
+            otherwise
+        """
+        if self._deployment is None:
+            return False
+        now = time.monotonic()
+        if self._last_version_check is not None and (
+            self._version_check_interval is None
+            or now - self._last_version_check < self._version_check_interval
+        ):
+            return self._deployment_is_up_to_date
+
+        is_up_to_date = True
+        for task, deployed_model in zip(
+            self.project.get_trainable_tasks(), self._deployment.models
+        ):
+            active_model = self._model_client.get_active_model_for_task(task)
+            if active_model is None or not _is_deployed_version_of(
+                deployed_model, active_model
+            ):
+                is_up_to_date = False
+                break
+        if is_up_to_date != self._deployment_is_up_to_date:
+            if is_up_to_date:
+                logging.info(
+                    f"The attached deployment is up to date with the active models for "
+                    f"project '{self.project.name}', predictions are generated locally."
+                )
+            else:
+                logging.warning(
+                    f"The models in the attached deployment differ from the active "
+                    f"models for project '{self.project.name}' on the server. "
+                    f"Predictions are requested from the server instead."
+                )
+        self._deployment_is_up_to_date = is_up_to_date
+        self._last_version_check = now
+        return is_up_to_date
+
+    def _record_prediction_source(self, source: PredictionSource) -> None:
+        """
+        Record where a prediction made by :py:meth:`predict_image` was generated.
+
+        :param source: PredictionSource for the prediction
+        """
+        self._last_prediction_source = source
+        self._prediction_source_counts[source] += 1
+
     def predict_image(
-        self, image: Union[Image, np.ndarray, os.PathLike, str]
+        self,
+        image: Union[Image, np.ndarray, os.PathLike, str],
+        max_size: Optional[int] = None,
+        encoding: str = "jpeg",
+        quality: Optional[int] = None,
     ) -> Prediction:
         """
         Push an image to the Intel® Geti™ project and receive a prediction for it.
 
         Note that this method will not save the image to the project.
 
+        The `max_size`, `encoding` and `quality` parameters control how the image is
+        encoded before it is sent to the server. For large images, limiting the size
+        of the payload can reduce upload time considerably. If the image is
+        downscaled, the shapes in the returned prediction are scaled back to the
+        coordinate system of the original image.
+
+        If a local deployment is attached to the PredictionClient and its models are
+        the active models for the project, the prediction is generated by the
+        deployment instead, at full resolution. The
+        :py:attr:`last_prediction_source` property reports where the prediction was
+        generated.
+
         :param image: Image object, filepath to an image or numpy array containing an
-            image to get the prediction for
+            image to get the prediction for. Pixel data is expected in BGR channel
+            order
+        :param max_size: Optional maximum length (in pixels) of the longest side of the
+            image that is sent to the server. Images that exceed this size are
+            downscaled before uploading. Defaults to None, in which case the image is
+            sent at full resolution
+        :param encoding: Image format to use for the payload. Can be either 'jpeg',
+            'png' or 'webp'. Defaults to 'jpeg'
+        :param quality: Optional encoding quality to use. For 'jpeg' and 'webp' this
+            is a value between 0 and 100, for 'png' it is the compression level
+            between 0 and 9. If left as None, the OpenCV default for the encoding is
+            used
         :return: Prediction for the image
         """
+        if encoding not in IMAGE_ENCODING_EXTENSIONS.keys():
+            raise ValueError(
+                f"Invalid image encoding `{encoding}` specified. Supported encodings "
+                f"are: {list(IMAGE_ENCODING_EXTENSIONS.keys())}"
+            )
         # Get image pixel data from input
         image_data: Optional[np.ndarray]
         image_name: Optional[str]
@@ -566,7 +875,7 @@ class PredictionClient:
             image_name = image.name
         elif isinstance(image, np.ndarray):
             image_data = image
-            image_name = "numpy_image.jpg"
+            image_name = "numpy_image"
         elif isinstance(image, (os.PathLike, str)):
             image_data = None
             image_name = None
@@ -576,17 +885,153 @@ class PredictionClient:
                 f"Please either pass an 'Image' object, a numpy array or a filepath."
             )
 
-        if image_data is None:
+        if self._check_deployment_versions():
+            if image_data is None:
+                image_data = _read_image_file(image)
+            prediction = self._deployment.infer(
+                cv2.cvtColor(image_data, cv2.COLOR_BGR2RGB)
+            )
+            self._record_prediction_source(PredictionSource.LOCAL)
+            return prediction
+
+        requires_encoding = (
+            max_size is not None or quality is not None or encoding != "jpeg"
+        )
+        scale_factor = 1.0
+        if image_data is None and not requires_encoding:
             image_io = open(image, "rb").read()
         else:
-            image_io = io.BytesIO(cv2.imencode(".jpg", image_data)[1].tobytes())
-            image_io.name = image_name
+            if image_data is None:
+                image_data = _read_image_file(image)
+                image_name = os.path.splitext(os.path.basename(image))[0]
+            image_io, scale_factor = self._encode_image_payload(
+                image_data=image_data,
+                max_size=max_size,
+                encoding=encoding,
+                quality=quality,
+            )
+            image_io.name = (
+                os.path.splitext(image_name)[0] + IMAGE_ENCODING_EXTENSIONS[encoding]
+            )
 
         # make POST request
         response = self.session.get_rest_response(
             url=f"{self._base_url}predict",
             method="POST",
-            contenttype="jpeg",
+            contenttype=encoding,
             data=image_io,
         )
-        return PredictionRESTConverter.from_dict(response)
+        prediction = PredictionRESTConverter.from_dict(response)
+        if scale_factor != 1:
+            self._rescale_prediction(
+                prediction=prediction,
+                resized_width=round(image_data.shape[1] * scale_factor),
+                resized_height=round(image_data.shape[0] * scale_factor),
+                original_width=image_data.shape[1],
+                original_height=image_data.shape[0],
+            )
+        self._record_prediction_source(PredictionSource.REMOTE)
+        return prediction
+
+    @staticmethod
+    def _encode_image_payload(
+        image_data: np.ndarray,
+        max_size: Optional[int] = None,
+        encoding: str = "jpeg",
+        quality: Optional[int] = None,
+    ) -> Tuple[io.BytesIO, float]:
+        """
+        Encode the pixel data in `image_data` to a binary payload that can be sent to
+        the Intel® Geti™ server, downscaling the image if needed.
+
+        :param image_data: Numpy array containing the pixel data to encode
+        :param max_size: Optional maximum length of the longest side of the image
+        :param encoding: Image format to encode to
+        :param quality: Optional quality or compression level for the encoding
+        :return: Tuple containing:
+         - BytesIO object holding the encoded image
+         - scale factor that was applied to the image before encoding
+        """
+        scale_factor = 1.0
+        height, width = image_data.shape[0:2]
+        if max_size is not None and max(height, width) > max_size:
+            scale_factor = max_size / max(height, width)
+            image_data = cv2.resize(
+                image_data,
+                dsize=(round(width * scale_factor), round(height * scale_factor)),
+                interpolation=cv2.INTER_AREA,
+            )
+        encoding_params: List[int] = []
+        if quality is not None:
+            encoding_params = [IMAGE_ENCODING_QUALITY_FLAGS[encoding], int(quality)]
+        success, buffer = cv2.imencode(
+            IMAGE_ENCODING_EXTENSIONS[encoding], image_data, encoding_params
+        )
+        if not success:
+            raise ValueError(f"Unable to encode image to format `{encoding}`.")
+        return io.BytesIO(buffer.tobytes()), scale_factor
+
+    @staticmethod
+    def _rescale_prediction(
+        prediction: Prediction,
+        resized_width: int,
+        resized_height: int,
+        original_width: int,
+        original_height: int,
+    ) -> None:
+        """
+        Convert the shapes in a `prediction` that was generated for a resized image
+        back to the coordinate system of the original image. The prediction is
+        modified in place.
+
+        :param prediction: Prediction to rescale
+        :param resized_width: Width of the image for which the prediction was made
+        :param resized_height: Height of the image for which the prediction was made
+        :param original_width: Width of the original image
+        :param original_height: Height of the original image
+        """
+        factor_x = original_width / resized_width
+        factor_y = original_height / resized_height
+        for annotation in prediction.annotations:
+            annotation.shape = annotation.shape.scale(
+                factor_x=factor_x, factor_y=factor_y
+            )
+
+
+def _read_image_file(path: Union[os.PathLike, str]) -> np.ndarray:
+    """
+    Read the pixel data for an image file, in BGR channel order.
+
+    :param path: Path to the image file
+    :return: Numpy array containing the pixel data
+    """
+    image_data = cv2.imread(str(path))
+    if image_data is None:
+        raise ValueError(
+            f"Unable to read image from file `{path}`. Please make sure that the "
+            f"file exists and is a valid image."
+        )
+    return image_data
+
+
+def _is_deployed_version_of(deployed_model: DeployedModel, active_model: Model) -> bool:
+    """
+    Return True if `deployed_model` is one of the optimized versions of the
+    `active_model`.
+
+    If the deployed model has no ID, the version numbers of the models are compared
+    instead.
+
+    :param deployed_model: Model in a local deployment
+    :param active_model: Active model for the corresponding task on the server
+    """
+    optimized_model_ids = {
+        optimized_model.id
+        for optimized_model in active_model.optimized_models
+        if optimized_model.id is not None
+    }
+    if deployed_model.id is not None and optimized_model_ids:
+        return deployed_model.id in optimized_model_ids
+    return deployed_model.version is not None and (
+        deployed_model.version == active_model.version
+    )
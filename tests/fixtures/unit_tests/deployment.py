@@ -0,0 +1,43 @@
+# Copyright (C) 2023 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions
+# and limitations under the License.
+from typing import Callable
+
+import pytest
+
+from geti_sdk.deployment import DeployedModel
+
+
+@pytest.fixture()
+def fxt_deployed_model_factory(
+    fxt_datetime_string: str,
+) -> Callable[[str], DeployedModel]:
+    """
+    Return a factory that creates a DeployedModel with the given name. The model
+    does not hold any model data
+    """
+
+    def _create_deployed_model(name: str = "dummy model") -> DeployedModel:
+        return DeployedModel(
+            name=name,
+            fps_throughput="0",
+            latency="0",
+            precision=["FP32"],
+            creation_date=fxt_datetime_string,
+            model_status="SUCCESS",
+            optimization_methods=[],
+            optimization_objectives={},
+            optimization_type="MO",
+        )
+
+    yield _create_deployed_model
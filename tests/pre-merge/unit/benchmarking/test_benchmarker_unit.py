@@ -0,0 +1,267 @@
+# Copyright (C) 2023 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions
+# and limitations under the License.
+import csv
+import weakref
+from typing import Callable, List
+
+import numpy as np
+import openvino.runtime as ov
+import pytest
+from openvino.model_api.adapters import OpenvinoAdapter
+from openvino.model_api.models import Model
+from openvino.runtime import opset8 as ops
+from pytest_mock import MockerFixture
+
+from geti_sdk.benchmarking import Benchmarker
+from geti_sdk.data_models import Prediction, Project
+from geti_sdk.deployment import DeployedModel, Deployment
+
+
+@pytest.fixture()
+def fxt_benchmarker(
+    mocker: MockerFixture,
+    fxt_classification_project: Project,
+    fxt_deployed_model_factory: Callable[[str], DeployedModel],
+) -> Benchmarker:
+    """
+    Return a Benchmarker for the classification project holding two deployments,
+    without connecting to a Geti server
+    """
+    benchmarker = Benchmarker.__new__(Benchmarker)
+    benchmarker.geti = mocker.MagicMock()
+    benchmarker.project = fxt_classification_project
+    benchmarker._is_single_task = True
+    benchmarker.images = None
+    benchmarker.video = None
+    benchmarker._deployment_folders = ["deployment_a", "deployment_b"]
+    mocker.patch(
+        "geti_sdk.benchmarking.benchmarker.Deployment.from_folder",
+        side_effect=lambda folder: Deployment(
+            project=fxt_classification_project,
+            models=[fxt_deployed_model_factory(f"model for {folder}")],
+        ),
+    )
+    mocker.patch(
+        "geti_sdk.benchmarking.benchmarker.load_benchmark_media",
+        return_value=[np.zeros((8, 8, 3), dtype=np.uint8)] * 10,
+    )
+    mocker.patch(
+        "geti_sdk.benchmarking.benchmarker.get_system_info",
+        return_value={"openvino_version": "test"},
+    )
+    mocker.patch.object(Deployment, "load_inference_models")
+    yield benchmarker
+
+
+class TestBenchmarker:
+    def test_run_batch_throughput_benchmark(
+        self, mocker: MockerFixture, fxt_benchmarker: Benchmarker, tmp_path
+    ):
+        # Arrange
+        batch_sizes: List[int] = []
+
+        def _infer_batch(images: List[np.ndarray], max_batch_size: int):
+            if max_batch_size > 4:
+                raise RuntimeError("Batch too large")
+            batch_sizes.append(len(images))
+
+        mocker.patch.object(Deployment, "infer_batch", side_effect=_infer_batch)
+
+        # Act
+        results = fxt_benchmarker.run_batch_throughput_benchmark(
+            working_directory=tmp_path, frames=10, repeats=2, batch_sizes=[1, 4, 8]
+        )
+
+        # Assert
+        with open(tmp_path / "batch_results.csv", newline="") as csvfile:
+            rows = list(csv.DictReader(csvfile))
+        assert rows == results
+        assert [row["batch size"] for row in rows] == ["1", "4", "8"] * 2
+        assert [row["success"] for row in rows] == ["1", "1", "0"] * 2
+        assert [row["source"] for row in rows] == ["deployment_a"] * 3 + [
+            "deployment_b"
+        ] * 3
+        assert rows[0]["model 1"] == "model for deployment_a"
+        assert rows[2]["fps"] == "0.00"
+        assert rows[0]["total frames"] == "20"
+        assert rows[0]["openvino_version"] == "test"
+        assert max(batch_sizes) == 4
+
+    def test_run_throughput_benchmark(
+        self, mocker: MockerFixture, fxt_benchmarker: Benchmarker, tmp_path
+    ):
+        # Arrange
+        task_title = fxt_benchmarker.project.get_trainable_tasks()[0].title
+        n_calls: List[int] = []
+
+        def _infer(deployment: Deployment, image: np.ndarray):
+            n_calls.append(1)
+            deployment.stage_timer.record(task_title, "infer", 0.002)
+            # The first frame after warm-up fails
+            if len(n_calls) == 3:
+                raise RuntimeError("Inference failed")
+
+        mocker.patch.object(Deployment, "infer", autospec=True, side_effect=_infer)
+
+        # Act
+        results = fxt_benchmarker.run_throughput_benchmark(
+            working_directory=tmp_path, frames=10, repeats=2, warmup_frames=2
+        )
+
+        # Assert
+        with open(tmp_path / "results_frames.csv", newline="") as csvfile:
+            frame_rows = list(csv.DictReader(csvfile))
+        assert len(n_calls) == 2 * (2 + 10 * 2)
+        assert [row["failed frames"] for row in results] == ["1", "0"]
+        assert all(row["success"] == "1" for row in results)
+        assert float(results[0]["latency p50 [ms]"]) <= float(
+            results[0]["latency p99 [ms]"]
+        )
+        assert results[0][f"{task_title} infer [ms]"] == "2.00"
+        assert float(results[0]["cold load time [s]"]) >= 0
+        assert float(results[0]["warm load time [s]"]) >= 0
+        assert float(results[0]["peak memory load [MB]"]) > 0
+        assert float(results[0]["peak memory inference [MB]"]) > 0
+        assert "memory delta [MB]" in results[0]
+        # Each deployment is loaded twice, for the cold and the warm load
+        assert Deployment.load_inference_models.call_count == 2 * 2
+        assert results[0][f"{task_title} preprocess [ms]"] == "0.00"
+        # Warm-up frames are not included in the frame timings
+        assert len(frame_rows) == 2 * 10 * 2
+        assert [row["success"] for row in frame_rows[:2]] == ["0", "1"]
+        assert frame_rows[0]["source"] == "deployment_a"
+
+    def test_run_throughput_benchmark_async(
+        self, mocker: MockerFixture, fxt_benchmarker: Benchmarker, tmp_path
+    ):
+        # Arrange
+        def _infer_async(
+            deployment: Deployment,
+            image: np.ndarray,
+            callback,
+            runtime_data=None,
+            error_callback=None,
+        ):
+            callback(image, Prediction(annotations=[]), runtime_data)
+
+        mocker.patch.object(
+            Deployment, "infer_async", autospec=True, side_effect=_infer_async
+        )
+        mocker.patch.object(Deployment, "await_all")
+
+        # Act
+        results = fxt_benchmarker.run_throughput_benchmark(
+            working_directory=tmp_path,
+            frames=10,
+            repeats=1,
+            mode="async",
+            streams=[1, "AUTO"],
+            requests=[1, 4],
+        )
+
+        # Assert
+        with open(tmp_path / "results_frames.csv", newline="") as csvfile:
+            frame_rows = list(csv.DictReader(csvfile))
+        assert len(results) == 2 * 4
+        assert [row["streams"] for row in results[:4]] == ["1", "1", "AUTO", "AUTO"]
+        assert all(row["mode"] == "async" for row in results)
+        assert all(row["success"] == "1" for row in results)
+        load_kwargs = [
+            call.kwargs for call in Deployment.load_inference_models.call_args_list
+        ]
+        # Every configuration is loaded twice, for the cold and the warm load
+        assert [kwargs["max_async_infer_requests"] for kwargs in load_kwargs[:8:2]] == [
+            1,
+            4,
+            1,
+            4,
+        ]
+        assert all(kwargs["performance_hint"] == "THROUGHPUT" for kwargs in load_kwargs)
+        assert len(frame_rows) == 2 * 4 * 10
+        assert all(float(row["latency [ms]"]) >= 0 for row in frame_rows)
+
+    def test_run_startup_benchmark(
+        self, mocker: MockerFixture, fxt_benchmarker: Benchmarker, tmp_path
+    ):
+        # Arrange
+        mocker.patch.object(Deployment, "infer")
+
+        # Act
+        results = fxt_benchmarker.run_startup_benchmark(working_directory=tmp_path)
+
+        # Assert
+        assert [row["cache"] for row in results] == ["cold", "warm"] * 2
+        assert all(row["success"] == "1" for row in results)
+        assert all(float(row["startup time [s]"]) >= 0 for row in results)
+        cache_dirs = [
+            call.kwargs["cache_dir"]
+            for call in Deployment.load_inference_models.call_args_list
+        ]
+        # Cold and warm start for a deployment share the cache, which is not
+        # shared between deployments
+        assert cache_dirs[0] == cache_dirs[1]
+        assert cache_dirs[2] == cache_dirs[3]
+        assert cache_dirs[0] != cache_dirs[2]
+
+    def test_run_throughput_benchmark_without_deployments(
+        self, fxt_benchmarker: Benchmarker, tmp_path
+    ):
+        # Arrange
+        fxt_benchmarker._deployment_folders = []
+
+        # Act and assert
+        with pytest.raises(ValueError):
+            fxt_benchmarker.run_throughput_benchmark(working_directory=tmp_path)
+
+    def test_load_deployment_with_metrics_releases_cold_deployment(
+        self, mocker: MockerFixture, fxt_benchmarker: Benchmarker, tmp_path
+    ):
+        # Arrange
+        image = ops.parameter([1, 3, 4, 4], np.float32, name="image")
+        output = ops.relu(image).output(0)
+        output.get_tensor().set_names({"relu"})
+        model_path = str(tmp_path / "model.xml")
+        ov.serialize(ov.Model([output], [image], "test_model"), model_path)
+        loaded_deployments: List[weakref.ref] = []
+        released_before_load: List[bool] = []
+
+        def _load_inference_models(self: Deployment, **kwargs):
+            # Give each model an infer queue that is set up like a real inference
+            # model, and check that earlier deployments have been released
+            released_before_load.append(
+                all(reference() is None for reference in loaded_deployments)
+            )
+            for model in self.models:
+                adapter = OpenvinoAdapter(ov.Core(), model=model_path)
+                model._inference_model = Model(adapter, configuration={}, preload=True)
+                adapter.set_callback(DeployedModel._adapter_callback)
+            self._prepare_async_inference(max_async_infer_requests=1)
+            self._are_models_loaded = True
+            loaded_deployments.append(weakref.ref(self))
+
+        mocker.patch.object(Deployment, "load_inference_models", _load_inference_models)
+        deployment = Deployment.from_folder("deployment_a")
+
+        # Act
+        load_metrics = fxt_benchmarker._load_deployment_with_metrics(
+            deployment, "deployment_a", "CPU", str(tmp_path / "cache")
+        )
+
+        # Assert
+        # The cold loaded deployment is collected before the warm load is measured
+        assert released_before_load == [True, True]
+        assert loaded_deployments[0]() is None
+        assert loaded_deployments[1]() is deployment
+        assert load_metrics["cold load time [s]"] > 0
+        assert load_metrics["warm load time [s]"] > 0
@@ -133,3 +133,32 @@ class TestShapes:
 
         with pytest.raises(ValueError):
             RotatedRectangle.from_polygon(polygon=fxt_triangle)
+
+    def test_scale(
+        self,
+        fxt_rectangle: Rectangle,
+        fxt_ellipse: Ellipse,
+        fxt_triangle: Polygon,
+        fxt_rotated_rectangle: RotatedRectangle,
+    ):
+        # Act
+        rectangle = fxt_rectangle.scale(factor_x=0.5, factor_y=2)
+        ellipse = fxt_ellipse.scale(factor_x=0.5, factor_y=2)
+        triangle = fxt_triangle.scale(factor_x=0.5, factor_y=2)
+        rotated_rect = fxt_rotated_rectangle.scale(factor_x=2, factor_y=2)
+        rotated_rect_non_uniform = fxt_rotated_rectangle.scale(factor_x=2, factor_y=1)
+
+        # Assert
+        assert rectangle == Rectangle(x=25, y=400, width=450, height=3200)
+        assert ellipse == Ellipse(x=25, y=400, width=450, height=3200)
+        assert triangle == Polygon(
+            points=[Point(x=5, y=40), Point(x=15, y=100), Point(x=25, y=40)]
+        )
+        assert rotated_rect == RotatedRectangle(
+            x=400, y=400, width=100, height=200, angle=45
+        )
+        assert rotated_rect_non_uniform.x == 400
+        assert rotated_rect_non_uniform.y == 200
+        assert rotated_rect_non_uniform.angle == pytest.approx(
+            math.degrees(math.atan(0.5)), abs=1e-3
+        )
@@ -0,0 +1,136 @@
+# Copyright (C) 2023 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions
+# and limitations under the License.
+import threading
+import time
+from typing import List, Optional, Tuple
+
+import numpy as np
+import pytest
+from pytest_mock import MockerFixture
+
+from geti_sdk.data_models import Prediction
+from geti_sdk.demos.predict_video import _VideoPredictionPipeline
+
+
+class _VideoCapture:
+    """
+    Stand-in for a cv2.VideoCapture that returns `n_frames` frames, filled with the
+    index of the frame
+    """
+
+    def __init__(self, n_frames: int):
+        self.frames = [
+            np.full((4, 4, 3), index, dtype=np.uint8) for index in range(n_frames)
+        ]
+
+    def read(self) -> Tuple[bool, Optional[np.ndarray]]:
+        if not self.frames:
+            return False, None
+        return True, self.frames.pop(0)
+
+
+class _VideoWriter:
+    """
+    Stand-in for a cv2.VideoWriter that records the index of the frames written
+    """
+
+    def __init__(self):
+        self.frame_indices: List[int] = []
+
+    def write(self, frame: np.ndarray):
+        self.frame_indices.append(int(frame[0, 0, 0]))
+
+
+class _Deployment:
+    """
+    Stand-in for a Deployment that completes asynchronous requests in separate
+    threads, after a random delay so that they complete out of order. Inference
+    fails for frames with a value in `fail_on`
+    """
+
+    def __init__(self, fail_on: Tuple[int, ...] = ()):
+        self.fail_on = fail_on
+        self.threads: List[threading.Thread] = []
+
+    def infer(self, image: np.ndarray) -> Prediction:
+        return Prediction(annotations=[])
+
+    def infer_async(self, image, callback, runtime_data=None, error_callback=None):
+        def _complete():
+            time.sleep(np.random.uniform(0, 0.005))
+            if image[0, 0, 0] in self.fail_on:
+                error_callback(ValueError("Inference failed"), runtime_data)
+            else:
+                callback(image, self.infer(image), runtime_data)
+
+        thread = threading.Thread(target=_complete)
+        thread.start()
+        self.threads.append(thread)
+
+    def await_all(self):
+        for thread in self.threads:
+            thread.join()
+
+
+@pytest.fixture(autouse=True)
+def fxt_mock_rendering(mocker: MockerFixture):
+    mocker.patch(
+        "geti_sdk.demos.predict_video.show_image_with_annotation_scene",
+        side_effect=lambda image, **kwargs: image,
+    )
+
+
+class TestVideoPredictionPipeline:
+    @pytest.mark.parametrize("max_async_infer_requests", [1, 4])
+    def test_run(self, max_async_infer_requests: int):
+        # Arrange
+        writer = _VideoWriter()
+        pipeline = _VideoPredictionPipeline(
+            deployment=_Deployment(),
+            video_capture=_VideoCapture(n_frames=40),
+            video_writer=writer,
+            max_async_infer_requests=max_async_infer_requests,
+            queue_size=2,
+        )
+
+        # Act
+        errors = pipeline.run()
+        report = pipeline.throughput_report(total_time=1.0)
+
+        # Assert
+        assert errors == []
+        assert writer.frame_indices == list(range(40))
+        for name, stage in pipeline.stages.items():
+            assert stage.frames == 40
+            assert f"{name:<10}      40 frames" in report
+
+    def test_run_inference_error(self):
+        # Arrange
+        writer = _VideoWriter()
+        pipeline = _VideoPredictionPipeline(
+            deployment=_Deployment(fail_on=(5,)),
+            video_capture=_VideoCapture(n_frames=40),
+            video_writer=writer,
+            max_async_infer_requests=4,
+            queue_size=2,
+        )
+
+        # Act
+        errors = pipeline.run()
+
+        # Assert
+        assert len(errors) == 1
+        assert isinstance(errors[0], ValueError)
+        assert writer.frame_indices == list(range(len(writer.frame_indices)))
+        assert len(writer.frame_indices) <= 5
@@ -0,0 +1,317 @@
+# Copyright (C) 2023 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions
+# and limitations under the License.
+import gc
+import json
+import os
+import weakref
+import zipfile
+from typing import Any, Callable, Dict, List
+
+import cv2
+import numpy as np
+import openvino.runtime as ov
+import pytest
+from openvino.model_api.adapters import OpenvinoAdapter
+from openvino.model_api.models import ImageModel
+from openvino.runtime import opset8 as ops
+from pytest_mock import MockerFixture
+
+from geti_sdk.deployment import DeployedModel
+from geti_sdk.deployment.deployed_model import (
+    COMPILED_MODEL_CACHE_DIR_NAME,
+    LABELS_CONFIG_KEY,
+    MODEL_CACHE_DIR_NAME,
+)
+
+INPUT_SHAPE = [1, 3, 4, 4]
+
+
+class _AdapterModel:
+    """
+    Minimal stand-in for a ModelAPI model, which runs inference through an
+    OpenvinoAdapter without any pre- or postprocessing
+    """
+
+    def __init__(self, adapter: OpenvinoAdapter):
+        self.inference_adapter = adapter
+
+    def infer_sync(self, dict_data: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        return self.inference_adapter.infer_sync(dict_data)
+
+    def infer_async_raw(self, dict_data: Dict[str, np.ndarray], callback_data):
+        self.inference_adapter.infer_async(dict_data, callback_data)
+
+    def await_all(self):
+        self.inference_adapter.await_all()
+
+
+def _load_openvino_model(
+    deployed_model: DeployedModel,
+    path_to_folder: str,
+    batched_outputs: bool = True,
+    max_num_requests: int = 1,
+) -> OpenvinoAdapter:
+    """
+    Create a small OpenVINO model with a single image input, and load it as the
+    inference model for the `deployed_model`. If `batched_outputs` is False, the
+    model gets an additional output that is reduced over the batch dimension
+    """
+    image = ops.parameter(INPUT_SHAPE, np.float32, name="image")
+    outputs = [ops.relu(image).output(0)]
+    outputs[0].get_tensor().set_names({"relu"})
+    if not batched_outputs:
+        outputs.append(ops.reduce_sum(image, np.array([0, 2, 3])).output(0))
+        outputs[1].get_tensor().set_names({"channel_sum"})
+    model_path = os.path.join(path_to_folder, "model.xml")
+    ov.serialize(ov.Model(outputs, [image], "test_model"), model_path)
+
+    adapter = OpenvinoAdapter(
+        ov.Core(), model=model_path, max_num_requests=max_num_requests
+    )
+    adapter.load_model()
+    adapter.set_callback(DeployedModel._adapter_callback)
+    deployed_model._inference_model = _AdapterModel(adapter)
+    deployed_model._max_num_requests = max_num_requests
+    return adapter
+
+
+class _IdentityImageModel(ImageModel):
+    """
+    ModelAPI image model wrapper that returns the model outputs unchanged
+    """
+
+    __model__ = "test_identity"
+
+    def postprocess(self, outputs: Dict[str, np.ndarray], meta: Dict[str, Any]):
+        return outputs
+
+
+def _save_image_model(path_to_folder: str) -> None:
+    """
+    Save a small OpenVINO model for images of 8x8 pixels, together with a
+    `config.json` file that defines its preprocessing
+    """
+    image = ops.parameter([1, 3, 8, 8], np.float32, name="image")
+    output = ops.relu(image).output(0)
+    output.get_tensor().set_names({"relu"})
+    ov.serialize(
+        ov.Model([output], [image], "test_model"),
+        os.path.join(path_to_folder, "model.xml"),
+        os.path.join(path_to_folder, "model.bin"),
+    )
+    configuration = {
+        "type_of_model": _IdentityImageModel.__model__,
+        "model_parameters": {
+            "mean_values": [10, 20, 30],
+            "scale_values": [2, 2, 2],
+            "resize_type": "standard",
+            LABELS_CONFIG_KEY: {"label_groups": [], "all_labels": {}},
+        },
+    }
+    with open(os.path.join(path_to_folder, "config.json"), "w") as file:
+        json.dump(configuration, file)
+
+
+def _preprocessed_images(n_images: int) -> List[Dict[str, np.ndarray]]:
+    return [
+        {"image": np.full(INPUT_SHAPE, index - 2, dtype=np.float32)}
+        for index in range(n_images)
+    ]
+
+
+class TestDeployedModel:
+    def test_get_plugin_config(self):
+        # Act
+        default_config = DeployedModel._get_plugin_config()
+        config = DeployedModel._get_plugin_config(
+            performance_hint="throughput", num_streams=4
+        )
+        auto_config = DeployedModel._get_plugin_config(num_streams="auto")
+        cache_config = DeployedModel._get_plugin_config(cache_dir="cache")
+
+        # Assert
+        assert default_config is None
+        assert config == {"PERFORMANCE_HINT": "THROUGHPUT", "NUM_STREAMS": "4"}
+        assert auto_config == {"NUM_STREAMS": "AUTO"}
+        assert cache_config == {
+            "CACHE_DIR": os.path.join("cache", COMPILED_MODEL_CACHE_DIR_NAME)
+        }
+        with pytest.raises(ValueError):
+            DeployedModel._get_plugin_config(performance_hint="fastest")
+        with pytest.raises(ValueError):
+            DeployedModel._get_plugin_config(num_streams=0)
+        with pytest.raises(ValueError):
+            DeployedModel._get_plugin_config(num_streams="many")
+
+    @pytest.mark.parametrize("max_batch_size", [1, 3, 16])
+    def test_infer_batch(
+        self,
+        fxt_deployed_model_factory: Callable[[str], DeployedModel],
+        max_batch_size: int,
+        tmp_path,
+    ):
+        # Arrange
+        deployed_model = fxt_deployed_model_factory()
+        adapter = _load_openvino_model(deployed_model, str(tmp_path))
+        images = _preprocessed_images(5)
+        infer_calls: List[int] = []
+        infer_sync = adapter.infer_sync
+
+        def _infer_sync(dict_data: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+            infer_calls.append(dict_data["image"].shape[0])
+            return infer_sync(dict_data)
+
+        adapter.infer_sync = _infer_sync
+
+        # Act
+        results = deployed_model.infer_batch(images, max_batch_size=max_batch_size)
+
+        # Assert
+        assert len(results) == 5
+        for image, result in zip(images, results):
+            assert result["relu"].shape == tuple(INPUT_SHAPE)
+            assert np.array_equal(result["relu"], np.maximum(image["image"], 0))
+        assert max(infer_calls) <= max_batch_size
+        assert sum(infer_calls) == 5
+        if max_batch_size > 1:
+            assert deployed_model._supports_batching
+            assert adapter.get_input_layers()["image"].shape[0] == -1
+        with pytest.raises(ValueError):
+            deployed_model.infer_batch(images, max_batch_size=0)
+
+    @pytest.mark.parametrize("max_num_requests", [1, 2])
+    def test_infer_batch_unbatched_outputs(
+        self,
+        fxt_deployed_model_factory: Callable[[str], DeployedModel],
+        max_num_requests: int,
+        tmp_path,
+    ):
+        # Arrange
+        deployed_model = fxt_deployed_model_factory()
+        adapter = _load_openvino_model(
+            deployed_model,
+            str(tmp_path),
+            batched_outputs=False,
+            max_num_requests=max_num_requests,
+        )
+        images = _preprocessed_images(4)
+
+        # Act
+        results = deployed_model.infer_batch(images)
+        second_results = deployed_model.infer_batch(images)
+
+        # Assert
+        # Batched inference is disabled and the model gets its static input shape
+        # back, so each image produces its own outputs
+        assert deployed_model._supports_batching is False
+        assert adapter.get_input_layers()["image"].shape == INPUT_SHAPE
+        for image, result, second_result in zip(images, results, second_results):
+            assert np.array_equal(result["relu"], np.maximum(image["image"], 0))
+            assert np.array_equal(
+                result["channel_sum"], image["image"].sum(axis=(0, 2, 3))
+            )
+            assert np.array_equal(result["relu"], second_result["relu"])
+
+    def test_infer_async_does_not_keep_model_alive(
+        self, fxt_deployed_model_factory: Callable[[str], DeployedModel], tmp_path
+    ):
+        # Arrange
+        deployed_model = fxt_deployed_model_factory()
+        _load_openvino_model(deployed_model, str(tmp_path), max_num_requests=2)
+        images = _preprocessed_images(3)
+        results: Dict[int, np.ndarray] = {}
+
+        def _callback(inference_results: Dict[str, np.ndarray], index: int):
+            results[index] = inference_results["relu"]
+
+        # Act
+        for index, image in enumerate(images):
+            deployed_model.infer_async(image, runtime_data=index, callback=_callback)
+        deployed_model.await_all()
+        model_reference = weakref.ref(deployed_model)
+        del deployed_model
+        gc.collect()
+
+        # Assert
+        # The infer queue holds the callback data of completed requests, which must
+        # not prevent the model from being collected
+        assert model_reference() is None
+        for index, image in enumerate(images):
+            assert np.array_equal(results[index], np.maximum(image["image"], 0))
+
+    def test_embedded_preprocessing(
+        self, fxt_deployed_model_factory: Callable[[str], DeployedModel], tmp_path
+    ):
+        # Arrange
+        deployed_model = fxt_deployed_model_factory()
+        model_folder = os.path.join(tmp_path, "model")
+        os.makedirs(model_folder)
+        _save_image_model(model_folder)
+        deployed_model._model_data_path = model_folder
+        image = np.random.default_rng(seed=0).integers(
+            0, 256, size=(20, 30, 3), dtype=np.uint8
+        )
+        expected_output = (
+            ((cv2.resize(image, (8, 8)).astype(np.float32) - [10, 20, 30]) / 2)
+            .clip(min=0)
+            .transpose(2, 0, 1)[None]
+        )
+
+        # Act
+        deployed_model.load_inference_model()
+        preprocessed_image, _ = deployed_model.preprocess(image)
+        output = deployed_model.infer(preprocessed_image)["relu"]
+        deployed_model.save_with_embedded_preprocessing(os.path.join(tmp_path, "ovms"))
+        saved_model = ov.Core().read_model(os.path.join(tmp_path, "ovms", "model.xml"))
+
+        # Assert
+        # The raw image is passed to the model, which resizes and normalizes it
+        assert preprocessed_image["image"].shape == (1, 20, 30, 3)
+        assert np.shares_memory(preprocessed_image["image"], image)
+        assert output.shape == (1, 3, 8, 8)
+        np.testing.assert_allclose(output, expected_output, atol=1)
+        assert saved_model.input(0).get_element_type() == ov.Type.u8
+        assert saved_model.input(0).get_partial_shape().is_dynamic
+
+    def test_get_data_from_zip_with_cache(
+        self,
+        mocker: MockerFixture,
+        fxt_deployed_model_factory: Callable[[str], DeployedModel],
+        tmp_path,
+    ):
+        # Arrange
+        zip_path = tmp_path / "model.zip"
+        with zipfile.ZipFile(zip_path, "w") as zip_file:
+            zip_file.writestr("model/model.xml", "<net/>")
+            zip_file.writestr("model/model.bin", b"weights")
+            zip_file.writestr("python/requirements.txt", "")
+        cache_dir = tmp_path / "cache"
+        extract_spy = mocker.spy(zipfile.ZipFile, "extractall")
+        first_model = fxt_deployed_model_factory()
+        second_model = fxt_deployed_model_factory()
+
+        # Act
+        first_model.get_data(str(zip_path), cache_dir=str(cache_dir))
+        second_model.get_data(str(zip_path), cache_dir=str(cache_dir))
+
+        # Assert
+        # The model data is extracted only once, and kept after the model is deleted
+        assert extract_spy.call_count == 1
+        assert first_model._model_data_path == second_model._model_data_path
+        assert os.listdir(cache_dir / MODEL_CACHE_DIR_NAME) == [
+            os.path.basename(os.path.dirname(first_model._model_data_path))
+        ]
+        assert not first_model._needs_tempdir_deletion
+        del first_model
+        assert os.path.isfile(os.path.join(second_model._model_data_path, "model.xml"))
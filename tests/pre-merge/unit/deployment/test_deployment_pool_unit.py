@@ -0,0 +1,177 @@
+# Copyright (C) 2023 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions
+# and limitations under the License.
+import threading
+import time
+from typing import Callable, List, Optional, Set
+
+import numpy as np
+import pytest
+from pytest_mock import MockerFixture
+
+from geti_sdk.deployment import DeploymentPool
+from geti_sdk.deployment.deployment_pool import _ERROR, _READY, _RESULT
+
+
+class _WorkerThread(threading.Thread):
+    """
+    Worker of the DeploymentPool that runs in a thread instead of a process. It
+    returns the sum of the pixel values of a frame as its prediction
+    """
+
+    exitcode = None
+
+    def __init__(self, pool: DeploymentPool, worker_index: int, crash_on: Set[int]):
+        super().__init__(daemon=True)
+        self.pool = pool
+        self.worker_index = worker_index
+        self.crash_on = crash_on
+        self.task_queue = pool._context.Queue()
+
+    def run(self):
+        self.pool._result_queue.put((_READY, self.worker_index, None, None))
+        while True:
+            task = self.task_queue.get()
+            if task is None:
+                return
+            frame_index, slot, shape, dtype = task
+            if frame_index in self.crash_on:
+                # Terminate without reporting a result, the frame is only
+                # crashed on once
+                self.crash_on.discard(frame_index)
+                return
+            frame = np.ndarray(
+                shape,
+                dtype=dtype,
+                buffer=self.pool._shared_memory.buf,
+                offset=slot * self.pool._slot_size,
+            )
+            # Random delays make the workers complete their frames out of order
+            time.sleep(np.random.uniform(0, 0.005))
+            if frame.min() < 0:
+                message = (_ERROR, self.worker_index, frame_index, "Negative frame")
+            else:
+                message = (_RESULT, self.worker_index, frame_index, int(frame.sum()))
+            del frame
+            self.pool._result_queue.put(message)
+
+
+@pytest.fixture()
+def fxt_thread_pool_factory(
+    mocker: MockerFixture,
+) -> Callable[..., DeploymentPool]:
+    """
+    Return a factory for DeploymentPools that run their workers in threads
+    """
+    crash_on: Set[int] = set()
+
+    def _start_worker(pool: DeploymentPool, worker_index: int) -> None:
+        worker = _WorkerThread(pool, worker_index, crash_on=crash_on)
+        worker.start()
+        pool._processes[worker_index] = worker
+        pool._task_queues[worker_index] = worker.task_queue
+
+    mocker.patch.object(DeploymentPool, "_start_worker", _start_worker)
+    mocker.patch("geti_sdk.deployment.deployment_pool.RESULT_POLL_INTERVAL", 0.05)
+    pools = []
+
+    def _create_pool(
+        crash_on_frames: Optional[Set[int]] = None, **kwargs
+    ) -> DeploymentPool:
+        if crash_on_frames is not None:
+            crash_on.update(crash_on_frames)
+        pool = DeploymentPool("dummy_folder", max_frame_bytes=64, **kwargs)
+        pools.append(pool)
+        return pool
+
+    yield _create_pool
+    for pool in pools:
+        pool.close()
+
+
+def _frames(n_frames: int) -> List[np.ndarray]:
+    return [np.full((2, 2, 2), index, dtype=np.int32) for index in range(n_frames)]
+
+
+class TestDeploymentPool:
+    def test_imap_ordering(
+        self, fxt_thread_pool_factory: Callable[..., DeploymentPool]
+    ):
+        # Arrange
+        pool = fxt_thread_pool_factory(workers=3, frames_per_worker=2)
+        frames = _frames(50)
+
+        # Act
+        predictions = list(pool.imap(frames))
+
+        # Assert
+        assert predictions == [8 * index for index in range(50)]
+        assert sorted(pool._free_slots) == list(range(6))
+        with pytest.raises(ValueError):
+            pool.infer(np.zeros((4, 4, 4), dtype=np.int32))
+
+    def test_inference_error(
+        self, fxt_thread_pool_factory: Callable[..., DeploymentPool]
+    ):
+        # Arrange
+        pool = fxt_thread_pool_factory(workers=2)
+
+        # Act and assert
+        with pytest.raises(RuntimeError, match="Negative frame"):
+            pool.infer(np.full((2, 2), -1, dtype=np.int32))
+        assert pool.infer(np.ones((2, 2), dtype=np.int32)) == 4
+
+    def test_handle_message_duplicate(
+        self, fxt_thread_pool_factory: Callable[..., DeploymentPool]
+    ):
+        # Arrange
+        pool = fxt_thread_pool_factory(workers=1, frames_per_worker=2)
+        slot = pool._free_slots.popleft()
+        pool._pending_tasks[0][7] = (slot, (2, 2), "<i4")
+
+        # Act
+        pool._handle_message((_RESULT, 0, 7, 42))
+        # A restarted worker may produce a second result for the same frame
+        pool._handle_message((_RESULT, 0, 7, 42))
+
+        # Assert
+        assert pool._completed == {7: 42}
+        assert sorted(pool._free_slots) == [0, 1]
+
+    def test_worker_restart(
+        self, fxt_thread_pool_factory: Callable[..., DeploymentPool]
+    ):
+        # Arrange
+        pool = fxt_thread_pool_factory(
+            crash_on_frames={3, 11}, workers=2, max_restarts=2
+        )
+        frames = _frames(20)
+
+        # Act
+        predictions = pool.infer_batch(frames)
+
+        # Assert
+        # Frames pending on the crashed workers are resubmitted after the restart
+        assert predictions == [8 * index for index in range(20)]
+        assert pool._restart_count == 2
+
+    def test_worker_restart_limit(
+        self, fxt_thread_pool_factory: Callable[..., DeploymentPool]
+    ):
+        # Arrange
+        pool = fxt_thread_pool_factory(crash_on_frames={2}, workers=1, max_restarts=0)
+
+        # Act and assert
+        with pytest.raises(RuntimeError, match="maximum number of worker restarts"):
+            pool.infer_batch(_frames(5))
+        assert pool._is_closed
@@ -0,0 +1,557 @@
+# Copyright (C) 2023 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions
+# and limitations under the License.
+import os
+import threading
+import time
+from typing import Any, Dict, List, Tuple
+
+import cv2
+import numpy as np
+import pytest
+from pytest_mock import MockerFixture
+
+from geti_sdk.data_models import (
+    Annotation,
+    Prediction,
+    Project,
+    ScoredLabel,
+    Task,
+    TaskType,
+)
+from geti_sdk.data_models.shapes import Rectangle
+from geti_sdk.deployment import Deployment, PredictionCache, StageTimer
+from geti_sdk.deployment.data_models import ROI, PredictionArray, PredictionFilter
+from geti_sdk.deployment.deployed_model import DEFAULT_MAX_BATCH_SIZE
+
+
+class _AsyncModel:
+    """
+    Stand-in for a DeployedModel that completes asynchronous requests in separate
+    threads, like the OpenVINO infer queue does
+    """
+
+    def __init__(self):
+        self.callback = None
+        self.threads: List[threading.Thread] = []
+
+    def set_asynchronous_callback(self, callback):
+        self.callback = callback
+
+    def preprocess(self, image: np.ndarray) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        return {"image": image}, {"original_shape": image.shape}
+
+    def infer_async(self, preprocessed_image: Dict[str, Any], runtime_data: Any):
+        thread = threading.Thread(
+            target=self.callback,
+            args=({"output": preprocessed_image["image"]}, runtime_data),
+        )
+        thread.start()
+        self.threads.append(thread)
+
+    def await_all(self):
+        for thread in self.threads:
+            thread.join()
+
+    def save(self, path_to_folder: str) -> bool:
+        return True
+
+
+class _BatchModel:
+    """
+    Stand-in for a DeployedModel that records the size of the batches it is asked
+    to infer. The model outputs hold the shape of the input images
+    """
+
+    def __init__(self):
+        self.batch_sizes: List[int] = []
+
+    def preprocess(self, image: np.ndarray) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        return {"image": image}, {"original_shape": image.shape}
+
+    def infer_batch(
+        self, preprocessed_images: List[Dict[str, Any]], max_batch_size: int
+    ) -> List[Dict[str, np.ndarray]]:
+        assert len(preprocessed_images) <= max_batch_size
+        self.batch_sizes.append(len(preprocessed_images))
+        return [
+            {"image_shape": np.array(image["image"].shape)}
+            for image in preprocessed_images
+        ]
+
+
+class _SlowLoadingModel:
+    """
+    Stand-in for a DeployedModel that takes some time to load, and records the
+    interval during which it was loading
+    """
+
+    def __init__(self):
+        self.ote_label_schema = None
+        self.openvino_model_parameters: Dict[str, Any] = {}
+        self.max_num_requests = 1
+        self.load_interval: Tuple[float, float] = (0, 0)
+
+    def load_inference_model(self, **kwargs):
+        t_start = time.perf_counter()
+        time.sleep(0.2)
+        self.load_interval = (t_start, time.perf_counter())
+
+    def set_asynchronous_callback(self, callback):
+        pass
+
+
+class _BoxesModel:
+    """
+    Stand-in for a DeployedModel that returns its inference results unchanged
+    """
+
+    def preprocess(self, image: np.ndarray) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        return {"image": image}, {"original_shape": image.shape}
+
+    def infer(self, preprocessed_image: Dict[str, Any]) -> Dict[str, Any]:
+        return preprocessed_image
+
+    def postprocess(self, inference_results: Dict[str, Any], metadata: Dict[str, Any]):
+        return inference_results
+
+
+class _ExplainModel(_BoxesModel):
+    """
+    Stand-in for a DeployedModel that produces a float saliency map per class, and
+    counts how often its explainability outputs are postprocessed
+    """
+
+    def __init__(self):
+        self._saliency_key = "saliency_map"
+        self.n_explain_calls = 0
+
+    def postprocess_explain_outputs(
+        self, inference_results: Dict[str, Any], metadata: Dict[str, Any]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        self.n_explain_calls += 1
+        saliency_map = np.linspace(-1, 1, num=2 * 400 * 200, dtype=np.float32)
+        return saliency_map.reshape(2, 400, 200), np.ones(16, dtype=np.float32)
+
+
+def _predict_boxes(task: Task, boxes: List[Rectangle]) -> Prediction:
+    label = ScoredLabel.from_label(task.labels[0], probability=1)
+    return Prediction(
+        annotations=[Annotation(shape=box, labels=[label]) for box in boxes]
+    )
+
+
+@pytest.fixture()
+def fxt_async_deployment(fxt_classification_project: Project) -> Deployment:
+    deployment = Deployment(project=fxt_classification_project, models=[_AsyncModel()])
+    deployment._are_models_loaded = True
+    deployment._prepare_async_inference(max_async_infer_requests=2)
+    yield deployment
+
+
+def _fail_for_negative_images(image: np.ndarray, **kwargs) -> Prediction:
+    if image.min() < 0:
+        raise ValueError("Invalid image")
+    return Prediction(annotations=[])
+
+
+class TestDeployment:
+    def test_infer_async(self, mocker: MockerFixture, fxt_async_deployment: Deployment):
+        # Arrange
+        mocker.patch.object(
+            fxt_async_deployment,
+            "_postprocess_task",
+            side_effect=_fail_for_negative_images,
+        )
+        images = [np.full((4, 4, 3), index) for index in range(8)]
+        results: Dict[int, str] = {}
+
+        def _callback(image: np.ndarray, prediction: Prediction, index: int):
+            results[index] = threading.current_thread().name
+
+        # Act
+        for index, image in enumerate(images):
+            fxt_async_deployment.infer_async(
+                image, callback=_callback, runtime_data=index
+            )
+        fxt_async_deployment.await_all()
+
+        # Assert
+        assert sorted(results.keys()) == list(range(8))
+        assert all(
+            name.startswith("GetiSDK-postprocessing") for name in results.values()
+        )
+
+    def test_infer_async_errors(
+        self, mocker: MockerFixture, fxt_async_deployment: Deployment
+    ):
+        # Arrange
+        mocker.patch.object(
+            fxt_async_deployment,
+            "_postprocess_task",
+            side_effect=_fail_for_negative_images,
+        )
+        images = [np.full((4, 4, 3), value) for value in [0, -1, 2, -3]]
+        results: List[int] = []
+        errors: List[Tuple[Exception, int]] = []
+
+        def _callback(image: np.ndarray, prediction: Prediction, index: int):
+            results.append(index)
+
+        # Act and assert
+        for index, image in enumerate(images):
+            fxt_async_deployment.infer_async(
+                image, callback=_callback, runtime_data=index
+            )
+        with pytest.raises(RuntimeError):
+            fxt_async_deployment.await_all()
+        assert sorted(results) == [0, 2]
+
+        # Errors are reset once they have been raised
+        fxt_async_deployment.await_all()
+
+        # With an error callback, errors are reported per image instead
+        results.clear()
+        for index, image in enumerate(images):
+            fxt_async_deployment.infer_async(
+                image,
+                callback=_callback,
+                runtime_data=index,
+                error_callback=lambda error, index: errors.append((error, index)),
+            )
+        fxt_async_deployment.await_all()
+        assert sorted(results) == [0, 2]
+        assert sorted(index for _, index in errors) == [1, 3]
+        assert all(isinstance(error, ValueError) for error, _ in errors)
+
+    def test_infer_async_after_save(
+        self, mocker: MockerFixture, fxt_async_deployment: Deployment, tmp_path
+    ):
+        # Arrange
+        mocker.patch.object(
+            fxt_async_deployment,
+            "_postprocess_task",
+            return_value=Prediction(annotations=[]),
+        )
+        results: List[int] = []
+
+        # Act
+        fxt_async_deployment.save(str(tmp_path))
+        fxt_async_deployment.infer_async(
+            np.zeros((4, 4, 3)),
+            callback=lambda image, prediction, index: results.append(index),
+            runtime_data=0,
+        )
+        fxt_async_deployment.await_all()
+
+        # Assert
+        assert results == [0]
+        assert os.path.isfile(tmp_path / "deployment" / "project.json")
+
+    def test_infer_batch(
+        self, mocker: MockerFixture, fxt_classification_project: Project
+    ):
+        # Arrange
+        model = _BatchModel()
+        deployment = Deployment(project=fxt_classification_project, models=[model])
+        deployment._are_models_loaded = True
+        mocker.patch.object(
+            deployment,
+            "_postprocess_task",
+            side_effect=lambda image, inference_results, **kwargs: inference_results,
+        )
+        images = [np.zeros((10 + index, 20, 3), dtype=np.uint8) for index in range(5)]
+
+        # Act
+        results = deployment.infer_batch(images, max_batch_size=2)
+
+        # Assert
+        assert model.batch_sizes == [2, 2, 1]
+        for image, result in zip(images, results):
+            assert tuple(result["image_shape"]) == image.shape
+        with pytest.raises(ValueError):
+            deployment.infer_batch(images, max_batch_size=0)
+
+    def test_infer_batch_task_chain(
+        self, mocker: MockerFixture, fxt_nightly_projects: List[Project]
+    ):
+        # Arrange
+        project = fxt_nightly_projects[3]
+        detection_task, segmentation_task = project.get_trainable_tasks()
+        assert segmentation_task.type == TaskType.SEGMENTATION
+        detection_model, segmentation_model = _BatchModel(), _BatchModel()
+        deployment = Deployment(
+            project=project, models=[detection_model, segmentation_model]
+        )
+        deployment._are_models_loaded = True
+        n_boxes = DEFAULT_MAX_BATCH_SIZE + 4
+        boxes = [
+            Rectangle(x=4 * index, y=10, width=4, height=8) for index in range(n_boxes)
+        ]
+
+        def _postprocess(
+            image: np.ndarray, task: Task, inference_results: Dict[str, Any], **kwargs
+        ) -> Prediction:
+            if task.type == TaskType.DETECTION:
+                return _predict_boxes(task, boxes)
+            # Each view is the crop of a detected box
+            assert tuple(inference_results["image_shape"]) == (8, 4, 3)
+            return _predict_boxes(task, [Rectangle(x=1, y=2, width=2, height=3)])
+
+        mocker.patch.object(deployment, "_postprocess_task", side_effect=_postprocess)
+        to_absolute_spy = mocker.spy(ROI, "to_absolute_coordinates")
+        images = [np.zeros((100, 100, 3), dtype=np.uint8) for _ in range(2)]
+
+        # Act
+        predictions = deployment.infer_batch(images)
+
+        # Assert
+        assert detection_model.batch_sizes == [2]
+        # ROIs are inferred in batches of limited size
+        assert segmentation_model.batch_sizes == [DEFAULT_MAX_BATCH_SIZE, 4] * 2
+        expected_shapes = [
+            Rectangle(x=box.x + 1, y=box.y + 2, width=2, height=3) for box in boxes
+        ]
+        for prediction in predictions:
+            shapes = [annotation.shape for annotation in prediction.annotations]
+            assert shapes == boxes + expected_shapes
+        # Each ROI for the segmentation results is converted to absolute
+        # coordinates exactly once, with respect to its own parent ROI
+        assert to_absolute_spy.call_count == 2 * n_boxes
+        assert [roi.shape for roi in to_absolute_spy.spy_return_list] == (
+            expected_shapes * 2
+        )
+
+    def test_load_inference_models_concurrently(
+        self, mocker: MockerFixture, fxt_nightly_projects: List[Project]
+    ):
+        # Arrange
+        project = fxt_nightly_projects[3]
+        models = [_SlowLoadingModel(), _SlowLoadingModel()]
+        deployment = Deployment(project=project, models=models)
+        mocker.patch(
+            "otx.api.usecases.exportable_code.prediction_to_annotation_converter."
+            "create_converter",
+            side_effect=lambda converter_type, **kwargs: converter_type,
+        )
+        mocker.patch(
+            "geti_sdk.deployment.deployment.create_prediction_converter",
+            return_value=None,
+        )
+
+        # Act
+        deployment.load_inference_models()
+
+        # Assert
+        assert deployment.are_models_loaded
+        # The models for both tasks were loading at the same time
+        assert models[0].load_interval[0] < models[1].load_interval[1]
+        assert models[1].load_interval[0] < models[0].load_interval[1]
+        tasks = project.get_trainable_tasks()
+        assert list(deployment.model_load_times.keys()) == [
+            task.title for task in tasks
+        ]
+        for load_times in deployment.model_load_times.values():
+            assert load_times["model"] >= 0.2
+            assert load_times["converter"] >= 0
+        assert list(deployment._inference_converters.values()) == [
+            task.type.to_ote_domain() for task in tasks
+        ]
+
+    def test_infer_with_prediction_filter(
+        self, mocker: MockerFixture, fxt_classification_project: Project
+    ):
+        # Arrange
+        task = fxt_classification_project.get_trainable_tasks()[0]
+        label = task.labels[0]
+        deployment = Deployment(
+            project=fxt_classification_project, models=[_BoxesModel()]
+        )
+        deployment._are_models_loaded = True
+        deployment._empty_labels = {task.title: None}
+        converter = mocker.MagicMock()
+        converter.convert_to_array.return_value = PredictionArray.from_boxes(
+            boxes=np.array([[0, 0, 10, 10], [1, 1, 10, 10], [50, 50, 10, 10]]),
+            label_indices=np.zeros(3),
+            scores=np.array([0.6, 0.9, 0.8]),
+            labels=[(label.name, label.id, label.color)],
+        )
+        deployment._prediction_converters = {task.title: converter}
+        image = np.zeros((100, 100, 3), dtype=np.uint8)
+
+        # Act
+        deployment.set_prediction_filter(PredictionFilter(iou_threshold=0.5, top_k=1))
+        prediction = deployment.infer(image)
+        prediction_array = deployment.infer(image, as_array=True)
+
+        # Assert
+        assert [annotation.shape for annotation in prediction.annotations] == [
+            Rectangle(x=1, y=1, width=10, height=10)
+        ]
+        assert prediction_array.scores.tolist() == [0.9]
+        converter.convert.assert_not_called()
+
+    def test_infer_with_prediction_cache(
+        self, mocker: MockerFixture, fxt_classification_project: Project
+    ):
+        # Arrange
+        task = fxt_classification_project.get_trainable_tasks()[0]
+        deployment = Deployment(
+            project=fxt_classification_project, models=[_BoxesModel()]
+        )
+        deployment._are_models_loaded = True
+        deployment._empty_labels = {task.title: None}
+        converter = mocker.MagicMock()
+        converter.convert.side_effect = lambda *args, **kwargs: _predict_boxes(
+            task, [Rectangle(x=0, y=0, width=10, height=10)]
+        )
+        deployment._prediction_converters = {task.title: converter}
+        image = np.zeros((100, 100, 3), dtype=np.uint8)
+        other_image = np.ones((100, 100, 3), dtype=np.uint8)
+
+        # Act
+        deployment.set_prediction_cache(PredictionCache())
+        predictions = [deployment.infer(image) for _ in range(3)]
+        deployment.infer(other_image)
+        n_cached_predictions = len(deployment.prediction_cache)
+        deployment.set_prediction_filter(PredictionFilter(top_k=1))
+
+        # Assert
+        # Inference runs only once for each distinct image
+        assert converter.convert.call_count == 2
+        assert predictions[0].annotations == predictions[2].annotations
+        assert predictions[1] is not predictions[2]
+        assert deployment.prediction_cache.hits == 2
+        assert n_cached_predictions == 2
+        # Cached predictions are discarded when the filter changes
+        assert len(deployment.prediction_cache) == 0
+
+    def test_infer_with_stage_timer(
+        self, mocker: MockerFixture, fxt_classification_project: Project
+    ):
+        # Arrange
+        task = fxt_classification_project.get_trainable_tasks()[0]
+        deployment = Deployment(
+            project=fxt_classification_project, models=[_BoxesModel()]
+        )
+        deployment._are_models_loaded = True
+        deployment._empty_labels = {task.title: None}
+        converter = mocker.MagicMock()
+        converter.convert.side_effect = lambda *args, **kwargs: _predict_boxes(
+            task, [Rectangle(x=0, y=0, width=10, height=10)]
+        )
+        deployment._prediction_converters = {task.title: converter}
+        stage_timer = StageTimer()
+        image = np.zeros((100, 100, 3), dtype=np.uint8)
+
+        # Act
+        deployment.set_stage_timer(stage_timer)
+        deployment.infer(image)
+        deployment.infer(image)
+        stage_times = stage_timer.reset()
+        deployment.set_stage_timer(None)
+        deployment.infer(image)
+
+        # Assert
+        assert list(stage_times.keys()) == [task.title]
+        assert list(stage_times[task.title].keys()) == [
+            "preprocess",
+            "infer",
+            "postprocess",
+            "convert",
+        ]
+        assert all(time >= 0 for time in stage_times[task.title].values())
+        assert stage_timer.stage_times == {}
+
+    def test_explain_outputs(
+        self, mocker: MockerFixture, fxt_classification_project: Project
+    ):
+        # Arrange
+        task = fxt_classification_project.get_trainable_tasks()[0]
+        model = _ExplainModel()
+        deployment = Deployment(project=fxt_classification_project, models=[model])
+        deployment._are_models_loaded = True
+        deployment._empty_labels = {task.title: None}
+        converter = mocker.MagicMock()
+        converter.convert.return_value = Prediction(annotations=[])
+        deployment._prediction_converters = {task.title: converter}
+        image = np.zeros((100, 100, 3), dtype=np.uint8)
+
+        # Act
+        prediction, explain_outputs = deployment.infer_with_explanation(
+            image, outputs={"features"}
+        )
+        n_calls_before_access = model.n_explain_calls
+        feature_vector = explain_outputs.feature_vector
+        explained_prediction = deployment.explain(
+            image, saliency_map_max_size=100, quantize_saliency_map=True
+        )
+
+        # Assert
+        # The outputs are computed on first access only, and only once
+        assert n_calls_before_access == 0
+        assert model.n_explain_calls == 2
+        assert feature_vector.shape == (16,)
+        with pytest.raises(ValueError):
+            explain_outputs.saliency_map
+        saliency_map = explained_prediction.maps[0].data
+        assert saliency_map.shape == (2, 100, 50)
+        assert saliency_map.dtype == np.uint8
+        assert saliency_map.min() == 0 and saliency_map.max() == 255
+        assert explained_prediction.feature_vector.shape == (16,)
+
+    @pytest.mark.parametrize("scale", [1.0, 0.5])
+    def test_infer_tiled(
+        self, mocker: MockerFixture, fxt_nightly_projects: List[Project], scale: float
+    ):
+        # Arrange
+        project = fxt_nightly_projects[3]
+        model = _BatchModel()
+        deployment = Deployment(project=project, models=[model, _BatchModel()])
+        deployment._are_models_loaded = True
+        deployment._is_single_task = True
+        deployment._empty_labels = {}
+        image = np.zeros((300, 500, 3), dtype=np.uint8)
+        objects = [
+            Rectangle(x=40, y=40, width=20, height=20),
+            Rectangle(x=230, y=100, width=20, height=20),
+            Rectangle(x=460, y=260, width=20, height=20),
+        ]
+        for box in objects:
+            image[box.y : box.y_max, box.x : box.x_max] = 255
+
+        def _detect_squares(image: np.ndarray, task: Task, **kwargs) -> Prediction:
+            _, _, stats, _ = cv2.connectedComponentsWithStats(image[..., 0])
+            return _predict_boxes(
+                task,
+                [Rectangle(x=x, y=y, width=w, height=h) for x, y, w, h, _ in stats[1:]],
+            )
+
+        mocker.patch.object(
+            deployment, "_postprocess_task", side_effect=_detect_squares
+        )
+
+        # Act
+        prediction = deployment.infer_tiled(
+            image, tile_size=int(256 * scale), tile_overlap=0.2, scale=scale
+        )
+
+        # Assert
+        # Six tiles of 256x256 pixels, inferred in a single batch
+        assert model.batch_sizes == [6]
+        # The second object lies in the overlap of four tiles
+        shapes = sorted(
+            [annotation.shape for annotation in prediction.annotations],
+            key=lambda shape: shape.x,
+        )
+        assert shapes == objects
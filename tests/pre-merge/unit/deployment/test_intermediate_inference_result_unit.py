@@ -0,0 +1,50 @@
+# Copyright (C) 2023 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions
+# and limitations under the License.
+import numpy as np
+
+from geti_sdk.data_models import Annotation, Prediction, ScoredLabel
+from geti_sdk.data_models.shapes import Rectangle
+from geti_sdk.deployment.data_models import ROI, IntermediateInferenceResult
+
+
+class TestIntermediateInferenceResult:
+    def test_generate_views(self, fxt_scored_label: ScoredLabel):
+        # Arrange
+        image = np.arange(100 * 200 * 3, dtype=np.uint8).reshape((100, 200, 3))
+        rectangles = [
+            Rectangle(x=10, y=20, width=30, height=40),
+            Rectangle(x=150, y=50, width=100, height=100),
+            Rectangle(x=0, y=0, width=5, height=5),
+        ]
+        rois = [
+            ROI.from_annotation(Annotation(shape=rect, labels=[fxt_scored_label]))
+            for rect in rectangles
+        ]
+        result = IntermediateInferenceResult(
+            image=image, prediction=Prediction(annotations=[]), rois=rois
+        )
+
+        # Act
+        all_views = result.generate_views()
+        selected_views = result.generate_views([rois[2], rois[0]])
+
+        # Assert
+        assert len(all_views) == 3
+        assert np.array_equal(all_views[0], image[20:60, 10:40])
+        # ROI extending beyond the image is clipped to the image boundaries
+        assert all_views[1].shape == (50, 50, 3)
+        assert np.shares_memory(all_views[0], image)
+        assert len(selected_views) == 2
+        assert np.array_equal(selected_views[0], image[0:5, 0:5])
+        assert np.array_equal(selected_views[1], all_views[0])
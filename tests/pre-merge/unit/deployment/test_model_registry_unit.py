@@ -0,0 +1,180 @@
+# Copyright (C) 2023 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions
+# and limitations under the License.
+import gc
+import os
+import threading
+import time
+import weakref
+from typing import Callable, List
+
+import numpy as np
+import openvino.runtime as ov
+import pytest
+from openvino.model_api.adapters import OpenvinoAdapter
+from openvino.model_api.models import Model
+from openvino.runtime import opset8 as ops
+from pytest_mock import MockerFixture
+
+from geti_sdk.data_models import Project
+from geti_sdk.deployment import DeployedModel, Deployment, ModelRegistry
+
+
+@pytest.fixture()
+def fxt_registry_deployments(
+    mocker: MockerFixture,
+    fxt_classification_project: Project,
+    fxt_deployed_model_factory: Callable[[str], DeployedModel],
+    tmp_path,
+) -> List[str]:
+    """
+    Create three deployment folders, holding model weights of 100, 200 and 300
+    bytes. Loading the deployments is mocked, each model gets a small OpenVINO
+    model with an infer queue that is set up like a real inference model
+    """
+    image = ops.parameter([1, 3, 4, 4], np.float32, name="image")
+    output = ops.relu(image).output(0)
+    output.get_tensor().set_names({"relu"})
+    openvino_model_path = str(tmp_path / "openvino_model.xml")
+    ov.serialize(ov.Model([output], [image], "test_model"), openvino_model_path)
+
+    folders: List[str] = []
+    for index in range(3):
+        folder = tmp_path / f"deployment_{index}"
+        os.makedirs(folder)
+        (folder / "model.bin").write_bytes(b"0" * 100 * (index + 1))
+        folders.append(str(folder))
+
+    def _from_folder(path_to_folder: str) -> Deployment:
+        model = fxt_deployed_model_factory(os.path.basename(path_to_folder))
+        model._model_data_path = path_to_folder
+        return Deployment(project=fxt_classification_project, models=[model])
+
+    def _load_inference_models(self: Deployment, **kwargs):
+        # Simulate model compilation
+        time.sleep(0.02)
+        for model in self.models:
+            adapter = OpenvinoAdapter(ov.Core(), model=openvino_model_path)
+            model._inference_model = Model(adapter, configuration={}, preload=True)
+            adapter.set_callback(DeployedModel._adapter_callback)
+        self._prepare_async_inference(max_async_infer_requests=1)
+        self._are_models_loaded = True
+
+    mocker.patch.object(Deployment, "from_folder", side_effect=_from_folder)
+    mocker.patch.object(
+        Deployment,
+        "load_inference_models",
+        autospec=True,
+        side_effect=_load_inference_models,
+    )
+    yield folders
+
+
+class TestModelRegistry:
+    def test_get_lru_eviction(self, fxt_registry_deployments: List[str]):
+        # Arrange
+        registry = ModelRegistry(max_memory_bytes=450)
+        registry._core = "shared core"
+        for index, folder in enumerate(fxt_registry_deployments):
+            registry.register(f"project {index}", folder)
+
+        # Act
+        first = registry.get("project 0")
+        registry.get("project 1")
+        first_again = registry.get("project 0")
+        # Exceeds the budget, the least recently used project 1 is evicted
+        registry.get("project 2")
+
+        # Assert
+        assert first is first_again
+        assert first.are_models_loaded
+        assert registry.loaded_deployments == ["project 0", "project 2"]
+        assert registry.memory_usage == 400
+        assert (registry.hits, registry.misses, registry.evictions) == (1, 3, 1)
+        load_calls = Deployment.load_inference_models.call_args_list
+        assert all(call.kwargs["core"] == "shared core" for call in load_calls)
+
+        # An evicted deployment is loaded again on its next request
+        registry.get("project 1")
+        assert registry.loaded_deployments == ["project 1"]
+        assert (registry.hits, registry.misses, registry.evictions) == (1, 4, 3)
+
+    def test_evicted_deployment_is_released(self, fxt_registry_deployments: List[str]):
+        # Arrange
+        registry = ModelRegistry(max_memory_bytes=250)
+        registry._core = "shared core"
+        registry.register("project 0", fxt_registry_deployments[0])
+        registry.register("project 1", fxt_registry_deployments[1])
+        deployment = registry.get("project 0")
+        results: List[int] = []
+        deployment.models[0].infer_async(
+            {"image": np.ones((1, 3, 4, 4), dtype=np.float32)},
+            runtime_data=0,
+            callback=lambda inference_results, index: results.append(index),
+        )
+        deployment.models[0].await_all()
+        deployment_reference = weakref.ref(deployment)
+        del deployment
+        # The mocked load method records the deployment it was called for
+        Deployment.load_inference_models.reset_mock()
+
+        # Act
+        # Exceeds the budget, project 0 is evicted
+        registry.get("project 1")
+        gc.collect()
+
+        # Assert
+        # Once evicted, nothing else holds on to the deployment or its models
+        assert results == [0]
+        assert registry.loaded_deployments == ["project 1"]
+        assert registry.evictions == 1
+        assert deployment_reference() is None
+
+    def test_get_concurrent(self, fxt_registry_deployments: List[str]):
+        # Arrange
+        registry = ModelRegistry()
+        registry._core = "shared core"
+        registry.register("project", fxt_registry_deployments[0])
+        deployments: List[Deployment] = []
+
+        # Act
+        threads = [
+            threading.Thread(target=lambda: deployments.append(registry.get("project")))
+            for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # Assert
+        # The deployment is loaded only once
+        assert Deployment.load_inference_models.call_count == 1
+        assert all(deployment is deployments[0] for deployment in deployments)
+        assert (registry.hits, registry.misses) == (3, 1)
+
+    def test_invalid_requests(self, fxt_registry_deployments: List[str]):
+        # Arrange
+        registry = ModelRegistry()
+        registry.register("project", fxt_registry_deployments[0])
+
+        # Act and assert
+        with pytest.raises(ValueError):
+            registry.register("project", fxt_registry_deployments[1])
+        with pytest.raises(KeyError):
+            registry.get("unknown project")
+        with pytest.raises(ValueError):
+            ModelRegistry(max_memory_bytes=0)
+        registry.unregister("project")
+        assert "project" not in registry
+        assert len(registry) == 0
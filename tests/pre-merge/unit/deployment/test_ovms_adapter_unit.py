@@ -0,0 +1,131 @@
+# Copyright (C) 2023 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions
+# and limitations under the License.
+import sys
+import threading
+import time
+import types
+from typing import Any, Dict, List
+
+import numpy as np
+import pytest
+from pytest_mock import MockerFixture
+
+from geti_sdk.deployment.ovms_adapter import AsyncOVMSAdapter, get_grpc_client
+
+MODEL_ADDRESS = "localhost:9000/models/dummy_model"
+
+
+class _MockOVMSClient:
+    """
+    Stand-in for an ovmsclient gRPC client. The model becomes available after a
+    number of status requests, and doubles its input. Requests for negative inputs
+    fail
+    """
+
+    def __init__(self, n_loading_checks: int = 0):
+        self.n_loading_checks = n_loading_checks
+        self.status_check_times: List[float] = []
+        self.max_in_flight = 0
+        self._in_flight = 0
+        self._lock = threading.Lock()
+
+    def get_model_status(self, model_name: str, model_version: int):
+        self.status_check_times.append(time.monotonic())
+        if len(self.status_check_times) <= self.n_loading_checks:
+            raise ConnectionError("OVMS is starting up")
+        return {1: {"state": "AVAILABLE", "error_code": 0}}
+
+    def get_model_metadata(self, model_name: str, model_version: int):
+        tensor = {"shape": [1, 4], "dtype": "DT_FLOAT"}
+        return {"inputs": {"input": tensor}, "outputs": {"output": tensor}}
+
+    def predict(self, inputs: Dict[str, np.ndarray], **kwargs) -> np.ndarray:
+        with self._lock:
+            self._in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self._in_flight)
+        time.sleep(0.05)
+        with self._lock:
+            self._in_flight -= 1
+        if inputs["input"].min() < 0:
+            raise ValueError("Invalid input")
+        return inputs["input"] * 2
+
+
+class TestAsyncOVMSAdapter:
+    def test_wait_for_model_with_backoff(self):
+        # Arrange
+        client = _MockOVMSClient(n_loading_checks=3)
+
+        # Act
+        AsyncOVMSAdapter(MODEL_ADDRESS, client=client)
+
+        # Assert
+        check_times = client.status_check_times
+        assert len(check_times) == 4
+        delays = np.diff(check_times)
+        assert delays[0] < delays[1] < delays[2]
+        with pytest.raises(RuntimeError):
+            AsyncOVMSAdapter(
+                MODEL_ADDRESS,
+                client=_MockOVMSClient(n_loading_checks=1000),
+                timeout=0.2,
+            )
+
+    def test_infer_async(self):
+        # Arrange
+        client = _MockOVMSClient()
+        adapter = AsyncOVMSAdapter(MODEL_ADDRESS, max_num_requests=4, client=client)
+        results: Dict[int, Any] = {}
+
+        def _callback(result: Any, callback_data: Any):
+            results[callback_data[1]] = result
+
+        adapter.set_callback(_callback)
+
+        # Act
+        t_start = time.perf_counter()
+        for index in range(8):
+            adapter.infer_async({"input": np.full((1, 4), index - 1.0)}, index)
+        adapter.await_all()
+        duration = time.perf_counter() - t_start
+
+        # Assert
+        assert client.max_in_flight == 4
+        assert duration < 8 * 0.05
+        assert isinstance(results[0], ValueError)
+        for index in range(1, 8):
+            np.testing.assert_array_equal(
+                results[index]["output"], np.full((1, 4), 2 * (index - 1))
+            )
+
+    def test_grpc_client_is_shared(self, mocker: MockerFixture):
+        # Arrange
+        fake_ovmsclient = types.ModuleType("ovmsclient")
+        fake_ovmsclient.make_grpc_client = mocker.MagicMock(
+            side_effect=lambda url: object()
+        )
+        mocker.patch.dict(sys.modules, {"ovmsclient": fake_ovmsclient})
+        mocker.patch.dict("geti_sdk.deployment.ovms_adapter._grpc_clients", clear=True)
+
+        # Act
+        clients = [
+            get_grpc_client("localhost:9000"),
+            get_grpc_client("localhost:9000"),
+            get_grpc_client("localhost:9001"),
+        ]
+
+        # Assert
+        assert clients[0] is clients[1]
+        assert clients[0] is not clients[2]
+        assert fake_ovmsclient.make_grpc_client.call_count == 2
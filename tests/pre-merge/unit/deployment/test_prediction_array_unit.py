@@ -0,0 +1,187 @@
+# Copyright (C) 2023 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions
+# and limitations under the License.
+import numpy as np
+
+from geti_sdk.data_models import Annotation, Prediction, ScoredLabel
+from geti_sdk.data_models.enums import ShapeType
+from geti_sdk.data_models.shapes import (
+    Ellipse,
+    Point,
+    Polygon,
+    Rectangle,
+    RotatedRectangle,
+)
+from geti_sdk.deployment.data_models import PredictionArray, PredictionFilter
+
+LABELS = [("cat", "1", "#ff0000ff"), ("dog", "2", "#00ff00ff")]
+
+
+class TestPredictionArray:
+    def test_prediction_round_trip(self):
+        # Arrange
+        cat = dict(name="cat", id="1", color="#ff0000ff")
+        dog = dict(name="dog", id="2", color="#00ff00ff")
+        annotations = [
+            Annotation(
+                shape=Rectangle(x=10, y=20, width=30, height=40),
+                labels=[ScoredLabel(probability=0.91, **cat)],
+            ),
+            Annotation(
+                shape=Polygon(points=[Point(1, 2), Point(30, 4), Point(15, 25)]),
+                labels=[
+                    ScoredLabel(probability=0.5, **dog),
+                    ScoredLabel(probability=0.25, **cat),
+                ],
+            ),
+            Annotation(
+                shape=RotatedRectangle(x=50, y=60, width=20, height=10, angle=33.1234),
+                labels=[ScoredLabel(probability=0.123456789, **dog)],
+            ),
+            Annotation(
+                shape=Ellipse(x=5, y=6, width=7, height=8),
+                labels=[ScoredLabel(probability=1.0, **cat)],
+            ),
+        ]
+        feature_vector = np.arange(4, dtype=np.float32)
+        prediction = Prediction(annotations=annotations, feature_vector=feature_vector)
+
+        # Act
+        prediction_array = PredictionArray.from_prediction(prediction)
+        converted_prediction = prediction_array.to_prediction()
+
+        # Assert
+        assert len(prediction_array) == 4
+        assert prediction_array.boxes.dtype == np.float32
+        assert prediction_array.shape_types.tolist() == [0, 2, 3, 1]
+        np.testing.assert_array_equal(prediction_array.boxes[1], [1, 2, 29, 23])
+        assert prediction_array.label_offsets.tolist() == [0, 1, 3, 4, 5]
+        assert prediction_array.polygon_offsets.tolist() == [0, 0, 3, 3, 3]
+        assert prediction_array.label_names == ["cat", "dog"]
+        assert converted_prediction.feature_vector is feature_vector
+        for annotation, expected in zip(converted_prediction.annotations, annotations):
+            assert annotation.shape == expected.shape
+            assert annotation.labels == expected.labels
+
+    def test_empty_prediction(self):
+        # Act
+        prediction_array = PredictionArray.from_prediction(Prediction(annotations=[]))
+
+        # Assert
+        assert len(prediction_array) == 0
+        assert prediction_array.boxes.shape == (0, 4)
+        assert prediction_array.polygon_points.shape == (0, 2)
+        assert prediction_array.to_prediction().annotations == []
+
+    def test_from_boxes(self):
+        # Act
+        prediction_array = PredictionArray.from_boxes(
+            boxes=np.array([[0, 0, 10, 10], [5, 5, 2, 2]]),
+            label_indices=np.array([1, 0]),
+            scores=np.array([0.8, 0.6]),
+            labels=LABELS,
+            shape_type=ShapeType.ELLIPSE,
+        )
+        prediction = prediction_array.to_prediction()
+
+        # Assert
+        assert [annotation.shape for annotation in prediction.annotations] == [
+            Ellipse(x=0, y=0, width=10, height=10),
+            Ellipse(x=5, y=5, width=2, height=2),
+        ]
+        assert [annotation.labels[0].name for annotation in prediction.annotations] == [
+            "dog",
+            "cat",
+        ]
+
+    def test_filter_by_confidence(self):
+        # Arrange
+        prediction_array = PredictionArray.from_boxes(
+            boxes=np.array([[0, 0, 10, 10]] * 4),
+            label_indices=np.array([0, 1, 0, 1]),
+            scores=np.array([0.2, 0.4, 0.6, 0.8]),
+            labels=LABELS,
+        )
+
+        # Act
+        filtered = prediction_array.filter_by_confidence(0.5)
+        filtered_per_label = prediction_array.filter_by_confidence(
+            {"cat": 0.1}, default_threshold=0.5
+        )
+
+        # Assert
+        assert filtered.scores.tolist() == [0.6, 0.8]
+        assert filtered_per_label.scores.tolist() == [0.2, 0.6, 0.8]
+        assert filtered_per_label.label_offsets.tolist() == [0, 1, 2, 3]
+
+    def test_non_max_suppression(self):
+        # Arrange
+        prediction_array = PredictionArray.from_boxes(
+            boxes=np.array(
+                [[0, 0, 10, 10], [1, 1, 10, 10], [0, 0, 10, 10], [20, 20, 5, 5]]
+            ),
+            label_indices=np.array([0, 0, 1, 0]),
+            scores=np.array([0.5, 0.9, 0.7, 0.3]),
+            labels=LABELS,
+        )
+
+        # Act
+        class_aware = prediction_array.non_max_suppression(iou_threshold=0.5)
+        class_agnostic = prediction_array.non_max_suppression(
+            iou_threshold=0.5, class_aware=False
+        )
+
+        # Assert
+        assert class_aware.scores.tolist() == [0.9, 0.7, 0.3]
+        assert class_agnostic.scores.tolist() == [0.9, 0.3]
+
+    def test_non_max_suppression_rotated(self):
+        # Arrange
+        prediction = Prediction(
+            annotations=[
+                Annotation(
+                    shape=RotatedRectangle(
+                        x=50, y=50, width=40, height=10, angle=angle
+                    ),
+                    labels=[ScoredLabel(name="cat", id="1", probability=score)],
+                )
+                for angle, score in [(45, 0.9), (50, 0.8), (135, 0.7)]
+            ]
+        )
+        prediction_filter = PredictionFilter(iou_threshold=0.5)
+
+        # Act
+        filtered = prediction_filter.apply_to_prediction(prediction)
+
+        # Assert
+        assert [annotation.shape.angle for annotation in filtered.annotations] == [
+            45,
+            135,
+        ]
+
+    def test_top_k(self):
+        # Arrange
+        prediction_array = PredictionArray.from_boxes(
+            boxes=np.arange(20).reshape(5, 4),
+            label_indices=np.array([0, 1, 0, 0, 1]),
+            scores=np.array([0.1, 0.2, 0.3, 0.4, 0.5]),
+            labels=LABELS,
+        )
+
+        # Act
+        top_per_label = prediction_array.top_k(2)
+        top = prediction_array.top_k(2, per_label=False)
+
+        # Assert
+        assert top_per_label.scores.tolist() == [0.2, 0.3, 0.4, 0.5]
+        np.testing.assert_array_equal(top.boxes, prediction_array.boxes[3:])
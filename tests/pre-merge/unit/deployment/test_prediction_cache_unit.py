@@ -0,0 +1,97 @@
+# Copyright (C) 2023 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions
+# and limitations under the License.
+import numpy as np
+import pytest
+from pytest_mock import MockerFixture
+
+from geti_sdk.data_models import Annotation, Prediction
+from geti_sdk.data_models.shapes import Rectangle
+from geti_sdk.deployment import PredictionCache
+
+
+def _prediction(width: int) -> Prediction:
+    return Prediction(
+        annotations=[
+            Annotation(shape=Rectangle(x=0, y=0, width=width, height=10), labels=[])
+        ]
+    )
+
+
+class TestPredictionCache:
+    def test_lru_eviction_and_copies(self):
+        # Arrange
+        cache = PredictionCache(max_size=2)
+        images = [np.full((8, 8, 3), value, dtype=np.uint8) for value in range(3)]
+        keys = [cache.compute_key(image) for image in images]
+
+        # Act
+        cache.put(keys[0], _prediction(1))
+        cache.put(keys[1], _prediction(2))
+        # Reading the first entry makes the second the least recently used one
+        first_prediction = cache.get(keys[0])
+        first_prediction.annotations[0].shape.width = 100
+        cache.put(keys[2], _prediction(3))
+
+        # Assert
+        assert len(set(keys)) == 3
+        assert cache.get(keys[1]) is None
+        assert cache.get(keys[0]).annotations[0].shape.width == 1
+        assert cache.get(keys[2]).annotations[0].shape.width == 3
+        assert (cache.hits, cache.misses, cache.evictions) == (3, 1, 1)
+        assert cache.hit_rate == 0.75
+        assert len(cache) == 2
+
+    def test_ttl(self, mocker: MockerFixture):
+        # Arrange
+        mock_time = mocker.patch(
+            "geti_sdk.deployment.prediction_cache.time.monotonic", return_value=100
+        )
+        cache = PredictionCache(ttl=10)
+        key = cache.compute_key(np.zeros((8, 8, 3), dtype=np.uint8))
+        cache.put(key, _prediction(1))
+
+        # Act
+        mock_time.return_value = 105
+        fresh_prediction = cache.get(key)
+        mock_time.return_value = 111
+        expired_prediction = cache.get(key)
+
+        # Assert
+        assert fresh_prediction is not None
+        assert expired_prediction is None
+        assert len(cache) == 0
+
+    def test_perceptual_hash(self):
+        # Arrange
+        rng = np.random.default_rng(seed=0)
+        image = np.zeros((480, 640, 3), dtype=np.uint8)
+        image[:, 320:] = 200
+        image[100:300, 100:200] = 100
+        noisy_image = np.clip(
+            image + rng.integers(-3, 4, size=image.shape), 0, 255
+        ).astype(np.uint8)
+        other_image = np.fliplr(image)
+        exact_cache = PredictionCache()
+        perceptual_cache = PredictionCache(hash_method="perceptual")
+
+        # Act and assert
+        assert exact_cache.compute_key(image) != exact_cache.compute_key(noisy_image)
+        assert perceptual_cache.compute_key(image) == perceptual_cache.compute_key(
+            noisy_image
+        )
+        assert perceptual_cache.compute_key(image) != perceptual_cache.compute_key(
+            other_image
+        )
+        with pytest.raises(ValueError):
+            PredictionCache(hash_method="md5")
@@ -0,0 +1,261 @@
+# Copyright (C) 2023 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions
+# and limitations under the License.
+import copy
+from typing import Any, Dict, List, Optional
+
+import cv2
+import numpy as np
+import pytest
+from openvino.model_api.models.utils import AnomalyResult, Detection, DetectionResult
+from otx.api.entities.color import Color
+from otx.api.entities.id import ID
+from otx.api.entities.label import Domain, LabelEntity
+from otx.api.entities.label_schema import LabelGroup, LabelSchemaEntity
+from otx.api.usecases.exportable_code.prediction_to_annotation_converter import (
+    create_converter,
+)
+from otx.api.utils.detection_utils import detection2array
+
+from geti_sdk.data_models import Prediction, TaskType
+from geti_sdk.deployment.data_models import PredictionArray
+from geti_sdk.deployment.prediction_converters import create_prediction_converter
+
+IMAGE_HEIGHT, IMAGE_WIDTH = 480, 640
+METADATA = {"original_shape": (IMAGE_HEIGHT, IMAGE_WIDTH, 3)}
+
+
+def _label_schema(
+    names: List[str], domain: Domain, anomalous: Optional[str] = None
+) -> LabelSchemaEntity:
+    labels = [
+        LabelEntity(
+            name=name,
+            domain=domain,
+            color=Color(10 * index, 20, 30),
+            id=ID(str(index + 1)),
+            is_anomalous=name == anomalous,
+        )
+        for index, name in enumerate(names)
+    ]
+    return LabelSchemaEntity(label_groups=[LabelGroup(name="labels", labels=labels)])
+
+
+def _convert_with_otx(
+    task_type: TaskType,
+    label_schema: LabelSchemaEntity,
+    configuration: Dict[str, Any],
+    postprocessing_results: Any,
+) -> Prediction:
+    """
+    Convert the model outputs via OTX annotation entities, like the Deployment did
+    before the direct converters were introduced
+    """
+    if hasattr(postprocessing_results, "objects"):
+        postprocessing_results = detection2array(postprocessing_results.objects)
+    converter = create_converter(
+        task_type.to_ote_domain(), labels=label_schema, configuration=configuration
+    )
+    scene = converter.convert_to_annotation(postprocessing_results, metadata=METADATA)
+    return Prediction.from_ote(
+        scene, image_width=IMAGE_WIDTH, image_height=IMAGE_HEIGHT
+    )
+
+
+def _assert_equivalent(
+    task_type: TaskType,
+    label_schema: LabelSchemaEntity,
+    postprocessing_results: Any,
+    configuration: Optional[Dict[str, Any]] = None,
+):
+    configuration = configuration if configuration is not None else {}
+    expected = _convert_with_otx(
+        task_type, label_schema, configuration, copy.deepcopy(postprocessing_results)
+    )
+    converter = create_prediction_converter(task_type, label_schema, configuration)
+    prediction = converter.convert(
+        postprocessing_results,
+        metadata=METADATA,
+        image_width=IMAGE_WIDTH,
+        image_height=IMAGE_HEIGHT,
+    )
+    assert len(prediction.annotations) == len(expected.annotations)
+    for annotation, expected_annotation in zip(
+        prediction.annotations, expected.annotations
+    ):
+        assert annotation.shape == expected_annotation.shape
+        assert [
+            (label.name, label.id, label.color, label.probability)
+            for label in annotation.labels
+        ] == [
+            (label.name, label.id, label.color, label.probability)
+            for label in expected_annotation.labels
+        ]
+
+
+def _random_detections(n_objects: int) -> DetectionResult:
+    rng = np.random.default_rng(seed=42)
+    objects = []
+    for _ in range(n_objects):
+        x_min, y_min = rng.uniform(0, IMAGE_WIDTH - 50), rng.uniform(
+            0, IMAGE_HEIGHT - 50
+        )
+        objects.append(
+            Detection(
+                xmin=x_min,
+                ymin=y_min,
+                xmax=x_min + rng.uniform(0.5, 50),
+                ymax=y_min + rng.uniform(0.5, 50),
+                score=rng.uniform(),
+                id=rng.integers(0, 2),
+            )
+        )
+    return DetectionResult(objects, None, None)
+
+
+def _random_masks(n_objects: int) -> tuple:
+    rng = np.random.default_rng(seed=42)
+    scores = rng.uniform(size=n_objects).astype(np.float32)
+    classes = rng.integers(1, 3, size=n_objects).astype(np.uint32)
+    boxes = np.zeros((n_objects, 4), dtype=np.float32)
+    masks = np.zeros((n_objects, IMAGE_HEIGHT, IMAGE_WIDTH), dtype=np.uint8)
+    for index in range(n_objects):
+        x_min, y_min = rng.integers(0, IMAGE_WIDTH - 60), rng.integers(
+            0, IMAGE_HEIGHT - 60
+        )
+        x_max, y_max = x_min + rng.integers(5, 60), y_min + rng.integers(5, 60)
+        boxes[index] = [x_min, y_min, x_max, y_max]
+        cv2.ellipse(
+            masks[index],
+            center=(int(x_min + x_max) // 2, int(y_min + y_max) // 2),
+            axes=(int(x_max - x_min) // 2, int(y_max - y_min) // 2),
+            angle=float(rng.uniform(0, 180)),
+            startAngle=0,
+            endAngle=360,
+            color=1,
+            thickness=-1,
+        )
+    return scores, classes, boxes, masks
+
+
+class TestPredictionConverters:
+    @pytest.mark.parametrize("use_ellipse_shapes", [False, True])
+    def test_detection(self, use_ellipse_shapes: bool):
+        # Arrange
+        label_schema = _label_schema(["cat", "dog"], Domain.DETECTION)
+        configuration = {
+            "use_ellipse_shapes": use_ellipse_shapes,
+            "confidence_threshold": 0.3,
+        }
+
+        # Act and assert
+        _assert_equivalent(
+            TaskType.DETECTION, label_schema, _random_detections(200), configuration
+        )
+        _assert_equivalent(TaskType.DETECTION, label_schema, _random_detections(0))
+
+    def test_detection_array(self):
+        # Arrange
+        label_schema = _label_schema(["cat", "dog"], Domain.DETECTION)
+        detections = detection2array(_random_detections(50).objects)
+
+        # Act and assert
+        _assert_equivalent(
+            TaskType.DETECTION, label_schema, detections.astype(np.float32)
+        )
+
+    @pytest.mark.parametrize("use_ellipse_shapes", [False, True])
+    def test_detection_to_prediction_array(self, use_ellipse_shapes: bool):
+        # Arrange
+        label_schema = _label_schema(["cat", "dog"], Domain.DETECTION)
+        converter = create_prediction_converter(
+            TaskType.DETECTION,
+            label_schema,
+            {"use_ellipse_shapes": use_ellipse_shapes, "confidence_threshold": 0.3},
+        )
+        kwargs = dict(
+            metadata=METADATA, image_width=IMAGE_WIDTH, image_height=IMAGE_HEIGHT
+        )
+
+        for detections in [_random_detections(200), _random_detections(0)]:
+            # Act
+            prediction_array = converter.convert_to_array(detections, **kwargs)
+            expected = PredictionArray.from_prediction(
+                converter.convert(detections, **kwargs)
+            )
+
+            # Assert
+            assert len(prediction_array) == len(expected)
+            assert prediction_array.boxes.dtype == np.float32
+            np.testing.assert_array_equal(prediction_array.boxes, expected.boxes)
+            np.testing.assert_array_equal(
+                prediction_array.shape_types, expected.shape_types
+            )
+            np.testing.assert_array_equal(prediction_array.scores, expected.scores)
+            assert [
+                prediction_array.label_names[index]
+                for index in prediction_array.label_indices
+            ] == [expected.label_names[index] for index in expected.label_indices]
+
+    @pytest.mark.parametrize(
+        "task_type", [TaskType.INSTANCE_SEGMENTATION, TaskType.ROTATED_DETECTION]
+    )
+    @pytest.mark.parametrize("use_ellipse_shapes", [False, True])
+    def test_instance_segmentation(self, task_type: TaskType, use_ellipse_shapes: bool):
+        # Arrange
+        label_schema = _label_schema(["cat", "dog"], task_type.to_ote_domain())
+        configuration = {
+            "use_ellipse_shapes": use_ellipse_shapes,
+            "confidence_threshold": 0.2,
+        }
+
+        # Act and assert
+        _assert_equivalent(task_type, label_schema, _random_masks(20), configuration)
+
+    def test_classification(self):
+        # Arrange
+        label_schema = _label_schema(["cat", "dog", "horse"], Domain.CLASSIFICATION)
+        single_label_schema = _label_schema(["cat"], Domain.CLASSIFICATION)
+
+        # Act and assert
+        _assert_equivalent(
+            TaskType.CLASSIFICATION, label_schema, [(2, np.float32(0.7))]
+        )
+        _assert_equivalent(TaskType.CLASSIFICATION, single_label_schema, [(0, 0.9)])
+
+    @pytest.mark.parametrize("n_boxes", [0, 3])
+    def test_anomaly(self, n_boxes: int):
+        # Arrange
+        label_schema = _label_schema(
+            ["Normal", "Anomalous"], Domain.ANOMALY_DETECTION, anomalous="Anomalous"
+        )
+        result = AnomalyResult(
+            anomaly_map=np.zeros((240, 320)),
+            pred_boxes=np.array(
+                [[10 * i, 5 * i, 10 * i + 33, 5 * i + 17] for i in range(n_boxes)]
+            ),
+            pred_label="Anomaly" if n_boxes > 0 else "Normal",
+            pred_mask=np.zeros((240, 320), dtype=np.uint8),
+            pred_score=0.75,
+        )
+
+        # Act and assert
+        _assert_equivalent(TaskType.ANOMALY_CLASSIFICATION, label_schema, result)
+        _assert_equivalent(TaskType.ANOMALY_DETECTION, label_schema, result)
+
+    def test_unsupported_task_types(self):
+        # Arrange
+        label_schema = _label_schema(["road"], Domain.SEGMENTATION)
+
+        # Act and assert
+        assert create_prediction_converter(TaskType.SEGMENTATION, label_schema) is None
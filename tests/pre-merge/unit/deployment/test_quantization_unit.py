@@ -0,0 +1,121 @@
+# Copyright (C) 2023 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions
+# and limitations under the License.
+from typing import Callable, List, Tuple
+
+import cv2
+import numpy as np
+
+from geti_sdk.data_models import Annotation, Prediction, ScoredLabel
+from geti_sdk.data_models.shapes import Rectangle
+from geti_sdk.deployment import DeployedModel, QuantizationReport
+from geti_sdk.deployment.quantization import (
+    _create_quantized_model,
+    _f1_score,
+    load_calibration_images,
+)
+
+
+def _prediction(boxes: List[Tuple[Rectangle, str, float]]) -> Prediction:
+    return Prediction(
+        annotations=[
+            Annotation(
+                shape=rectangle, labels=[ScoredLabel(name=name, probability=score)]
+            )
+            for rectangle, name, score in boxes
+        ]
+    )
+
+
+class TestQuantization:
+    def test_f1_score(self):
+        # Arrange
+        reference = _prediction(
+            [
+                (Rectangle(x=0, y=0, width=10, height=10), "cat", 1.0),
+                (Rectangle(x=50, y=50, width=10, height=10), "dog", 1.0),
+            ]
+        )
+        prediction = _prediction(
+            [
+                # Matches the cat
+                (Rectangle(x=1, y=1, width=10, height=10), "cat", 0.9),
+                # Duplicate of the cat, with a lower score
+                (Rectangle(x=0, y=0, width=10, height=10), "cat", 0.5),
+                # Right location, wrong label
+                (Rectangle(x=50, y=50, width=10, height=10), "cat", 0.8),
+            ]
+        )
+
+        # Act
+        score = _f1_score(prediction, reference, iou_threshold=0.5)
+
+        # Assert
+        assert score == 2 * 1 / (3 + 2)
+        assert _f1_score(reference, reference, iou_threshold=0.5) == 1
+        assert _f1_score(_prediction([]), _prediction([]), iou_threshold=0.5) == 1
+        assert _f1_score(_prediction([]), reference, iou_threshold=0.5) == 0
+
+    def test_create_quantized_model(
+        self, fxt_deployed_model_factory: Callable[[str], DeployedModel]
+    ):
+        # Arrange
+        model = fxt_deployed_model_factory("detector")
+        model._model_data_path = "dummy/model"
+        model._model_python_path = "dummy/python"
+
+        # Act
+        quantized_model = _create_quantized_model(model)
+
+        # Assert
+        assert quantized_model.precision == ["INT8"]
+        assert quantized_model.name == "detector INT8 PTQ"
+        assert quantized_model.model_data_path == "dummy/model"
+        assert quantized_model._model_python_path == "dummy/python"
+        assert model.precision == ["FP32"]
+
+    def test_load_calibration_images(self, tmp_path):
+        # Arrange
+        image = np.zeros((8, 6, 3), dtype=np.uint8)
+        image[..., 0] = 255
+        cv2.imwrite(str(tmp_path / "b.png"), image)
+        cv2.imwrite(str(tmp_path / "a.png"), image)
+        (tmp_path / "notes.txt").write_text("not an image")
+
+        # Act
+        images = load_calibration_images(tmp_path)
+        first_image = load_calibration_images(tmp_path, max_images=1)
+
+        # Assert
+        assert len(images) == 2
+        assert len(first_image) == 1
+        # Blue in BGR order is loaded as blue in RGB order
+        assert images[0].shape == (8, 6, 3)
+        assert images[0][0, 0].tolist() == [0, 0, 255]
+
+    def test_report(self):
+        # Arrange
+        report = QuantizationReport(
+            output_folder="quantized",
+            n_calibration_images=300,
+            n_validation_images=50,
+            reference_accuracy=0.9,
+            quantized_accuracy=0.85,
+            reference_fps=20.0,
+            quantized_fps=50.0,
+            uses_ground_truth=True,
+        )
+
+        # Act and assert
+        assert np.isclose(report.accuracy_delta, -0.05)
+        assert report.throughput_gain == 2.5
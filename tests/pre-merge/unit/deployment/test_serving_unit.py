@@ -0,0 +1,108 @@
+# Copyright (C) 2023 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions
+# and limitations under the License.
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Sequence
+
+import cv2
+import numpy as np
+import requests
+
+from geti_sdk.data_models import Annotation, Prediction, ScoredLabel
+from geti_sdk.data_models.shapes import Rectangle
+from geti_sdk.deployment import InferenceServer
+
+
+class _FakeDeployment:
+    """
+    Stand-in for a Deployment that records the size of the batches it is asked to
+    infer. The prediction for each image holds a box covering the image, labelled
+    with the value of its first pixel
+    """
+
+    are_models_loaded = True
+
+    def __init__(self):
+        self.batch_sizes: List[int] = []
+        self._lock = threading.Lock()
+
+    def infer_batch(
+        self, images: Sequence[np.ndarray], max_batch_size: int
+    ) -> List[Prediction]:
+        with self._lock:
+            self.batch_sizes.append(len(images))
+        time.sleep(0.02)
+        if any(image[0, 0, 0] == 13 for image in images):
+            raise ValueError("Unlucky image")
+        return [
+            Prediction(
+                annotations=[
+                    Annotation(
+                        shape=Rectangle(
+                            x=0, y=0, width=image.shape[1], height=image.shape[0]
+                        ),
+                        labels=[
+                            ScoredLabel(
+                                name=str(image[0, 0, 0]), probability=1.0, id="1"
+                            )
+                        ],
+                    )
+                ]
+            )
+            for image in images
+        ]
+
+
+def _encode(value: int) -> bytes:
+    image = np.full((8, 16, 3), value, dtype=np.uint8)
+    return cv2.imencode(".png", image)[1].tobytes()
+
+
+class TestInferenceServer:
+    def test_dynamic_batching(self):
+        # Arrange
+        deployment = _FakeDeployment()
+        server = InferenceServer(
+            deployment, port=0, max_batch_size=4, max_queue_delay=0.05
+        )
+
+        def _predict(value: int) -> requests.Response:
+            return requests.post(f"{server.address}/predict", data=_encode(value))
+
+        # Act
+        with server:
+            with ThreadPoolExecutor(max_workers=12) as executor:
+                responses = list(executor.map(_predict, range(12)))
+            error_response = _predict(13)
+            invalid_response = requests.post(
+                f"{server.address}/predict", data=b"no image"
+            )
+            metrics = requests.get(f"{server.address}/metrics").json()
+
+        # Assert
+        assert [response.status_code for response in responses] == [200] * 12
+        for value, response in enumerate(responses):
+            annotation = response.json()["annotations"][0]
+            assert annotation["labels"][0]["name"] == str(value)
+            assert annotation["shape"]["width"] == 16
+        # Concurrent requests are inferred together
+        assert max(deployment.batch_sizes) == 4
+        assert sum(deployment.batch_sizes) == 13
+        assert error_response.status_code == 500
+        assert invalid_response.status_code == 400
+        assert metrics["requests"] == 14
+        assert metrics["errors"] == 2
+        assert metrics["mean_batch_size"] > 1
+        assert metrics["latency_p99_ms"] >= metrics["latency_p50_ms"] > 0
@@ -0,0 +1,141 @@
+# Copyright (C) 2023 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions
+# and limitations under the License.
+from typing import List
+
+import numpy as np
+import pytest
+
+from geti_sdk.data_models import Annotation, Prediction, ScoredLabel
+from geti_sdk.data_models.shapes import Rectangle
+from geti_sdk.deployment import IoUTracker, VideoInferencer
+
+
+def _prediction(rectangles: List[Rectangle], label: ScoredLabel) -> Prediction:
+    return Prediction(
+        annotations=[Annotation(shape=rect, labels=[label]) for rect in rectangles]
+    )
+
+
+class _MovingBoxDeployment:
+    """
+    Stand-in for a Deployment that detects two boxes, moving 2 pixels to the right
+    per frame. The frames hold their frame index as pixel value
+    """
+
+    def __init__(self, label: ScoredLabel):
+        self.label = label
+        self.inferred_frames: List[int] = []
+
+    def infer(self, frame: np.ndarray) -> Prediction:
+        frame_index = int(frame[0, 0, 0])
+        self.inferred_frames.append(frame_index)
+        return _prediction(
+            [
+                Rectangle(x=10 + 2 * frame_index, y=10, width=20, height=20),
+                Rectangle(x=100, y=100 - 2 * frame_index, width=40, height=40),
+            ],
+            self.label,
+        )
+
+
+class TestIoUTracker:
+    def test_update(self, fxt_scored_label: ScoredLabel):
+        # Arrange
+        tracker = IoUTracker(iou_threshold=0.3)
+        first = _prediction(
+            [Rectangle(0, 0, 10, 10), Rectangle(50, 50, 10, 10)], fxt_scored_label
+        )
+        second = _prediction(
+            [
+                Rectangle(52, 50, 10, 10),
+                Rectangle(1, 0, 10, 10),
+                Rectangle(200, 200, 10, 10),
+            ],
+            fxt_scored_label,
+        )
+
+        # Act
+        first_ids = [annotation.id for annotation in tracker.update(first).annotations]
+        tracker.advance()
+        second_ids = [
+            annotation.id for annotation in tracker.update(second).annotations
+        ]
+        tracker.advance()
+        third_ids = [
+            annotation.id
+            for annotation in tracker.update(
+                _prediction([Rectangle(54, 50, 10, 10)], fxt_scored_label)
+            ).annotations
+        ]
+
+        # Assert
+        assert first_ids == ["0", "1"]
+        assert second_ids == ["1", "0", "2"]
+        assert third_ids == ["1"]
+        # Unmatched tracks are removed
+        assert [track.track_id for track in tracker.tracks] == [1]
+        # The first velocity estimate is used as is, later ones are smoothed
+        assert np.allclose(tracker.tracks[0].velocity, [2, 0])
+
+
+class TestVideoInferencer:
+    def test_infer_video(self, fxt_scored_label: ScoredLabel):
+        # Arrange
+        deployment = _MovingBoxDeployment(fxt_scored_label)
+        inferencer = VideoInferencer(deployment, keyframe_interval=4)
+        frames = [np.full((8, 8, 3), index, dtype=np.uint8) for index in range(10)]
+
+        # Act
+        predictions = list(inferencer.infer_video(frames))
+
+        # Assert
+        assert deployment.inferred_frames == [0, 4, 8]
+        assert inferencer.frames_inferred == 3
+        assert inferencer.frames_propagated == 7
+        for prediction in predictions:
+            assert [annotation.id for annotation in prediction.annotations] == [
+                "0",
+                "1",
+            ]
+        # Before the second keyframe the velocity is unknown, afterwards the boxes
+        # are propagated at the estimated velocity
+        assert predictions[3].annotations[0].shape == Rectangle(10, 10, 20, 20)
+        for frame_index in [5, 6, 7, 9]:
+            first_box, second_box = (
+                annotation.shape for annotation in predictions[frame_index].annotations
+            )
+            assert first_box == Rectangle(
+                x=10 + 2 * frame_index, y=10, width=20, height=20
+            )
+            assert second_box == Rectangle(
+                x=100, y=100 - 2 * frame_index, width=40, height=40
+            )
+
+    def test_infer_difference_threshold(self, fxt_scored_label: ScoredLabel):
+        # Arrange
+        deployment = _MovingBoxDeployment(fxt_scored_label)
+        inferencer = VideoInferencer(
+            deployment, keyframe_interval=100, difference_threshold=0.1
+        )
+        frames = [np.full((8, 8, 3), index, dtype=np.uint8) for index in range(5)]
+        frames.append(np.full((8, 8, 3), 100, dtype=np.uint8))
+
+        # Act
+        for frame in frames:
+            inferencer.infer(frame)
+
+        # Assert
+        assert deployment.inferred_frames == [0, 100]
+        with pytest.raises(ValueError):
+            VideoInferencer(deployment, keyframe_interval=0)
@@ -0,0 +1,40 @@
+# Copyright (C) 2023 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions
+# and limitations under the License.
+import pytest
+
+
+class TestGetiSession:
+    @pytest.mark.parametrize(
+        "content_type, expected_header",
+        [
+            ("json", "application/json"),
+            ("jpeg", "image/jpeg"),
+            ("png", "image/png"),
+            ("webp", "image/webp"),
+            ("multipart", None),
+        ],
+    )
+    def test_get_headers_for_content_type(
+        self, fxt_mocked_session_factory, content_type: str, expected_header: str
+    ):
+        # Arrange
+        session = fxt_mocked_session_factory()
+        session_headers = dict(session.headers)
+
+        # Act
+        headers = session._get_headers_for_content_type(content_type)
+
+        # Assert
+        assert headers == {"Content-Type": expected_header}
+        assert dict(session.headers) == session_headers
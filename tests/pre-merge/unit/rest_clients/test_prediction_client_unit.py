@@ -0,0 +1,276 @@
+# Copyright (C) 2023 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions
+# and limitations under the License.
+import os
+import threading
+import time
+from typing import Callable, List
+
+import cv2
+import numpy as np
+import pytest
+from pytest_mock import MockerFixture
+
+from geti_sdk.data_models import Annotation, Prediction, Project, VideoFrame
+from geti_sdk.data_models.containers import MediaList
+from geti_sdk.data_models.shapes import Rectangle
+from geti_sdk.rest_clients import PredictionClient
+
+
+@pytest.fixture()
+def fxt_prediction_client(
+    mocker: MockerFixture,
+    fxt_mocked_session_factory,
+    fxt_classification_project: Project,
+) -> PredictionClient:
+    mocker.patch.object(
+        PredictionClient, "_PredictionClient__are_models_trained", return_value=True
+    )
+    session = fxt_mocked_session_factory(return_value={})
+    yield PredictionClient(
+        session=session, project=fxt_classification_project, workspace_id="1"
+    )
+
+
+class TestPredictionClient:
+    @pytest.mark.parametrize("encoding", ["jpeg", "png", "webp"])
+    def test_encode_image_payload(self, fxt_numpy_image: np.ndarray, encoding: str):
+        # Arrange
+        max_size = 100
+        height, width = fxt_numpy_image.shape[0:2]
+        expected_scale = max_size / max(height, width)
+
+        # Act
+        image_io, scale_factor = PredictionClient._encode_image_payload(
+            fxt_numpy_image, max_size=max_size, encoding=encoding
+        )
+        decoded = cv2.imdecode(
+            np.frombuffer(image_io.getvalue(), dtype=np.uint8), cv2.IMREAD_COLOR
+        )
+
+        # Assert
+        assert scale_factor == expected_scale
+        assert max(decoded.shape[0:2]) == max_size
+        assert decoded.shape[0] == round(height * scale_factor)
+        assert decoded.shape[1] == round(width * scale_factor)
+
+    def test_encode_image_payload_no_resize(self, fxt_numpy_image: np.ndarray):
+        # Act
+        image_io, scale_factor = PredictionClient._encode_image_payload(
+            fxt_numpy_image, max_size=max(fxt_numpy_image.shape), encoding="png"
+        )
+        decoded = cv2.imdecode(
+            np.frombuffer(image_io.getvalue(), dtype=np.uint8), cv2.IMREAD_COLOR
+        )
+
+        # Assert
+        assert scale_factor == 1
+        assert np.array_equal(decoded, fxt_numpy_image)
+
+    def test_rescale_prediction(
+        self, fxt_rectangle_annotation_factory: Callable[[int, int], Annotation]
+    ):
+        # Arrange
+        prediction = Prediction(
+            annotations=[
+                fxt_rectangle_annotation_factory(image_width=100, image_height=200)
+            ]
+        )
+        expected_annotation = fxt_rectangle_annotation_factory(
+            image_width=1000, image_height=2000
+        )
+
+        # Act
+        PredictionClient._rescale_prediction(
+            prediction,
+            resized_width=100,
+            resized_height=200,
+            original_width=1000,
+            original_height=2000,
+        )
+
+        # Assert
+        assert prediction.annotations[0].shape == expected_annotation.shape
+
+    @pytest.mark.parametrize("encoding", ["jpeg", "png", "webp"])
+    def test_predict_image_downscaled(
+        self,
+        mocker: MockerFixture,
+        fxt_prediction_client: PredictionClient,
+        fxt_rectangle_annotation_factory: Callable[[int, int], Annotation],
+        encoding: str,
+    ):
+        # Arrange
+        image = np.zeros((800, 400, 3), dtype=np.uint8)
+        mocker.patch(
+            "geti_sdk.rest_clients.prediction_client.PredictionRESTConverter.from_dict",
+            return_value=Prediction(
+                annotations=[
+                    fxt_rectangle_annotation_factory(image_width=100, image_height=200)
+                ]
+            ),
+        )
+        mock_get_rest_response = fxt_prediction_client.session.get_rest_response
+
+        # Act
+        prediction = fxt_prediction_client.predict_image(
+            image, max_size=200, encoding=encoding
+        )
+
+        # Assert
+        request_kwargs = mock_get_rest_response.call_args.kwargs
+        assert request_kwargs["contenttype"] == encoding
+        assert request_kwargs["data"].name.startswith("numpy_image.")
+        assert prediction.annotations[0].shape == Rectangle(
+            x=20, y=80, width=360, height=640
+        )
+
+    def test_predict_image_local_routing(
+        self, mocker: MockerFixture, fxt_prediction_client: PredictionClient
+    ):
+        # Arrange
+        image = np.zeros((20, 10, 3), dtype=np.uint8)
+        image[..., 0] = 255
+        local_prediction = Prediction(annotations=[])
+        remote_prediction = Prediction(annotations=[])
+        mocker.patch(
+            "geti_sdk.rest_clients.prediction_client.PredictionRESTConverter.from_dict",
+            return_value=remote_prediction,
+        )
+        active_model = mocker.MagicMock(version=2)
+        active_model.optimized_models = [mocker.MagicMock(id="optimized_model")]
+        mock_model_client = mocker.patch(
+            "geti_sdk.rest_clients.prediction_client.ModelClient"
+        )
+        mock_model_client.return_value.get_active_model_for_task.return_value = (
+            active_model
+        )
+        deployment = mocker.MagicMock(are_models_loaded=True)
+        deployment.models = [mocker.MagicMock(id="optimized_model", version=2)]
+        deployment.infer.return_value = local_prediction
+
+        # Act
+        fxt_prediction_client.attach_deployment(deployment, version_check_interval=0)
+        first_prediction = fxt_prediction_client.predict_image(image)
+        first_source = fxt_prediction_client.last_prediction_source
+        # The model is retrained on the server, the deployment is outdated
+        active_model.optimized_models = [mocker.MagicMock(id="new_model")]
+        second_prediction = fxt_prediction_client.predict_image(image)
+        second_source = fxt_prediction_client.last_prediction_source
+
+        # Assert
+        assert first_prediction is local_prediction
+        assert str(first_source) == "local"
+        # The deployment receives the image in RGB channel order
+        assert deployment.infer.call_args.args[0][0, 0].tolist() == [0, 0, 255]
+        assert second_prediction is remote_prediction
+        assert str(second_source) == "remote"
+        assert fxt_prediction_client.prediction_source_counts == {
+            "local": 1,
+            "remote": 1,
+        }
+        deployment.are_models_loaded = False
+        with pytest.raises(ValueError):
+            fxt_prediction_client.attach_deployment(deployment)
+
+    def test_predict_image_invalid_input(
+        self, fxt_prediction_client: PredictionClient, tmp_path
+    ):
+        # Act and assert
+        with pytest.raises(ValueError):
+            fxt_prediction_client.predict_image(
+                np.zeros((10, 10, 3), dtype=np.uint8), encoding="bmp"
+            )
+        with pytest.raises(ValueError):
+            fxt_prediction_client.predict_image(
+                str(tmp_path / "does_not_exist.jpg"), max_size=100
+            )
+
+    @pytest.mark.parametrize("max_concurrent_requests", [1, 3])
+    def test_download_predictions_concurrency(
+        self,
+        mocker: MockerFixture,
+        fxt_prediction_client: PredictionClient,
+        fxt_video_frames: MediaList[VideoFrame],
+        max_concurrent_requests: int,
+        tmp_path,
+    ):
+        # Arrange
+        frames = MediaList(fxt_video_frames[0:12])
+        in_flight: List[int] = [0]
+        max_in_flight: List[int] = [0]
+        downloaded: List[str] = []
+        lock = threading.Lock()
+
+        def _download(media_item: VideoFrame, **kwargs) -> bool:
+            with lock:
+                in_flight[0] += 1
+                max_in_flight[0] = max(max_in_flight[0], in_flight[0])
+            time.sleep(0.01)
+            with lock:
+                in_flight[0] -= 1
+                downloaded.append(media_item.name)
+            return True
+
+        mocker.patch.object(
+            fxt_prediction_client,
+            "_download_prediction_for_media_item",
+            side_effect=_download,
+        )
+
+        # Act
+        fxt_prediction_client._download_predictions_for_2d_media_list(
+            media_list=frames,
+            path_to_folder=str(tmp_path),
+            max_concurrent_requests=max_concurrent_requests,
+        )
+
+        # Assert
+        assert sorted(downloaded) == sorted(frame.name for frame in frames)
+        assert max_in_flight[0] <= max_concurrent_requests
+        if max_concurrent_requests > 1:
+            assert max_in_flight[0] > 1
+
+    def test_download_predictions_resume(
+        self,
+        mocker: MockerFixture,
+        fxt_prediction_client: PredictionClient,
+        fxt_video_frames: MediaList[VideoFrame],
+        tmp_path,
+    ):
+        # Arrange
+        frames = MediaList(fxt_video_frames[0:6])
+        predictions_folder = tmp_path / "predictions"
+        os.makedirs(predictions_folder)
+        completed = [frame.name for frame in frames[0:4:2]]
+        for name in completed:
+            (predictions_folder / f"{name}.json").write_text("{}")
+        mock_download = mocker.patch.object(
+            fxt_prediction_client,
+            "_download_prediction_for_media_item",
+            return_value=True,
+        )
+
+        # Act
+        fxt_prediction_client._download_predictions_for_2d_media_list(
+            media_list=frames,
+            path_to_folder=str(tmp_path),
+            max_concurrent_requests=2,
+            resume=True,
+        )
+
+        # Assert
+        requested = [call.args[0].name for call in mock_download.call_args_list]
+        assert sorted(requested) == sorted(
+            frame.name for frame in frames if frame.name not in completed
+        )